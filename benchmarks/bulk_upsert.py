@@ -0,0 +1,114 @@
+"""
+Bulk upsert through a temporary staging table.
+
+Rows are loaded into a temp table -- streamed with ``COPY ... FROM STDIN`` on
+PostgreSQL, ``executemany`` elsewhere (SQLite in tests) -- and merged into the
+target with a single ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` that only
+rewrites rows whose values changed. Optionally, target rows within a scope
+(e.g. a range of months) that are missing from the batch are deleted, so one
+call can replace that scope without a delete-everything-then-reinsert cycle.
+"""
+import csv
+import io
+import json
+
+from django.db import transaction
+
+# COPY's NULL marker; csv would otherwise write None and '' the same way.
+_NULL = '\\N'
+
+
+def _db_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class _CsvStream:
+    """Read-only file-like CSV view over ``rows``, encoded as ``copy_expert`` reads it."""
+
+    def __init__(self, rows):
+        self._out = io.StringIO()
+        self._writer = csv.writer(self._out, lineterminator='\n')
+        self._rows = iter(rows)
+        self._buffer = ''
+
+    def _line(self, row):
+        self._writer.writerow([_NULL if value is None else _db_value(value) for value in row])
+        line = self._out.getvalue()
+        self._out.seek(0)
+        self._out.truncate()
+        return line
+
+    def read(self, size=-1):
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = self._line(row)
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def upsert_rows(connection, table, columns, conflict_columns, rows, replace=None):
+    """
+    Merge ``rows`` into ``table``.
+
+    :param connection: Django database connection (``django.db.connections[alias]``)
+    :param table: target table name
+    :param columns: column names, in row order
+    :param conflict_columns: unique key the rows are matched on; a subset of ``columns``
+        with a unique constraint on it
+    :param rows: iterable of tuples; at most one per key (a duplicate key raises ``IntegrityError``)
+    :param replace: optional ``(where_sql, params)`` on the target's columns. Target rows
+        matching it whose key is not among ``rows`` are deleted.
+    :return: ``(written, deleted)``: rows inserted or changed, and stale rows deleted
+    """
+    quote = connection.ops.quote_name
+    target = quote(table)
+    staging = quote(f'staging_{table}')
+    column_list = ', '.join(quote(c) for c in columns)
+    key_list = ', '.join(quote(c) for c in conflict_columns)
+    value_columns = [c for c in columns if c not in conflict_columns]
+    distinct = 'IS DISTINCT FROM' if connection.vendor == 'postgresql' else 'IS NOT'
+    if value_columns:
+        assignments = ', '.join(f'{quote(c)} = excluded.{quote(c)}' for c in value_columns)
+        changed = ' OR '.join(f'{target}.{quote(c)} {distinct} excluded.{quote(c)}' for c in value_columns)
+        on_conflict = f'DO UPDATE SET {assignments} WHERE {changed}'
+    else:
+        on_conflict = 'DO NOTHING'
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {staging}')
+        cursor.execute(f'CREATE TEMPORARY TABLE {staging} AS SELECT {column_list} FROM {target} WHERE 1 = 0')
+        if connection.vendor == 'postgresql':
+            cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')",
+                               _CsvStream(rows))
+        else:
+            placeholders = ', '.join(['%s'] * len(columns))
+            cursor.executemany(f'INSERT INTO {staging} ({column_list}) VALUES ({placeholders})',
+                               [tuple(_db_value(value) for value in row) for row in rows])
+        # Keyed lookups for the stale-row delete; autovacuum never analyzes temp tables.
+        cursor.execute(f'CREATE UNIQUE INDEX {quote(f"staging_{table}_key")} ON {staging} ({key_list})')
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'ANALYZE {staging}')
+        # ``WHERE true`` keeps SQLite from parsing ON CONFLICT as a join constraint.
+        cursor.execute(f'INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {staging} WHERE true '
+                       f'ON CONFLICT ({key_list}) {on_conflict}')
+        written = cursor.rowcount
+        deleted = 0
+        if replace is not None:
+            where_sql, params = replace
+            matches = ' AND '.join(f'{staging}.{quote(c)} = {target}.{quote(c)}' for c in conflict_columns)
+            cursor.execute(f'DELETE FROM {target} WHERE ({where_sql}) '
+                           f'AND NOT EXISTS (SELECT 1 FROM {staging} WHERE {matches})', params)
+            deleted = cursor.rowcount
+        cursor.execute(f'DROP TABLE {staging}')
+    return written, deleted
@@ -1,24 +1,43 @@
-"""Recompute monthly score-trend aggregates and benchmark edges.
-
-The vectorized ``_aggregate_for_month_fast`` below is algorithmically
-equivalent to the per-row notebook helpers in
-``analytics/per-model_wayback/aggregate_scores.ipynb`` (filter -> build
-expected -> initialize -> aggregate), reorganized into pandas matrix ops so
-it scales past a few thousand models. The DB loaders below replace the
-notebook's CSV inputs with live queries; visibility is applied at the
-loader so private benchmarks/scores never enter the aggregation.
+"""Recompute monthly score-trend aggregates, public monthly ranks, first
+qualifying scores and benchmark edges.
+
+``--mode incremental`` keeps a per-domain ``ScoreTrendWatermark`` (highest
+``Score`` id and ``end_timestamp`` processed) and recomputes only the models
+with scores past it, from the earliest month those scores land in; stored
+aggregates stand in for everyone else. When the new scores move the month a
+leaf benchmark is first counted in (or the visible tree / public model set
+changes), every model's aggregate moves and it recomputes all models instead.
+
+The month loop (``_MonthlySweep`` below) is algorithmically equivalent to the
+per-row notebook helpers in ``analytics/per-model_wayback/aggregate_scores.ipynb``
+(filter -> build expected -> initialize -> aggregate), reorganized into one
+pass over the scores in timestamp order that updates a dense latest-score
+matrix, so a backfill costs one sort rather than one per month. The DB
+loaders below replace the notebook's CSV inputs with live queries; visibility
+is applied at the loader so private benchmarks/scores never enter the
+aggregation.
 """
+import hashlib
+import json
 import logging
+import multiprocessing
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pandas as pd
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, connections, transaction
+from django.db.models import F, Max, Min, Q
 
+from benchmarks.bulk_upsert import upsert_rows
 from benchmarks.models import (
-    BenchmarkType, ModelMonthlyAggregate, MonthBenchmarkEdge, Score,
+    BenchmarkType, Model, ModelLeafFirstScore, ModelMonthlyAggregate, ModelMonthlyRank, MonthBenchmarkEdge,
+    Score, ScoreTrendVersion, ScoreTrendWatermark,
 )
+from benchmarks.views.model_trends import trend_ranking_scores
+from benchmarks.views.ranking import min_rank
 
 logger = logging.getLogger(__name__)
 
@@ -52,17 +71,25 @@ def _load_tree_df(domain):
     return pd.DataFrame(rows)
 
 
-def _load_score_long(domain):
+def _visible_scores(domain):
+    """Scores that enter the aggregation: visible benchmarks, timestamped, ceiled."""
+    return Score.objects.filter(benchmark__benchmark_type__domain=domain,
+                                benchmark__benchmark_type__visible=True,
+                                end_timestamp__isnull=False,
+                                score_ceiled__isnull=False)
+
+
+def _load_score_long(domain, model_ids=None):
     """Long-format Score rows: one row per measurement. Multiple rows per
     ``(model_id, benchmark)`` are kept so ``_aggregate_for_month_fast`` can
     pick the latest score with ``end_timestamp <= month_end`` -- a benchmark
     re-scored after a past month's end must still surface its earlier value
-    in that month."""
-    qs = (Score.objects
-          .filter(benchmark__benchmark_type__domain=domain,
-                  benchmark__benchmark_type__visible=True,
-                  end_timestamp__isnull=False,
-                  score_ceiled__isnull=False)
+    in that month. ``model_ids`` restricts the rows to those models."""
+    qs = _visible_scores(domain)
+    if model_ids is not None:
+        qs = qs.filter(model_id__in=model_ids)
+    qs = (qs
+          .order_by('id')  # ties on end_timestamp resolve to the latest row
           .values('model_id',
                   'benchmark__benchmark_type__identifier',
                   'score_ceiled',
@@ -87,6 +114,14 @@ def _month_end_utc(month_str):
     return (pd.Timestamp(month_str + '-01', tz='UTC') + pd.offsets.MonthEnd(0)).to_pydatetime()
 
 
+def _prev_month(ym):
+    return (pd.Timestamp(ym + '-01') - pd.offsets.MonthBegin(1)).strftime('%Y-%m')
+
+
+def _next_month(ym):
+    return (pd.Timestamp(ym + '-01') + pd.offsets.MonthBegin(1)).strftime('%Y-%m')
+
+
 def _month_iter(start_ym, end_ym):
     cur = pd.Timestamp(start_ym + '-01')
     end = pd.Timestamp(end_ym + '-01')
@@ -122,68 +157,448 @@ def _depth_groups(tree_df):
     return tree_df.groupby('depth')['identifier'].apply(list).to_dict()
 
 
+def _utc_datetime64(ts):
+    return pd.Timestamp(ts).tz_convert('UTC').tz_localize(None).to_datetime64()
+
+
+def _sweep_arrays(long_df, all_model_ids):
+    """The long frame as the flat arrays ``_MonthlySweep`` walks: ``ts`` (naive UTC),
+    ``rows`` / ``cols`` (indices into ``model_ids`` / ``col_names``) and ``vals``,
+    sorted by timestamp (stable, so input order breaks ties)."""
+    all_model_ids = list(all_model_ids)
+    if long_df is None or long_df.empty:
+        long_df = pd.DataFrame({'model_id': [], 'benchmark': [], 'score_ceiled': [],
+                                'end_timestamp': pd.to_datetime([], utc=True)})
+    ts = pd.DatetimeIndex(long_df['end_timestamp']).tz_convert('UTC').tz_localize(None).to_numpy()
+    order = np.argsort(ts, kind='stable')
+    sorted_df = long_df.iloc[order]
+    known_ids = set(all_model_ids)
+    model_ids = all_model_ids + sorted(set(sorted_df['model_id'].tolist()) - known_ids)
+    row_of = {mid: i for i, mid in enumerate(model_ids)}
+    col_codes, col_names = pd.factorize(sorted_df['benchmark'], sort=True)
+    return {
+        'ts': ts[order],
+        'rows': np.fromiter((row_of[mid] for mid in sorted_df['model_id'].tolist()),
+                            dtype=np.int64, count=len(sorted_df)),
+        'cols': col_codes.astype(np.int64),
+        'vals': sorted_df['score_ceiled'].to_numpy(dtype=float),
+        'model_ids': model_ids,
+        'col_names': col_names,
+    }
+
+
+class _MonthlySweep:
+    """
+    Month-by-month aggregation over one pass of the long frame.
+
+    Scores are sorted by ``end_timestamp`` once; each ``advance(month_end)``
+    applies only the rows up to ``month_end`` not seen yet to a dense
+    (model x benchmark) latest-score matrix, then rolls the tree up, reusing
+    every parent whose children neither changed value nor membership since
+    the previous month. Output is identical to filtering, de-duplicating and
+    pivoting the frame per month (``tests/test_helpers/legacy_aggregate.py``);
+    parents average their children left to right, as pandas does.
+
+    ``advance`` must be called with non-decreasing ``month_end``. Sweeps only
+    read ``arrays`` (``_sweep_arrays``), so several can share one set.
+    """
+
+    def __init__(self, long_df, all_model_ids, parent_child_map, depth_groups, max_depth, agg_root,
+                 arrays=None):
+        self._parent_child_map = parent_child_map
+        self._depth_groups = depth_groups
+        self._max_depth = max_depth
+        self._agg_root = agg_root
+        self._all_model_ids = list(all_model_ids)
+        if arrays is None:
+            arrays = _sweep_arrays(long_df, self._all_model_ids)
+        self._ts, self._rows, self._cols, self._vals = arrays['ts'], arrays['rows'], arrays['cols'], arrays['vals']
+        self._model_ids, self._col_names = arrays['model_ids'], arrays['col_names']
+        self._col_of = {name: j for j, name in enumerate(self._col_names)}
+
+        n_models, n_cols = len(self._model_ids), len(self._col_names)
+        self._matrix = np.full((n_models, n_cols), np.nan)
+        self._notna_count = np.zeros(n_cols, dtype=np.int64)  # models with a non-NaN latest score
+        self._seen_cols = np.zeros(n_cols, dtype=bool)
+        self._seen_rows = np.zeros(n_models, dtype=bool)
+        self._zeros = np.zeros(n_models)
+        self._pos = 0
+        self._parents = {}  # ident -> (children, filled column)
+        self._coverage = [frozenset()] * n_models
+        self._coverage_leaves = None
+
+    def _apply(self, stop):
+        """Apply rows ``[pos, stop)``; returns ``(changed rows, changed columns)``."""
+        rows, cols, vals = self._rows[self._pos:stop], self._cols[self._pos:stop], self._vals[self._pos:stop]
+        self._pos = stop
+        if not len(rows):
+            return np.empty(0, dtype=np.int64), set()
+        # the latest row per cell wins (rows are in timestamp order)
+        keys = rows * len(self._col_names) + cols
+        _, reverse_first = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - reverse_first
+        rows, cols, vals = rows[last], cols[last], vals[last]
+        before = ~np.isnan(self._matrix[rows, cols])
+        self._matrix[rows, cols] = vals
+        np.add.at(self._notna_count, cols, (~np.isnan(vals)).astype(np.int64) - before)
+        self._seen_cols[cols] = True
+        self._seen_rows[rows] = True
+        return np.unique(rows), {self._col_names[j] for j in np.unique(cols)}
+
+    def _filled(self, name, parent_values):
+        if name in parent_values:
+            return parent_values[name]
+        j = self._col_of.get(name)
+        if j is None:  # a known leaf nobody in this frame was scored on
+            return self._zeros
+        column = self._matrix[:, j]
+        return np.where(np.isnan(column), 0.0, column)
+
+    def advance(self, month_end, known_leaves=None):
+        """``({model_id: agg_root_score}, leaf_set, per_model_coverage)`` for the
+        month ending at ``month_end``; see ``_aggregate_for_month_fast``."""
+        stop = int(np.searchsorted(self._ts, _utc_datetime64(month_end), side='right'))
+        changed_rows, changed_cols = self._apply(stop)
+        if not self._pos:
+            return ({mid: 0.0 for mid in self._all_model_ids}, set(known_leaves or ()),
+                    {mid: frozenset() for mid in self._all_model_ids})
+
+        benchmark_cols = {name for name, seen in zip(self._col_names, self._seen_cols) if seen}
+        if known_leaves is not None:
+            benchmark_cols |= set(known_leaves)
+            existing = set(known_leaves)
+        else:
+            existing = {name for name, count in zip(self._col_names, self._notna_count) if count}
+        for depth in range(self._max_depth, -1, -1):
+            for ident in self._depth_groups.get(depth, []):
+                if ident in existing:
+                    continue
+                for child in self._parent_child_map.get(ident, []):
+                    if child in existing:
+                        existing.add(ident)
+                        break
+
+        leaf_existing = {c for c in benchmark_cols if c in existing}
+        available = set(leaf_existing)
+        parent_values = {}
+        dirty = set(changed_cols)
+        parents = {}
+        for depth in range(self._max_depth, -1, -1):
+            for ident in self._depth_groups.get(depth, []):
+                if ident not in existing or ident in benchmark_cols:
+                    continue
+                children = tuple(c for c in self._parent_child_map.get(ident, [])
+                                 if c in existing and c in available)
+                if not children:
+                    continue
+                cached = self._parents.get(ident)
+                if cached is not None and cached[0] == children and dirty.isdisjoint(children):
+                    values = cached[1]
+                else:
+                    total = np.zeros(len(self._model_ids))
+                    for child in children:
+                        total = total + self._filled(child, parent_values)
+                    values = total / len(children)
+                    dirty.add(ident)
+                parents[ident] = (children, values)
+                parent_values[ident] = values
+                available.add(ident)
+        self._parents = parents
+
+        if self._agg_root in parent_values:
+            root = parent_values[self._agg_root]
+        elif self._agg_root in leaf_existing:
+            root = self._filled(self._agg_root, parent_values)
+        else:
+            root = None
+        out_scores = {mid: 0.0 for mid in self._all_model_ids}
+        seen = np.flatnonzero(self._seen_rows)
+        if root is not None:
+            root_values = root[seen].tolist()
+            for i, value in zip(seen.tolist(), root_values):
+                out_scores[self._model_ids[i]] = value
+
+        coverage_cols = sorted(self._col_of[c] for c in leaf_existing if c in self._col_of)
+        stale = seen if coverage_cols != self._coverage_leaves else changed_rows
+        self._coverage_leaves = coverage_cols
+        if len(stale):
+            names = self._col_names[coverage_cols] if coverage_cols else []
+            scored = ~np.isnan(self._matrix[np.ix_(stale, coverage_cols)])
+            for i, mask in zip(stale.tolist(), scored):
+                self._coverage[i] = frozenset(names[mask]) if coverage_cols else frozenset()
+        out_coverage = {mid: frozenset() for mid in self._all_model_ids}
+        for i in seen.tolist():
+            out_coverage[self._model_ids[i]] = self._coverage[i]
+
+        leaf_set = {b for b in existing if b in benchmark_cols}
+        return out_scores, leaf_set, out_coverage
+
+
 def _aggregate_for_month_fast(
     long_df, all_model_ids, parent_child_map,
-    depth_groups, max_depth, month_end, agg_root,
+    depth_groups, max_depth, month_end, agg_root, known_leaves=None,
 ):
     """Returns ``({model_id: agg_root_score}, leaf_set, per_model_coverage)`` for
     the month ending at ``month_end``. Missing models in either dict are filled
-    with ``0.0`` / ``frozenset()`` so downstream callers see consistent keys."""
-    empty_scores = {mid: 0.0 for mid in all_model_ids}
-    empty_cov = {mid: frozenset() for mid in all_model_ids}
+    with ``0.0`` / ``frozenset()`` so downstream callers see consistent keys.
+
+    ``known_leaves`` is the global set of leaves counted by ``month_end``, for
+    when ``long_df`` only holds some models' scores: the leaves those models
+    happen to have must not decide which parents exist or what they average.
+
+    A single month of ``_MonthlySweep``; month loops should hold one sweep instead."""
+    sweep = _MonthlySweep(long_df, all_model_ids, parent_child_map, depth_groups, max_depth, agg_root)
+    return sweep.advance(month_end, known_leaves=known_leaves)
+
+
+# ---------------------------------------------------------------------
+# Parallel backfill
+# ---------------------------------------------------------------------
+
+# More chunks than workers, so the writer can start on the first months early
+# and a slow chunk does not hold up the others.
+_CHUNKS_PER_WORKER = 4
+
+# Set in the parent right before the pool forks; workers read it copy-on-write,
+# so the score arrays are shared with every process instead of pickled to it.
+_SWEEP_INPUTS = None
+
+
+def _month_chunks(months, n_chunks):
+    """Split ``months`` into at most ``n_chunks`` contiguous runs of near-equal length."""
+    n_chunks = max(1, min(n_chunks, len(months)))
+    size, extra = divmod(len(months), n_chunks)
+    chunks, start = [], 0
+    for i in range(n_chunks):
+        end = start + size + (i < extra)
+        chunks.append(months[start:end])
+        start = end
+    return chunks
+
+
+def _sweep_chunk(months):
+    """Worker: ``[(month, (scores, leaf_set, coverage)), ...]`` for consecutive ``months``,
+    from a sweep of its own over the shared arrays."""
+    all_model_ids, tree_args, agg_root, arrays = _SWEEP_INPUTS
+    sweep = _MonthlySweep(None, all_model_ids, *tree_args, agg_root, arrays=arrays)
+    return [(month, sweep.advance(_month_end_utc(month))) for month in months]
+
+
+def _sweep_months(long_df, all_model_ids, tree_args, agg_root, months, workers=1):
+    """
+    Yield ``(month, (scores, leaf_set, coverage))`` for ``months``, in order.
+
+    With ``workers > 1``, contiguous chunks of months are aggregated in forked
+    processes, each advancing its own sweep straight to its first month. Chunks
+    are yielded in month order as they complete, so the caller stays the single
+    writer.
+
+    :param tree_args: ``(parent_child_map, depth_groups, max_depth)``
+    """
+    global _SWEEP_INPUTS
+    arrays = _sweep_arrays(long_df, all_model_ids)
+    if workers <= 1 or len(months) < 2:
+        sweep = _MonthlySweep(None, all_model_ids, *tree_args, agg_root, arrays=arrays)
+        for month in months:
+            yield month, sweep.advance(_month_end_utc(month))
+        return
+    # Forked workers must not inherit (and on exit, close) the parent's DB
+    # connections; the parent reconnects on its next query.
+    connections.close_all()
+    _SWEEP_INPUTS = (list(all_model_ids), tree_args, agg_root, arrays)
+    try:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+        with pool:
+            for chunk in pool.map(_sweep_chunk, _month_chunks(months, workers * _CHUNKS_PER_WORKER)):
+                yield from chunk
+    finally:
+        _SWEEP_INPUTS = None
+
+
+def _public_month_ranks(scores_by_model, public_model_ids):
+    """``([(model_id, rank)], cohort_size)`` for one month: competition ranks of
+    the public models' aggregates, rounded as the leaderboard ranks them. Models
+    without a score that month (aggregate ``0``) are not ranked."""
+    model_ids = [mid for mid in scores_by_model if mid in public_model_ids]
+    ranks = min_rank(trend_ranking_scores([scores_by_model[mid] for mid in model_ids]))
+    ranked = [(mid, int(rank)) for mid, rank in zip(model_ids, ranks.tolist()) if rank == rank]
+    return ranked, len(ranked)
+
+
+def _first_positive_scores(long_df):
+    """Earliest positive, non-NaN score per ``(model_id, benchmark)``: a frame
+    with ``model_id``, ``benchmark``, ``end_timestamp`` and ``score_ceiled``."""
+    columns = ['model_id', 'benchmark', 'end_timestamp', 'score_ceiled']
     if long_df is None or long_df.empty:
-        return empty_scores, set(), empty_cov
-
-    sub = long_df[long_df['end_timestamp'] <= pd.Timestamp(month_end)]
-    if sub.empty:
-        return empty_scores, set(), empty_cov
-
-    sub = sub.sort_values('end_timestamp').drop_duplicates(['model_id', 'benchmark'], keep='last')
-    score_df = sub.pivot(index='model_id', columns='benchmark', values='score_ceiled')
-    benchmark_cols = list(score_df.columns)
-
-    leaves_present = score_df.notna().any(axis=0)
-    existing = {col for col in benchmark_cols if bool(leaves_present.get(col, False))}
-    for depth in range(max_depth, -1, -1):
-        for ident in depth_groups.get(depth, []):
-            if ident in existing:
-                continue
-            for child in parent_child_map.get(ident, []):
-                if child in existing:
-                    existing.add(ident)
-                    break
-
-    leaf_existing = [c for c in benchmark_cols if c in existing]
-    if leaf_existing:
-        agg_df = score_df[leaf_existing].copy()
-        leaf_mask = score_df[leaf_existing].notna()
-        per_model_coverage = {
-            mid: frozenset(leaf_mask.columns[leaf_mask.loc[mid].to_numpy()])
-            for mid in leaf_mask.index
-        }
-    else:
-        agg_df = pd.DataFrame(index=score_df.index)
-        per_model_coverage = {mid: frozenset() for mid in score_df.index}
-
-    for depth in range(max_depth, -1, -1):
-        for ident in depth_groups.get(depth, []):
-            if ident not in existing or ident in benchmark_cols:
-                continue
-            children = [c for c in parent_child_map.get(ident, []) if c in existing]
-            children = [c for c in children if c in agg_df.columns]
-            if not children:
-                continue
-            agg_df[ident] = agg_df[children].fillna(0).mean(axis=1)
-
-    leaf_set = {b for b in existing if b in benchmark_cols}
-    out_scores = dict(empty_scores)
-    out_coverage = dict(empty_cov)
-    if agg_root in agg_df.columns:
-        for mid, val in agg_df[agg_root].fillna(0.0).items():
-            out_scores[mid] = float(val)
-    for mid, cov in per_model_coverage.items():
-        out_coverage[mid] = cov
-    return out_scores, leaf_set, out_coverage
+        return pd.DataFrame(columns=columns)
+    positive = long_df[long_df['score_ceiled'].astype(float) > 0]  # NaN compares False
+    return (positive.sort_values('end_timestamp', kind='stable')
+            .drop_duplicates(['model_id', 'benchmark'], keep='first')[columns]
+            .reset_index(drop=True))
+
+
+# ---------------------------------------------------------------------
+# Incremental watermark
+# ---------------------------------------------------------------------
+
+def _fingerprint(items):
+    return hashlib.sha256(json.dumps(sorted(items)).encode()).hexdigest()
+
+
+def _tree_fingerprint(tree_df):
+    return _fingerprint([(row.identifier, row.parent_id or '') for row in tree_df.itertuples()])
+
+
+def _public_fingerprint(public_model_ids):
+    return _fingerprint([int(mid) for mid in public_model_ids])
+
+
+def _score_high_water(domain):
+    """``(max id, max end_timestamp)`` over the domain's aggregated scores."""
+    marks = _visible_scores(domain).aggregate(max_id=Max('id'), max_end=Max('end_timestamp'))
+    return marks['max_id'], marks['max_end']
+
+
+def _leaf_first_months(scores):
+    """``{leaf: 'YYYY-MM'}``: the month each leaf benchmark is first scored in ``scores``."""
+    rows = (scores.values('benchmark__benchmark_type__identifier')
+            .annotate(first=Min('end_timestamp'))
+            .values_list('benchmark__benchmark_type__identifier', 'first'))
+    return {leaf: first.astimezone(timezone.utc).strftime('%Y-%m') for leaf, first in rows}
+
+
+def _incremental_plan(last_month, curr_ym, changed_months, first_months, old_first_months):
+    """
+    Where an incremental run has to start.
+
+    :param last_month: last month the watermark run wrote
+    :param curr_ym: current month
+    :param changed_months: months of the scores past the watermark
+    :param first_months: ``_leaf_first_months`` over all scores
+    :param old_first_months: ``_leaf_first_months`` over the scores before the watermark
+    :return: ``(start_month, all_models)``; ``start_month`` is ``None`` when nothing
+        changed. ``all_models`` is set when the new scores move the month a leaf is
+        first counted in, which changes every model's aggregate from that month on.
+    """
+    starts = list(changed_months)
+    if last_month < curr_ym:
+        starts.append(_next_month(last_month))
+    leaf_moves = [month for leaf, month in first_months.items() if old_first_months.get(leaf) != month]
+    if not starts and not leaf_moves:
+        return None, False
+    return min(min(starts + leaf_moves), curr_ym), bool(leaf_moves)
+
+
+# ---------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------
+
+# Months merged per staging-table upsert (and per transaction).
+_WRITE_BATCH_MONTHS = 12
+
+_AGGREGATE_COLUMNS = ('model_id', 'domain', 'month', 'score', 'coverage_leaves_added_vs_prev')
+_RANK_COLUMNS = ('model_id', 'domain', 'month', 'rank', 'cohort_size')
+_FIRST_SCORE_COLUMNS = ('model_id', 'domain', 'leaf', 'first_positive_timestamp', 'first_positive_score')
+_EDGE_COLUMNS = ('domain', 'month_prev', 'month_curr', 'leaf_benchmarks')
+
+
+def _model_ids_sql(model_ids):
+    return f"model_id IN ({', '.join(['%s'] * len(model_ids))})", list(model_ids)
+
+
+def _aggregate_rows(domain, month_str, scores_by_model, coverage, prev_coverage, prev_global_leaves):
+    """``_AGGREGATE_COLUMNS`` tuples for one month."""
+    rows = []
+    for mid, val in scores_by_model.items():
+        delta = sorted(
+            (coverage.get(mid, frozenset()) - prev_coverage.get(mid, frozenset()))
+            & prev_global_leaves
+        )
+        rows.append((mid, domain, month_str, 0.0 if pd.isna(val) else float(val), delta))
+    return rows
+
+
+def _rank_rows(domain, month_str, scores_by_model, public_model_ids):
+    """``_RANK_COLUMNS`` tuples for one month."""
+    ranked, cohort_size = _public_month_ranks(scores_by_model, public_model_ids)
+    return [(mid, domain, month_str, rank, cohort_size) for mid, rank in ranked]
+
+
+class _MonthWriter:
+    """
+    Buffers monthly aggregate and rank rows and merges them into their tables
+    ``_WRITE_BATCH_MONTHS`` months at a time (``bulk_upsert.upsert_rows``), each
+    batch in one transaction. A batch replaces its month range: rows in it that
+    the batch does not carry are deleted. With ``model_ids``, only those models'
+    aggregates are replaced in months up to ``last_month`` (the other models'
+    stored rows stand); ranks always replace whole months.
+    """
+
+    def __init__(self, domain, public_model_ids, model_ids=None, last_month=None):
+        self.domain = domain
+        self.public_model_ids = public_model_ids
+        self.model_ids = model_ids
+        self.last_month = last_month
+        self.written = self.deleted = 0
+        self._months, self._aggregates, self._ranks = [], [], []
+
+    def add(self, month_str, aggregate_rows, month_scores):
+        self._months.append(month_str)
+        self._aggregates += aggregate_rows
+        self._ranks += _rank_rows(self.domain, month_str, month_scores, self.public_model_ids)
+        if len(self._months) >= _WRITE_BATCH_MONTHS:
+            self.flush()
+
+    def _aggregate_scope(self, months_sql, params):
+        if self.model_ids is None:
+            return months_sql, params
+        if not self.model_ids:
+            return f'{months_sql} AND month > %s', params + [self.last_month]
+        ids_sql, ids = _model_ids_sql(self.model_ids)
+        return f'{months_sql} AND (month > %s OR {ids_sql})', params + [self.last_month] + ids
+
+    def flush(self):
+        if not self._months:
+            return
+        months_sql = 'domain = %s AND month >= %s AND month <= %s'
+        params = [self.domain, self._months[0], self._months[-1]]
+        with transaction.atomic():
+            for table, columns, rows, scope in (
+                    (ModelMonthlyAggregate._meta.db_table, _AGGREGATE_COLUMNS, self._aggregates,
+                     self._aggregate_scope(months_sql, params)),
+                    (ModelMonthlyRank._meta.db_table, _RANK_COLUMNS, self._ranks, (months_sql, params))):
+                written, deleted = upsert_rows(connection, table, columns, columns[:3], rows, replace=scope)
+                self.written += written
+                self.deleted += deleted
+        self._months, self._aggregates, self._ranks = [], [], []
+
+
+def _write_first_scores(domain, long_df, model_ids=None):
+    """Replace the domain's ``ModelLeafFirstScore`` rows (only ``model_ids``' when given)."""
+    first_scores = _first_positive_scores(long_df)
+    scope_sql, params = 'domain = %s', [domain]
+    if model_ids is not None:
+        if not model_ids:
+            return 0
+        ids_sql, ids = _model_ids_sql(model_ids)
+        scope_sql, params = f'{scope_sql} AND {ids_sql}', params + ids
+    upsert_rows(connection, ModelLeafFirstScore._meta.db_table, _FIRST_SCORE_COLUMNS, _FIRST_SCORE_COLUMNS[:3], [
+        (mid, domain, leaf, ts.to_pydatetime(), float(score))
+        for mid, leaf, ts, score in first_scores.itertuples(index=False, name=None)
+    ], replace=(scope_sql, params))
+    return len(first_scores)
+
+
+def _bump_trend_version(domain):
+    if not ScoreTrendVersion.objects.filter(domain=domain).update(version=F('version') + 1):
+        ScoreTrendVersion.objects.get_or_create(domain=domain, defaults={'version': 1})
+
+
+def _write_edges(domain, ordered, leaf_set_by_month):
+    upsert_rows(connection, MonthBenchmarkEdge._meta.db_table, _EDGE_COLUMNS, _EDGE_COLUMNS[:3], [
+        (domain, m_prev, m_curr, sorted(leaf_set_by_month[m_curr] - leaf_set_by_month[m_prev]))
+        for m_prev, m_curr in zip(ordered, ordered[1:])
+    ])
 
 
 # ---------------------------------------------------------------------
@@ -195,18 +610,110 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--domain', default='vision')
-        parser.add_argument('--mode', choices=['latest', 'backfill'], default='latest')
+        parser.add_argument('--mode', choices=['latest', 'backfill', 'incremental'], default='latest',
+                            help='incremental: only what changed since the last backfill/incremental run '
+                                 '(falls back to a full backfill the first time).')
         parser.add_argument('--since', default=None,
                             help='YYYY-MM. With mode=backfill, recompute from this month forward.')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Aggregate months in this many processes when recomputing every model '
+                                 '(rows are still written by one process, in month order).')
+
+    def handle(self, *args, domain, mode, since, workers=1, **opts):
+        # Taken before loading, so scores landing mid-run are picked up next time.
+        track_watermark = mode == 'incremental' or (mode == 'backfill' and not since)
+        high_water = _score_high_water(domain) if track_watermark else None
+        if mode == 'incremental':
+            self._incremental(domain, high_water, workers)
+        else:
+            months = _resolve_months(mode, since, domain)
+            if not months:
+                self.stdout.write(self.style.WARNING(f'No scores for domain={domain}, nothing to do.'))
+                return
+            tree_df = _load_tree_df(domain)
+            public_model_ids = set(Model.objects.filter(domain=domain, public=True).values_list('id', flat=True))
+            if not self._recompute_months(domain, mode, months, tree_df, public_model_ids, workers):
+                return
+            # Only a full backfill covers every month a new score can land in.
+            if track_watermark:
+                self._save_watermark(domain, high_water, months[-1], tree_df, public_model_ids)
+
+        # Every worker keys its trend caches on this counter; the explicit bust
+        # lets this process see the new version without waiting out the memo TTL.
+        _bump_trend_version(domain)
+        from benchmarks.views.model_trends import clear_trend_cache, prime_public_trend_frames
+        clear_trend_cache()
+        prime_public_trend_frames(domain)
+
+        self.stdout.write(self.style.SUCCESS(f'Recompute complete for domain={domain}.'))
+
+    def _save_watermark(self, domain, high_water, last_month, tree_df, public_model_ids):
+        max_id, max_end = high_water
+        if max_id is None:
+            return
+        ScoreTrendWatermark.objects.update_or_create(domain=domain, defaults={
+            'max_score_id': max_id, 'max_end_timestamp': max_end, 'last_month': last_month,
+            'tree_fingerprint': _tree_fingerprint(tree_df),
+            'public_fingerprint': _public_fingerprint(public_model_ids),
+        })
+
+    def _incremental(self, domain, high_water, workers=1):
+        watermark = ScoreTrendWatermark.objects.filter(domain=domain).first()
+        tree_df = _load_tree_df(domain)
+        public_model_ids = set(Model.objects.filter(domain=domain, public=True).values_list('id', flat=True))
+        curr_ym = datetime.now(timezone.utc).strftime('%Y-%m')
+
+        reason = None
+        if watermark is None:
+            reason = 'no watermark yet'
+        elif watermark.tree_fingerprint != _tree_fingerprint(tree_df):
+            reason = 'visible benchmark tree changed'
+        elif watermark.public_fingerprint != _public_fingerprint(public_model_ids):
+            reason = 'public model set changed'
+        if reason:
+            self.stdout.write(f'Incremental: {reason}, running a full backfill.')
+            months = _resolve_months('backfill', None, domain)
+            if months and self._recompute_months(domain, 'backfill', months, tree_df, public_model_ids, workers):
+                self._save_watermark(domain, high_water, months[-1], tree_df, public_model_ids)
+            return
 
-    def handle(self, *args, domain, mode, since, **opts):
-        months = _resolve_months(mode, since, domain)
-        if not months:
-            self.stdout.write(self.style.WARNING(f'No scores for domain={domain}, nothing to do.'))
+        past = Q(id__gt=watermark.max_score_id) | Q(end_timestamp__gt=watermark.max_end_timestamp)
+        changed = list(_visible_scores(domain).filter(past).values_list('model_id', 'end_timestamp'))
+        changed_model_ids = sorted({mid for mid, _ in changed})
+        changed_months = {ts.astimezone(timezone.utc).strftime('%Y-%m') for _, ts in changed}
+        first_months = _leaf_first_months(_visible_scores(domain))
+        old_first_months = _leaf_first_months(_visible_scores(domain).exclude(past)) if changed else first_months
+        start, all_models = _incremental_plan(watermark.last_month, curr_ym, changed_months,
+                                              first_months, old_first_months)
+        if start is None:
+            self.stdout.write(f'Incremental: domain={domain} is up to date (watermark id={watermark.max_score_id}).')
             return
+        if not all_models:
+            stored_model_ids = set(ModelMonthlyAggregate.objects
+                                   .filter(domain=domain, model_id__in=changed_model_ids)
+                                   .values_list('model_id', flat=True).distinct())
+            if stored_model_ids != set(changed_model_ids):
+                # A model without stored rows gets every month of the axis, as in a backfill.
+                start = min(start, _resolve_months('backfill', None, domain)[0])
+        months = _month_iter(start, curr_ym)
+        self.stdout.write(
+            f'Incremental: {len(changed)} new score row(s) for {len(changed_model_ids)} model(s) since '
+            f'id={watermark.max_score_id}; recomputing {"all" if all_models else "changed"} models '
+            f'from {start}.'
+        )
+        if all_models:
+            done = self._recompute_months(domain, 'incremental', months, tree_df, public_model_ids, workers)
+        else:
+            done = self._recompute_models(domain, changed_model_ids, months, watermark.last_month,
+                                          first_months, tree_df, public_model_ids)
+        if done:
+            self._save_watermark(domain, high_water, months[-1], tree_df, public_model_ids)
+
+    def _recompute_months(self, domain, mode, months, tree_df, public_model_ids, workers=1):
+        """Recompute every model for ``months``. Returns ``False`` when there is nothing to aggregate."""
         self.stdout.write(
             f'Recomputing score trends domain={domain} mode={mode} '
-            f'months={months[0]}..{months[-1]} (n={len(months)})'
+            f'months={months[0]}..{months[-1]} (n={len(months)}, workers={workers})'
         )
         logger.info(
             'Recomputing score trends domain=%s mode=%s months=%s..%s (n=%d)',
@@ -215,11 +722,10 @@ class Command(BaseCommand):
 
         self.stdout.write('Loading tree and scores from DB...', ending=' ')
         self.stdout.flush()
-        tree_df = _load_tree_df(domain)
         long_df = _load_score_long(domain)
         if long_df.empty:
             self.stdout.write(self.style.WARNING(f'\nNo scores for domain={domain}.'))
-            return
+            return False
         all_model_ids = sorted(long_df['model_id'].unique().tolist())
         parent_child_map = build_parent_child_map(tree_df)
         depth_groups = _depth_groups(tree_df)
@@ -235,69 +741,112 @@ class Command(BaseCommand):
         # Pre-compute the boundary month (one before months[0]) so the very
         # first iteration has a prior-month coverage + global leaf set to diff
         # against. Without this, mode='latest' would always emit empty deltas.
-        boundary = (pd.Timestamp(months[0] + '-01') - pd.offsets.MonthBegin(1)).strftime('%Y-%m')
-        _, b_leaves, b_coverage = _aggregate_for_month_fast(
-            long_df, all_model_ids, parent_child_map,
-            depth_groups, max_depth, _month_end_utc(boundary), agg_root,
-        )
+        boundary = _prev_month(months[0])
+        results = _sweep_months(long_df, all_model_ids, (parent_child_map, depth_groups, max_depth), agg_root,
+                                [boundary] + months, workers=workers)
+        _, (_, b_leaves, b_coverage) = next(results)
         leaf_set_by_month[boundary] = b_leaves
         # Only the immediately preceding month's coverage is ever diffed, so carry
         # a single rolling map instead of retaining every month's per-model sets.
         prev_coverage = b_coverage
         prev_month_for_coverage = boundary
 
-        for idx, month_str in enumerate(months, start=1):
-            t0 = datetime.now(timezone.utc)
-            month_end = _month_end_utc(month_str)
-            scores_by_model, leaf_set, coverage = _aggregate_for_month_fast(
-                long_df, all_model_ids, parent_child_map,
-                depth_groups, max_depth, month_end, agg_root,
-            )
+        writer = _MonthWriter(domain, public_model_ids)
+        t0 = datetime.now(timezone.utc)
+        for idx, (month_str, (scores_by_model, leaf_set, coverage)) in enumerate(results, start=1):
             leaf_set_by_month[month_str] = leaf_set
 
             prev_global_leaves = leaf_set_by_month.get(prev_month_for_coverage, set())
-
-            with transaction.atomic():
-                ModelMonthlyAggregate.objects.filter(domain=domain, month=month_str).delete()
-                rows = []
-                for mid, val in scores_by_model.items():
-                    delta = sorted(
-                        (coverage.get(mid, frozenset()) - prev_coverage.get(mid, frozenset()))
-                        & prev_global_leaves
-                    )
-                    rows.append(ModelMonthlyAggregate(
-                        model_id=mid, domain=domain, month=month_str,
-                        score=(0.0 if pd.isna(val) else float(val)),
-                        coverage_leaves_added_vs_prev=delta,
-                    ))
-                ModelMonthlyAggregate.objects.bulk_create(rows, batch_size=2000)
+            writer.add(month_str,
+                       _aggregate_rows(domain, month_str, scores_by_model, coverage, prev_coverage, prev_global_leaves),
+                       scores_by_model)
             elapsed = (datetime.now(timezone.utc) - t0).total_seconds()
             self.stdout.write(
-                f'  [{idx}/{len(months)}] {month_str}: wrote {len(scores_by_model)} rows in {elapsed:.2f}s'
+                f'  [{idx}/{len(months)}] {month_str}: {len(scores_by_model)} rows in {elapsed:.2f}s'
             )
             self.stdout.flush()
-            logger.info('  month %s: wrote %d aggregate rows in %.2fs', month_str, len(scores_by_model), elapsed)
+            logger.info('  month %s: %d aggregate rows in %.2fs', month_str, len(scores_by_model), elapsed)
             prev_coverage = coverage
             prev_month_for_coverage = month_str
+            t0 = datetime.now(timezone.utc)
+        writer.flush()
+        self._report_writes(writer)
+
+        self.stdout.write('Writing first-positive-score rows...', ending=' ')
+        self.stdout.flush()
+        written = _write_first_scores(domain, long_df)
+        self.stdout.write(f'done ({written}).')
 
         ordered = [boundary] + months
         self.stdout.write(f'Writing {len(ordered) - 1} month-edge rows...', ending=' ')
         self.stdout.flush()
-        with transaction.atomic():
-            for i in range(1, len(ordered)):
-                m_prev, m_curr = ordered[i - 1], ordered[i]
-                added = sorted(leaf_set_by_month[m_curr] - leaf_set_by_month[m_prev])
-                MonthBenchmarkEdge.objects.update_or_create(
-                    domain=domain, month_prev=m_prev, month_curr=m_curr,
-                    defaults={'leaf_benchmarks': added},
-                )
+        _write_edges(domain, ordered, leaf_set_by_month)
         self.stdout.write('done.')
+        return True
+
+    def _report_writes(self, writer):
+        self.stdout.write(f'Merged aggregates and ranks: {writer.written} row(s) inserted or changed, '
+                          f'{writer.deleted} stale row(s) removed.')
+        logger.info('  merged %d changed and removed %d stale aggregate/rank rows', writer.written, writer.deleted)
+
+    def _recompute_models(self, domain, model_ids, months, last_month, first_months, tree_df, public_model_ids):
+        """Recompute only ``model_ids`` for ``months``, against the global leaf sets in
+        ``first_months``. Every other model keeps its stored aggregate; months after
+        ``last_month`` carry it forward. Ranks are rewritten for every month."""
+        long_df = _load_score_long(domain, model_ids=model_ids)
+        parent_child_map = build_parent_child_map(tree_df)
+        depth_groups = _depth_groups(tree_df)
+        max_depth = int(tree_df['depth'].max())
+        agg_root = f'average_{domain}'
 
-        # Same-month reruns don't change ``max(month)``, so the snapshot cache
-        # wouldn't naturally invalidate without an explicit bust.
-        from benchmarks.views.model_trends import clear_trend_cache
-        clear_trend_cache()
+        leaf_set_by_month = {}
+
+        def leaves_at(month):
+            if month not in leaf_set_by_month:
+                leaf_set_by_month[month] = {leaf for leaf, first in first_months.items() if first <= month}
+            return leaf_set_by_month[month]
+
+        sweep = _MonthlySweep(long_df, model_ids, parent_child_map, depth_groups, max_depth, agg_root)
+
+        def aggregate(month):
+            return sweep.advance(_month_end_utc(month), known_leaves=leaves_at(month))
+
+        stored = defaultdict(dict)
+        for mid, month, score in (ModelMonthlyAggregate.objects
+                                  .filter(domain=domain, month__gte=min(months[0], last_month), month__lte=last_month)
+                                  .values_list('model_id', 'month', 'score')):
+            stored[month][mid] = score
+        carried = stored.get(last_month, {})
 
-        self.stdout.write(self.style.SUCCESS(
-            f'Recompute complete for domain={domain}: {len(months)} month(s).'
-        ))
+        boundary = _prev_month(months[0])
+        _, _, prev_coverage = aggregate(boundary)
+        writer = _MonthWriter(domain, public_model_ids, model_ids=model_ids, last_month=last_month)
+        for idx, month_str in enumerate(months, start=1):
+            t0 = datetime.now(timezone.utc)
+            scores_by_model, _, coverage = aggregate(month_str)
+            rows = _aggregate_rows(domain, month_str, scores_by_model, coverage, prev_coverage,
+                                   leaves_at(_prev_month(month_str)))
+            if month_str > last_month:
+                others = {mid: score for mid, score in carried.items() if mid not in scores_by_model}
+                rows += [(mid, domain, month_str, score, []) for mid, score in others.items()]
+                month_scores = {**others, **scores_by_model}
+            else:
+                month_scores = {**stored.get(month_str, {}), **scores_by_model}
+            writer.add(month_str, rows, month_scores)
+            elapsed = (datetime.now(timezone.utc) - t0).total_seconds()
+            self.stdout.write(f'  [{idx}/{len(months)}] {month_str}: {len(rows)} rows in {elapsed:.2f}s')
+            self.stdout.flush()
+            prev_coverage = coverage
+        writer.flush()
+        self._report_writes(writer)
+
+        written = _write_first_scores(domain, long_df, model_ids=model_ids)
+        self.stdout.write(f'Rewrote {written} first-positive-score rows for {len(model_ids)} model(s).')
+
+        new_months = [month for month in months if month > last_month]
+        if new_months:
+            ordered = [_prev_month(new_months[0])] + new_months
+            for month in ordered:
+                leaves_at(month)
+            _write_edges(domain, ordered, leaf_set_by_month)
+        return True
@@ -0,0 +1,199 @@
+"""
+Management command to refresh the leaderboard materialized views and report
+how long each step took.
+
+Usage:
+    python manage.py refresh_leaderboard                      # full refresh, then the breakdown
+    python manage.py refresh_leaderboard --plain              # full refresh without CONCURRENTLY
+    python manage.py refresh_leaderboard --model-ids 12,34    # refresh_model_rows() for two models
+    python manage.py refresh_leaderboard --metadata           # refresh_benchmark_metadata()
+    python manage.py refresh_leaderboard --report-only        # breakdown of the latest full refresh
+
+The refresh functions record every step (start and end, rows written,
+relation size) in ``mv_refresh_run`` / ``mv_refresh_step`` (see mv.sql).
+Each step is compared with its median over the previous runs of the same
+kind; steps at least ``--threshold`` times slower than that (and slower by
+more than ``MIN_REGRESSION_SECONDS``) are flagged, and with
+``--fail-on-regression`` make the command fail, e.g. in a staging job.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+# Steps slower by less than this are noise, whatever the ratio.
+MIN_REGRESSION_SECONDS = 0.5
+
+
+def load_runs(cursor, kind, limit, before=None):
+    """The latest ``limit`` runs of ``kind`` (older than run ``before``, if given), newest first:
+    ``(id, started_at, model_count)`` tuples."""
+    cursor.execute("""
+        SELECT id, started_at, model_count
+        FROM mv_refresh_run
+        WHERE kind = %s AND (%s::bigint IS NULL OR id < %s::bigint)
+        ORDER BY id DESC
+        LIMIT %s
+    """, [kind, before, before, limit])
+    return cursor.fetchall()
+
+
+def load_steps(cursor, run_ids):
+    """Steps of ``run_ids`` in the order they ran: dicts with ``run_id``, ``step``, ``seconds``,
+    ``row_count`` and ``relation_bytes``."""
+    cursor.execute("""
+        SELECT run_id, step, EXTRACT(EPOCH FROM finished_at - started_at), row_count, relation_bytes
+        FROM mv_refresh_step
+        WHERE run_id = ANY(%s)
+        ORDER BY run_id, id
+    """, [list(run_ids)])
+    return [{'run_id': run_id, 'step': step, 'seconds': float(seconds), 'row_count': row_count,
+             'relation_bytes': relation_bytes}
+            for run_id, step, seconds, row_count, relation_bytes in cursor.fetchall()]
+
+
+def compare_steps(steps, history, threshold):
+    """
+    Compare the steps of a run with earlier runs.
+
+    :param steps: the run's steps, as returned by ``load_steps``
+    :param history: steps of earlier runs, as returned by ``load_steps``
+    :param threshold: ratio to the median of earlier runs from which a step counts as slower
+    :return: one dict per step: the step's fields plus ``median`` (None without history)
+        and ``regression``
+    """
+    earlier = {}
+    for step in history:
+        earlier.setdefault(step['step'], []).append(step['seconds'])
+    rows = []
+    for step in steps:
+        median = statistics.median(earlier[step['step']]) if step['step'] in earlier else None
+        regression = (median is not None
+                      and step['seconds'] - median > MIN_REGRESSION_SECONDS
+                      and step['seconds'] >= median * threshold)
+        rows.append({**step, 'median': median, 'regression': regression})
+    return rows
+
+
+def _size(num_bytes):
+    if num_bytes is None:
+        return ''
+    for unit in ('B', 'kB', 'MB', 'GB'):
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{num_bytes:.0f} {unit}" if unit == 'B' else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def _change(row):
+    if row['median'] is None:
+        return 'new'
+    if row['median'] == 0:
+        return ''
+    return f"{(row['seconds'] / row['median'] - 1) * 100:+.0f}%"
+
+
+class Command(BaseCommand):
+    help = 'Refresh the leaderboard materialized views and print a per-step timing breakdown'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model-ids',
+            type=str,
+            default=None,
+            help='Comma-separated model ids: refresh only their rows with refresh_model_rows()'
+        )
+        parser.add_argument(
+            '--metadata',
+            action='store_true',
+            help='Refresh only benchmark metadata with refresh_benchmark_metadata() '
+                 '(a full refresh if the benchmark tree changed)'
+        )
+        parser.add_argument(
+            '--plain',
+            action='store_true',
+            help='Refresh without CONCURRENTLY (faster, but blocks readers of the chain)'
+        )
+        parser.add_argument(
+            '--report-only',
+            action='store_true',
+            help='Do not refresh; report the latest run of the same kind'
+        )
+        parser.add_argument(
+            '--history',
+            type=int,
+            default=10,
+            help='Number of previous runs to compare with (default: 10)'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=1.5,
+            help='Flag steps at least this many times slower than their median (default: 1.5)'
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error when a step is flagged'
+        )
+
+    def handle(self, *args, **options):
+        model_ids = None
+        if options['model_ids']:
+            try:
+                model_ids = sorted({int(part) for part in options['model_ids'].split(',') if part.strip()})
+            except ValueError:
+                raise CommandError('--model-ids must be a comma-separated list of ids')
+        if model_ids and options['metadata']:
+            raise CommandError('--model-ids and --metadata are exclusive')
+        kind = 'models' if model_ids else 'metadata' if options['metadata'] else 'full'
+
+        with connection.cursor() as cursor:
+            if not options['report_only']:
+                self.stdout.write(f"Refreshing {'models ' + ','.join(map(str, model_ids)) if model_ids else kind}...")
+                start = time.perf_counter()
+                if model_ids:
+                    cursor.execute("SELECT refresh_model_rows(%s::integer[])", [model_ids])
+                elif options['metadata']:
+                    cursor.execute("SELECT refresh_benchmark_metadata(%s)", [not options['plain']])
+                    # A changed benchmark tree makes it a full refresh
+                    kind = cursor.fetchone()[0]
+                else:
+                    cursor.execute("SELECT refresh_all_materialized_views(%s)", [not options['plain']])
+                self.stdout.write(f"Refreshed in {time.perf_counter() - start:.1f}s")
+                self.stdout.write('')
+
+            runs = load_runs(cursor, kind, 1)
+            if not runs:
+                raise CommandError(f"No {kind} refresh has been recorded yet")
+            run_id, started_at, model_count = runs[0]
+            previous = load_runs(cursor, kind, options['history'], before=run_id)
+            steps = load_steps(cursor, [run_id])
+            history = load_steps(cursor, [run[0] for run in previous])
+
+        rows = compare_steps(steps, history, options['threshold'])
+        total = sum(row['seconds'] for row in rows)
+        models = f", {model_count} model(s)" if model_count else ''
+        self.stdout.write(self.style.SUCCESS(f"=== RUN {run_id} ({kind}{models}) started {started_at} ==="))
+        self.stdout.write(f"{len(rows)} steps, {total:.2f}s; compared with the median of "
+                          f"{len(previous)} previous {kind} run(s)")
+        self.stdout.write('')
+        self.stdout.write(f"{'step':<34} {'seconds':>9} {'median':>9} {'change':>7} {'rows':>12} {'size':>10}")
+        for row in rows:
+            median = f"{row['median']:.2f}" if row['median'] is not None else ''
+            row_count = f"{row['row_count']:,}" if row['row_count'] is not None else ''
+            line = (f"{row['step']:<34} {row['seconds']:>9.2f} {median:>9} {_change(row):>7} "
+                    f"{row_count:>12} {_size(row['relation_bytes']):>10}")
+            self.stdout.write(self.style.WARNING(line) if row['regression'] else line)
+
+        regressions = [row['step'] for row in rows if row['regression']]
+        self.stdout.write('')
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No step slower than its history'))
+            return
+        message = (f"{len(regressions)} step(s) at least {options['threshold']}x slower than their median: "
+                   f"{', '.join(regressions)}")
+        if options['fail_on_regression']:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(message))
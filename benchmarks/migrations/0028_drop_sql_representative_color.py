@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from django.db import migrations
+
+
+MIGRATION_SQL = (
+    Path(__file__).resolve().parent / 'sql' / '0028_materialized_views.sql'
+).read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0027_refresh_materialized_view_definitions'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=MIGRATION_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
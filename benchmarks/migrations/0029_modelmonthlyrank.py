@@ -0,0 +1,34 @@
+# Per-model, per-month public rank written by `recompute_score_trends`, so rank
+# trends read one indexed table instead of re-ranking the model x month matrix.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0028_drop_sql_representative_color'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelMonthlyRank',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(default='vision', max_length=200)),
+                ('month', models.CharField(max_length=7)),
+                ('rank', models.IntegerField()),
+                ('cohort_size', models.IntegerField()),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='benchmarks.model')),
+            ],
+            options={
+                'db_table': 'brainscore_model_monthly_rank',
+                'unique_together': {('model', 'domain', 'month')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='modelmonthlyrank',
+            index=models.Index(fields=['domain', 'month'], name='brainscore__domain_7edd74_idx'),
+        ),
+    ]
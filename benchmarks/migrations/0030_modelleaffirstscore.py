@@ -0,0 +1,34 @@
+# First positive score per (model, leaf benchmark), written by
+# `recompute_score_trends` so the trend loaders stop re-scanning `Score`.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0029_modelmonthlyrank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelLeafFirstScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(default='vision', max_length=200)),
+                ('leaf', models.CharField(max_length=200)),
+                ('first_positive_timestamp', models.DateTimeField()),
+                ('first_positive_score', models.FloatField()),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='benchmarks.model')),
+            ],
+            options={
+                'db_table': 'brainscore_model_leaf_first_score',
+                'unique_together': {('model', 'domain', 'leaf')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='modelleaffirstscore',
+            index=models.Index(fields=['model', 'domain'], name='brainscore__model_i_e8798b_idx'),
+        ),
+    ]
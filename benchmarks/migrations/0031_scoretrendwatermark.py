@@ -0,0 +1,29 @@
+# Per-domain watermark for `recompute_score_trends --mode incremental`.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0030_modelleaffirstscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreTrendWatermark',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=200, unique=True)),
+                ('max_score_id', models.BigIntegerField()),
+                ('max_end_timestamp', models.DateTimeField()),
+                ('last_month', models.CharField(max_length=7)),
+                ('tree_fingerprint', models.CharField(max_length=64)),
+                ('public_fingerprint', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'brainscore_score_trend_watermark',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Per-domain trend data version, bumped by `recompute_score_trends` and used as
+# the trend cache key now that the trend tables are upserted in place.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0031_scoretrendwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreTrendVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=200, unique=True)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'brainscore_score_trend_version',
+            },
+        ),
+    ]
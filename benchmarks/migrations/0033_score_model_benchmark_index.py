@@ -0,0 +1,17 @@
+# Index probed by the per-model base-score lookup in mv_base_scores (see 0034).
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0032_scoretrendversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='score',
+            index=models.Index(fields=['model', 'benchmark'], name='brainscore__model_i_bb5671_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Per-model leaderboard refresh: the per-model layers of the materialized-view chain
+# become tables filled by `refresh_model_rows()`.
+from pathlib import Path
+
+from django.db import migrations
+
+
+MIGRATION_SQL = (
+    Path(__file__).resolve().parent / 'sql' / '0034_materialized_views.sql'
+).read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0033_score_model_benchmark_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=MIGRATION_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Unique indexes on the materialized views so the full refresh can run CONCURRENTLY
+# without blocking leaderboard reads.
+from pathlib import Path
+
+from django.db import migrations
+
+
+MIGRATION_SQL = (
+    Path(__file__).resolve().parent / 'sql' / '0035_materialized_views.sql'
+).read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0034_per_model_refresh'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=MIGRATION_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
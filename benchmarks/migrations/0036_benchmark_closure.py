@@ -0,0 +1,23 @@
+# Benchmark tree closure table; the score roll-up joins parents to children through it.
+from pathlib import Path
+
+from django.db import migrations
+
+
+MIGRATION_SQL = (
+    Path(__file__).resolve().parent / 'sql' / '0036_materialized_views.sql'
+).read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0035_concurrent_refresh'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=MIGRATION_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
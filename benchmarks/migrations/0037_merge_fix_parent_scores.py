@@ -0,0 +1,23 @@
+# NULL/NaN parent scores are computed in the aggregation pass; drops fix_parent_scores().
+from pathlib import Path
+
+from django.db import migrations
+
+
+MIGRATION_SQL = (
+    Path(__file__).resolve().parent / 'sql' / '0037_materialized_views.sql'
+).read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0036_benchmark_closure'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=MIGRATION_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
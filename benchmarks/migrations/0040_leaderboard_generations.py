@@ -0,0 +1,35 @@
+# Pages read the leaderboard through views over a published, validated generation.
+from pathlib import Path
+
+from django.db import migrations
+
+
+MIGRATION_SQL = (
+    Path(__file__).resolve().parent / 'sql' / '0040_materialized_views.sql'
+).read_text(encoding='utf-8')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarks', '0039_historical_versions'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=MIGRATION_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterModelTable(
+            name='benchmarkminmax',
+            table='leaderboard_benchmark_minmax',
+        ),
+        migrations.AlterModelTable(
+            name='finalbenchmarkcontext',
+            table='leaderboard_final_benchmark_context',
+        ),
+        migrations.AlterModelTable(
+            name='finalmodelcontext',
+            table='leaderboard_final_model_context',
+        ),
+    ]
@@ -0,0 +1,1788 @@
+
+-- ********************************************************************************
+-- NOTE FROM AUTHOR:
+-- This file builds a hierarchical "benchmark tree," infers leaf (end) benchmarks,
+-- performs score aggregations for abstract parent benchmarks via functions,
+-- and finally enriches model data with certain-benchmark metadata and styling
+-- information
+
+-- Certain materialized views are used in the final scoreboard processes,
+-- while others might no longer be used.
+-- Search for "SUGGESTION" notes below for possible cleanup suggestions.
+-- ********************************************************************************
+
+
+-- ********************************************************************************
+--
+--  GATHER BENCHMARK CONTEXT
+--
+-- ********************************************************************************
+
+-- ********************************************************************************
+-- STEP 1: Build the Recursive Benchmark Tree with a DFS Sort Path
+-- "mv_benchmark_tree" is used widely downstream to query the hierarchy.
+-- For roots, we pad their "order" with zeros (LPAD) and attach their identifier.
+-- For children, we recursively append the parent's sort_path.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_benchmark_tree CASCADE;
+CREATE MATERIALIZED VIEW mv_benchmark_tree AS
+WITH RECURSIVE tree AS (
+  -- Anchor: roots (Capture all benchmarks regardless of visibility)
+  SELECT
+    bt.identifier,
+    bt.parent_id,
+    bt.domain,
+    bt."order",
+    bt.visible,
+    bt.owner_id,
+    bt.reference_id,
+    0 AS depth,
+    LPAD(bt."order"::text, 5, '0') || '-' || bt.identifier AS sort_path,
+    bt.identifier AS root_parent
+  FROM brainscore_benchmarktype bt
+    WHERE bt.parent_id IS NULL
+
+  UNION ALL
+
+  -- Recursive part: join children using the text-based parent_id
+  -- Propogate the parent's root_parent
+  SELECT
+    c.identifier,
+    c.parent_id,
+    c.domain,
+    c."order",
+    c.visible,
+    c.owner_id,
+    c.reference_id,
+    p.depth + 1 AS depth,
+    p.sort_path || '-' || LPAD(c."order"::text, 5, '0') || '-' || c.identifier AS sort_path,
+    p.root_parent
+  FROM brainscore_benchmarktype c
+  JOIN tree p ON c.parent_id = p.identifier
+)
+SELECT * FROM tree;
+CREATE UNIQUE INDEX mv_benchmark_tree_identifier_idx ON mv_benchmark_tree (identifier);
+
+-- ********************************************************************************
+-- STEP 2: Aggregate immediate children for each Benchmark
+-- "mv_benchmark_children" is used in later steps when deriving
+-- whether a benchmark is a leaf and to list sub-benchmarks.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_benchmark_children CASCADE;
+CREATE MATERIALIZED VIEW mv_benchmark_children AS
+SELECT
+  parent_id,
+  jsonb_agg(identifier ORDER BY "order") AS children
+FROM mv_benchmark_tree
+WHERE parent_id IS NOT NULL
+GROUP BY parent_id;
+CREATE UNIQUE INDEX mv_benchmark_children_parent_id_idx ON mv_benchmark_children (parent_id);
+
+-- ********************************************************************************
+-- STEP 2.5: Closure of the Benchmark Tree
+-- "mv_benchmark_closure" holds one row per (ancestor, descendant) pair, including
+-- each benchmark with itself at distance 0. The aggregation rolls scores up
+-- along its distance-1 rows with plain equi-joins.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_benchmark_closure CASCADE;
+CREATE MATERIALIZED VIEW mv_benchmark_closure AS
+WITH RECURSIVE closure AS (
+  SELECT
+    t.identifier AS ancestor_identifier,
+    t.identifier AS descendant_identifier,
+    0 AS distance,
+    t.depth AS ancestor_depth
+  FROM mv_benchmark_tree t
+
+  UNION ALL
+
+  SELECT
+    c.ancestor_identifier,
+    t.identifier,
+    c.distance + 1,
+    c.ancestor_depth
+  FROM closure c
+  JOIN mv_benchmark_tree t ON t.parent_id = c.descendant_identifier
+)
+SELECT * FROM closure;
+CREATE UNIQUE INDEX mv_benchmark_closure_ancestor_descendant_idx
+  ON mv_benchmark_closure (ancestor_identifier, descendant_identifier);
+CREATE INDEX mv_benchmark_closure_depth_idx ON mv_benchmark_closure (ancestor_depth, distance);
+CREATE INDEX mv_benchmark_closure_descendant_idx ON mv_benchmark_closure (descendant_identifier, distance);
+
+-- ********************************************************************************
+-- STEP 3: For Each Benchmark Type, Pick the Latest Instance
+-- "mv_latest_benchmark_instance" is joined in final contexts to pick the newest
+-- version for leaf benchmarks.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_latest_benchmark_instance CASCADE;
+CREATE MATERIALIZED VIEW mv_latest_benchmark_instance AS
+SELECT
+  bi.benchmark_type_id,
+  MAX(bi.version) AS latest_version
+FROM brainscore_benchmarkinstance bi
+GROUP BY bi.benchmark_type_id;
+CREATE UNIQUE INDEX mv_latest_benchmark_instance_benchmark_type_id_idx
+  ON mv_latest_benchmark_instance (benchmark_type_id);
+
+-- ********************************************************************************
+-- STEP 3.5: Version Timeline for Wayback Machine
+-- "mv_version_timeline" tracks when each benchmark version was "active"
+-- by inferring from the first score submission for each version.
+-- Used by wayback functionality to determine which version was current at any date.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_version_timeline CASCADE;
+CREATE MATERIALIZED VIEW mv_version_timeline AS
+WITH version_first_score AS (
+  -- Find the earliest score timestamp for each benchmark version
+  SELECT
+    bi.id AS instance_id,
+    bi.benchmark_type_id,
+    bi.version,
+    MIN(s.end_timestamp) AS first_score_at
+  FROM brainscore_benchmarkinstance bi
+  LEFT JOIN brainscore_score s ON s.benchmark_id = bi.id
+  GROUP BY bi.id, bi.benchmark_type_id, bi.version
+),
+version_periods AS (
+  -- Calculate valid_from and valid_to using window function
+  -- valid_from = when this version first received a score
+  -- valid_to = when the next version first received a score (NULL if current)
+  SELECT
+    instance_id,
+    benchmark_type_id,
+    version,
+    first_score_at AS valid_from,
+    LEAD(first_score_at) OVER (
+      PARTITION BY benchmark_type_id
+      ORDER BY version
+    ) AS valid_to
+  FROM version_first_score
+)
+SELECT
+  instance_id,
+  benchmark_type_id,
+  version,
+  valid_from,
+  valid_to,
+  CASE WHEN valid_to IS NULL THEN true ELSE false END AS is_current
+FROM version_periods;
+CREATE UNIQUE INDEX mv_version_timeline_instance_id_idx ON mv_version_timeline (instance_id);
+
+-- ********************************************************************************
+-- STEP 4: Mark Each Benchmark as Leaf (has no children) or Parent
+-- "mv_leaf_status" is joined to distinguish leaf vs. parent.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_leaf_status CASCADE;
+CREATE MATERIALIZED VIEW mv_leaf_status AS
+SELECT
+  t.identifier AS benchmark_identifier,
+  -- A node is a leaf if no row in mv_benchmark_tree has its parent_id equal to this identifier.
+  NOT EXISTS (
+    SELECT 1
+    FROM mv_benchmark_tree sub
+    WHERE sub.parent_id = t.identifier
+  ) AS is_leaf,
+  t.depth,
+  t.sort_path
+FROM mv_benchmark_tree t;
+CREATE UNIQUE INDEX mv_leaf_status_benchmark_identifier_idx ON mv_leaf_status (benchmark_identifier);
+
+-- ********************************************************************************
+-- STEP 5: Final Benchmark Context
+-- Join the tree, leaf-status, latest instance data, children, and all associated
+-- benchmark metadata. Benchmark can be described by the associated stimuli, data,
+-- metric, and ceiling metadata.
+-- For leaves we use the latest instance version; for abstract parent nodes, version = 0.
+-- Overall_order is computed by ordering on our DFS sort_path.
+-- The descendant count is computed as the number of leaf nodes in the subtree
+-- (minus 1 for a leaf itself).
+-- This is used downstream for final scoring/aggregation MVs, etc.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_final_benchmark_context CASCADE;
+CREATE MATERIALIZED VIEW mv_final_benchmark_context AS
+SELECT
+  -- Benchmark type: our text-based primary key from BenchmarkType
+  t.identifier AS benchmark_type_id,
+  -- For leaf nodes, use the latest instance version; for abstract/dummy nodes, version is 0.
+  CASE
+    WHEN ls.is_leaf THEN COALESCE(li.latest_version, 0)
+    ELSE 0
+  END AS version,
+  -- For leaves, take the ceiling from the instance; if missing, default to 'X'
+  COALESCE(bi.ceiling::text, 'X') AS ceiling,
+  bi.ceiling_error,
+  bi.meta_id,
+  -- Aggregate the immediate children from our benchmark children view.
+  bc.children,
+  -- Build the parent JSON object using the parent identifier from BenchmarkType.
+  (
+    SELECT row_to_json(p)
+    FROM (
+      SELECT pbt.identifier,
+             pbt.domain,
+             pbt.reference_id,
+             pbt."order",
+             pbt.parent_id,
+             pbt.visible,
+             pbt.owner_id
+      FROM brainscore_benchmarktype pbt
+      WHERE pbt.identifier = t.parent_id
+    ) p
+  ) AS parent,
+  -- Use the propagated root_parent value.
+  t.visible,
+  t.owner_id,
+  t.root_parent,
+  t.depth,
+  -- Include the domain column from mv_benchmark_tree
+  t.domain AS domain,
+  -- Include the benchmark's own reference_id
+  t.reference_id AS benchmark_reference_id,
+  -- Include the benchmark's reference information
+  br.author AS benchmark_author,
+  br.year AS benchmark_year,
+  br.url AS benchmark_url,
+  (br.author || ' et al., ' || br.year) AS benchmark_reference_identifier,
+  br.bibtex AS benchmark_bibtex,
+  -- Count descendant leaves: count leaves in the subtree (using the sort_path) minus one if current is a leaf.
+  (
+    SELECT COUNT(*)
+    FROM mv_leaf_status ls2
+    JOIN mv_benchmark_tree t2 ON ls2.benchmark_identifier = t2.identifier
+    WHERE ls2.is_leaf
+      AND ls2.sort_path LIKE t.sort_path || '%'
+      AND t2.visible=True
+  ) - (CASE WHEN ls.is_leaf THEN 1 ELSE 0 END) AS number_of_all_children,
+  -- Overall order is computed using a row_number ordered by the DFS sort_path.
+  ROW_NUMBER() OVER (ORDER BY t.sort_path) - 1 AS overall_order,
+  -- Build a versioned benchmark identifier (concatenating the identifier and version)
+  t.identifier || '_v' || CASE
+                             WHEN ls.is_leaf THEN COALESCE(li.latest_version, 0)
+                             ELSE 0
+                           END AS identifier,
+  -- Compute short_name by stripping off the lab prefix (everything before the first dot; assumes lab prefix does not contain capital letters)
+  -- A simpler approach was used by postgresql was running into issue with incorrect regex escaping
+  CASE
+      WHEN position('.' in t.identifier) > 0
+           AND substring(t.identifier FROM 1 FOR position('.' in t.identifier) - 1) ~ '[A-Z]'
+      THEN
+          t.identifier
+      WHEN position('.' in t.identifier) > 0 THEN
+          substring(t.identifier FROM position('.' in t.identifier) + 1)
+      ELSE
+          t.identifier
+  END AS short_name,
+  bi.id AS benchmark_id,
+-- JSONB columns for data_meta, metric_meta, stimuli_meta
+jsonb_build_object(
+    'benchmark_type', bdm.benchmark_type,
+    'task', bdm.task,
+    'region', bdm.region,
+    'hemisphere', bdm.hemisphere,
+    'num_recording_sites', bdm.num_recording_sites,
+    'duration_ms', bdm.duration_ms,
+    'species', bdm.species,
+    'datatype', bdm.datatype,
+    'num_subjects', bdm.num_subjects,
+    'pre_processing', bdm.pre_processing,
+    'brainscore_link', bdm.brainscore_link,
+    'data_publicly_available', bdm.data_publicly_available,
+    'extra_notes', bdm.extra_notes
+  ) AS benchmark_data_meta,
+  jsonb_build_object(
+    'type', bmm.type,
+    'reference', bmm.reference,
+    'public', bmm.public,
+    'brainscore_link', bmm.brainscore_link,
+    'extra_notes', bmm.extra_notes
+  ) AS benchmark_metric_meta,
+  jsonb_build_object(
+    'num_stimuli', bsm.num_stimuli,
+    'datatype', bsm.datatype,
+    'stimuli_subtype', bsm.stimuli_subtype,
+    'total_size_mb', bsm.total_size_mb,
+    'brainscore_link', bsm.brainscore_link,
+    'extra_notes', bsm.extra_notes
+  ) AS benchmark_stimuli_meta
+FROM mv_benchmark_tree t
+JOIN mv_leaf_status ls ON t.identifier = ls.benchmark_identifier
+LEFT JOIN mv_latest_benchmark_instance li
+  ON t.identifier = li.benchmark_type_id AND ls.is_leaf
+LEFT JOIN brainscore_benchmarkinstance bi
+  ON bi.benchmark_type_id = t.identifier
+     AND bi.version = CASE
+                        WHEN ls.is_leaf THEN COALESCE(li.latest_version, 0)
+                        ELSE 0
+                      END
+LEFT JOIN mv_benchmark_children bc
+  ON t.identifier = bc.parent_id
+LEFT JOIN brainscore_reference br
+  ON t.reference_id = br.id
+LEFT JOIN brainscore_benchmark_data_meta bdm
+  ON bdm.id = bi.data_meta_id
+LEFT JOIN brainscore_benchmark_metric_meta bmm
+  ON bmm.id = bi.metric_meta_id
+LEFT JOIN brainscore_benchmark_stimuli_meta bsm
+  ON bsm.id = bi.stimuli_meta_id;
+CREATE UNIQUE INDEX mv_final_benchmark_context_benchmark_type_id_idx
+  ON mv_final_benchmark_context (benchmark_type_id);
+
+
+
+-- ********************************************************************************
+-- STEP 6: Benchmarks that Hold a Score Cell for Every Model
+-- "mv_scored_benchmarks" lists the visible leaves with an instance, plus every
+-- parent above one of them. Score tables below only store the cells a model has
+-- a score under; each of these benchmarks has a cell for every model of its
+-- domain, and a cell without a row reads as NULL. "scored_children" is a
+-- parent's number of such children, the denominator of its average.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_scored_benchmarks CASCADE;
+CREATE MATERIALIZED VIEW mv_scored_benchmarks AS
+WITH scored AS (
+  SELECT DISTINCT c.ancestor_identifier AS benchmark_type_id
+  FROM mv_benchmark_closure c
+  JOIN mv_final_benchmark_context leaf ON leaf.benchmark_type_id = c.descendant_identifier
+  JOIN mv_leaf_status ls ON ls.benchmark_identifier = leaf.benchmark_type_id
+  WHERE ls.is_leaf
+    AND leaf.visible
+    AND leaf.benchmark_id IS NOT NULL
+)
+SELECT
+  sc.benchmark_type_id,
+  ls.is_leaf,
+  (
+    SELECT COUNT(*)
+    FROM mv_benchmark_closure c
+    JOIN scored child ON child.benchmark_type_id = c.descendant_identifier
+    WHERE c.ancestor_identifier = sc.benchmark_type_id
+      AND c.distance = 1
+  ) AS scored_children
+FROM scored sc
+JOIN mv_leaf_status ls ON ls.benchmark_identifier = sc.benchmark_type_id;
+CREATE UNIQUE INDEX mv_scored_benchmarks_benchmark_type_id_idx ON mv_scored_benchmarks (benchmark_type_id);
+
+
+-- ********************************************************************************
+--
+--  GATHER MODEL CONTEXT
+--
+-- ********************************************************************************
+
+-- ********************************************************************************
+-- The per-model layers below (mv_base_scores, mv_base_scores_fixed_engineering,
+-- mv_model_scores, mv_historical_versions, mv_model_scores_json,
+-- mv_final_model_context) are tables, not
+-- materialized views, so that the rows of a few models can be rewritten without
+-- rebuilding the whole chain (see "refresh_model_rows()" at the bottom). Each one
+-- keeps its historical name so readers are unchanged, and is filled from a plain
+-- view "v_<name without mv_>" holding its definition.
+-- Earlier versions of this file created them as materialized views; drop
+-- whichever kind exists.
+-- ********************************************************************************
+DO $$
+DECLARE
+  rel record;
+BEGIN
+  FOR rel IN
+    SELECT c.relname, c.relkind
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND c.relname IN ('mv_base_scores', 'mv_base_scores_fixed_engineering', 'mv_model_scores',
+                        'mv_historical_versions', 'mv_model_scores_json', 'mv_final_model_context')
+  LOOP
+    IF rel.relkind = 'm' THEN
+      EXECUTE format('DROP MATERIALIZED VIEW %I CASCADE', rel.relname);
+    ELSE
+      EXECUTE format('DROP TABLE %I CASCADE', rel.relname);
+    END IF;
+  END LOOP;
+END $$;
+
+-- "refresh_model_table()" rewrites the rows of "p_model_ids" in one of the tables
+-- above from its source view (every row when "p_model_ids" is NULL).
+-- TRUNCATE locks out readers until the refresh commits; "p_concurrently" deletes
+-- the rows instead, so readers keep seeing the previous rows meanwhile.
+DROP FUNCTION IF EXISTS refresh_model_table(regclass, regclass, integer[]);
+DROP FUNCTION IF EXISTS refresh_model_table(regclass, regclass, integer[], boolean);
+CREATE OR REPLACE FUNCTION refresh_model_table(target regclass, source regclass, p_model_ids integer[],
+                                               p_concurrently boolean DEFAULT false) RETURNS void AS $$
+DECLARE
+  started timestamptz := clock_timestamp();
+  written bigint;
+BEGIN
+  IF p_model_ids IS NULL AND p_concurrently THEN
+    EXECUTE format('DELETE FROM %s', target);
+    EXECUTE format('INSERT INTO %s SELECT * FROM %s', target, source);
+  ELSIF p_model_ids IS NULL THEN
+    EXECUTE format('TRUNCATE %s', target);
+    EXECUTE format('INSERT INTO %s SELECT * FROM %s', target, source);
+  ELSE
+    EXECUTE format('DELETE FROM %s WHERE model_id = ANY($1)', target) USING p_model_ids;
+    EXECUTE format('INSERT INTO %s SELECT * FROM %s WHERE model_id = ANY($1)', target, source) USING p_model_ids;
+  END IF;
+  GET DIAGNOSTICS written = ROW_COUNT;
+  PERFORM log_refresh_step(target::text, started, target, written);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ********************************************************************************
+-- STEP A: Model Metadata (mv_model_data)
+-- Captures model rows + reference + submission + user info
+-- to be referenced later in final model score contexts.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_model_data CASCADE;
+CREATE MATERIALIZED VIEW mv_model_data AS
+SELECT
+    m.id AS model_id,
+    m.name,
+    m.domain,
+    m.public,
+    m.competition,
+    m.reference_id,
+    r.url AS reference_link,
+    m.owner_id AS "user",
+    s.status AS build_status,
+    s.submitter_id AS submitter,
+    m.submission_id,
+    s.jenkins_id,
+    s.timestamp
+FROM brainscore_model m
+LEFT JOIN brainscore_reference r ON m.reference_id = r.id
+LEFT JOIN brainscore_submission s ON m.submission_id = s.id;
+CREATE UNIQUE INDEX mv_model_data_model_id_idx ON mv_model_data (model_id);
+
+-- ********************************************************************************
+-- STEP B.0: Base Scores for Leaf Benchmarks (mv_base_scores)
+-- For each model and each leaf benchmark instance it was scored on, pick the
+-- "best" score if multiple exist, preferring non-null & highest. This shouldn't
+-- be the case but somehow certain model-benchmark scores have duplicates (NaN and
+-- then a valid score).
+-- IMPORTANT: This is the foundation for aggregated scoring.
+-- Only scored (model, leaf) pairs get a row; a missing pair is a NULL score (see
+-- "mv_scored_benchmarks"). Filtering on model_id narrows the scan of
+-- brainscore_score, which is probed by (model_id, benchmark_id).
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_base_scores CASCADE;
+CREATE VIEW v_base_scores AS
+SELECT DISTINCT ON (s.model_id, fbc.benchmark_id)
+  s.id,
+  s.model_id,
+  fbc.benchmark_type_id,
+  fbc.benchmark_id,
+  fbc.version,
+  fbc.overall_order,
+  s.score_raw,
+  -- Cap score_ceiled between 0 and 1 inclusive
+  CASE
+    WHEN s.score_ceiled IS NULL THEN NULL
+    WHEN s.score_ceiled::text ILIKE 'nan' THEN s.score_ceiled
+    ELSE GREATEST(LEAST(s.score_ceiled::numeric, 1), 0)
+  END AS score_ceiled,
+  s.error,
+  s.comment,
+  s.start_timestamp,
+  s.end_timestamp,
+  CASE WHEN s.score_raw IS NOT NULL THEN TRUE ELSE FALSE END AS is_complete
+FROM brainscore_score s
+JOIN
+  -- All leaf benchmarks with valid benchmark_id (instances)
+  (
+    SELECT
+      benchmark_id,
+      benchmark_type_id,
+      version,
+      overall_order
+    FROM mv_final_benchmark_context
+    WHERE benchmark_id IS NOT NULL
+      AND benchmark_type_id IN (
+        SELECT benchmark_identifier
+        FROM mv_leaf_status
+        WHERE is_leaf = TRUE
+      )
+  ) fbc
+  ON fbc.benchmark_id = s.benchmark_id
+ORDER BY
+  s.model_id,
+  fbc.benchmark_id,
+  (s.score_raw IS NOT NULL) DESC,  -- prioritize non-null score_raw
+  s.score_raw DESC NULLS LAST;     -- highest score_raw if both non-null
+
+CREATE TABLE mv_base_scores AS SELECT * FROM v_base_scores WITH NO DATA;
+CREATE INDEX mv_base_scores_model_id_idx ON mv_base_scores (model_id);
+
+
+-- ********************************************************************************
+-- STEP B.1: "mv_base_scores_fixed_engineering"
+-- This view modifies 'score_ceiled' for engineering-type benchmarks to remain
+-- the raw score for engineering tasks. Used heavily in final aggregation steps
+-- to treat engineering benchmarks differently.
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_base_scores_fixed_engineering CASCADE;
+CREATE VIEW v_base_scores_fixed_engineering AS
+SELECT
+  bs.id,
+  bs.model_id,
+  bs.benchmark_type_id,
+  bs.benchmark_id,
+  bs.version,
+  bs.overall_order,
+  bs.score_raw::float8,
+  CASE
+    WHEN bs.comment ILIKE '%error%' AND bs.score_ceiled IS NULL THEN 'NaN'::float8
+    WHEN fbt.root_parent ILIKE '%engineering%' THEN bs.score_raw::float8
+    ELSE bs.score_ceiled::float8
+  END AS score_ceiled,
+  bs.error,
+  bs.comment,
+  bs.start_timestamp,
+  bs.end_timestamp,
+  bs.is_complete
+FROM mv_base_scores bs
+JOIN mv_final_benchmark_context fbt
+  ON bs.benchmark_type_id = fbt.benchmark_type_id;
+
+CREATE TABLE mv_base_scores_fixed_engineering AS SELECT * FROM v_base_scores_fixed_engineering WITH NO DATA;
+CREATE INDEX mv_base_scores_fixed_engineering_model_benchmark_idx
+  ON mv_base_scores_fixed_engineering (model_id, benchmark_id);
+
+
+-- ********************************************************************************
+-- STEP C: Aggregate Scores for all Benchmarks
+-- These aggregations steps create "final_agg_scores", a table (not MV).
+-- "populate_final_agg_scores()" calculates leaf and parent-level scores.
+-- ********************************************************************************
+-- "final_agg_scores" is a permanent table storing hierarchical aggregation.
+-- A table was necessary because functions cannot be used on MVs
+DROP TABLE IF EXISTS final_agg_scores CASCADE;
+CREATE TABLE final_agg_scores (
+  score_id          integer,
+  benchmark         text,       -- benchmark identifier (e.g. 'Marques2020')
+  benchmark_id      integer,
+  model_id          integer,
+  score_raw         numeric,    -- the computed aggregated score_raw
+  score_ceiled      numeric,    -- the computed aggregated score_ceiled
+  depth             integer,
+  sort_path         text,
+  root_parent       text,
+  error             numeric,
+  comment           text,
+  start_timestamp   timestamp,
+  end_timestamp     timestamp,
+  is_leaf           boolean
+);
+CREATE INDEX final_agg_scores_model_id_idx ON final_agg_scores (model_id);
+CREATE INDEX final_agg_scores_benchmark_model_id_idx ON final_agg_scores (benchmark, model_id);
+
+-- This function populates "final_agg_scores" by first inserting
+-- all leaf scores, then iteratively rolling them up to parents
+-- from the bottom-up, joining each parent to its children's rows through
+-- "mv_benchmark_closure". Called during the main refresh function.
+-- With "p_model_ids", only those models' rows are replaced.
+-- Only cells with a row are stored: a parent gets a row once one of its
+-- children has one, and averages over all its "scored_children", counting the
+-- missing ones as NULL (i.e. 0, like NaN) -- the same as when every model had a
+-- row, NULL or not, for every leaf.
+DROP FUNCTION IF EXISTS populate_final_agg_scores();
+DROP FUNCTION IF EXISTS populate_final_agg_scores(integer[]);
+CREATE OR REPLACE FUNCTION populate_final_agg_scores(p_model_ids integer[] DEFAULT NULL) RETURNS void AS $$
+DECLARE
+  d integer;
+  max_depth integer;
+BEGIN
+  -- Clear the table (or the models' rows) first
+  IF p_model_ids IS NULL THEN
+    TRUNCATE final_agg_scores;
+  ELSE
+    DELETE FROM final_agg_scores WHERE model_id = ANY(p_model_ids);
+  END IF;
+
+  -- Get max_depth, handle NULL case
+  SELECT COALESCE(MAX(depth), 0) INTO max_depth FROM mv_benchmark_tree;
+
+  -- Only proceed if we have data (should always be true)
+  IF max_depth > 0 THEN
+    -- Insert leaf scores.
+    INSERT INTO final_agg_scores (score_id, benchmark, benchmark_id, model_id, score_raw, score_ceiled, depth, sort_path, root_parent, error, comment, start_timestamp, end_timestamp, is_leaf)
+    SELECT
+      bs.id,
+      t.identifier,
+      bs.benchmark_id,
+      bs.model_id,
+      bs.score_raw,
+      bs.score_ceiled,
+      t.depth,
+      t.sort_path,
+      t.root_parent,
+      bs.error,
+      bs.comment,
+      bs.start_timestamp,
+      bs.end_timestamp,
+      TRUE    -- sets is_leaf= true
+    FROM mv_benchmark_tree t
+    JOIN mv_leaf_status ls ON t.identifier = ls.benchmark_identifier
+    JOIN mv_base_scores_fixed_engineering bs ON bs.benchmark_type_id = t.identifier
+    WHERE ls.is_leaf = TRUE
+    AND t.visible = TRUE
+    AND (p_model_ids IS NULL OR bs.model_id = ANY(p_model_ids));
+
+    -- The table was just emptied; let the planner see the leaf rows.
+    IF p_model_ids IS NULL THEN
+      ANALYZE final_agg_scores;
+    END IF;
+
+    -- Loop from max_depth-1 down to 0 (i.e., roll up scores to compute parents)
+    FOR d IN REVERSE max_depth-1 .. 0 LOOP
+      INSERT INTO final_agg_scores (benchmark, model_id, score_raw, score_ceiled, depth, sort_path, root_parent, start_timestamp, end_timestamp, is_leaf)
+      SELECT
+        p.identifier AS benchmark,
+        s.model_id,
+
+        -- Compute score_raw
+        CASE
+          WHEN SUM(CASE WHEN s.score_raw IS NOT NULL AND s.score_raw = s.score_raw THEN 1 ELSE 0 END) > 0 THEN
+            -- At least one numeric score
+            SUM(COALESCE(NULLIF(s.score_raw, 'NaN'::float8), 0)) / sb.scored_children::float8
+          WHEN SUM(CASE WHEN s.score_raw <> s.score_raw THEN 1 ELSE 0 END) > 0 THEN
+            -- All scores are NaN or NULL, at least one is NaN
+            'NaN'::float8
+          ELSE
+            -- All scores are NULL
+            NULL
+        END AS score_raw,
+
+        -- Compute score_ceiled. Postgres treats NaN as equal to itself, so the
+        -- numeric test above counts NaN children as numbers (averaged as 0);
+        -- here a parent without any real-numbered child is NaN if some child is
+        -- NaN, and NULL if all are NULL, rather than 0. Children are final by
+        -- the time their parent's depth is aggregated, so this bubbles up.
+        CASE
+          WHEN COUNT(*) FILTER (WHERE s.score_ceiled <> 'NaN') > 0 THEN
+            SUM(COALESCE(NULLIF(s.score_ceiled, 'NaN'::float8), 0)) / sb.scored_children::float8
+          WHEN COUNT(*) FILTER (WHERE s.score_ceiled = 'NaN') > 0 THEN
+            'NaN'::float8
+          ELSE
+            NULL
+        END AS score_ceiled,
+
+        p.depth,
+        p.sort_path,
+        p.root_parent,
+        -- For parent nodes, use earliest start_timestamp and latest end_timestamp from children
+        MIN(s.start_timestamp) AS start_timestamp,
+        MAX(s.end_timestamp) AS end_timestamp,
+        FALSE -- sets parent nodes to is_leaf = false
+      FROM mv_benchmark_closure c
+      JOIN mv_benchmark_tree p ON p.identifier = c.ancestor_identifier
+      JOIN mv_scored_benchmarks sb ON sb.benchmark_type_id = p.identifier
+      -- For each parent, join to its direct children's scores.
+      JOIN final_agg_scores s ON s.benchmark = c.descendant_identifier
+      WHERE c.ancestor_depth = d
+        AND c.distance = 1
+        AND (p_model_ids IS NULL OR s.model_id = ANY(p_model_ids))
+      GROUP BY p.identifier, s.model_id, p.depth, p.sort_path, p.root_parent, sb.scored_children;
+    END LOOP;
+  END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- "fix_parent_scores()" used to correct parents set to 0 from NaN/NULL children
+-- after the fact; "populate_final_agg_scores()" now computes them directly.
+DROP FUNCTION IF EXISTS fix_parent_scores();
+DROP FUNCTION IF EXISTS fix_parent_scores(integer[]);
+DROP TABLE IF EXISTS intermediate_parent_stats;
+
+
+-- ********************************************************************************
+-- STEP D: Add benchmark metadata to aggregated scores (mv_model_scores)
+-- "mv_model_scores" is the immediate post-aggregation layer
+-- that references the fully aggregated "final_agg_scores" table.
+-- It joins final context info and basic model info.
+
+-- SUGGESTION: It is unclear at the time of writing this how much of the
+-- benchmark metadata needs to be embedded here vs in the mv_final_benchmark_context MV.
+-- Currently, excludes post-metadata-tagging-system metadata.
+-- Tbh, it should probably be included.
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_model_scores CASCADE;
+CREATE VIEW v_model_scores AS
+SELECT
+  fbc.benchmark_id,
+  fbc.identifier AS benchmark_id_version,  -- Include the full identifier with version
+  fa.benchmark    AS benchmark_identifier,
+  fa.model_id,
+  fa.score_raw,
+  fa.score_ceiled,
+  fbc.version,
+  fbc.overall_order,
+  fbc.root_parent,
+  fbc.parent,
+  fbc.meta_id,
+  fbc.ceiling,
+  fbc.ceiling_error,
+  fbc.children,
+  fbc.number_of_all_children,
+  fbc.short_name,
+  fa.is_leaf,
+  fa.error,
+  fa.comment,
+  fa.start_timestamp,
+  fa.end_timestamp,
+  m.visual_degrees,
+  m.id           AS model_pk,
+  m.name         AS model_name,
+  m.reference_id AS model_reference,
+  m.public       AS public,
+  m.competition  AS competition,
+  m.domain       AS model_domain,
+  fbc.domain     AS benchmark_domain,
+  m.submission_id,
+  fbc.depth,
+  s.status       AS build_status,
+  s.submitter_id AS submitter,
+  s.timestamp    AS submission_timestamp,
+  fbc.benchmark_author,
+  fbc.benchmark_year,
+  fbc.benchmark_url,
+  fbc.benchmark_reference_identifier,
+  fbc.benchmark_bibtex,
+  fbc.visible   AS benchmark_visible,
+  fbc.owner_id  AS benchmark_owner,
+  m.public      AS model_public,
+  m.owner_id    AS model_owner
+FROM final_agg_scores fa
+JOIN mv_final_benchmark_context fbc
+  ON fbc.benchmark_type_id = fa.benchmark
+JOIN brainscore_model m
+  ON m.id = fa.model_id
+LEFT JOIN brainscore_submission s
+  ON s.id = m.submission_id;
+
+CREATE TABLE mv_model_scores AS SELECT * FROM v_model_scores WITH NO DATA;
+CREATE INDEX mv_model_scores_model_id_idx ON mv_model_scores (model_id);
+
+
+
+-- ********************************************************************************
+-- STEP E: Compute Min/Max per Benchmark and generate color scales
+-- Used by "mv_model_scores_enriched" to determine color scaling.
+-- SUGGESTION: This view is currently a Django Model. If not needed for re-computing
+-- color scaling for leaderboard views, it should be removed (from the Django Model)
+-- ********************************************************************************
+-- Compute min/max per benchmark (mv_benchmark_minmax)
+DROP MATERIALIZED VIEW IF EXISTS mv_benchmark_minmax CASCADE;
+CREATE MATERIALIZED VIEW mv_benchmark_minmax AS
+
+WITH constants AS (
+    SELECT 'engineering'::text AS engineering_root
+),
+
+-- Every scored benchmark, including those no model has a row for yet
+benchmarks AS (
+    SELECT
+        fbc.identifier AS benchmark_id_version,
+        CONCAT(fbc.benchmark_type_id, '_v', fbc.version, '_v', fbc.version) AS bench_id,
+        fbc.benchmark_type_id AS benchmark_identifier,
+        fbc.version,
+        fbc.root_parent
+    FROM
+        mv_scored_benchmarks sb
+    JOIN
+        mv_final_benchmark_context fbc ON fbc.benchmark_type_id = sb.benchmark_type_id
+),
+
+valid_scores AS (
+    SELECT
+        ms.benchmark_id_version,
+        CONCAT(ms.benchmark_identifier, '_v', ms.version, '_v', ms.version) AS bench_id,
+        ms.benchmark_identifier,
+        ms.version,
+        ms.score_ceiled::float8 AS score_ceiled,
+        ms.root_parent
+    FROM
+        mv_model_scores ms
+    WHERE
+        ms.public = TRUE
+        AND ms.score_ceiled IS NOT NULL
+        AND ms.score_ceiled::text <> 'NaN'
+        AND ms.score_ceiled::float8 <> 0  -- Exclude zeros introduced during aggregation
+),
+
+minmax_scores AS (
+    SELECT
+        vs.benchmark_id_version,
+        vs.bench_id,
+        vs.benchmark_identifier,
+        MIN(vs.score_ceiled) AS min_score_raw,
+        MAX(vs.score_ceiled) AS max_score_raw,
+        vs.root_parent
+    FROM
+        valid_scores vs
+    GROUP BY
+        vs.benchmark_id_version,
+        vs.bench_id,
+        vs.benchmark_identifier,
+        vs.root_parent
+)
+
+SELECT
+    b.benchmark_identifier,
+    b.bench_id,
+    b.benchmark_id_version,
+    CASE
+        WHEN mm.min_score_raw IS NULL THEN 0  -- No scores available
+        WHEN mm.min_score_raw = mm.max_score_raw THEN 0  -- Zero range
+        ELSE mm.min_score_raw
+    END AS min_score,
+    CASE
+        WHEN mm.min_score_raw IS NULL THEN 1  -- No scores available
+        WHEN mm.min_score_raw = mm.max_score_raw THEN 1  -- Zero range
+        WHEN b.root_parent ILIKE '%' || constants.engineering_root || '%' THEN mm.max_score_raw * 2.5
+        ELSE mm.max_score_raw
+    END AS max_score
+FROM
+    benchmarks b
+LEFT JOIN
+    minmax_scores mm ON mm.bench_id = b.bench_id
+CROSS JOIN
+    constants;
+CREATE UNIQUE INDEX mv_benchmark_minmax_benchmark_identifier_idx ON mv_benchmark_minmax (benchmark_identifier);
+
+-- Cell colors are no longer computed in the database: the leaderboard colors client-side
+-- (color-utils.js) and the Django views use the lookup tables in benchmarks/views/palette.py.
+-- CASCADE: older definitions of "mv_model_scores_enriched" reference the function (recreated below).
+DROP FUNCTION IF EXISTS representative_color_sql_precomputed(FLOAT, FLOAT, FLOAT, TEXT) CASCADE;
+
+
+-- ********************************************************************************
+-- STEP F: "mv_model_scores_enriched"
+-- This merges "mv_model_scores" with "mv_benchmark_minmax" to
+-- provide min/max and computed aggregation score.
+-- This materialized view is the closest thing to the CSV download format however
+-- with much more metadata.
+-- Its median/best/rank columns are domain-wide statistics, so it is only rebuilt
+-- by the full refresh; nothing downstream reads it. Like "mv_model_scores", it
+-- has no rows for cells a model has no score under.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_model_scores_enriched CASCADE;
+CREATE MATERIALIZED VIEW mv_model_scores_enriched AS
+WITH base AS (
+  SELECT
+    ms.*,
+    bsfe.score_raw AS bs_score_raw,
+    bsfe.score_ceiled AS bs_score_ceiled,
+    -- Our chosen score:
+    CASE
+      WHEN ms.is_leaf AND ms.root_parent ILIKE '%engineering%' THEN bsfe.score_raw
+      WHEN ms.is_leaf THEN bsfe.score_ceiled
+      ELSE ms.score_ceiled
+    END AS computed_score
+  FROM mv_model_scores ms
+  LEFT JOIN mv_base_scores_fixed_engineering bsfe
+    ON bsfe.model_id = ms.model_id
+   AND bsfe.benchmark_id = ms.benchmark_id
+),
+-- Compute median and best score per benchmark group using only valid numbers.
+score_stats AS (
+  SELECT DISTINCT ON (sub.bi)
+    sub.bi,
+    sub.ver,
+    CASE WHEN COUNT(sub.valid_score) = 0 THEN 'NaN'::numeric
+         ELSE percentile_cont(0.5) WITHIN GROUP (ORDER BY sub.valid_score)
+    END AS median_score,
+    COALESCE(MAX(sub.valid_score), 'NaN'::numeric) AS best_score
+  FROM (
+    SELECT
+      b.benchmark_identifier AS bi,
+      b.version AS ver,
+      b.computed_score,
+      -- SUGGESTION: The part below in particular might be producing discrepancies in the median score
+      -- because nan and nulls are handled differently from legancy approach.
+      -- This is more noticable in engineering benchmarks due to high failure rate (i.e. many NaN scores)
+      CASE
+        WHEN b.computed_score::text NOT ILIKE 'nan' THEN b.computed_score
+        ELSE NULL
+      END AS valid_score
+    FROM base b
+    -- Only take rows from public models
+    WHERE b.public = True
+  ) sub
+  GROUP BY sub.bi, sub.ver
+),
+-- Compute the per-benchmark ranking using row_number(), treating NaN as NULL so they rank last.
+-- This is used for model card benchmark tree when providing individual ranks for benchmark.
+-- SUGGESTION: This doesn't really work. Should be refactored entirely. Would save around 1.5 seconds
+-- when loading the model card page if can be successfully done in database.
+ranked AS (
+  SELECT
+    b.benchmark_identifier AS bi,
+    b.version AS ver,
+    b.model_id,
+    row_number() OVER (
+      PARTITION BY b.benchmark_identifier, b.version
+      ORDER BY
+        CASE
+          WHEN b.computed_score::text ILIKE 'nan' THEN NULL
+          ELSE b.computed_score
+        END DESC NULLS LAST
+    ) AS benchmark_rank
+  FROM base b
+)
+SELECT
+  b.benchmark_id,
+  b.benchmark_id_version,
+  b.benchmark_identifier,
+  b.model_id,
+  b.score_raw,
+  b.score_ceiled,
+  b.version,
+  b.overall_order,
+  b.root_parent,
+  b.parent,
+  b.meta_id,
+  b.ceiling,
+  b.ceiling_error,
+  b.children,
+  b.number_of_all_children,
+  b.short_name,
+  b.is_leaf,
+  b.error,
+  b.comment,
+  b.start_timestamp,
+  b.end_timestamp,
+  b.visual_degrees,
+  b.model_pk,
+  b.model_name,
+  b.model_reference,
+  b.public,
+  b.competition,
+  b.model_domain,
+  b.benchmark_domain,
+  b.submission_id,
+  b.depth,
+  b.build_status,
+  b.submitter,
+  b.submission_timestamp,
+  b.benchmark_author,
+  b.benchmark_year,
+  b.benchmark_url,
+  b.benchmark_reference_identifier,
+  b.benchmark_bibtex,
+  mmx.bench_id,
+  b.benchmark_visible,
+  b.benchmark_owner,
+  b.model_public,
+  b.model_owner,
+  COALESCE(mmx.min_score, 0) AS min_score,
+  COALESCE(mmx.max_score, 1) AS max_score,
+  -- No public row at all reads as public NULL rows: no valid numbers.
+  COALESCE(s.median_score, 'NaN'::numeric) AS median_score,
+  COALESCE(s.best_score, 'NaN'::numeric) AS best_score,
+  r.benchmark_rank
+FROM base b
+LEFT JOIN mv_benchmark_minmax mmx
+  ON mmx.benchmark_identifier = b.benchmark_identifier
+  AND mmx.benchmark_id_version = b.benchmark_identifier || '_v' || b.version
+LEFT JOIN score_stats s
+  ON s.bi = b.benchmark_identifier
+ AND s.ver = b.version
+LEFT JOIN ranked r
+  ON r.bi = b.benchmark_identifier
+ AND r.ver = b.version
+ AND r.model_id = b.model_id;
+
+
+
+-- ********************************************************************************
+-- STEP F.1: Scores on Older Benchmark Versions (mv_historical_versions)
+-- For the wayback machine: each model's score on every version of a scored leaf
+-- older than its current version, with the period that version was current.
+-- Duplicate scores on a version are resolved like in "mv_base_scores".
+-- Built once here and joined into the JSON below, instead of being looked up
+-- for every cell.
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_historical_versions CASCADE;
+CREATE VIEW v_historical_versions AS
+SELECT DISTINCT ON (hs.model_id, hv.id)
+  hs.model_id,
+  hv.benchmark_type_id,
+  hv.version,
+  CASE
+    WHEN fbc.root_parent ILIKE '%engineering%' THEN hs.score_raw
+    ELSE hs.score_ceiled
+  END AS value,
+  hs.score_raw,
+  hs.end_timestamp,
+  hvt.valid_from AS version_valid_from,
+  hvt.valid_to AS version_valid_to
+FROM brainscore_score hs
+JOIN brainscore_benchmarkinstance hv
+  ON hv.id = hs.benchmark_id
+JOIN mv_final_benchmark_context fbc
+  ON fbc.benchmark_type_id = hv.benchmark_type_id
+JOIN mv_scored_benchmarks sb
+  ON sb.benchmark_type_id = fbc.benchmark_type_id
+ AND sb.is_leaf
+JOIN mv_version_timeline hvt
+  ON hvt.instance_id = hv.id
+WHERE hv.version < fbc.version
+ORDER BY
+  hs.model_id,
+  hv.id,
+  (hs.score_raw IS NOT NULL) DESC,
+  hs.score_raw DESC NULLS LAST;
+
+CREATE TABLE mv_historical_versions AS SELECT * FROM v_historical_versions WITH NO DATA;
+ALTER TABLE mv_historical_versions ADD PRIMARY KEY (model_id, benchmark_type_id, version);
+
+
+-- ********************************************************************************
+-- STEP G: Assemble JSON in _get_models()-like return.
+-- _get_models() was the original function that was used in Django.
+-- "mv_model_scores_json" compiles everything for each model into a JSON object,
+-- used as the final scoreboard output. Specifically, each model will have a JSON
+-- object with ALL scores for ALL benchmarks, alongside all metadata will provided above
+-- Reads "mv_model_scores" rather than "mv_model_scores_enriched": none of the
+-- domain-wide statistics that "mv_model_scores_enriched" adds end up in the JSON,
+-- and reading the per-model table keeps a per-model refresh per-model.
+-- The JSON keeps one entry per scored benchmark of the model's domain (templates
+-- and the leaderboard line scores up with benchmarks): cells the model has no
+-- row for are rendered from the benchmark alone, with NULL score values.
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_model_scores_json CASCADE;
+CREATE VIEW v_model_scores_json AS
+WITH historical AS (
+    SELECT
+        h.model_id,
+        h.benchmark_type_id,
+        jsonb_object_agg(
+            h.version::text,
+            jsonb_build_object(
+                'value', h.value,
+                'score_raw', h.score_raw,
+                'timestamp', h.end_timestamp,
+                'version', h.version,
+                'version_valid_from', h.version_valid_from,
+                'version_valid_to', h.version_valid_to
+            )
+        ) AS versions
+    FROM mv_historical_versions h
+    GROUP BY h.model_id, h.benchmark_type_id
+),
+score_with_value AS (
+    SELECT
+        m.id AS model_id,
+        fbc.benchmark_type_id AS benchmark_identifier,
+        fbc.version,
+        fbc.overall_order,
+        fbc.root_parent,
+        sb.is_leaf,
+        ms.error,
+        ms.end_timestamp,
+        b.score_raw AS base_score_raw,
+        b.score_ceiled AS base_score_ceiled,
+        CASE
+            WHEN sb.is_leaf AND fbc.root_parent ILIKE '%engineering%' THEN b.score_raw
+            WHEN sb.is_leaf THEN b.score_ceiled
+            ELSE ms.score_ceiled
+        END AS score_ceiled_value,
+        CASE
+            WHEN sb.is_leaf THEN b.score_raw
+            ELSE ms.score_raw
+        END AS score_raw_value,
+        to_jsonb(bm) AS meta,
+        -- Version timeline data for wayback machine
+        vt.valid_from AS version_valid_from,
+        vt.valid_to AS version_valid_to,
+        vt.is_current AS version_is_current,
+        hist.versions AS historical_versions
+    FROM brainscore_model m
+    -- SUGGESTION: The domain match isn't necessary however is a catch if we have overlapping identifiers between domains.
+    JOIN mv_final_benchmark_context fbc
+           ON fbc.domain = m.domain
+    JOIN mv_scored_benchmarks sb
+           ON sb.benchmark_type_id = fbc.benchmark_type_id
+    LEFT JOIN mv_model_scores ms
+           ON ms.model_id = m.id
+          AND ms.benchmark_identifier = fbc.benchmark_type_id
+    LEFT JOIN mv_base_scores_fixed_engineering b
+           ON b.benchmark_id = fbc.benchmark_id
+          AND b.model_id     = m.id
+    LEFT JOIN brainscore_benchmarkmeta bm
+           ON bm.id = fbc.meta_id
+    -- Join version timeline for leaf benchmarks (parents don't have versions)
+    LEFT JOIN mv_version_timeline vt
+           ON vt.benchmark_type_id = fbc.benchmark_type_id
+          AND vt.version = fbc.version
+          AND sb.is_leaf = TRUE
+    LEFT JOIN historical hist
+           ON hist.model_id = m.id
+          AND hist.benchmark_type_id = fbc.benchmark_type_id
+),
+-- This determines the JSON structure for how scoring is organized for each model.
+-- Was used to replicate ScoreDisplay namedTuple that was originally used by _get_context but provides
+-- much more metadata.
+-- SUGGESTION: Certain fields could be renamed for clarity. The field names were used
+-- to minimize the changes to the Django Template Logic.
+score_json AS (
+    SELECT
+        model_id,
+        jsonb_agg(
+            jsonb_build_object(
+                -- Flat benchmark_type_id (optimized structure from master)
+                'benchmark_type_id', benchmark_identifier,
+                'versioned_benchmark_identifier', benchmark_identifier || '_v' || version,
+                'score_ceiled',
+                  CASE
+                    WHEN score_ceiled_value IS NULL THEN ''
+                    WHEN score_ceiled_value::text ILIKE 'nan' THEN 'X'
+                    WHEN score_ceiled_value >= 1
+                        THEN TO_CHAR( round(score_ceiled_value::numeric, 1)   -- 1.27 → 1.3
+                                    , 'FM0.0')                               -- always "#.0"
+                    -- Store 3 decimal places for detail pages (compare, model card, benchmark)
+                    -- Leaderboard JS formats to 2 decimals at display time via toFixed(2)
+                    WHEN score_ceiled_value < 1 THEN TRIM(LEADING '0' FROM TO_CHAR(ROUND(score_ceiled_value::numeric, 3), 'FM0.000'))
+                    ELSE TO_CHAR(ROUND(score_ceiled_value::numeric, 3), 'FM0.000')
+                  END,
+                'error', error,
+                'end_timestamp', end_timestamp,
+                'is_complete', CASE WHEN score_ceiled_value IS NULL THEN 0 ELSE 1 END,
+                -- Wayback machine: version timeline data (from wayback branch)
+                'version_valid_from', version_valid_from,
+                'version_valid_to', version_valid_to,
+                'version_is_current', version_is_current
+            )
+            -- Wayback machine: scores from older benchmark versions, only on cells
+            -- that have any (readers treat a missing key as none)
+            || CASE
+                 WHEN historical_versions IS NULL THEN '{}'::jsonb
+                 ELSE jsonb_build_object('historical_versions', historical_versions)
+               END
+            ORDER BY overall_order
+        ) AS scores
+    FROM score_with_value swv
+    GROUP BY model_id
+)
+SELECT
+    model_id,
+    scores
+FROM score_json;
+
+CREATE TABLE mv_model_scores_json AS SELECT * FROM v_model_scores_json WITH NO DATA;
+ALTER TABLE mv_model_scores_json ADD PRIMARY KEY (model_id);
+
+
+
+-- ********************************************************************************
+-- STEP H.0: Rank models within their domain
+-- Ranking models based on "average_<domain>" benchmarks if they are public.
+-- SUGGESTION:This is currently not used in the Django index.py as private leaderboards
+-- necessitate re-ranking. If re-ranking is not needed, this would have
+-- sped up the leaderboard view by a couple hundred milliseconds. Consider still keeping
+-- this to quickly see top models per domain from within the database.
+-- A view of its own because a per-model refresh re-ranks the other models of
+-- the domain as well (see "refresh_model_rows()").
+-- Public models without an average row rank last, as a NULL average.
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_model_domain_ranks CASCADE;
+CREATE VIEW v_model_domain_ranks AS
+SELECT
+  m.id AS model_id,
+  m.domain AS model_domain,
+  ms.comment,
+  RANK() OVER (
+    PARTITION BY m.domain
+    ORDER BY
+      CASE
+        WHEN ms.score_ceiled IS NOT NULL AND ms.score_ceiled::text NOT ILIKE 'nan' THEN 0
+        WHEN ms.score_ceiled IS NOT NULL AND ms.score_ceiled::text ILIKE 'nan' THEN 1
+        WHEN ms.score_ceiled IS NULL THEN 2
+      END ASC,
+      ms.score_ceiled DESC
+  ) AS rank
+FROM brainscore_model m
+JOIN mv_scored_benchmarks sb
+  ON sb.benchmark_type_id = 'average_' || m.domain
+LEFT JOIN mv_model_scores ms
+  ON ms.model_id = m.id
+ AND ms.benchmark_identifier = sb.benchmark_type_id
+WHERE m.public = TRUE;  -- Only rank public models
+
+CREATE INDEX mv_model_scores_benchmark_model_idx ON mv_model_scores (benchmark_identifier, model_id);
+
+-- ********************************************************************************
+-- STEP H: Join per-model score JSON with model metadata
+-- "mv_final_model_context" is the final state used by the leaderboard/card views
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_final_model_context CASCADE;
+CREATE VIEW v_final_model_context AS
+WITH
+  -- SUGGESTION: This is a bit of a mess. Consider refactoring.
+  -- These CTEs for the model_meta and submission_meta do not provide
+  -- utility vs normal joins
+  model_meta AS (
+    SELECT
+      m.id,
+      m.name,
+      m.reference_id,
+      m.public,
+      m.competition,
+      m.domain,
+      m.owner_id,
+      m.submission_id,
+      m.visual_degrees
+    FROM brainscore_model m
+  ),
+  submission_meta AS (
+    SELECT
+      s.id AS submission_id,
+      s.status AS build_status,
+      s.submitter_id,
+      s.timestamp,
+      s.jenkins_id
+    FROM brainscore_submission s
+  ),
+  reference_meta AS (
+    SELECT
+      r.id AS reference_id,
+      r.author,
+      r.year,
+      r.url,
+      r.bibtex
+    FROM brainscore_reference r
+  )
+
+SELECT
+  mm.id AS model_id,
+  mm.name,
+  rm.author,
+  rm.year,
+  rm.url,
+  (rm.author || ' et al., ' || rm.year) AS reference_identifier,
+  rm.bibtex,
+  to_jsonb(u.*) AS "user",
+  to_jsonb(u.*) AS "owner",
+  mm.public,
+  mm.competition,
+  mm.domain,
+  mm.visual_degrees,
+  fl.layers,  -- Include layers from the per-model lookup below
+  mr.rank,
+  sc.scores,
+  sm.build_status,
+  to_jsonb(u2.*) AS "submitter",
+  mm.submission_id,
+  sm.jenkins_id,
+  sm.timestamp,
+  u2.id AS user_id,
+  NULL::INTEGER AS primary_model_id,
+  0 AS num_secondary_models,
+  -- Additional columns from brainscore_modelmeta stored in a JSONB
+  jsonb_build_object(
+    'architecture', mm2.architecture,
+    'model_family', mm2.model_family,
+    'total_parameter_count', mm2.total_parameter_count,
+    'trainable_parameter_count', mm2.trainable_parameter_count,
+    'total_layers', mm2.total_layers,
+    'trainable_layers', mm2.trainable_layers,
+    'model_size_mb', mm2.model_size_mb,
+    'training_dataset', mm2.training_dataset,
+    'task_specialization', mm2.task_specialization,
+    'brainscore_link', mm2.brainscore_link,
+    'hugging_face_link', mm2.hugging_face_link,
+    'runnable', mm2.runnable,
+    'extra_notes', mm2.extra_notes
+  ) AS model_meta
+FROM model_meta mm
+LEFT JOIN brainscore_user u ON mm.owner_id = u.id
+LEFT JOIN submission_meta sm ON mm.submission_id = sm.submission_id
+LEFT JOIN brainscore_user u2 ON sm.submitter_id = u2.id
+LEFT JOIN v_model_domain_ranks mr ON mm.id = mr.model_id
+LEFT JOIN mv_model_scores_json sc ON mm.id = sc.model_id
+LEFT JOIN reference_meta rm ON mm.reference_id = rm.reference_id
+-- Hacky layers extraction, processing and storing into JSONB.
+-- Necessary because layer information is stored in a piece-wise manner in
+-- the brainscore_score.comment field. Could be cleaned up.
+-- For each region, the layer of the benchmark latest in the overall order wins.
+-- Looked up per model (LATERAL), so refreshing a few models only parses their comments.
+-- SUGGESTION: This orders the layers in alphabetical order. In Django, we
+-- reorder the layers based on V1>V2>V4>IT. Consider adding it to this step
+-- and removing it from Django.
+LEFT JOIN LATERAL (
+  SELECT
+    jsonb_object_agg(ml.region, ml.layer ORDER BY COALESCE(ro."order", 0)) AS layers
+  FROM (
+    SELECT DISTINCT ON (kv.key)
+      kv.key AS region,
+      kv.value AS layer
+    FROM mv_model_scores ms,
+         -- Extract and clean the layers data from the comment, then parse it into JSONB
+         jsonb_each_text(
+           REPLACE(SUBSTRING(ms.comment FROM LENGTH('layers: ') + 1), '''', '"')::jsonb
+         ) AS kv(key, value)
+    WHERE ms.model_id = mm.id
+      AND ms.comment IS NOT NULL AND ms.comment LIKE 'layers: %'
+    ORDER BY kv.key, ms.overall_order DESC
+  ) ml
+  -- "order" is a reserved SQL keyword, so use quotes to specify it is a column name
+  LEFT JOIN brainscore_benchmarktype ro ON ml.region = ro.identifier
+) fl ON TRUE
+LEFT JOIN brainscore_modelmeta mm2 ON mm.id = mm2.model_id
+WHERE
+  -- Remove models with no valid scores (to be consistent with legacy implementation)
+  -- At least one score is valid (not '', not 'X', not NULL, not 'NaN')
+  EXISTS (
+    SELECT 1
+    FROM jsonb_array_elements(sc.scores) AS score
+    WHERE
+      (score->>'score_ceiled') IS NOT NULL
+      AND (score->>'score_ceiled') <> 'X'
+  );
+
+CREATE TABLE mv_final_model_context AS SELECT * FROM v_final_model_context WITH NO DATA;
+ALTER TABLE mv_final_model_context ADD PRIMARY KEY (model_id);
+
+
+
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+------------REFRESH MATERIALIZED VIEWS AND POPULATE TABLE-----------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+
+-- Refresh log. Each refresh (a "run": full, or of some models) records its
+-- steps: when each started and finished, the rows it wrote (the relation's
+-- row count for materialized views) and the relation's size afterwards.
+-- Rows are written in the refresh's transaction, so a failed refresh leaves
+-- none. Kept across migrations; "python manage.py refresh_leaderboard" runs a
+-- refresh and compares its steps with earlier runs.
+CREATE TABLE IF NOT EXISTS mv_refresh_run (
+    id bigserial PRIMARY KEY,
+    kind text NOT NULL,
+    model_count integer,
+    started_at timestamptz NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mv_refresh_step (
+    id bigserial PRIMARY KEY,
+    run_id bigint NOT NULL REFERENCES mv_refresh_run (id) ON DELETE CASCADE,
+    step text NOT NULL,
+    started_at timestamptz NOT NULL,
+    finished_at timestamptz NOT NULL,
+    row_count bigint,
+    relation_bytes bigint
+);
+CREATE INDEX IF NOT EXISTS mv_refresh_step_run_idx ON mv_refresh_step (run_id);
+
+-- Starts a run unless this transaction is already in one (a full refresh runs
+-- "refresh_model_rows()"); returns the current run.
+DROP FUNCTION IF EXISTS start_refresh_run(text, integer);
+CREATE OR REPLACE FUNCTION start_refresh_run(p_kind text, p_model_count integer DEFAULT NULL) RETURNS bigint AS $$
+DECLARE
+    run bigint := NULLIF(current_setting('leaderboard.refresh_run', true), '')::bigint;
+BEGIN
+    IF run IS NULL THEN
+        INSERT INTO mv_refresh_run (kind, model_count, started_at)
+        VALUES (p_kind, p_model_count, clock_timestamp())
+        RETURNING id INTO run;
+        PERFORM set_config('leaderboard.refresh_run', run::text, true);
+    END IF;
+    RETURN run;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Records a step of the current run, finished now. Without "p_row_count" the
+-- rows of "p_relation" are counted. Steps outside a run are not recorded.
+DROP FUNCTION IF EXISTS log_refresh_step(text, timestamptz, regclass, bigint);
+CREATE OR REPLACE FUNCTION log_refresh_step(p_step text, p_started timestamptz, p_relation regclass DEFAULT NULL,
+                                            p_row_count bigint DEFAULT NULL) RETURNS void AS $$
+DECLARE
+    run bigint := NULLIF(current_setting('leaderboard.refresh_run', true), '')::bigint;
+    finished timestamptz := clock_timestamp();
+BEGIN
+    IF run IS NULL THEN
+        RETURN;
+    END IF;
+    IF p_relation IS NOT NULL AND p_row_count IS NULL THEN
+        EXECUTE format('SELECT COUNT(*) FROM %s', p_relation) INTO p_row_count;
+    END IF;
+    INSERT INTO mv_refresh_step (run_id, step, started_at, finished_at, row_count, relation_bytes)
+    VALUES (run, p_step, p_started, finished, p_row_count,
+            CASE WHEN p_relation IS NOT NULL THEN pg_total_relation_size(p_relation) END);
+END;
+$$ LANGUAGE plpgsql;
+
+-- "refresh_model_rows()" rebuilds the per-model tables, from base scores through
+-- aggregation to the JSON and final context rows, for "p_model_ids" only (every
+-- model when NULL), then re-ranks the other models of the touched domains.
+-- Publishing new scores for a model only needs this; new benchmarks, benchmark
+-- versions or tree changes need "refresh_all_materialized_views()".
+-- Refreshes are serialized so that concurrent calls never interleave their
+-- deletes and inserts of the same rows.
+-- "p_concurrently" only matters for the full rebuild (see "refresh_model_table()").
+DROP FUNCTION IF EXISTS refresh_model_rows(integer[]);
+DROP FUNCTION IF EXISTS refresh_model_rows(integer[], boolean);
+CREATE OR REPLACE FUNCTION refresh_model_rows(p_model_ids integer[] DEFAULT NULL,
+                                              p_concurrently boolean DEFAULT false) RETURNS void AS $$
+DECLARE
+    started timestamptz;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_model_rows'));
+    PERFORM start_refresh_run(CASE WHEN p_model_ids IS NULL THEN 'full' ELSE 'models' END,
+                              cardinality(p_model_ids));
+
+    PERFORM refresh_model_table('mv_base_scores', 'v_base_scores', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_base_scores_fixed_engineering', 'v_base_scores_fixed_engineering', p_model_ids, p_concurrently);
+
+    -- Only try to populate if we have data
+    IF EXISTS (SELECT 1 FROM mv_benchmark_tree LIMIT 1) THEN
+        RAISE NOTICE 'Performing Aggregation';
+        started := clock_timestamp();
+        PERFORM populate_final_agg_scores(p_model_ids);
+        PERFORM log_refresh_step('final_agg_scores', started,
+                                 CASE WHEN p_model_ids IS NULL THEN 'final_agg_scores'::regclass END);
+    END IF;
+
+    PERFORM refresh_model_table('mv_model_scores', 'v_model_scores', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_historical_versions', 'v_historical_versions', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_model_scores_json', 'v_model_scores_json', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_final_model_context', 'v_final_model_context', p_model_ids, p_concurrently);
+
+    -- New or changed average scores move the other models of the domain
+    IF p_model_ids IS NOT NULL THEN
+        started := clock_timestamp();
+        UPDATE mv_final_model_context f
+        SET rank = ranked.rank
+        FROM (
+            SELECT f2.model_id, mr.rank
+            FROM mv_final_model_context f2
+            LEFT JOIN v_model_domain_ranks mr ON mr.model_id = f2.model_id
+            WHERE f2.domain IN (SELECT m.domain FROM brainscore_model m WHERE m.id = ANY(p_model_ids))
+        ) ranked
+        WHERE f.model_id = ranked.model_id
+          AND f.rank IS DISTINCT FROM ranked.rank;
+
+        -- Readers see the published generation: carry the rewritten rows and ranks over
+        IF to_regclass('leaderboard_live.mv_final_model_context') IS NOT NULL THEN
+            DELETE FROM leaderboard_live.mv_final_model_context WHERE model_id = ANY(p_model_ids);
+            INSERT INTO leaderboard_live.mv_final_model_context
+            SELECT * FROM mv_final_model_context WHERE model_id = ANY(p_model_ids);
+            UPDATE leaderboard_live.mv_final_model_context l
+            SET rank = f.rank
+            FROM mv_final_model_context f
+            WHERE f.model_id = l.model_id
+              AND f.domain IN (SELECT m.domain FROM brainscore_model m WHERE m.id = ANY(p_model_ids))
+              AND l.rank IS DISTINCT FROM f.rank;
+        END IF;
+        PERFORM log_refresh_step('domain ranks', started);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- "refresh_materialized_view()" refreshes one materialized view, CONCURRENTLY if
+-- asked and possible: every materialized view above has a unique index for that,
+-- but a view that was never populated can only be refreshed plainly.
+DROP FUNCTION IF EXISTS refresh_materialized_view(regclass, boolean);
+CREATE OR REPLACE FUNCTION refresh_materialized_view(target regclass, p_concurrently boolean) RETURNS void AS $$
+DECLARE
+  started timestamptz := clock_timestamp();
+BEGIN
+  IF p_concurrently AND (SELECT relispopulated FROM pg_class WHERE oid = target) THEN
+    EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %s', target);
+  ELSE
+    EXECUTE format('REFRESH MATERIALIZED VIEW %s', target);
+  END IF;
+  PERFORM log_refresh_step(target::text, started, target);
+END;
+$$ LANGUAGE plpgsql;
+
+-- "refresh_all_materialized_views()" orchestrates all creation/refresh
+-- of the hierarchy and scoring MVs, plus calls aggregation functions.
+-- Called at the end to ensure everything is up-to-date.
+-- A plain REFRESH takes an ACCESS EXCLUSIVE lock held until the refresh commits,
+-- blocking every leaderboard read meanwhile. By default ("p_concurrently") the
+-- views are refreshed CONCURRENTLY and the tables rewritten with DELETE, so
+-- readers see the previous data until the commit. That is slower; pass false
+-- when nothing reads the views (e.g. right after creating them below).
+-- "mv_model_scores_enriched" has no unique key to diff on and is always
+-- refreshed plainly; it is refreshed last and nothing serves pages from it.
+-- The refreshed data is then published as a new leaderboard generation (see
+-- "publish_leaderboard_generation()"); "p_max_row_drop" is passed through.
+DROP FUNCTION IF EXISTS refresh_all_materialized_views();
+DROP FUNCTION IF EXISTS refresh_all_materialized_views(boolean);
+DROP FUNCTION IF EXISTS refresh_all_materialized_views(boolean, numeric);
+CREATE OR REPLACE FUNCTION refresh_all_materialized_views(p_concurrently boolean DEFAULT true,
+                                                          p_max_row_drop numeric DEFAULT 0.1) RETURNS void AS $$
+DECLARE
+    started timestamptz;
+BEGIN
+    PERFORM start_refresh_run('full');
+
+  -- Refresh materialized views in the correct order
+    RAISE NOTICE 'Refreshing Benchmark-related Context';
+    PERFORM refresh_materialized_view('mv_benchmark_tree', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_children', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_closure', p_concurrently);
+    PERFORM refresh_materialized_view('mv_latest_benchmark_instance', p_concurrently);
+    PERFORM refresh_materialized_view('mv_version_timeline', p_concurrently);
+    PERFORM refresh_materialized_view('mv_leaf_status', p_concurrently);
+    PERFORM refresh_materialized_view('mv_final_benchmark_context', p_concurrently);
+    PERFORM refresh_materialized_view('mv_scored_benchmarks', p_concurrently);
+
+    RAISE NOTICE 'Refreshing Model-related Tables';
+    PERFORM refresh_materialized_view('mv_model_data', p_concurrently);
+    PERFORM refresh_model_rows(NULL, p_concurrently);
+
+    -- Refresh additional materialized views depending on updated data
+    RAISE NOTICE 'Refreshing Model-related Context';
+    PERFORM refresh_materialized_view('mv_benchmark_minmax', p_concurrently);
+    started := clock_timestamp();
+    REFRESH MATERIALIZED VIEW mv_model_scores_enriched;
+    PERFORM log_refresh_step('mv_model_scores_enriched', started, 'mv_model_scores_enriched');
+
+    RAISE NOTICE 'Publishing Leaderboard Generation';
+    started := clock_timestamp();
+    PERFORM publish_leaderboard_generation(p_max_row_drop);
+    PERFORM log_refresh_step('publish_leaderboard_generation', started);
+
+    RAISE NOTICE 'Completed';
+END;
+$$ LANGUAGE plpgsql;
+
+-- "benchmark_tree_signature()" hashes everything about the benchmarks that
+-- scores, ranks or the per-model JSON depend on: the tree, visibility, domains,
+-- ordering and each leaf's current instance. Not their metadata.
+DROP FUNCTION IF EXISTS benchmark_tree_signature();
+CREATE OR REPLACE FUNCTION benchmark_tree_signature() RETURNS text AS $$
+    SELECT md5(COALESCE(string_agg(
+        concat_ws('|', t.identifier, t.parent_id, t.visible, t.domain, t.sort_path, t.root_parent,
+                  fbc.version, fbc.benchmark_id),
+        ',' ORDER BY t.identifier), ''))
+    FROM mv_benchmark_tree t
+    JOIN mv_final_benchmark_context fbc ON fbc.benchmark_type_id = t.identifier;
+$$ LANGUAGE sql STABLE;
+
+-- "refresh_benchmark_metadata()" publishes edits of benchmark metadata
+-- (BenchmarkMeta, stimuli/data/metric meta, references, ceilings, owners)
+-- without recomputing scores: it refreshes the benchmark-side views up to
+-- "mv_final_benchmark_context", copies the metadata columns into the
+-- "mv_model_scores" rows that embed them, and publishes a new generation.
+-- The per-model JSON and "mv_benchmark_minmax" embed no metadata;
+-- "mv_model_scores_enriched", which nothing serves, is left to the next full
+-- refresh. If the tree signature changed (a benchmark was added, moved, hidden
+-- or got a new version), everything downstream may change and it runs
+-- "refresh_all_materialized_views()" instead.
+-- Returns 'metadata' or 'full', the refresh that ran.
+DROP FUNCTION IF EXISTS refresh_benchmark_metadata(boolean);
+CREATE OR REPLACE FUNCTION refresh_benchmark_metadata(p_concurrently boolean DEFAULT true) RETURNS text AS $$
+DECLARE
+    signature text := benchmark_tree_signature();
+    run bigint;
+    started timestamptz;
+    patched bigint;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_model_rows'));
+    run := start_refresh_run('metadata');
+
+    RAISE NOTICE 'Refreshing Benchmark-related Context';
+    PERFORM refresh_materialized_view('mv_benchmark_tree', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_children', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_closure', p_concurrently);
+    PERFORM refresh_materialized_view('mv_latest_benchmark_instance', p_concurrently);
+    PERFORM refresh_materialized_view('mv_leaf_status', p_concurrently);
+    PERFORM refresh_materialized_view('mv_final_benchmark_context', p_concurrently);
+
+    IF benchmark_tree_signature() IS DISTINCT FROM signature THEN
+        RAISE NOTICE 'Benchmark tree changed, refreshing everything';
+        UPDATE mv_refresh_run SET kind = 'full' WHERE id = run;
+        PERFORM refresh_all_materialized_views(p_concurrently);
+        RETURN 'full';
+    END IF;
+
+    RAISE NOTICE 'Patching Model Scores';
+    started := clock_timestamp();
+    UPDATE mv_model_scores ms
+    SET meta_id = fbc.meta_id,
+        ceiling = fbc.ceiling,
+        ceiling_error = fbc.ceiling_error,
+        benchmark_author = fbc.benchmark_author,
+        benchmark_year = fbc.benchmark_year,
+        benchmark_url = fbc.benchmark_url,
+        benchmark_reference_identifier = fbc.benchmark_reference_identifier,
+        benchmark_bibtex = fbc.benchmark_bibtex,
+        benchmark_owner = fbc.owner_id
+    FROM mv_final_benchmark_context fbc
+    WHERE fbc.benchmark_type_id = ms.benchmark_identifier
+      AND (ms.meta_id, ms.ceiling, ms.ceiling_error, ms.benchmark_author, ms.benchmark_year, ms.benchmark_url,
+           ms.benchmark_reference_identifier, ms.benchmark_bibtex, ms.benchmark_owner)
+          IS DISTINCT FROM
+          (fbc.meta_id, fbc.ceiling, fbc.ceiling_error, fbc.benchmark_author, fbc.benchmark_year, fbc.benchmark_url,
+           fbc.benchmark_reference_identifier, fbc.benchmark_bibtex, fbc.owner_id);
+    GET DIAGNOSTICS patched = ROW_COUNT;
+    PERFORM log_refresh_step('mv_model_scores metadata', started, 'mv_model_scores', patched);
+
+    RAISE NOTICE 'Publishing Leaderboard Generation';
+    started := clock_timestamp();
+    PERFORM publish_leaderboard_generation();
+    PERFORM log_refresh_step('publish_leaderboard_generation', started);
+    RETURN 'metadata';
+END;
+$$ LANGUAGE plpgsql;
+
+
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+------------------PUBLISH LEADERBOARD GENERATIONS-------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+
+-- Pages never read the relations above directly, but the "leaderboard_*" views
+-- below (FinalModelContext, FinalBenchmarkContext and BenchmarkMinMax). They
+-- point at a copy of those relations, a "generation", in schema
+-- "leaderboard_live":
+--   * "publish_leaderboard_generation()" copies the relations into schema
+--     "leaderboard_next", checks the copy, then in one transaction points the
+--     views at it and renames the schemas next -> live -> previous. Readers keep
+--     reading the old generation while the chain is rebuilt and copied, and only
+--     wait for the view swap itself.
+--   * "rollback_leaderboard_generation()" swaps live and previous back.
+-- Recreating the views here (on every migration) points them back at the chain,
+-- until the refresh at the end of this file publishes the first generation.
+
+-- Served relations, their unique key and the view readers query them through.
+DROP FUNCTION IF EXISTS leaderboard_served_relations();
+CREATE OR REPLACE FUNCTION leaderboard_served_relations()
+RETURNS TABLE (relation text, key_column text, view_name text) AS $$
+    VALUES ('mv_final_model_context', 'model_id', 'leaderboard_final_model_context'),
+           ('mv_final_benchmark_context', 'benchmark_type_id', 'leaderboard_final_benchmark_context'),
+           ('mv_benchmark_minmax', 'benchmark_identifier', 'leaderboard_benchmark_minmax');
+$$ LANGUAGE sql IMMUTABLE;
+
+DROP SCHEMA IF EXISTS leaderboard_next CASCADE;
+DROP SCHEMA IF EXISTS leaderboard_live CASCADE;
+DROP SCHEMA IF EXISTS leaderboard_previous CASCADE;
+
+DROP VIEW IF EXISTS leaderboard_final_model_context;
+DROP VIEW IF EXISTS leaderboard_final_benchmark_context;
+DROP VIEW IF EXISTS leaderboard_benchmark_minmax;
+CREATE VIEW leaderboard_final_model_context AS SELECT * FROM mv_final_model_context;
+CREATE VIEW leaderboard_final_benchmark_context AS SELECT * FROM mv_final_benchmark_context;
+CREATE VIEW leaderboard_benchmark_minmax AS SELECT * FROM mv_benchmark_minmax;
+
+-- Row count and checksum of a relation: the md5 of its rows' text in key order.
+DROP FUNCTION IF EXISTS leaderboard_relation_stats(regclass, text);
+CREATE OR REPLACE FUNCTION leaderboard_relation_stats(target regclass, key_column text,
+                                                      OUT row_count bigint, OUT checksum text) AS $$
+BEGIN
+    EXECUTE format('SELECT COUNT(*), md5(COALESCE(string_agg(md5(t::text), '''' ORDER BY t.%I), '''')) FROM %s t',
+                   key_column, target)
+    INTO row_count, checksum;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Checks, per served relation, before anything is swapped (any failure raises
+-- and leaves the live generation in place):
+--   * the copy has the row count and checksum of the relation it was copied from;
+--   * it does not empty a non-empty live generation, nor lose more than
+--     "p_max_row_drop" (a fraction) of its rows.
+-- With no live generation yet (a fresh database) the copy is published as is,
+-- even if empty, so that migrating an empty database succeeds.
+-- A copy identical to the live generation is not published, so that "previous"
+-- stays the last generation that differed.
+-- Returns 'published' or 'unchanged'.
+DROP FUNCTION IF EXISTS publish_leaderboard_generation(numeric);
+CREATE OR REPLACE FUNCTION publish_leaderboard_generation(p_max_row_drop numeric DEFAULT 0.1) RETURNS text AS $$
+DECLARE
+    served record;
+    source_stats record;
+    next_stats record;
+    live_stats record;
+    has_live boolean := to_regnamespace('leaderboard_live') IS NOT NULL;
+    changed boolean := NOT has_live;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('leaderboard_generation'));
+
+    DROP SCHEMA IF EXISTS leaderboard_next CASCADE;
+    CREATE SCHEMA leaderboard_next;
+
+    FOR served IN SELECT * FROM leaderboard_served_relations() LOOP
+        EXECUTE format('CREATE TABLE leaderboard_next.%I AS SELECT * FROM %I', served.relation, served.relation);
+        EXECUTE format('ALTER TABLE leaderboard_next.%I ADD PRIMARY KEY (%I)', served.relation, served.key_column);
+        EXECUTE format('ANALYZE leaderboard_next.%I', served.relation);
+
+        SELECT * INTO source_stats FROM leaderboard_relation_stats(served.relation::regclass, served.key_column);
+        SELECT * INTO next_stats
+        FROM leaderboard_relation_stats(format('leaderboard_next.%I', served.relation)::regclass, served.key_column);
+        IF (next_stats.row_count, next_stats.checksum) IS DISTINCT FROM
+           (source_stats.row_count, source_stats.checksum) THEN
+            RAISE EXCEPTION 'Leaderboard generation copy of % does not match its source', served.relation;
+        END IF;
+
+        IF has_live THEN
+            SELECT * INTO live_stats
+            FROM leaderboard_relation_stats(format('leaderboard_live.%I', served.relation)::regclass, served.key_column);
+            IF next_stats.row_count = 0 AND live_stats.row_count > 0 THEN
+                RAISE EXCEPTION 'Leaderboard generation copy of % is empty', served.relation;
+            END IF;
+            IF next_stats.row_count < live_stats.row_count * (1 - p_max_row_drop) THEN
+                RAISE EXCEPTION 'Leaderboard generation % has % rows, down from % live (more than % dropped)',
+                    served.relation, next_stats.row_count, live_stats.row_count, p_max_row_drop;
+            END IF;
+            changed := changed OR next_stats.checksum <> live_stats.checksum;
+        END IF;
+    END LOOP;
+
+    IF NOT changed THEN
+        DROP SCHEMA leaderboard_next CASCADE;
+        RETURN 'unchanged';
+    END IF;
+
+    -- Views reference their tables, not names: repointed first, they follow the renames
+    FOR served IN SELECT * FROM leaderboard_served_relations() LOOP
+        EXECUTE format('CREATE OR REPLACE VIEW %I AS SELECT * FROM leaderboard_next.%I',
+                       served.view_name, served.relation);
+    END LOOP;
+    DROP SCHEMA IF EXISTS leaderboard_previous CASCADE;
+    IF has_live THEN
+        ALTER SCHEMA leaderboard_live RENAME TO leaderboard_previous;
+    END IF;
+    ALTER SCHEMA leaderboard_next RENAME TO leaderboard_live;
+    RETURN 'published';
+END;
+$$ LANGUAGE plpgsql;
+
+-- Points the views back at the previous generation, which becomes live; the
+-- replaced one is kept as "previous", so calling this again undoes it.
+DROP FUNCTION IF EXISTS rollback_leaderboard_generation();
+CREATE OR REPLACE FUNCTION rollback_leaderboard_generation() RETURNS void AS $$
+DECLARE
+    served record;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('leaderboard_generation'));
+
+    IF to_regnamespace('leaderboard_previous') IS NULL THEN
+        RAISE EXCEPTION 'No previous leaderboard generation to roll back to';
+    END IF;
+
+    FOR served IN SELECT * FROM leaderboard_served_relations() LOOP
+        EXECUTE format('CREATE OR REPLACE VIEW %I AS SELECT * FROM leaderboard_previous.%I',
+                       served.view_name, served.relation);
+    END LOOP;
+    ALTER SCHEMA leaderboard_live RENAME TO leaderboard_rollback;
+    ALTER SCHEMA leaderboard_previous RENAME TO leaderboard_live;
+    ALTER SCHEMA leaderboard_rollback RENAME TO leaderboard_previous;
+END;
+$$ LANGUAGE plpgsql;
+
+
+SELECT refresh_all_materialized_views(p_concurrently => false);
@@ -295,6 +295,10 @@ class Score(models.Model):
 
     class Meta:
         db_table = 'brainscore_score'
+        indexes = [
+            # mv_base_scores picks each model's best score per leaf by this pair
+            models.Index(fields=['model', 'benchmark']),
+        ]
 
 
 class ModelMonthlyAggregate(models.Model):
@@ -302,8 +306,8 @@ class ModelMonthlyAggregate(models.Model):
 
     Long-format table written by the ``recompute_score_trends`` management
     command. ``score`` is computed from the public-benchmark subtree as of
-    ``YYYY-MM``-end. Rows exist for every model (public and private); rank
-    computation against the public pool happens at read time.
+    ``YYYY-MM``-end. Rows exist for every model (public and private); public
+    ranks are persisted in ``ModelMonthlyRank``.
     """
     model = models.ForeignKey(Model, on_delete=models.CASCADE)
     domain = models.CharField(max_length=200, default='vision')
@@ -323,6 +327,51 @@ class ModelMonthlyAggregate(models.Model):
         ]
 
 
+class ModelMonthlyRank(models.Model):
+    """Per-model, per-month public leaderboard rank.
+
+    Written by ``recompute_score_trends`` alongside ``ModelMonthlyAggregate``,
+    for public models with a non-zero aggregate that month. ``rank`` is the
+    competition rank of the aggregate as the leaderboard rounds it, among the
+    month's ``cohort_size`` ranked public models. Private models are ranked at
+    read time by binary search over the public scores (``rank_if_inserted``).
+    """
+    model = models.ForeignKey(Model, on_delete=models.CASCADE)
+    domain = models.CharField(max_length=200, default='vision')
+    month = models.CharField(max_length=7)  # 'YYYY-MM'
+    rank = models.IntegerField()
+    cohort_size = models.IntegerField()
+
+    class Meta:
+        db_table = 'brainscore_model_monthly_rank'
+        unique_together = (('model', 'domain', 'month'),)
+        indexes = [
+            models.Index(fields=['domain', 'month']),
+        ]
+
+
+class ModelLeafFirstScore(models.Model):
+    """First qualifying score of a model on a leaf benchmark.
+
+    Written by ``recompute_score_trends`` alongside ``ModelMonthlyAggregate``:
+    the earliest ``Score`` (by ``end_timestamp``) with a positive, non-NaN
+    ``score_ceiled`` per (model, visible leaf). Drives the "scored on N of the
+    new benchmarks" trend narrative without re-scanning ``Score``.
+    """
+    model = models.ForeignKey(Model, on_delete=models.CASCADE)
+    domain = models.CharField(max_length=200, default='vision')
+    leaf = models.CharField(max_length=200)  # BenchmarkType identifier
+    first_positive_timestamp = models.DateTimeField()
+    first_positive_score = models.FloatField()
+
+    class Meta:
+        db_table = 'brainscore_model_leaf_first_score'
+        unique_together = (('model', 'domain', 'leaf'),)
+        indexes = [
+            models.Index(fields=['model', 'domain']),
+        ]
+
+
 class MonthBenchmarkEdge(models.Model):
     """Leaf benchmarks newly counted in the public aggregate between two months.
 
@@ -339,6 +388,42 @@ class MonthBenchmarkEdge(models.Model):
         unique_together = (('domain', 'month_prev', 'month_curr'),)
 
 
+class ScoreTrendWatermark(models.Model):
+    """How far ``recompute_score_trends`` has processed ``Score`` for a domain.
+
+    ``--mode incremental`` only recomputes what changed past this point: scores
+    with a higher id or a later ``end_timestamp`` (in-place re-scores bump the
+    timestamp), and months after ``last_month``. The fingerprints of the
+    visible benchmark tree and of the public model set force a full recompute
+    when either changes, since those move every model's aggregate or rank.
+    """
+    domain = models.CharField(max_length=200, unique=True)
+    max_score_id = models.BigIntegerField()
+    max_end_timestamp = models.DateTimeField()
+    last_month = models.CharField(max_length=7)  # 'YYYY-MM'
+    tree_fingerprint = models.CharField(max_length=64)
+    public_fingerprint = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'brainscore_score_trend_watermark'
+
+
+class ScoreTrendVersion(models.Model):
+    """Per-domain counter bumped by every ``recompute_score_trends`` run.
+
+    The trend loaders key their caches on it, so a recompute in any process
+    invalidates every worker's cached frames. (The trend tables are upserted,
+    so their row ids no longer move on every run.)
+    """
+    domain = models.CharField(max_length=200, unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'brainscore_score_trend_version'
+
+
 class ResourceUsage(models.Model):
     """Per-attempt resource log written by any compute job — not tied to
     scoring. Feeds the memoized-peak tier dispatcher and the failure
@@ -521,7 +606,7 @@ class FinalBenchmarkContext(models.Model):
 
     class Meta:
         managed = False
-        db_table = 'mv_final_benchmark_context'
+        db_table = 'leaderboard_final_benchmark_context'
 
     @property
     def id(self):
@@ -562,6 +647,8 @@ class FinalModelContext(models.Model):
             - error (float, optional): Error margin for uncertainty/error bars
             - end_timestamp (str): Timestamp for wayback machine feature
             - is_complete (int): Data availability flag (0 or 1)
+            - historical_versions (dict, optional): Scores on older versions of the benchmark by
+              version, for the wayback machine; absent when there are none
 
             Note: Fields removed during optimization (computed on-demand or moved client-side):
             - benchmark object (20+ fields) -> use FinalBenchmarkContext for full metadata
@@ -608,7 +695,7 @@ class FinalModelContext(models.Model):
     model_meta = JSONBField(null=True, blank=True)
     class Meta:
         managed = False
-        db_table = 'mv_final_model_context'
+        db_table = 'leaderboard_final_model_context'
 
     @property
     def id(self):
@@ -626,7 +713,7 @@ class BenchmarkMinMax(models.Model):
 
     class Meta:
         managed = False
-        db_table = 'mv_benchmark_minmax'
+        db_table = 'leaderboard_benchmark_minmax'
         
 class FileUploadTracker(models.Model):
     id = models.AutoField(primary_key=True, serialize=False)
@@ -0,0 +1,226 @@
+"""
+Reference implementation of the leaderboard score aggregation, in numpy.
+
+Mirrors what ``mv.sql`` computes into ``final_agg_scores`` (``v_base_scores``,
+``v_base_scores_fixed_engineering``, ``mv_scored_benchmarks`` and
+``populate_final_agg_scores()``), so that the SQL can be checked against it
+(see ``tests/test_score_aggregation.py``) and scores can be aggregated without
+PostgreSQL, e.g. on a local SQLite copy:
+
+    tree, scores = load_inputs()
+    aggregated = aggregate_scores(tree, scores)
+
+SQL NULL and NaN mean different things here (a parent of NaN children is NaN,
+of NULL children NULL), so scores are float arrays with separate NULL masks
+rather than NaN-for-missing. Timestamps, errors and comments are not carried
+over to parents.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class BenchmarkTree:
+    """Benchmark types reachable from a root, as in ``mv_benchmark_tree``, indexed by position."""
+    identifiers: np.ndarray     # object
+    parent: np.ndarray          # index of the parent, -1 for roots
+    depth: np.ndarray
+    root: np.ndarray            # index of the root
+    is_leaf: np.ndarray
+    visible: np.ndarray
+    instance_id: np.ndarray     # latest instance of a leaf, -1 for parents and leaves without one
+    scored_children: np.ndarray  # as in mv_scored_benchmarks; 0 for benchmarks without score cells
+
+    @classmethod
+    def build(cls, types, latest_instances):
+        """
+        :param types: ``(identifier, parent_id, visible)`` of every benchmark type
+        :param latest_instances: ``{identifier: id}`` of each type's highest-version instance
+        """
+        children = {}
+        for identifier, parent_id, visible in types:
+            children.setdefault(parent_id, []).append((identifier, visible))
+        identifiers, parent, depth, root, visible = [], [], [], [], []
+        # Depth-first from the roots, children in input order
+        stack = [(identifier, vis, -1) for identifier, vis in reversed(children.get(None, []))]
+        while stack:
+            identifier, vis, parent_index = stack.pop()
+            index = len(identifiers)
+            identifiers.append(identifier)
+            parent.append(parent_index)
+            depth.append(0 if parent_index < 0 else depth[parent_index] + 1)
+            root.append(index if parent_index < 0 else root[parent_index])
+            visible.append(bool(vis))
+            stack.extend((child, child_vis, index) for child, child_vis in reversed(children.get(identifier, [])))
+
+        parent = np.array(parent, dtype=np.int64)
+        is_leaf = np.ones(len(identifiers), dtype=bool)
+        is_leaf[parent[parent >= 0]] = False
+        instance_id = np.array([latest_instances.get(identifier, -1) if leaf else -1
+                                for identifier, leaf in zip(identifiers, is_leaf)], dtype=np.int64)
+        visible = np.array(visible, dtype=bool)
+
+        # Visible leaves with an instance, and every benchmark above one of them
+        scored = is_leaf & visible & (instance_id >= 0)
+        for index in np.flatnonzero(scored):
+            index = parent[index]
+            while index >= 0 and not scored[index]:
+                scored[index] = True
+                index = parent[index]
+        scored_children = np.bincount(parent[scored & (parent >= 0)], minlength=len(identifiers))
+
+        return cls(identifiers=np.array(identifiers, dtype=object), parent=parent,
+                   depth=np.array(depth, dtype=np.int64), root=np.array(root, dtype=np.int64), is_leaf=is_leaf,
+                   visible=visible, instance_id=instance_id, scored_children=scored_children)
+
+
+@dataclass
+class ScoreRows:
+    """``brainscore_score`` rows as arrays: NULL scores are NaN in the values and True in ``*_null``."""
+    model_id: np.ndarray
+    benchmark_id: np.ndarray    # benchmark instance
+    score_raw: np.ndarray
+    score_ceiled: np.ndarray
+    raw_null: np.ndarray
+    ceiled_null: np.ndarray
+    error_comment: np.ndarray   # comment ILIKE '%error%'
+
+    @classmethod
+    def from_records(cls, records):
+        """:param records: ``(model_id, benchmark_id, score_raw, score_ceiled, comment)`` tuples"""
+        records = list(records)
+        columns = list(zip(*records)) if records else [()] * 5
+        model_id, benchmark_id, score_raw, score_ceiled, comment = columns
+
+        def scores(values):
+            null = np.array([value is None for value in values], dtype=bool)
+            return np.array([np.nan if value is None else value for value in values], dtype=np.float64), null
+
+        score_raw, raw_null = scores(score_raw)
+        score_ceiled, ceiled_null = scores(score_ceiled)
+        return cls(model_id=np.array(model_id, dtype=np.int64), benchmark_id=np.array(benchmark_id, dtype=np.int64),
+                   score_raw=score_raw, score_ceiled=score_ceiled, raw_null=raw_null, ceiled_null=ceiled_null,
+                   error_comment=np.array([value is not None and 'error' in value.lower() for value in comment],
+                                          dtype=bool))
+
+
+@dataclass
+class AggregatedScores:
+    """``final_agg_scores`` rows: one per (model, benchmark) with a score cell, leaves first."""
+    model_id: np.ndarray
+    benchmark: np.ndarray       # index into the tree
+    score_raw: np.ndarray
+    score_ceiled: np.ndarray
+    raw_null: np.ndarray
+    ceiled_null: np.ndarray
+    tree: BenchmarkTree
+
+    def __len__(self):
+        return len(self.model_id)
+
+    def records(self):
+        """``(model_id, benchmark identifier, score_raw, score_ceiled, depth, is_leaf)`` tuples, None for NULL."""
+        tree = self.tree
+        for i in range(len(self)):
+            benchmark = self.benchmark[i]
+            yield (int(self.model_id[i]), tree.identifiers[benchmark],
+                   None if self.raw_null[i] else float(self.score_raw[i]),
+                   None if self.ceiled_null[i] else float(self.score_ceiled[i]),
+                   int(tree.depth[benchmark]), bool(tree.is_leaf[benchmark]))
+
+
+def _leaf_scores(tree, scores):
+    """``v_base_scores_fixed_engineering`` restricted to visible leaves: one row per (model, leaf)."""
+    leaf_nodes = np.flatnonzero(tree.is_leaf & tree.visible & (tree.instance_id >= 0))
+    order = np.argsort(tree.instance_id[leaf_nodes])
+    instances, leaf_nodes = tree.instance_id[leaf_nodes][order], leaf_nodes[order]
+    # A -1 sentinel, which matches no instance, keeps lookups past the end (or into no leaves) in bounds
+    instances, leaf_nodes = np.append(instances, -1), np.append(leaf_nodes, -1)
+    position = np.searchsorted(instances[:-1], scores.benchmark_id)
+    keep = np.flatnonzero(instances[position] == scores.benchmark_id)
+
+    # Per (model, instance), the non-NULL score_raw first, then the highest (NaN sorts above numbers)
+    raw, raw_null = scores.score_raw[keep], scores.raw_null[keep]
+    raw_order = np.where(raw_null, np.inf, np.where(np.isnan(raw), -np.inf, -raw))
+    model_id, instance_id = scores.model_id[keep], scores.benchmark_id[keep]
+    order = np.lexsort((raw_order, instance_id, model_id))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (model_id[order][1:] != model_id[order][:-1]) | (instance_id[order][1:] != instance_id[order][:-1])
+    rows = keep[order[first]]
+    node = leaf_nodes[position[rows]]
+
+    raw, raw_null = scores.score_raw[rows], scores.raw_null[rows]
+    ceiled, ceiled_null = scores.score_ceiled[rows], scores.ceiled_null[rows]
+    ceiled = np.where(np.isnan(ceiled), ceiled, np.clip(ceiled, 0, 1))
+    error = scores.error_comment[rows] & ceiled_null
+    engineering = np.array(['engineering' in identifier.lower() for identifier in tree.identifiers],
+                           dtype=bool)[tree.root[node]]
+    ceiled = np.where(error, np.nan, np.where(engineering, raw, ceiled))
+    ceiled_null = np.where(error, False, np.where(engineering, raw_null, ceiled_null))
+    return scores.model_id[rows], node, raw, raw_null, ceiled, ceiled_null
+
+
+def _aggregate_level(tree, model_id, node, raw, raw_null, ceiled, ceiled_null):
+    """Rows of the parents of ``node``: the average over the parent's scored children, missing as 0."""
+    parent = tree.parent[node]
+    keys, group = np.unique(model_id * len(tree.identifiers) + parent, return_inverse=True)
+    size = len(keys)
+    parent_model, parent_node = np.divmod(keys, len(tree.identifiers))
+    denominator = tree.scored_children[parent_node].astype(np.float64)
+
+    raw_any = np.bincount(group, weights=~raw_null, minlength=size) > 0
+    raw_sum = np.bincount(group, weights=np.where(raw_null | np.isnan(raw), 0, raw), minlength=size)
+    ceiled_real = ~ceiled_null & ~np.isnan(ceiled)
+    ceiled_any_real = np.bincount(group, weights=ceiled_real, minlength=size) > 0
+    ceiled_any_nan = np.bincount(group, weights=~ceiled_null & np.isnan(ceiled), minlength=size) > 0
+    ceiled_sum = np.bincount(group, weights=np.where(ceiled_real, ceiled, 0), minlength=size)
+
+    return (parent_model, parent_node,
+            np.where(raw_any, raw_sum / denominator, np.nan), ~raw_any,
+            np.where(ceiled_any_real, ceiled_sum / denominator, np.nan), ~ceiled_any_real & ~ceiled_any_nan)
+
+
+def aggregate_scores(tree, scores):
+    """
+    Leaf scores, then parents bottom-up, as ``populate_final_agg_scores()`` computes them.
+
+    :param tree: ``BenchmarkTree``
+    :param scores: ``ScoreRows`` of every model to aggregate
+    :return: ``AggregatedScores``
+    """
+    leaf = _leaf_scores(tree, scores)
+    max_depth = int(tree.depth.max()) if len(tree.depth) else 0
+    levels = {depth: [] for depth in range(max_depth + 1)}
+    leaf_depth = tree.depth[leaf[1]]
+    for depth in np.unique(leaf_depth):
+        levels[int(depth)].append(tuple(column[leaf_depth == depth] for column in leaf))
+
+    parts = [leaf]
+    for depth in range(max_depth, 0, -1):
+        if not levels[depth]:
+            continue
+        children = tuple(np.concatenate(column) for column in zip(*levels[depth]))
+        parents = _aggregate_level(tree, *children)
+        levels[depth - 1].append(parents)
+        parts.append(parents)
+
+    model_id, node, raw, raw_null, ceiled, ceiled_null = (np.concatenate(column) for column in zip(*parts))
+    return AggregatedScores(model_id=model_id, benchmark=node, score_raw=raw, score_ceiled=ceiled,
+                            raw_null=raw_null, ceiled_null=ceiled_null, tree=tree)
+
+
+def load_inputs(using='default'):
+    """``(BenchmarkTree, ScoreRows)`` from the database behind ``using``; works on SQLite too."""
+    from benchmarks.models import BenchmarkInstance, BenchmarkType, Score
+
+    latest = {}
+    for benchmark_type_id, version, instance_id in (BenchmarkInstance.objects.using(using)
+                                                    .order_by('benchmark_type_id', 'version')
+                                                    .values_list('benchmark_type_id', 'version', 'id')):
+        latest[benchmark_type_id] = instance_id
+    tree = BenchmarkTree.build(BenchmarkType.objects.using(using).values_list('identifier', 'parent_id', 'visible'),
+                               latest)
+    scores = ScoreRows.from_records(Score.objects.using(using).values_list(
+        'model_id', 'benchmark_id', 'score_raw', 'score_ceiled', 'comment').iterator(chunk_size=10000))
+    return tree, scores
@@ -61,6 +61,7 @@ WITH RECURSIVE tree AS (
   JOIN tree p ON c.parent_id = p.identifier
 )
 SELECT * FROM tree;
+CREATE UNIQUE INDEX mv_benchmark_tree_identifier_idx ON mv_benchmark_tree (identifier);
 
 -- ********************************************************************************
 -- STEP 2: Aggregate immediate children for each Benchmark
@@ -75,6 +76,39 @@ SELECT
 FROM mv_benchmark_tree
 WHERE parent_id IS NOT NULL
 GROUP BY parent_id;
+CREATE UNIQUE INDEX mv_benchmark_children_parent_id_idx ON mv_benchmark_children (parent_id);
+
+-- ********************************************************************************
+-- STEP 2.5: Closure of the Benchmark Tree
+-- "mv_benchmark_closure" holds one row per (ancestor, descendant) pair, including
+-- each benchmark with itself at distance 0. The aggregation rolls scores up
+-- along its distance-1 rows with plain equi-joins.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_benchmark_closure CASCADE;
+CREATE MATERIALIZED VIEW mv_benchmark_closure AS
+WITH RECURSIVE closure AS (
+  SELECT
+    t.identifier AS ancestor_identifier,
+    t.identifier AS descendant_identifier,
+    0 AS distance,
+    t.depth AS ancestor_depth
+  FROM mv_benchmark_tree t
+
+  UNION ALL
+
+  SELECT
+    c.ancestor_identifier,
+    t.identifier,
+    c.distance + 1,
+    c.ancestor_depth
+  FROM closure c
+  JOIN mv_benchmark_tree t ON t.parent_id = c.descendant_identifier
+)
+SELECT * FROM closure;
+CREATE UNIQUE INDEX mv_benchmark_closure_ancestor_descendant_idx
+  ON mv_benchmark_closure (ancestor_identifier, descendant_identifier);
+CREATE INDEX mv_benchmark_closure_depth_idx ON mv_benchmark_closure (ancestor_depth, distance);
+CREATE INDEX mv_benchmark_closure_descendant_idx ON mv_benchmark_closure (descendant_identifier, distance);
 
 -- ********************************************************************************
 -- STEP 3: For Each Benchmark Type, Pick the Latest Instance
@@ -88,6 +122,8 @@ SELECT
   MAX(bi.version) AS latest_version
 FROM brainscore_benchmarkinstance bi
 GROUP BY bi.benchmark_type_id;
+CREATE UNIQUE INDEX mv_latest_benchmark_instance_benchmark_type_id_idx
+  ON mv_latest_benchmark_instance (benchmark_type_id);
 
 -- ********************************************************************************
 -- STEP 3.5: Version Timeline for Wayback Machine
@@ -131,6 +167,7 @@ SELECT
   valid_to,
   CASE WHEN valid_to IS NULL THEN true ELSE false END AS is_current
 FROM version_periods;
+CREATE UNIQUE INDEX mv_version_timeline_instance_id_idx ON mv_version_timeline (instance_id);
 
 -- ********************************************************************************
 -- STEP 4: Mark Each Benchmark as Leaf (has no children) or Parent
@@ -149,6 +186,7 @@ SELECT
   t.depth,
   t.sort_path
 FROM mv_benchmark_tree t;
+CREATE UNIQUE INDEX mv_leaf_status_benchmark_identifier_idx ON mv_leaf_status (benchmark_identifier);
 
 -- ********************************************************************************
 -- STEP 5: Final Benchmark Context
@@ -287,15 +325,109 @@ LEFT JOIN brainscore_benchmark_metric_meta bmm
   ON bmm.id = bi.metric_meta_id
 LEFT JOIN brainscore_benchmark_stimuli_meta bsm
   ON bsm.id = bi.stimuli_meta_id;
+CREATE UNIQUE INDEX mv_final_benchmark_context_benchmark_type_id_idx
+  ON mv_final_benchmark_context (benchmark_type_id);
 
 
 
+-- ********************************************************************************
+-- STEP 6: Benchmarks that Hold a Score Cell for Every Model
+-- "mv_scored_benchmarks" lists the visible leaves with an instance, plus every
+-- parent above one of them. Score tables below only store the cells a model has
+-- a score under; each of these benchmarks has a cell for every model of its
+-- domain, and a cell without a row reads as NULL. "scored_children" is a
+-- parent's number of such children, the denominator of its average.
+-- ********************************************************************************
+DROP MATERIALIZED VIEW IF EXISTS mv_scored_benchmarks CASCADE;
+CREATE MATERIALIZED VIEW mv_scored_benchmarks AS
+WITH scored AS (
+  SELECT DISTINCT c.ancestor_identifier AS benchmark_type_id
+  FROM mv_benchmark_closure c
+  JOIN mv_final_benchmark_context leaf ON leaf.benchmark_type_id = c.descendant_identifier
+  JOIN mv_leaf_status ls ON ls.benchmark_identifier = leaf.benchmark_type_id
+  WHERE ls.is_leaf
+    AND leaf.visible
+    AND leaf.benchmark_id IS NOT NULL
+)
+SELECT
+  sc.benchmark_type_id,
+  ls.is_leaf,
+  (
+    SELECT COUNT(*)
+    FROM mv_benchmark_closure c
+    JOIN scored child ON child.benchmark_type_id = c.descendant_identifier
+    WHERE c.ancestor_identifier = sc.benchmark_type_id
+      AND c.distance = 1
+  ) AS scored_children
+FROM scored sc
+JOIN mv_leaf_status ls ON ls.benchmark_identifier = sc.benchmark_type_id;
+CREATE UNIQUE INDEX mv_scored_benchmarks_benchmark_type_id_idx ON mv_scored_benchmarks (benchmark_type_id);
+
+
 -- ********************************************************************************
 --
 --  GATHER MODEL CONTEXT
 --
 -- ********************************************************************************
 
+-- ********************************************************************************
+-- The per-model layers below (mv_base_scores, mv_base_scores_fixed_engineering,
+-- mv_model_scores, mv_historical_versions, mv_model_scores_json,
+-- mv_final_model_context) are tables, not
+-- materialized views, so that the rows of a few models can be rewritten without
+-- rebuilding the whole chain (see "refresh_model_rows()" at the bottom). Each one
+-- keeps its historical name so readers are unchanged, and is filled from a plain
+-- view "v_<name without mv_>" holding its definition.
+-- Earlier versions of this file created them as materialized views; drop
+-- whichever kind exists.
+-- ********************************************************************************
+DO $$
+DECLARE
+  rel record;
+BEGIN
+  FOR rel IN
+    SELECT c.relname, c.relkind
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND c.relname IN ('mv_base_scores', 'mv_base_scores_fixed_engineering', 'mv_model_scores',
+                        'mv_historical_versions', 'mv_model_scores_json', 'mv_final_model_context')
+  LOOP
+    IF rel.relkind = 'm' THEN
+      EXECUTE format('DROP MATERIALIZED VIEW %I CASCADE', rel.relname);
+    ELSE
+      EXECUTE format('DROP TABLE %I CASCADE', rel.relname);
+    END IF;
+  END LOOP;
+END $$;
+
+-- "refresh_model_table()" rewrites the rows of "p_model_ids" in one of the tables
+-- above from its source view (every row when "p_model_ids" is NULL).
+-- TRUNCATE locks out readers until the refresh commits; "p_concurrently" deletes
+-- the rows instead, so readers keep seeing the previous rows meanwhile.
+DROP FUNCTION IF EXISTS refresh_model_table(regclass, regclass, integer[]);
+DROP FUNCTION IF EXISTS refresh_model_table(regclass, regclass, integer[], boolean);
+CREATE OR REPLACE FUNCTION refresh_model_table(target regclass, source regclass, p_model_ids integer[],
+                                               p_concurrently boolean DEFAULT false) RETURNS void AS $$
+DECLARE
+  started timestamptz := clock_timestamp();
+  written bigint;
+BEGIN
+  IF p_model_ids IS NULL AND p_concurrently THEN
+    EXECUTE format('DELETE FROM %s', target);
+    EXECUTE format('INSERT INTO %s SELECT * FROM %s', target, source);
+  ELSIF p_model_ids IS NULL THEN
+    EXECUTE format('TRUNCATE %s', target);
+    EXECUTE format('INSERT INTO %s SELECT * FROM %s', target, source);
+  ELSE
+    EXECUTE format('DELETE FROM %s WHERE model_id = ANY($1)', target) USING p_model_ids;
+    EXECUTE format('INSERT INTO %s SELECT * FROM %s WHERE model_id = ANY($1)', target, source) USING p_model_ids;
+  END IF;
+  GET DIAGNOSTICS written = ROW_COUNT;
+  PERFORM log_refresh_step(target::text, started, target, written);
+END;
+$$ LANGUAGE plpgsql;
+
 -- ********************************************************************************
 -- STEP A: Model Metadata (mv_model_data)
 -- Captures model rows + reference + submission + user info
@@ -320,30 +452,24 @@ SELECT
 FROM brainscore_model m
 LEFT JOIN brainscore_reference r ON m.reference_id = r.id
 LEFT JOIN brainscore_submission s ON m.submission_id = s.id;
+CREATE UNIQUE INDEX mv_model_data_model_id_idx ON mv_model_data (model_id);
 
 -- ********************************************************************************
 -- STEP B.0: Base Scores for Leaf Benchmarks (mv_base_scores)
--- For each model and each leaf benchmark instance, pick the "best" score if
--- multiple exist, preferring non-null & highest. This shouldn't be the case but
--- somehow certain model-benchmark scores have duplicates (NaN and then a valid score).
+-- For each model and each leaf benchmark instance it was scored on, pick the
+-- "best" score if multiple exist, preferring non-null & highest. This shouldn't
+-- be the case but somehow certain model-benchmark scores have duplicates (NaN and
+-- then a valid score).
 -- IMPORTANT: This is the foundation for aggregated scoring.
+-- Only scored (model, leaf) pairs get a row; a missing pair is a NULL score (see
+-- "mv_scored_benchmarks"). Filtering on model_id narrows the scan of
+-- brainscore_score, which is probed by (model_id, benchmark_id).
 -- ********************************************************************************
-DROP MATERIALIZED VIEW IF EXISTS mv_base_scores CASCADE;
-CREATE MATERIALIZED VIEW mv_base_scores AS
-WITH s_ranked AS (
-  SELECT
-    s.*,
-    ROW_NUMBER() OVER (
-      PARTITION BY s.model_id, s.benchmark_id
-      ORDER BY
-        (s.score_raw IS NOT NULL) DESC,  -- prioritize non-null score_raw
-        s.score_raw DESC NULLS LAST      -- highest score_raw if both non-null
-    ) AS rn
-  FROM brainscore_score s
-)
-SELECT
+DROP VIEW IF EXISTS v_base_scores CASCADE;
+CREATE VIEW v_base_scores AS
+SELECT DISTINCT ON (s.model_id, fbc.benchmark_id)
   s.id,
-  m.model_id,
+  s.model_id,
   fbc.benchmark_type_id,
   fbc.benchmark_id,
   fbc.version,
@@ -360,10 +486,8 @@ SELECT
   s.start_timestamp,
   s.end_timestamp,
   CASE WHEN s.score_raw IS NOT NULL THEN TRUE ELSE FALSE END AS is_complete
-FROM
-  -- All models
-  (SELECT DISTINCT model_id FROM mv_model_data) m
-CROSS JOIN
+FROM brainscore_score s
+JOIN
   -- All leaf benchmarks with valid benchmark_id (instances)
   (
     SELECT
@@ -379,10 +503,15 @@ CROSS JOIN
         WHERE is_leaf = TRUE
       )
   ) fbc
-LEFT JOIN s_ranked s
-  ON s.model_id = m.model_id
-  AND s.benchmark_id = fbc.benchmark_id
-  AND s.rn = 1;
+  ON fbc.benchmark_id = s.benchmark_id
+ORDER BY
+  s.model_id,
+  fbc.benchmark_id,
+  (s.score_raw IS NOT NULL) DESC,  -- prioritize non-null score_raw
+  s.score_raw DESC NULLS LAST;     -- highest score_raw if both non-null
+
+CREATE TABLE mv_base_scores AS SELECT * FROM v_base_scores WITH NO DATA;
+CREATE INDEX mv_base_scores_model_id_idx ON mv_base_scores (model_id);
 
 
 -- ********************************************************************************
@@ -391,8 +520,8 @@ LEFT JOIN s_ranked s
 -- the raw score for engineering tasks. Used heavily in final aggregation steps
 -- to treat engineering benchmarks differently.
 -- ********************************************************************************
-DROP MATERIALIZED VIEW IF EXISTS mv_base_scores_fixed_engineering CASCADE;
-CREATE MATERIALIZED VIEW mv_base_scores_fixed_engineering AS
+DROP VIEW IF EXISTS v_base_scores_fixed_engineering CASCADE;
+CREATE VIEW v_base_scores_fixed_engineering AS
 SELECT
   bs.id,
   bs.model_id,
@@ -415,12 +544,15 @@ FROM mv_base_scores bs
 JOIN mv_final_benchmark_context fbt
   ON bs.benchmark_type_id = fbt.benchmark_type_id;
 
+CREATE TABLE mv_base_scores_fixed_engineering AS SELECT * FROM v_base_scores_fixed_engineering WITH NO DATA;
+CREATE INDEX mv_base_scores_fixed_engineering_model_benchmark_idx
+  ON mv_base_scores_fixed_engineering (model_id, benchmark_id);
+
 
 -- ********************************************************************************
 -- STEP C: Aggregate Scores for all Benchmarks
 -- These aggregations steps create "final_agg_scores", a table (not MV).
 -- "populate_final_agg_scores()" calculates leaf and parent-level scores.
--- "fix_parent_scores()" further corrects parent scores if children are all NaN/NULL.
 -- ********************************************************************************
 -- "final_agg_scores" is a permanent table storing hierarchical aggregation.
 -- A table was necessary because functions cannot be used on MVs
@@ -441,18 +573,31 @@ CREATE TABLE final_agg_scores (
   end_timestamp     timestamp,
   is_leaf           boolean
 );
+CREATE INDEX final_agg_scores_model_id_idx ON final_agg_scores (model_id);
+CREATE INDEX final_agg_scores_benchmark_model_id_idx ON final_agg_scores (benchmark, model_id);
 
 -- This function populates "final_agg_scores" by first inserting
 -- all leaf scores, then iteratively rolling them up to parents
--- from the bottom-up. Called during the main refresh function.
+-- from the bottom-up, joining each parent to its children's rows through
+-- "mv_benchmark_closure". Called during the main refresh function.
+-- With "p_model_ids", only those models' rows are replaced.
+-- Only cells with a row are stored: a parent gets a row once one of its
+-- children has one, and averages over all its "scored_children", counting the
+-- missing ones as NULL (i.e. 0, like NaN) -- the same as when every model had a
+-- row, NULL or not, for every leaf.
 DROP FUNCTION IF EXISTS populate_final_agg_scores();
-CREATE OR REPLACE FUNCTION populate_final_agg_scores() RETURNS void AS $$
+DROP FUNCTION IF EXISTS populate_final_agg_scores(integer[]);
+CREATE OR REPLACE FUNCTION populate_final_agg_scores(p_model_ids integer[] DEFAULT NULL) RETURNS void AS $$
 DECLARE
   d integer;
   max_depth integer;
 BEGIN
-  -- Clear the table first
-  TRUNCATE final_agg_scores;
+  -- Clear the table (or the models' rows) first
+  IF p_model_ids IS NULL THEN
+    TRUNCATE final_agg_scores;
+  ELSE
+    DELETE FROM final_agg_scores WHERE model_id = ANY(p_model_ids);
+  END IF;
 
   -- Get max_depth, handle NULL case
   SELECT COALESCE(MAX(depth), 0) INTO max_depth FROM mv_benchmark_tree;
@@ -480,11 +625,17 @@ BEGIN
     JOIN mv_leaf_status ls ON t.identifier = ls.benchmark_identifier
     JOIN mv_base_scores_fixed_engineering bs ON bs.benchmark_type_id = t.identifier
     WHERE ls.is_leaf = TRUE
-    AND t.visible = TRUE;
+    AND t.visible = TRUE
+    AND (p_model_ids IS NULL OR bs.model_id = ANY(p_model_ids));
+
+    -- The table was just emptied; let the planner see the leaf rows.
+    IF p_model_ids IS NULL THEN
+      ANALYZE final_agg_scores;
+    END IF;
 
     -- Loop from max_depth-1 down to 0 (i.e., roll up scores to compute parents)
     FOR d IN REVERSE max_depth-1 .. 0 LOOP
-      INSERT INTO final_agg_scores (benchmark, model_id, score_raw, score_ceiled, depth, sort_path, start_timestamp, end_timestamp, is_leaf)
+      INSERT INTO final_agg_scores (benchmark, model_id, score_raw, score_ceiled, depth, sort_path, root_parent, start_timestamp, end_timestamp, is_leaf)
       SELECT
         p.identifier AS benchmark,
         s.model_id,
@@ -493,7 +644,7 @@ BEGIN
         CASE
           WHEN SUM(CASE WHEN s.score_raw IS NOT NULL AND s.score_raw = s.score_raw THEN 1 ELSE 0 END) > 0 THEN
             -- At least one numeric score
-            SUM(COALESCE(NULLIF(s.score_raw, 'NaN'::float8), 0)) / COUNT(*)::float8
+            SUM(COALESCE(NULLIF(s.score_raw, 'NaN'::float8), 0)) / sb.scored_children::float8
           WHEN SUM(CASE WHEN s.score_raw <> s.score_raw THEN 1 ELSE 0 END) > 0 THEN
             -- All scores are NaN or NULL, at least one is NaN
             'NaN'::float8
@@ -502,11 +653,15 @@ BEGIN
             NULL
         END AS score_raw,
 
-        -- Compute score_ceiled
+        -- Compute score_ceiled. Postgres treats NaN as equal to itself, so the
+        -- numeric test above counts NaN children as numbers (averaged as 0);
+        -- here a parent without any real-numbered child is NaN if some child is
+        -- NaN, and NULL if all are NULL, rather than 0. Children are final by
+        -- the time their parent's depth is aggregated, so this bubbles up.
         CASE
-          WHEN SUM(CASE WHEN s.score_ceiled IS NOT NULL AND s.score_ceiled = s.score_ceiled THEN 1 ELSE 0 END) > 0 THEN
-            SUM(COALESCE(NULLIF(s.score_ceiled, 'NaN'::float8), 0)) / COUNT(*)::float8
-          WHEN SUM(CASE WHEN s.score_ceiled <> s.score_ceiled THEN 1 ELSE 0 END) > 0 THEN
+          WHEN COUNT(*) FILTER (WHERE s.score_ceiled <> 'NaN') > 0 THEN
+            SUM(COALESCE(NULLIF(s.score_ceiled, 'NaN'::float8), 0)) / sb.scored_children::float8
+          WHEN COUNT(*) FILTER (WHERE s.score_ceiled = 'NaN') > 0 THEN
             'NaN'::float8
           ELSE
             NULL
@@ -514,114 +669,30 @@ BEGIN
 
         p.depth,
         p.sort_path,
+        p.root_parent,
         -- For parent nodes, use earliest start_timestamp and latest end_timestamp from children
         MIN(s.start_timestamp) AS start_timestamp,
         MAX(s.end_timestamp) AS end_timestamp,
         FALSE -- sets parent nodes to is_leaf = false
-      FROM mv_benchmark_tree p
-      JOIN mv_benchmark_children bc ON p.identifier = bc.parent_id
+      FROM mv_benchmark_closure c
+      JOIN mv_benchmark_tree p ON p.identifier = c.ancestor_identifier
+      JOIN mv_scored_benchmarks sb ON sb.benchmark_type_id = p.identifier
       -- For each parent, join to its direct children's scores.
-      JOIN final_agg_scores s
-        ON s.benchmark = ANY (
-             SELECT jsonb_array_elements_text(bc.children)
-           ) AND s.model_id = s.model_id  -- Keep same model_id
-      WHERE p.depth = d
-      GROUP BY p.identifier, s.model_id, p.depth, p.sort_path;
+      JOIN final_agg_scores s ON s.benchmark = c.descendant_identifier
+      WHERE c.ancestor_depth = d
+        AND c.distance = 1
+        AND (p_model_ids IS NULL OR s.model_id = ANY(p_model_ids))
+      GROUP BY p.identifier, s.model_id, p.depth, p.sort_path, p.root_parent, sb.scored_children;
     END LOOP;
-
-    -- Update root parent
-    UPDATE final_agg_scores f
-    SET root_parent = (
-      SELECT t0.identifier
-      FROM mv_benchmark_tree t0
-      WHERE t0.depth = 0
-        AND f.sort_path LIKE t0.sort_path || '%'
-      LIMIT 1
-    )
-    WHERE f.root_parent IS NULL;
   END IF;
 END;
 $$ LANGUAGE plpgsql;
 
--- "fix_parent_scores()" adjusts parent nodes if child scores
--- are all NaN or missing.
--- This function was necessary as a workaround for parents being set
--- as 0.000 during the populate_final_agg_scores() step.
--- Called after "populate_final_agg_scores()".
+-- "fix_parent_scores()" used to correct parents set to 0 from NaN/NULL children
+-- after the fact; "populate_final_agg_scores()" now computes them directly.
 DROP FUNCTION IF EXISTS fix_parent_scores();
-CREATE OR REPLACE FUNCTION fix_parent_scores() RETURNS void AS $$
-DECLARE
-  max_depth INT;
-  current_depth INT;
-BEGIN
-
-  /*
-    We first find the maximum depth in final_agg_scores.
-    Then we iterate from that maximum depth up to 1.
-    In each iteration, we build an "intermediate_parent_stats" table
-    for the parent rows at depth = current_depth - 1 based on child rows
-    at depth = current_depth. Then we update the parent scores for that level.
-    This way, we bubble up the correct scores one level at a time
-    until we reach the root(s).
-    SUGGESTION: It is likely that we can combine this function with populate_final_agg_scores()
-    to reduce the number of steps.
-  */
-  SELECT MAX(depth) INTO max_depth
-  FROM final_agg_scores;
-
-  FOR current_depth IN REVERSE max_depth..1 LOOP
-
-    -- Drop existing intermediate table.
-    DROP TABLE IF EXISTS intermediate_parent_stats;
-    -- Create an intermediate table of parent statistics.
-    -- SUGGESTION: Could use truncate instead like in populate_final_agg_scores()
-    -- Just need to create tables appropriately above
-    CREATE TABLE intermediate_parent_stats AS
-    WITH parent_stats AS (
-      SELECT
-        p.benchmark AS parent_benchmark,
-        p.model_id,
-        TRIM(p.sort_path) AS parent_sort_path,
-        COUNT(*) FILTER (WHERE c.score_ceiled IS NULL) AS count_null,
-        COUNT(*) FILTER (WHERE c.score_ceiled IS NOT NULL
-                            AND c.score_ceiled::text ILIKE 'nan') AS count_nan,
-        COUNT(*) FILTER (WHERE c.score_ceiled IS NOT NULL
-                            AND c.score_ceiled::text NOT ILIKE 'nan') AS count_numeric
-      FROM final_agg_scores p
-      JOIN final_agg_scores c
-        ON c.model_id = p.model_id
-        -- Compare exactly one level up for each pass:
-        AND c.depth = current_depth
-        AND p.depth = current_depth - 1
-        AND TRIM(c.sort_path) LIKE TRIM(p.sort_path) || '-%'
-      GROUP BY p.benchmark, p.model_id, TRIM(p.sort_path)
-    )
-    SELECT * FROM parent_stats;
-
-    -- Use the intermediate stats to update parent's score_ceiled.
-    -- Set as Null or NaN appropriately for different use cases.
-    -- If all children are NULL, set parent to NULL.
-    -- If there no valid children scores, but parent was set to 0, change it to NaN.
-    -- If all children are NaN, set parent to NaN.
-    -- If some children are NULL and others are NaN, set parent to NaN.
-    UPDATE final_agg_scores p
-    SET score_ceiled = CASE
-        WHEN ips.count_numeric = 0 AND ips.count_nan = 0 THEN NULL
-        WHEN ips.count_numeric = 0 AND p.score_ceiled = 0 THEN 'NaN'::numeric
-        WHEN ips.count_numeric = 0 AND ips.count_nan > 0 THEN 'NaN'::numeric
-        ELSE p.score_ceiled
-      END
-    FROM intermediate_parent_stats ips
-    WHERE p.benchmark = ips.parent_benchmark
-      AND p.model_id = ips.model_id
-      AND TRIM(p.sort_path) = ips.parent_sort_path
-      AND p.score_ceiled = 0.0
-      AND p.is_leaf = false;
-
-  END LOOP;
-
-END;
-$$ LANGUAGE plpgsql;
+DROP FUNCTION IF EXISTS fix_parent_scores(integer[]);
+DROP TABLE IF EXISTS intermediate_parent_stats;
 
 
 -- ********************************************************************************
@@ -635,8 +706,8 @@ $$ LANGUAGE plpgsql;
 -- Currently, excludes post-metadata-tagging-system metadata.
 -- Tbh, it should probably be included.
 -- ********************************************************************************
-DROP MATERIALIZED VIEW IF EXISTS mv_model_scores CASCADE;
-CREATE MATERIALIZED VIEW mv_model_scores AS
+DROP VIEW IF EXISTS v_model_scores CASCADE;
+CREATE VIEW v_model_scores AS
 SELECT
   fbc.benchmark_id,
   fbc.identifier AS benchmark_id_version,  -- Include the full identifier with version
@@ -689,6 +760,9 @@ JOIN brainscore_model m
 LEFT JOIN brainscore_submission s
   ON s.id = m.submission_id;
 
+CREATE TABLE mv_model_scores AS SELECT * FROM v_model_scores WITH NO DATA;
+CREATE INDEX mv_model_scores_model_id_idx ON mv_model_scores (model_id);
+
 
 
 -- ********************************************************************************
@@ -705,15 +779,18 @@ WITH constants AS (
     SELECT 'engineering'::text AS engineering_root
 ),
 
+-- Every scored benchmark, including those no model has a row for yet
 benchmarks AS (
-    SELECT DISTINCT
-        ms.benchmark_id_version,
-        CONCAT(ms.benchmark_identifier, '_v', ms.version, '_v', ms.version) AS bench_id,
-        ms.benchmark_identifier,
-        ms.version,
-        ms.root_parent
+    SELECT
+        fbc.identifier AS benchmark_id_version,
+        CONCAT(fbc.benchmark_type_id, '_v', fbc.version, '_v', fbc.version) AS bench_id,
+        fbc.benchmark_type_id AS benchmark_identifier,
+        fbc.version,
+        fbc.root_parent
     FROM
-        mv_model_scores ms
+        mv_scored_benchmarks sb
+    JOIN
+        mv_final_benchmark_context fbc ON fbc.benchmark_type_id = sb.benchmark_type_id
 ),
 
 valid_scores AS (
@@ -771,109 +848,23 @@ LEFT JOIN
     minmax_scores mm ON mm.bench_id = b.bench_id
 CROSS JOIN
     constants;
+CREATE UNIQUE INDEX mv_benchmark_minmax_benchmark_identifier_idx ON mv_benchmark_minmax (benchmark_identifier);
 
--- Helper function for coloring cells based on normalized score.
--- Referenced in "mv_model_scores_enriched".
--- Renders a gradient from red-to-green, or gray if engineering.
--- Attempts to replicate the behavior of the original Django function.
-CREATE OR REPLACE FUNCTION representative_color_sql_precomputed(
-    value FLOAT,
-    min_value FLOAT,
-    max_value FLOAT,
-    root_parent TEXT
-) RETURNS TEXT AS $$
-DECLARE
-    normalized_value FLOAT;
-    idx INTEGER;
-    color_hex TEXT;
-    redgreen_colors TEXT[];
-    gray_colors TEXT[];
-    -- Variables for extracting RGB values:
-    fallback_R INTEGER;
-    fallback_G INTEGER;
-    fallback_B INTEGER;
-    R FLOAT;
-    G FLOAT;
-    B FLOAT;
-    alpha FLOAT;
-    slope FLOAT;
-    intercept FLOAT;
-    fallback_color TEXT;
-    rgba_color TEXT;
-    color_None TEXT := '#e0e1e2';
-    gamma FLOAT := 0.5;  -- Gamma value to stretch high-end differences.
-BEGIN
-    -- Return a neutral (light grey) color if value is NULL or NaN.
-    IF value IS NULL OR value::text ILIKE 'nan' THEN
-        RETURN 'background-color: ' || color_None || ';';
-    END IF;
-
-    -- Normalize the input value between 0 and 1.
-    IF max_value - min_value = 0 THEN
-        normalized_value := 0.5;
-    ELSE
-        normalized_value := (value - min_value) / (max_value - min_value);
-    END IF;
-    normalized_value := GREATEST(LEAST(normalized_value, 1), 0);
-
-    -- Apply gamma correction to emphasize differences at the top-end.
-    normalized_value := POWER(normalized_value, 1.0/gamma);
-
-    -- Optionally scale down the normalized value.
-    normalized_value := 0.8 * normalized_value;
-    normalized_value := GREATEST(LEAST(normalized_value, 1), 0);
-
-    idx := FLOOR(100 * normalized_value)::INTEGER;
-    IF idx > 100 THEN
-        idx := 100;
-    END IF;
-
-    -- Precomputed color arrays generated from your Python code.
-    redgreen_colors := ARRAY[
-        '#ff0000', '#ff0000', '#ff0000', '#ff0000', '#fe0600', '#fe0600', '#fd0d01', '#fd0d01', '#fc1301', '#fb1901', '#fb1901', '#fa1f02', '#f92502', '#f92502', '#f82b02', '#f73103', '#f73103', '#f63703', '#f53d03', '#f44204', '#f44204', '#f44804', '#f34d04', '#f25305', '#f15805', '#f15805', '#f05e05', '#ef6306', '#ee6806', '#ed6e06', '#ec7307', '#eb7807', '#ea7d07', '#e98208', '#e88708', '#e88708', '#e78c08', '#e69109', '#e69509', '#e59a09', '#e49f0a', '#e3a30a', '#e2a80a', '#e1ac0a', '#e0b10b', '#dfb50b', '#deb90b', '#ddbe0c', '#dcc20c', '#dcc60c', '#dbca0d', '#d9d20d', '#d8d60d', '#d4d70e', '#cfd60e', '#c9d50e', '#c4d40f', '#bed40f', '#b9d30f', '#b4d20f', '#aed110', '#a4cf10', '#9fce10', '#9acd11', '#95cc11', '#90cc11', '#8bcb11', '#86ca12', '#7dc812', '#78c712', '#74c613', '#6fc613', '#6ac513', '#66c413', '#5dc214', '#59c114', '#55c014', '#51c015', '#48be15', '#44bd15', '#40bc16', '#3cbb16', '#38bb16', '#31b917', '#2db817', '#29b717', '#26b617', '#1eb518', '#1bb418', '#18b319', '#18b21c', '#19b124', '#19b028', '#19af2b', '#19ad32', '#1aad36', '#1aac39', '#1aaa40', '#1aa943', '#1ba947', '#1ba84a'
-    ];
-    gray_colors := ARRAY[
-        '#f2f2f2', '#f2f2f2', '#f2f2f2', '#f2f2f2', '#f0f0f0', '#f0f0f0', '#eeeeee', '#eeeeee', '#ededed', '#ebebeb', '#ebebeb', '#e9e9e9', '#e7e7e7', '#e7e7e7', '#e6e6e6', '#e4e4e4', '#e4e4e4', '#e2e2e2', '#e0e0e0', '#dedede', '#dedede', '#dddddd', '#dbdbdb', '#d9d9d9', '#d7d7d7', '#d7d7d7', '#d6d6d6', '#d4d4d4', '#d2d2d2', '#d0d0d0', '#cecece', '#cdcdcd', '#cbcbcb', '#c9c9c9', '#c7c7c7', '#c7c7c7', '#c5c5c5', '#c4c4c4', '#c2c2c2', '#c0c0c0', '#bebebe', '#bdbdbd', '#bbbbbb', '#b9b9b9', '#b7b7b7', '#b5b5b5', '#b4b4b4', '#b2b2b2', '#b0b0b0', '#aeaeae', '#adadad', '#a9a9a9', '#a7a7a7', '#a5a5a5', '#a4a4a4', '#a2a2a2', '#a0a0a0', '#9e9e9e', '#9d9d9d', '#9b9b9b', '#999999', '#959595', '#949494', '#929292', '#909090', '#8e8e8e', '#8d8d8d', '#8b8b8b', '#878787', '#858585', '#848484', '#828282', '#808080', '#7e7e7e', '#7b7b7b', '#797979', '#777777', '#757575', '#727272', '#707070', '#6e6e6e', '#6c6c6c', '#6b6b6b', '#676767', '#656565', '#646464', '#626262', '#5e5e5e', '#5c5c5c', '#5b5b5b', '#595959', '#555555', '#545454', '#525252', '#4e4e4e', '#4c4c4c', '#4b4b4b', '#474747', '#454545', '#444444', '#424242'
-    ];
-
-    IF root_parent ILIKE '%engineering%' THEN
-        color_hex := gray_colors[idx+1];  -- PostgreSQL arrays are 1-indexed.
-    ELSE
-        color_hex := redgreen_colors[idx+1];
-    END IF;
-
-    R := ('x' || substring(color_hex from 2 for 2))::bit(8)::int;
-    G := ('x' || substring(color_hex from 4 for 2))::bit(8)::int;
-    B := ('x' || substring(color_hex from 6 for 2))::bit(8)::int;
-
-    IF max_value - min_value = 0 THEN
-        alpha := 1.0;
-    ELSE
-        slope := -0.9 / (min_value - max_value);
-        intercept := 0.1 - slope * min_value;
-        alpha := slope * value + intercept;
-    END IF;
-    alpha := GREATEST(LEAST(alpha, 1), 0);
-
-    fallback_R := ROUND(R);
-    fallback_G := ROUND(G);
-    fallback_B := ROUND(B);
-
-    fallback_color := 'rgb(' || fallback_R || ', ' || fallback_G || ', ' || fallback_B || ')';
-    rgba_color := 'rgba(' || R || ', ' || G || ', ' || B || ', ' || alpha || ')';
-
-    RETURN 'background-color: ' || fallback_color || '; background-color: ' || rgba_color || ';';
-END;
-$$ LANGUAGE plpgsql IMMUTABLE;
+-- Cell colors are no longer computed in the database: the leaderboard colors client-side
+-- (color-utils.js) and the Django views use the lookup tables in benchmarks/views/palette.py.
+-- CASCADE: older definitions of "mv_model_scores_enriched" reference the function (recreated below).
+DROP FUNCTION IF EXISTS representative_color_sql_precomputed(FLOAT, FLOAT, FLOAT, TEXT) CASCADE;
 
 
 -- ********************************************************************************
 -- STEP F: "mv_model_scores_enriched"
 -- This merges "mv_model_scores" with "mv_benchmark_minmax" to
--- provide coloring, min/max, and computed aggregation score.
+-- provide min/max and computed aggregation score.
 -- This materialized view is the closest thing to the CSV download format however
 -- with much more metadata.
--- Used by "mv_model_scores_json" for final JSON assembly.
+-- Its median/best/rank columns are domain-wide statistics, so it is only rebuilt
+-- by the full refresh; nothing downstream reads it. Like "mv_model_scores", it
+-- has no rows for cells a model has no score under.
 -- ********************************************************************************
 DROP MATERIALIZED VIEW IF EXISTS mv_model_scores_enriched CASCADE;
 CREATE MATERIALIZED VIEW mv_model_scores_enriched AS
@@ -986,14 +977,9 @@ SELECT
   b.model_owner,
   COALESCE(mmx.min_score, 0) AS min_score,
   COALESCE(mmx.max_score, 1) AS max_score,
-  representative_color_sql_precomputed(
-    b.computed_score::float,
-    COALESCE(mmx.min_score, 0)::float,
-    COALESCE(mmx.max_score, 1)::float,
-    b.root_parent
-  ) AS color,
-  s.median_score,
-  s.best_score,
+  -- No public row at all reads as public NULL rows: no valid numbers.
+  COALESCE(s.median_score, 'NaN'::numeric) AS median_score,
+  COALESCE(s.best_score, 'NaN'::numeric) AS best_score,
   r.benchmark_rank
 FROM base b
 LEFT JOIN mv_benchmark_minmax mmx
@@ -1009,47 +995,131 @@ LEFT JOIN ranked r
 
 
 
+-- ********************************************************************************
+-- STEP F.1: Scores on Older Benchmark Versions (mv_historical_versions)
+-- For the wayback machine: each model's score on every version of a scored leaf
+-- older than its current version, with the period that version was current.
+-- Duplicate scores on a version are resolved like in "mv_base_scores".
+-- Built once here and joined into the JSON below, instead of being looked up
+-- for every cell.
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_historical_versions CASCADE;
+CREATE VIEW v_historical_versions AS
+SELECT DISTINCT ON (hs.model_id, hv.id)
+  hs.model_id,
+  hv.benchmark_type_id,
+  hv.version,
+  CASE
+    WHEN fbc.root_parent ILIKE '%engineering%' THEN hs.score_raw
+    ELSE hs.score_ceiled
+  END AS value,
+  hs.score_raw,
+  hs.end_timestamp,
+  hvt.valid_from AS version_valid_from,
+  hvt.valid_to AS version_valid_to
+FROM brainscore_score hs
+JOIN brainscore_benchmarkinstance hv
+  ON hv.id = hs.benchmark_id
+JOIN mv_final_benchmark_context fbc
+  ON fbc.benchmark_type_id = hv.benchmark_type_id
+JOIN mv_scored_benchmarks sb
+  ON sb.benchmark_type_id = fbc.benchmark_type_id
+ AND sb.is_leaf
+JOIN mv_version_timeline hvt
+  ON hvt.instance_id = hv.id
+WHERE hv.version < fbc.version
+ORDER BY
+  hs.model_id,
+  hv.id,
+  (hs.score_raw IS NOT NULL) DESC,
+  hs.score_raw DESC NULLS LAST;
+
+CREATE TABLE mv_historical_versions AS SELECT * FROM v_historical_versions WITH NO DATA;
+ALTER TABLE mv_historical_versions ADD PRIMARY KEY (model_id, benchmark_type_id, version);
+
+
 -- ********************************************************************************
 -- STEP G: Assemble JSON in _get_models()-like return.
 -- _get_models() was the original function that was used in Django.
 -- "mv_model_scores_json" compiles everything for each model into a JSON object,
 -- used as the final scoreboard output. Specifically, each model will have a JSON
 -- object with ALL scores for ALL benchmarks, alongside all metadata will provided above
+-- Reads "mv_model_scores" rather than "mv_model_scores_enriched": none of the
+-- domain-wide statistics that "mv_model_scores_enriched" adds end up in the JSON,
+-- and reading the per-model table keeps a per-model refresh per-model.
+-- The JSON keeps one entry per scored benchmark of the model's domain (templates
+-- and the leaderboard line scores up with benchmarks): cells the model has no
+-- row for are rendered from the benchmark alone, with NULL score values.
 -- ********************************************************************************
-DROP MATERIALIZED VIEW IF EXISTS mv_model_scores_json CASCADE;
-CREATE MATERIALIZED VIEW mv_model_scores_json AS
-WITH score_with_value AS (
+DROP VIEW IF EXISTS v_model_scores_json CASCADE;
+CREATE VIEW v_model_scores_json AS
+WITH historical AS (
+    SELECT
+        h.model_id,
+        h.benchmark_type_id,
+        jsonb_object_agg(
+            h.version::text,
+            jsonb_build_object(
+                'value', h.value,
+                'score_raw', h.score_raw,
+                'timestamp', h.end_timestamp,
+                'version', h.version,
+                'version_valid_from', h.version_valid_from,
+                'version_valid_to', h.version_valid_to
+            )
+        ) AS versions
+    FROM mv_historical_versions h
+    GROUP BY h.model_id, h.benchmark_type_id
+),
+score_with_value AS (
     SELECT
-        ms.*,
+        m.id AS model_id,
+        fbc.benchmark_type_id AS benchmark_identifier,
+        fbc.version,
+        fbc.overall_order,
+        fbc.root_parent,
+        sb.is_leaf,
+        ms.error,
+        ms.end_timestamp,
         b.score_raw AS base_score_raw,
         b.score_ceiled AS base_score_ceiled,
         CASE
-            WHEN ms.is_leaf AND ms.root_parent ILIKE '%engineering%' THEN b.score_raw
-            WHEN ms.is_leaf THEN b.score_ceiled
+            WHEN sb.is_leaf AND fbc.root_parent ILIKE '%engineering%' THEN b.score_raw
+            WHEN sb.is_leaf THEN b.score_ceiled
             ELSE ms.score_ceiled
         END AS score_ceiled_value,
         CASE
-            WHEN ms.is_leaf THEN b.score_raw
+            WHEN sb.is_leaf THEN b.score_raw
             ELSE ms.score_raw
         END AS score_raw_value,
         to_jsonb(bm) AS meta,
         -- Version timeline data for wayback machine
         vt.valid_from AS version_valid_from,
         vt.valid_to AS version_valid_to,
-        vt.is_current AS version_is_current
-    FROM mv_model_scores_enriched ms
+        vt.is_current AS version_is_current,
+        hist.versions AS historical_versions
+    FROM brainscore_model m
+    -- SUGGESTION: The domain match isn't necessary however is a catch if we have overlapping identifiers between domains.
+    JOIN mv_final_benchmark_context fbc
+           ON fbc.domain = m.domain
+    JOIN mv_scored_benchmarks sb
+           ON sb.benchmark_type_id = fbc.benchmark_type_id
+    LEFT JOIN mv_model_scores ms
+           ON ms.model_id = m.id
+          AND ms.benchmark_identifier = fbc.benchmark_type_id
     LEFT JOIN mv_base_scores_fixed_engineering b
-           ON b.benchmark_id = ms.benchmark_id
-          AND b.model_id     = ms.model_id
+           ON b.benchmark_id = fbc.benchmark_id
+          AND b.model_id     = m.id
     LEFT JOIN brainscore_benchmarkmeta bm
-           ON bm.id = ms.meta_id
+           ON bm.id = fbc.meta_id
     -- Join version timeline for leaf benchmarks (parents don't have versions)
     LEFT JOIN mv_version_timeline vt
-           ON vt.benchmark_type_id = ms.benchmark_identifier
-          AND vt.version = ms.version
-          AND ms.is_leaf = TRUE
-    -- SUGGESTION: This isn't necessary however is a catch if we have overlapping identifiers between domains.
-    WHERE ms.benchmark_domain = ms.model_domain
+           ON vt.benchmark_type_id = fbc.benchmark_type_id
+          AND vt.version = fbc.version
+          AND sb.is_leaf = TRUE
+    LEFT JOIN historical hist
+           ON hist.model_id = m.id
+          AND hist.benchmark_type_id = fbc.benchmark_type_id
 ),
 -- This determines the JSON structure for how scoring is organized for each model.
 -- Was used to replicate ScoreDisplay namedTuple that was originally used by _get_context but provides
@@ -1082,34 +1152,14 @@ score_json AS (
                 -- Wayback machine: version timeline data (from wayback branch)
                 'version_valid_from', version_valid_from,
                 'version_valid_to', version_valid_to,
-                'version_is_current', version_is_current,
-                -- Wayback machine: historical versions (scores from older benchmark versions)
-                'historical_versions', (
-                    SELECT jsonb_object_agg(
-                        hv.version::text,
-                        jsonb_build_object(
-                            'value', CASE
-                                WHEN swv.root_parent ILIKE '%engineering%' THEN hs.score_raw
-                                ELSE hs.score_ceiled
-                            END,
-                            'score_raw', hs.score_raw,
-                            'timestamp', hs.end_timestamp,
-                            'version', hv.version,
-                            'version_valid_from', hvt.valid_from,
-                            'version_valid_to', hvt.valid_to
-                        )
-                    )
-                    FROM brainscore_benchmarkinstance hv
-                    JOIN brainscore_score hs
-                        ON hs.benchmark_id = hv.id
-                        AND hs.model_id = swv.model_id
-                    JOIN mv_version_timeline hvt
-                        ON hvt.instance_id = hv.id
-                    WHERE hv.benchmark_type_id = swv.benchmark_identifier
-                        AND hv.version < swv.version
-                        AND swv.is_leaf = TRUE
-                )
+                'version_is_current', version_is_current
             )
+            -- Wayback machine: scores from older benchmark versions, only on cells
+            -- that have any (readers treat a missing key as none)
+            || CASE
+                 WHEN historical_versions IS NULL THEN '{}'::jsonb
+                 ELSE jsonb_build_object('historical_versions', historical_versions)
+               END
             ORDER BY overall_order
         ) AS scores
     FROM score_with_value swv
@@ -1120,14 +1170,54 @@ SELECT
     scores
 FROM score_json;
 
+CREATE TABLE mv_model_scores_json AS SELECT * FROM v_model_scores_json WITH NO DATA;
+ALTER TABLE mv_model_scores_json ADD PRIMARY KEY (model_id);
+
+
+
+-- ********************************************************************************
+-- STEP H.0: Rank models within their domain
+-- Ranking models based on "average_<domain>" benchmarks if they are public.
+-- SUGGESTION:This is currently not used in the Django index.py as private leaderboards
+-- necessitate re-ranking. If re-ranking is not needed, this would have
+-- sped up the leaderboard view by a couple hundred milliseconds. Consider still keeping
+-- this to quickly see top models per domain from within the database.
+-- A view of its own because a per-model refresh re-ranks the other models of
+-- the domain as well (see "refresh_model_rows()").
+-- Public models without an average row rank last, as a NULL average.
+-- ********************************************************************************
+DROP VIEW IF EXISTS v_model_domain_ranks CASCADE;
+CREATE VIEW v_model_domain_ranks AS
+SELECT
+  m.id AS model_id,
+  m.domain AS model_domain,
+  ms.comment,
+  RANK() OVER (
+    PARTITION BY m.domain
+    ORDER BY
+      CASE
+        WHEN ms.score_ceiled IS NOT NULL AND ms.score_ceiled::text NOT ILIKE 'nan' THEN 0
+        WHEN ms.score_ceiled IS NOT NULL AND ms.score_ceiled::text ILIKE 'nan' THEN 1
+        WHEN ms.score_ceiled IS NULL THEN 2
+      END ASC,
+      ms.score_ceiled DESC
+  ) AS rank
+FROM brainscore_model m
+JOIN mv_scored_benchmarks sb
+  ON sb.benchmark_type_id = 'average_' || m.domain
+LEFT JOIN mv_model_scores ms
+  ON ms.model_id = m.id
+ AND ms.benchmark_identifier = sb.benchmark_type_id
+WHERE m.public = TRUE;  -- Only rank public models
 
+CREATE INDEX mv_model_scores_benchmark_model_idx ON mv_model_scores (benchmark_identifier, model_id);
 
 -- ********************************************************************************
 -- STEP H: Join per-model score JSON with model metadata
 -- "mv_final_model_context" is the final state used by the leaderboard/card views
 -- ********************************************************************************
-DROP MATERIALIZED VIEW IF EXISTS mv_final_model_context CASCADE;
-CREATE MATERIALIZED VIEW mv_final_model_context AS
+DROP VIEW IF EXISTS v_final_model_context CASCADE;
+CREATE VIEW v_final_model_context AS
 WITH
   -- SUGGESTION: This is a bit of a mess. Consider refactoring.
   -- These CTEs for the model_meta and submission_meta do not provide
@@ -1154,30 +1244,6 @@ WITH
       s.jenkins_id
     FROM brainscore_submission s
   ),
-  -- Ranking models based on "average_<domain>" benchmarks if they are public.
-  -- SUGGESTION:This is currently not used in the Django index.py as private leaderboards
-  -- necessitate re-ranking. If re-ranking is not needed, this would have
-  -- sped up the leaderboard view by a couple hundred milliseconds. Consider still keeping
-  -- this to quickly see top models per domain from within the database.
-  model_ranks AS (
-      SELECT
-        ms.model_id,
-        ms.model_domain,
-        ms.comment,
-        RANK() OVER (
-          PARTITION BY ms.model_domain
-          ORDER BY
-            CASE
-              WHEN ms.score_ceiled IS NOT NULL AND ms.score_ceiled::text NOT ILIKE 'nan' THEN 0
-              WHEN ms.score_ceiled IS NOT NULL AND ms.score_ceiled::text ILIKE 'nan' THEN 1
-              WHEN ms.score_ceiled IS NULL THEN 2
-            END ASC,
-            ms.score_ceiled DESC
-        ) AS rank
-      FROM mv_model_scores_enriched ms
-      WHERE ms.benchmark_identifier = 'average_' || ms.model_domain
-        AND ms.public = TRUE  -- Only rank public models
-    ),
   reference_meta AS (
     SELECT
       r.id AS reference_id,
@@ -1186,94 +1252,6 @@ WITH
       r.url,
       r.bibtex
     FROM brainscore_reference r
-  ),
-
-  -- Hacky CTEs for layers extraction, processing and storing into JSONB.
-  -- Necessary because layer information is stored in a piece-wise manner in
-  -- the brainscore_score.comment field. Could be cleaned up.
-  -- SUGGESTION: This orders the layers in alphabetical order. In Django, we
-  -- reorder the layers based on V1>V2>V4>IT. Consider adding it to this step
-  -- and removing it from Django.
-  layer_comments AS (
-    SELECT
-      ms.model_id,
-      ms.overall_order,
-      -- Extract and clean the layers data from the comment
-      REPLACE(SUBSTRING(ms.comment FROM LENGTH('layers: ') + 1), '''', '"') AS layers_json_str
-    FROM
-      mv_model_scores_enriched ms
-    WHERE
-      ms.comment IS NOT NULL AND ms.comment LIKE 'layers: %'
-  ),
-  layer_comments_parsed AS (
-    SELECT
-      model_id,
-      overall_order,
-      layers_json_str,
-      -- Parse the layers_json_str into JSONB
-      CASE
-        WHEN layers_json_str IS NOT NULL THEN layers_json_str::jsonb
-        ELSE NULL
-      END AS layers_jsonb
-    FROM
-      layer_comments
-    WHERE
-      layers_json_str IS NOT NULL
-  ),
-  layer_keys AS (
-    SELECT
-      lc.model_id,
-      lc.overall_order,
-      kv.key AS region,
-      kv.value AS layer
-    FROM
-      layer_comments_parsed lc,
-      jsonb_each_text(lc.layers_jsonb) AS kv(key, value)
-  ),
-  layer_keys_ordered AS (
-    SELECT
-      lk.model_id,
-      lk.region,
-      lk.layer,
-      ROW_NUMBER() OVER (PARTITION BY lk.model_id, lk.region ORDER BY lk.overall_order DESC) AS rn
-    FROM
-      layer_keys lk
-  ),
-  merged_layers AS (
-    SELECT
-      model_id,
-      region,
-      layer
-    FROM
-      layer_keys_ordered
-    WHERE
-      rn = 1
-  ),
-  region_order AS (
-    SELECT
-      identifier AS region,
-      "order" AS region_order  -- "order" is a reserved SQL keyword, so use quotes to specify it is a column name
-    FROM brainscore_benchmarktype
-  ),
-  ordered_layers AS (
-    SELECT
-      ml.model_id,
-      ml.region,
-      ml.layer,
-      COALESCE(ro.region_order, 0) AS region_order
-    FROM
-      merged_layers ml
-    LEFT JOIN
-      region_order ro ON ml.region = ro.region
-  ),
-  final_layers AS (
-    SELECT
-      model_id,
-      jsonb_object_agg(region, layer ORDER BY region_order) AS layers
-    FROM
-      ordered_layers
-    GROUP BY
-      model_id
   )
 
 SELECT
@@ -1290,7 +1268,7 @@ SELECT
   mm.competition,
   mm.domain,
   mm.visual_degrees,
-  fl.layers,  -- Include layers from 'final_layers'
+  fl.layers,  -- Include layers from the per-model lookup below
   mr.rank,
   sc.scores,
   sm.build_status,
@@ -1321,10 +1299,36 @@ FROM model_meta mm
 LEFT JOIN brainscore_user u ON mm.owner_id = u.id
 LEFT JOIN submission_meta sm ON mm.submission_id = sm.submission_id
 LEFT JOIN brainscore_user u2 ON sm.submitter_id = u2.id
-LEFT JOIN model_ranks mr ON mm.id = mr.model_id
+LEFT JOIN v_model_domain_ranks mr ON mm.id = mr.model_id
 LEFT JOIN mv_model_scores_json sc ON mm.id = sc.model_id
 LEFT JOIN reference_meta rm ON mm.reference_id = rm.reference_id
-LEFT JOIN final_layers fl ON mm.id = fl.model_id
+-- Hacky layers extraction, processing and storing into JSONB.
+-- Necessary because layer information is stored in a piece-wise manner in
+-- the brainscore_score.comment field. Could be cleaned up.
+-- For each region, the layer of the benchmark latest in the overall order wins.
+-- Looked up per model (LATERAL), so refreshing a few models only parses their comments.
+-- SUGGESTION: This orders the layers in alphabetical order. In Django, we
+-- reorder the layers based on V1>V2>V4>IT. Consider adding it to this step
+-- and removing it from Django.
+LEFT JOIN LATERAL (
+  SELECT
+    jsonb_object_agg(ml.region, ml.layer ORDER BY COALESCE(ro."order", 0)) AS layers
+  FROM (
+    SELECT DISTINCT ON (kv.key)
+      kv.key AS region,
+      kv.value AS layer
+    FROM mv_model_scores ms,
+         -- Extract and clean the layers data from the comment, then parse it into JSONB
+         jsonb_each_text(
+           REPLACE(SUBSTRING(ms.comment FROM LENGTH('layers: ') + 1), '''', '"')::jsonb
+         ) AS kv(key, value)
+    WHERE ms.model_id = mm.id
+      AND ms.comment IS NOT NULL AND ms.comment LIKE 'layers: %'
+    ORDER BY kv.key, ms.overall_order DESC
+  ) ml
+  -- "order" is a reserved SQL keyword, so use quotes to specify it is a column name
+  LEFT JOIN brainscore_benchmarktype ro ON ml.region = ro.identifier
+) fl ON TRUE
 LEFT JOIN brainscore_modelmeta mm2 ON mm.id = mm2.model_id
 WHERE
   -- Remove models with no valid scores (to be consistent with legacy implementation)
@@ -1337,6 +1341,9 @@ WHERE
       AND (score->>'score_ceiled') <> 'X'
   );
 
+CREATE TABLE mv_final_model_context AS SELECT * FROM v_final_model_context WITH NO DATA;
+ALTER TABLE mv_final_model_context ADD PRIMARY KEY (model_id);
+
 
 
 --------------------------------------------------------------------------
@@ -1349,42 +1356,445 @@ WHERE
 --------------------------------------------------------------------------
 --------------------------------------------------------------------------
 
+-- Refresh log. Each refresh (a "run": full, or of some models) records its
+-- steps: when each started and finished, the rows it wrote (the relation's
+-- row count for materialized views) and the relation's size afterwards.
+-- Rows are written in the refresh's transaction, so a failed refresh leaves
+-- none. Kept across migrations, pruned to the latest runs of each kind by
+-- "start_refresh_run()"; "python manage.py refresh_leaderboard" runs a
+-- refresh and compares its steps with earlier runs.
+CREATE TABLE IF NOT EXISTS mv_refresh_run (
+    id bigserial PRIMARY KEY,
+    kind text NOT NULL,
+    model_count integer,
+    started_at timestamptz NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mv_refresh_step (
+    id bigserial PRIMARY KEY,
+    run_id bigint NOT NULL REFERENCES mv_refresh_run (id) ON DELETE CASCADE,
+    step text NOT NULL,
+    started_at timestamptz NOT NULL,
+    finished_at timestamptz NOT NULL,
+    row_count bigint,
+    relation_bytes bigint
+);
+CREATE INDEX IF NOT EXISTS mv_refresh_step_run_idx ON mv_refresh_step (run_id);
+CREATE INDEX IF NOT EXISTS mv_refresh_run_kind_idx ON mv_refresh_run (kind, id);
+
+-- Starts a run unless this transaction is already in one (a full refresh runs
+-- "refresh_model_rows()"); returns the current run. Runs of the same kind
+-- beyond the latest "keep_runs" are deleted, their steps with them.
+DROP FUNCTION IF EXISTS start_refresh_run(text, integer);
+CREATE OR REPLACE FUNCTION start_refresh_run(p_kind text, p_model_count integer DEFAULT NULL) RETURNS bigint AS $$
+DECLARE
+    run bigint := NULLIF(current_setting('leaderboard.refresh_run', true), '')::bigint;
+    keep_runs CONSTANT integer := 200;
+BEGIN
+    IF run IS NULL THEN
+        INSERT INTO mv_refresh_run (kind, model_count, started_at)
+        VALUES (p_kind, p_model_count, clock_timestamp())
+        RETURNING id INTO run;
+        PERFORM set_config('leaderboard.refresh_run', run::text, true);
+        DELETE FROM mv_refresh_run
+        WHERE kind = p_kind
+          AND id <= (SELECT id FROM mv_refresh_run WHERE kind = p_kind ORDER BY id DESC OFFSET keep_runs LIMIT 1);
+    END IF;
+    RETURN run;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Records a step of the current run, finished now. Without "p_row_count" the
+-- rows of "p_relation" are counted. Steps outside a run are not recorded.
+DROP FUNCTION IF EXISTS log_refresh_step(text, timestamptz, regclass, bigint);
+CREATE OR REPLACE FUNCTION log_refresh_step(p_step text, p_started timestamptz, p_relation regclass DEFAULT NULL,
+                                            p_row_count bigint DEFAULT NULL) RETURNS void AS $$
+DECLARE
+    run bigint := NULLIF(current_setting('leaderboard.refresh_run', true), '')::bigint;
+    finished timestamptz := clock_timestamp();
+BEGIN
+    IF run IS NULL THEN
+        RETURN;
+    END IF;
+    IF p_relation IS NOT NULL AND p_row_count IS NULL THEN
+        EXECUTE format('SELECT COUNT(*) FROM %s', p_relation) INTO p_row_count;
+    END IF;
+    INSERT INTO mv_refresh_step (run_id, step, started_at, finished_at, row_count, relation_bytes)
+    VALUES (run, p_step, p_started, finished, p_row_count,
+            CASE WHEN p_relation IS NOT NULL THEN pg_total_relation_size(p_relation) END);
+END;
+$$ LANGUAGE plpgsql;
+
+-- "refresh_model_rows()" rebuilds the per-model tables, from base scores through
+-- aggregation to the JSON and final context rows, for "p_model_ids" only (every
+-- model when NULL), then re-ranks the other models of the touched domains.
+-- Publishing new scores for a model only needs this; new benchmarks, benchmark
+-- versions or tree changes need "refresh_all_materialized_views()".
+-- Refreshes are serialized so that concurrent calls never interleave their
+-- deletes and inserts of the same rows.
+-- "p_concurrently" only matters for the full rebuild (see "refresh_model_table()").
+DROP FUNCTION IF EXISTS refresh_model_rows(integer[]);
+DROP FUNCTION IF EXISTS refresh_model_rows(integer[], boolean);
+CREATE OR REPLACE FUNCTION refresh_model_rows(p_model_ids integer[] DEFAULT NULL,
+                                              p_concurrently boolean DEFAULT false) RETURNS void AS $$
+DECLARE
+    started timestamptz;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_model_rows'));
+    PERFORM start_refresh_run(CASE WHEN p_model_ids IS NULL THEN 'full' ELSE 'models' END,
+                              cardinality(p_model_ids));
+
+    PERFORM refresh_model_table('mv_base_scores', 'v_base_scores', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_base_scores_fixed_engineering', 'v_base_scores_fixed_engineering', p_model_ids, p_concurrently);
+
+    -- Only try to populate if we have data
+    IF EXISTS (SELECT 1 FROM mv_benchmark_tree LIMIT 1) THEN
+        RAISE NOTICE 'Performing Aggregation';
+        started := clock_timestamp();
+        PERFORM populate_final_agg_scores(p_model_ids);
+        PERFORM log_refresh_step('final_agg_scores', started,
+                                 CASE WHEN p_model_ids IS NULL THEN 'final_agg_scores'::regclass END);
+    END IF;
+
+    PERFORM refresh_model_table('mv_model_scores', 'v_model_scores', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_historical_versions', 'v_historical_versions', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_model_scores_json', 'v_model_scores_json', p_model_ids, p_concurrently);
+    PERFORM refresh_model_table('mv_final_model_context', 'v_final_model_context', p_model_ids, p_concurrently);
+
+    -- New or changed average scores move the other models of the domain
+    IF p_model_ids IS NOT NULL THEN
+        started := clock_timestamp();
+        UPDATE mv_final_model_context f
+        SET rank = ranked.rank
+        FROM (
+            SELECT f2.model_id, mr.rank
+            FROM mv_final_model_context f2
+            LEFT JOIN v_model_domain_ranks mr ON mr.model_id = f2.model_id
+            WHERE f2.domain IN (SELECT m.domain FROM brainscore_model m WHERE m.id = ANY(p_model_ids))
+        ) ranked
+        WHERE f.model_id = ranked.model_id
+          AND f.rank IS DISTINCT FROM ranked.rank;
+
+        -- Readers see the published generation: carry the rewritten rows and ranks over
+        IF to_regclass('leaderboard_live.mv_final_model_context') IS NOT NULL THEN
+            DELETE FROM leaderboard_live.mv_final_model_context WHERE model_id = ANY(p_model_ids);
+            INSERT INTO leaderboard_live.mv_final_model_context
+            SELECT * FROM mv_final_model_context WHERE model_id = ANY(p_model_ids);
+            UPDATE leaderboard_live.mv_final_model_context l
+            SET rank = f.rank
+            FROM mv_final_model_context f
+            WHERE f.model_id = l.model_id
+              AND f.domain IN (SELECT m.domain FROM brainscore_model m WHERE m.id = ANY(p_model_ids))
+              AND l.rank IS DISTINCT FROM f.rank;
+        END IF;
+        PERFORM log_refresh_step('domain ranks', started);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- "refresh_materialized_view()" refreshes one materialized view, CONCURRENTLY if
+-- asked and possible: every materialized view above has a unique index for that,
+-- but a view that was never populated can only be refreshed plainly.
+DROP FUNCTION IF EXISTS refresh_materialized_view(regclass, boolean);
+CREATE OR REPLACE FUNCTION refresh_materialized_view(target regclass, p_concurrently boolean) RETURNS void AS $$
+DECLARE
+  started timestamptz := clock_timestamp();
+BEGIN
+  IF p_concurrently AND (SELECT relispopulated FROM pg_class WHERE oid = target) THEN
+    EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %s', target);
+  ELSE
+    EXECUTE format('REFRESH MATERIALIZED VIEW %s', target);
+  END IF;
+  PERFORM log_refresh_step(target::text, started, target);
+END;
+$$ LANGUAGE plpgsql;
+
 -- "refresh_all_materialized_views()" orchestrates all creation/refresh
 -- of the hierarchy and scoring MVs, plus calls aggregation functions.
 -- Called at the end to ensure everything is up-to-date.
-CREATE OR REPLACE FUNCTION refresh_all_materialized_views() RETURNS void AS $$
+-- A plain REFRESH takes an ACCESS EXCLUSIVE lock held until the refresh commits,
+-- blocking every leaderboard read meanwhile. By default ("p_concurrently") the
+-- views are refreshed CONCURRENTLY and the tables rewritten with DELETE, so
+-- readers see the previous data until the commit. That is slower; pass false
+-- when nothing reads the views (e.g. right after creating them below).
+-- "mv_model_scores_enriched" has no unique key to diff on and is always
+-- refreshed plainly; it is refreshed last and nothing serves pages from it.
+-- The refreshed data is then published as a new leaderboard generation (see
+-- "publish_leaderboard_generation()"); "p_max_row_drop" is passed through.
+-- Every refresh entry point takes the "refresh_model_rows" advisory lock before
+-- it touches any view, so that refreshes queue instead of deadlocking on each
+-- other's view locks.
+DROP FUNCTION IF EXISTS refresh_all_materialized_views();
+DROP FUNCTION IF EXISTS refresh_all_materialized_views(boolean);
+DROP FUNCTION IF EXISTS refresh_all_materialized_views(boolean, numeric);
+CREATE OR REPLACE FUNCTION refresh_all_materialized_views(p_concurrently boolean DEFAULT true,
+                                                          p_max_row_drop numeric DEFAULT 0.1) RETURNS void AS $$
+DECLARE
+    started timestamptz;
 BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_model_rows'));
+    PERFORM start_refresh_run('full');
+
   -- Refresh materialized views in the correct order
     RAISE NOTICE 'Refreshing Benchmark-related Context';
-    REFRESH MATERIALIZED VIEW mv_benchmark_tree;
-    REFRESH MATERIALIZED VIEW mv_benchmark_children;
-    REFRESH MATERIALIZED VIEW mv_latest_benchmark_instance;
-    REFRESH MATERIALIZED VIEW mv_version_timeline;
-    REFRESH MATERIALIZED VIEW mv_leaf_status;
-    REFRESH MATERIALIZED VIEW mv_final_benchmark_context;
+    PERFORM refresh_materialized_view('mv_benchmark_tree', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_children', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_closure', p_concurrently);
+    PERFORM refresh_materialized_view('mv_latest_benchmark_instance', p_concurrently);
+    PERFORM refresh_materialized_view('mv_version_timeline', p_concurrently);
+    PERFORM refresh_materialized_view('mv_leaf_status', p_concurrently);
+    PERFORM refresh_materialized_view('mv_final_benchmark_context', p_concurrently);
+    PERFORM refresh_materialized_view('mv_scored_benchmarks', p_concurrently);
 
     RAISE NOTICE 'Refreshing Model-related Tables';
-    REFRESH MATERIALIZED VIEW mv_model_data;
-    REFRESH MATERIALIZED VIEW mv_base_scores;
-    REFRESH MATERIALIZED VIEW mv_base_scores_fixed_engineering;
-
-    -- Only try to populate if we have data
-    IF EXISTS (SELECT 1 FROM mv_benchmark_tree LIMIT 1) THEN
-        RAISE NOTICE 'Performing Aggregation';
-        PERFORM populate_final_agg_scores();
-        PERFORM fix_parent_scores();
-    END IF;
+    PERFORM refresh_materialized_view('mv_model_data', p_concurrently);
+    PERFORM refresh_model_rows(NULL, p_concurrently);
 
     -- Refresh additional materialized views depending on updated data
     RAISE NOTICE 'Refreshing Model-related Context';
-    REFRESH MATERIALIZED VIEW mv_model_scores;
-    REFRESH MATERIALIZED VIEW mv_benchmark_minmax;
+    PERFORM refresh_materialized_view('mv_benchmark_minmax', p_concurrently);
+    started := clock_timestamp();
     REFRESH MATERIALIZED VIEW mv_model_scores_enriched;
-    REFRESH MATERIALIZED VIEW mv_model_scores_json;
-    REFRESH MATERIALIZED VIEW mv_final_model_context;
+    PERFORM log_refresh_step('mv_model_scores_enriched', started, 'mv_model_scores_enriched');
+
+    RAISE NOTICE 'Publishing Leaderboard Generation';
+    started := clock_timestamp();
+    PERFORM publish_leaderboard_generation(p_max_row_drop);
+    PERFORM log_refresh_step('publish_leaderboard_generation', started);
 
     RAISE NOTICE 'Completed';
 END;
 $$ LANGUAGE plpgsql;
 
-SELECT refresh_all_materialized_views();
\ No newline at end of file
+-- "benchmark_tree_signature()" hashes everything about the benchmarks that
+-- scores, ranks or the per-model JSON depend on: the tree, visibility, domains,
+-- ordering and each leaf's current instance. Not their metadata.
+DROP FUNCTION IF EXISTS benchmark_tree_signature();
+CREATE OR REPLACE FUNCTION benchmark_tree_signature() RETURNS text AS $$
+    SELECT md5(COALESCE(string_agg(
+        concat_ws('|', t.identifier, t.parent_id, t.visible, t.domain, t.sort_path, t.root_parent,
+                  fbc.version, fbc.benchmark_id),
+        ',' ORDER BY t.identifier), ''))
+    FROM mv_benchmark_tree t
+    JOIN mv_final_benchmark_context fbc ON fbc.benchmark_type_id = t.identifier;
+$$ LANGUAGE sql STABLE;
+
+-- "refresh_benchmark_metadata()" publishes edits of benchmark metadata
+-- (BenchmarkMeta, stimuli/data/metric meta, references, ceilings, owners)
+-- without recomputing scores: it refreshes the benchmark-side views up to
+-- "mv_final_benchmark_context", copies the metadata columns into the
+-- "mv_model_scores" rows that embed them, and publishes a new generation.
+-- The per-model JSON and "mv_benchmark_minmax" embed no metadata;
+-- "mv_model_scores_enriched", which nothing serves, is left to the next full
+-- refresh. If the tree signature changed (a benchmark was added, moved, hidden
+-- or got a new version), everything downstream may change and it runs
+-- "refresh_all_materialized_views()" instead.
+-- Returns 'metadata' or 'full', the refresh that ran.
+DROP FUNCTION IF EXISTS refresh_benchmark_metadata(boolean);
+CREATE OR REPLACE FUNCTION refresh_benchmark_metadata(p_concurrently boolean DEFAULT true) RETURNS text AS $$
+DECLARE
+    signature text;
+    run bigint;
+    started timestamptz;
+    patched bigint;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_model_rows'));
+    signature := benchmark_tree_signature();
+    run := start_refresh_run('metadata');
+
+    RAISE NOTICE 'Refreshing Benchmark-related Context';
+    PERFORM refresh_materialized_view('mv_benchmark_tree', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_children', p_concurrently);
+    PERFORM refresh_materialized_view('mv_benchmark_closure', p_concurrently);
+    PERFORM refresh_materialized_view('mv_latest_benchmark_instance', p_concurrently);
+    PERFORM refresh_materialized_view('mv_leaf_status', p_concurrently);
+    PERFORM refresh_materialized_view('mv_final_benchmark_context', p_concurrently);
+
+    IF benchmark_tree_signature() IS DISTINCT FROM signature THEN
+        RAISE NOTICE 'Benchmark tree changed, refreshing everything';
+        UPDATE mv_refresh_run SET kind = 'full' WHERE id = run;
+        PERFORM refresh_all_materialized_views(p_concurrently);
+        RETURN 'full';
+    END IF;
+
+    RAISE NOTICE 'Patching Model Scores';
+    started := clock_timestamp();
+    UPDATE mv_model_scores ms
+    SET meta_id = fbc.meta_id,
+        ceiling = fbc.ceiling,
+        ceiling_error = fbc.ceiling_error,
+        benchmark_author = fbc.benchmark_author,
+        benchmark_year = fbc.benchmark_year,
+        benchmark_url = fbc.benchmark_url,
+        benchmark_reference_identifier = fbc.benchmark_reference_identifier,
+        benchmark_bibtex = fbc.benchmark_bibtex,
+        benchmark_owner = fbc.owner_id
+    FROM mv_final_benchmark_context fbc
+    WHERE fbc.benchmark_type_id = ms.benchmark_identifier
+      AND (ms.meta_id, ms.ceiling, ms.ceiling_error, ms.benchmark_author, ms.benchmark_year, ms.benchmark_url,
+           ms.benchmark_reference_identifier, ms.benchmark_bibtex, ms.benchmark_owner)
+          IS DISTINCT FROM
+          (fbc.meta_id, fbc.ceiling, fbc.ceiling_error, fbc.benchmark_author, fbc.benchmark_year, fbc.benchmark_url,
+           fbc.benchmark_reference_identifier, fbc.benchmark_bibtex, fbc.owner_id);
+    GET DIAGNOSTICS patched = ROW_COUNT;
+    PERFORM log_refresh_step('mv_model_scores metadata', started, 'mv_model_scores', patched);
+
+    RAISE NOTICE 'Publishing Leaderboard Generation';
+    started := clock_timestamp();
+    PERFORM publish_leaderboard_generation();
+    PERFORM log_refresh_step('publish_leaderboard_generation', started);
+    RETURN 'metadata';
+END;
+$$ LANGUAGE plpgsql;
+
+
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+------------------PUBLISH LEADERBOARD GENERATIONS-------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+--------------------------------------------------------------------------
+
+-- Pages never read the relations above directly, but the "leaderboard_*" views
+-- below (FinalModelContext, FinalBenchmarkContext and BenchmarkMinMax). They
+-- point at a copy of those relations, a "generation", in schema
+-- "leaderboard_live":
+--   * "publish_leaderboard_generation()" copies the relations into schema
+--     "leaderboard_next", checks the copy, then in one transaction points the
+--     views at it and renames the schemas next -> live -> previous. Readers keep
+--     reading the old generation while the chain is rebuilt and copied, and only
+--     wait for the view swap itself.
+--   * "rollback_leaderboard_generation()" swaps live and previous back.
+-- Recreating the views here (on every migration) points them back at the chain,
+-- until the refresh at the end of this file publishes the first generation.
+
+-- Served relations, their unique key and the view readers query them through.
+DROP FUNCTION IF EXISTS leaderboard_served_relations();
+CREATE OR REPLACE FUNCTION leaderboard_served_relations()
+RETURNS TABLE (relation text, key_column text, view_name text) AS $$
+    VALUES ('mv_final_model_context', 'model_id', 'leaderboard_final_model_context'),
+           ('mv_final_benchmark_context', 'benchmark_type_id', 'leaderboard_final_benchmark_context'),
+           ('mv_benchmark_minmax', 'benchmark_identifier', 'leaderboard_benchmark_minmax');
+$$ LANGUAGE sql IMMUTABLE;
+
+DROP SCHEMA IF EXISTS leaderboard_next CASCADE;
+DROP SCHEMA IF EXISTS leaderboard_live CASCADE;
+DROP SCHEMA IF EXISTS leaderboard_previous CASCADE;
+
+DROP VIEW IF EXISTS leaderboard_final_model_context;
+DROP VIEW IF EXISTS leaderboard_final_benchmark_context;
+DROP VIEW IF EXISTS leaderboard_benchmark_minmax;
+CREATE VIEW leaderboard_final_model_context AS SELECT * FROM mv_final_model_context;
+CREATE VIEW leaderboard_final_benchmark_context AS SELECT * FROM mv_final_benchmark_context;
+CREATE VIEW leaderboard_benchmark_minmax AS SELECT * FROM mv_benchmark_minmax;
+
+-- Row count and checksum of a relation: the md5 of its rows' text in key order.
+DROP FUNCTION IF EXISTS leaderboard_relation_stats(regclass, text);
+CREATE OR REPLACE FUNCTION leaderboard_relation_stats(target regclass, key_column text,
+                                                      OUT row_count bigint, OUT checksum text) AS $$
+BEGIN
+    EXECUTE format('SELECT COUNT(*), md5(COALESCE(string_agg(md5(t::text), '''' ORDER BY t.%I), '''')) FROM %s t',
+                   key_column, target)
+    INTO row_count, checksum;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Checks, per served relation, before anything is swapped (any failure raises
+-- and leaves the live generation in place):
+--   * the copy has the row count and checksum of the relation it was copied from;
+--   * it does not empty a non-empty live generation, nor lose more than
+--     "p_max_row_drop" (a fraction) of its rows.
+-- With no live generation yet (a fresh database) the copy is published as is,
+-- even if empty, so that migrating an empty database succeeds.
+-- A copy identical to the live generation is not published, so that "previous"
+-- stays the last generation that differed.
+-- Returns 'published' or 'unchanged'.
+DROP FUNCTION IF EXISTS publish_leaderboard_generation(numeric);
+CREATE OR REPLACE FUNCTION publish_leaderboard_generation(p_max_row_drop numeric DEFAULT 0.1) RETURNS text AS $$
+DECLARE
+    served record;
+    source_stats record;
+    next_stats record;
+    live_stats record;
+    has_live boolean := to_regnamespace('leaderboard_live') IS NOT NULL;
+    changed boolean := NOT has_live;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('leaderboard_generation'));
+
+    DROP SCHEMA IF EXISTS leaderboard_next CASCADE;
+    CREATE SCHEMA leaderboard_next;
+
+    FOR served IN SELECT * FROM leaderboard_served_relations() LOOP
+        EXECUTE format('CREATE TABLE leaderboard_next.%I AS SELECT * FROM %I', served.relation, served.relation);
+        EXECUTE format('ALTER TABLE leaderboard_next.%I ADD PRIMARY KEY (%I)', served.relation, served.key_column);
+        EXECUTE format('ANALYZE leaderboard_next.%I', served.relation);
+
+        SELECT * INTO source_stats FROM leaderboard_relation_stats(served.relation::regclass, served.key_column);
+        SELECT * INTO next_stats
+        FROM leaderboard_relation_stats(format('leaderboard_next.%I', served.relation)::regclass, served.key_column);
+        IF (next_stats.row_count, next_stats.checksum) IS DISTINCT FROM
+           (source_stats.row_count, source_stats.checksum) THEN
+            RAISE EXCEPTION 'Leaderboard generation copy of % does not match its source', served.relation;
+        END IF;
+
+        IF has_live THEN
+            SELECT * INTO live_stats
+            FROM leaderboard_relation_stats(format('leaderboard_live.%I', served.relation)::regclass, served.key_column);
+            IF next_stats.row_count = 0 AND live_stats.row_count > 0 THEN
+                RAISE EXCEPTION 'Leaderboard generation copy of % is empty', served.relation;
+            END IF;
+            IF next_stats.row_count < live_stats.row_count * (1 - p_max_row_drop) THEN
+                RAISE EXCEPTION 'Leaderboard generation % has % rows, down from % live (more than % dropped)',
+                    served.relation, next_stats.row_count, live_stats.row_count, p_max_row_drop;
+            END IF;
+            changed := changed OR next_stats.checksum <> live_stats.checksum;
+        END IF;
+    END LOOP;
+
+    IF NOT changed THEN
+        DROP SCHEMA leaderboard_next CASCADE;
+        RETURN 'unchanged';
+    END IF;
+
+    -- Views reference their tables, not names: repointed first, they follow the renames
+    FOR served IN SELECT * FROM leaderboard_served_relations() LOOP
+        EXECUTE format('CREATE OR REPLACE VIEW %I AS SELECT * FROM leaderboard_next.%I',
+                       served.view_name, served.relation);
+    END LOOP;
+    DROP SCHEMA IF EXISTS leaderboard_previous CASCADE;
+    IF has_live THEN
+        ALTER SCHEMA leaderboard_live RENAME TO leaderboard_previous;
+    END IF;
+    ALTER SCHEMA leaderboard_next RENAME TO leaderboard_live;
+    RETURN 'published';
+END;
+$$ LANGUAGE plpgsql;
+
+-- Points the views back at the previous generation, which becomes live; the
+-- replaced one is kept as "previous", so calling this again undoes it.
+DROP FUNCTION IF EXISTS rollback_leaderboard_generation();
+CREATE OR REPLACE FUNCTION rollback_leaderboard_generation() RETURNS void AS $$
+DECLARE
+    served record;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('leaderboard_generation'));
+
+    IF to_regnamespace('leaderboard_previous') IS NULL THEN
+        RAISE EXCEPTION 'No previous leaderboard generation to roll back to';
+    END IF;
+
+    FOR served IN SELECT * FROM leaderboard_served_relations() LOOP
+        EXECUTE format('CREATE OR REPLACE VIEW %I AS SELECT * FROM leaderboard_previous.%I',
+                       served.view_name, served.relation);
+    END LOOP;
+    ALTER SCHEMA leaderboard_live RENAME TO leaderboard_rollback;
+    ALTER SCHEMA leaderboard_previous RENAME TO leaderboard_live;
+    ALTER SCHEMA leaderboard_rollback RENAME TO leaderboard_previous;
+END;
+$$ LANGUAGE plpgsql;
+
+
+SELECT refresh_all_materialized_views(p_concurrently => false);
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from benchmarks.models import BenchmarkInstance, Score
+from benchmarks.views import benchmark as benchmark_view
+from benchmarks.views.benchmark import PageInfo
+from .test_views import BaseTestCase
+
+
+class TestPageInfo(SimpleTestCase):
+    def test_navigation(self):
+        page = PageInfo(number=2, num_pages=3, count=250, per_page=100)
+        self.assertTrue(page.has_previous)
+        self.assertTrue(page.has_next)
+        self.assertTrue(page.has_other_pages)
+        self.assertEqual(page.start_index, 101)
+        self.assertFalse(PageInfo(number=1, num_pages=1, count=5, per_page=100).has_other_pages)
+
+
+class TestRankedScorePages(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = LocMemCache('benchmark-pages-test', {})
+        self.cache.clear()
+        for patcher in (patch.object(benchmark_view, 'get_domain_cache', return_value=(self.cache, 1)),
+                        patch.object(benchmark_view, 'SCORES_PER_PAGE', 30)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.benchmark = BenchmarkInstance.objects.get(id=1)
+        self.num_pages = -(-Score.objects.filter(benchmark_id=1, model__public=True).count() // 30)
+
+    def test_out_of_range_pages_share_the_last_page_entry(self):
+        _, last = benchmark_view._ranked_score_rows(self.benchmark, 'vision', False, self.num_pages)
+        for page_number in ('9999', '123456'):
+            _, page = benchmark_view._ranked_score_rows(self.benchmark, 'vision', False, page_number)
+            self.assertEqual(page.number, last.number)
+            self.assertIsNone(self.cache.get(f'vision:benchmark:1:v1:page:{page_number}'))
+        self.assertIsNotNone(self.cache.get(f'vision:benchmark:1:v1:page:{self.num_pages}'))
+
+    def test_cached_page_needs_no_queries(self):
+        benchmark_view._ranked_score_rows(self.benchmark, 'vision', False, '2')
+        with self.assertNumQueries(0):
+            _, page = benchmark_view._ranked_score_rows(self.benchmark, 'vision', False, '2')
+        self.assertEqual(page.number, 2)
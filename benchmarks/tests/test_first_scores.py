@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from benchmarks.management.commands.recompute_score_trends import _first_positive_scores
+from benchmarks.views import model_trends
+
+
+def _long_df(seed=0, n=2000):
+    rng = np.random.default_rng(seed)
+    scores = rng.choice([0.0, np.nan, -0.1, 0.2, 0.5, 0.7], size=n)
+    return pd.DataFrame({
+        'model_id': rng.integers(1, 30, size=n),
+        'benchmark': rng.choice(['leaf_a', 'leaf_b', 'leaf_c', 'leaf_d'], size=n),
+        'score_ceiled': scores,
+        'end_timestamp': pd.to_datetime(rng.integers(1.6e9, 1.7e9, size=n), unit='s', utc=True),
+    })
+
+
+class TestFirstPositiveScores(SimpleTestCase):
+    def test_matches_per_row_scan(self):
+        long_df = _long_df()
+        expected = {}
+        for mid, leaf, score, ts in long_df[['model_id', 'benchmark', 'score_ceiled', 'end_timestamp']].itertuples(
+                index=False, name=None):
+            if not score > 0:
+                continue
+            if (mid, leaf) not in expected or ts < expected[(mid, leaf)][0]:
+                expected[(mid, leaf)] = (ts, score)
+        first = _first_positive_scores(long_df)
+        actual = {(mid, leaf): (ts, score) for mid, leaf, ts, score in first.itertuples(index=False, name=None)}
+        self.assertEqual(actual, expected)
+
+    def test_empty(self):
+        self.assertTrue(_first_positive_scores(pd.DataFrame()).empty)
+
+
+class TestFirstScoreLoaders(SimpleTestCase):
+    def setUp(self):
+        ts = pd.Timestamp
+        self.rows = [
+            ('leaf_a', ts('2024-01-15', tz='UTC'), 0.4),
+            ('leaf_b', ts('2024-03-01', tz='UTC'), 0.6),
+            ('leaf_c', ts('2024-01-02', tz='UTC'), 0.1),  # never newly added
+        ]
+        self.table = MagicMock()
+        self.table.objects.filter.return_value.values_list.return_value = self.rows
+        patcher = patch.object(model_trends, 'ModelLeafFirstScore', self.table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.edges = {'2023-12|2024-01': ['leaf_a', 'leaf_b'], '2024-01|2024-02': [], '2024-02|2024-03': ['leaf_d']}
+
+    def test_scored_new_leaves(self):
+        self.assertEqual(model_trends._load_focal_scored_new_leaves(7, 'vision', self.edges),
+                         {'2024-01': ['leaf_a']})
+        self.table.objects.filter.assert_called_once_with(model_id=7, domain='vision')
+
+    def test_scored_new_leaf_values(self):
+        self.assertEqual(model_trends._load_scored_new_leaf_values(7, 'vision', self.edges),
+                         {'leaf_a': 0.4, 'leaf_b': 0.6})
+
+    def test_no_edges_skip_the_query(self):
+        self.assertEqual(model_trends._load_focal_scored_new_leaves(7, 'vision', {}), {})
+        self.table.objects.filter.assert_not_called()
@@ -0,0 +1,22 @@
+"""
+Opt-in performance benchmarks. They are skipped unless ``RUN_BENCHMARKS`` is set::
+
+    RUN_BENCHMARKS=1 python manage.py test benchmarks.tests.test_ranking
+
+They check results, not wall-clock time; timings are logged at INFO on this module's logger.
+"""
+import logging
+import os
+import time
+import unittest
+
+logger = logging.getLogger(__name__)
+
+benchmark = unittest.skipUnless(os.getenv('RUN_BENCHMARKS'), 'set RUN_BENCHMARKS=1 to run benchmarks')
+
+
+def timed(function, *args):
+    """``(result, seconds)`` of ``function(*args)``."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
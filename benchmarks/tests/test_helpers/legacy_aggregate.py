@@ -0,0 +1,79 @@
+"""
+Reference copy of the per-month aggregation as it was before the single-sweep
+``_MonthlySweep`` (filter, sort, de-duplicate and pivot the long frame for every
+month), kept for parity tests and the backfill micro-benchmark.
+"""
+import pandas as pd
+
+
+def _aggregate_for_month_fast(
+    long_df, all_model_ids, parent_child_map,
+    depth_groups, max_depth, month_end, agg_root, known_leaves=None,
+):
+    """Returns ``({model_id: agg_root_score}, leaf_set, per_model_coverage)`` for
+    the month ending at ``month_end``. Missing models in either dict are filled
+    with ``0.0`` / ``frozenset()`` so downstream callers see consistent keys.
+
+    ``known_leaves`` is the global set of leaves counted by ``month_end``, for
+    when ``long_df`` only holds some models' scores: the leaves those models
+    happen to have must not decide which parents exist or what they average."""
+    empty_scores = {mid: 0.0 for mid in all_model_ids}
+    empty_cov = {mid: frozenset() for mid in all_model_ids}
+    if long_df is None or long_df.empty:
+        return empty_scores, set(known_leaves or ()), empty_cov
+
+    sub = long_df[long_df['end_timestamp'] <= pd.Timestamp(month_end)]
+    if sub.empty:
+        return empty_scores, set(known_leaves or ()), empty_cov
+
+    # stable, so same-timestamp re-scores resolve the same way for any subset of models
+    sub = sub.sort_values('end_timestamp', kind='stable').drop_duplicates(['model_id', 'benchmark'], keep='last')
+    score_df = sub.pivot(index='model_id', columns='benchmark', values='score_ceiled')
+    if known_leaves is not None:
+        score_df = score_df.reindex(columns=sorted(set(score_df.columns) | set(known_leaves)))
+        existing = set(known_leaves)
+    benchmark_cols = list(score_df.columns)
+
+    if known_leaves is None:
+        leaves_present = score_df.notna().any(axis=0)
+        existing = {col for col in benchmark_cols if bool(leaves_present.get(col, False))}
+    for depth in range(max_depth, -1, -1):
+        for ident in depth_groups.get(depth, []):
+            if ident in existing:
+                continue
+            for child in parent_child_map.get(ident, []):
+                if child in existing:
+                    existing.add(ident)
+                    break
+
+    leaf_existing = [c for c in benchmark_cols if c in existing]
+    if leaf_existing:
+        agg_df = score_df[leaf_existing].copy()
+        leaf_mask = score_df[leaf_existing].notna()
+        per_model_coverage = {
+            mid: frozenset(leaf_mask.columns[leaf_mask.loc[mid].to_numpy()])
+            for mid in leaf_mask.index
+        }
+    else:
+        agg_df = pd.DataFrame(index=score_df.index)
+        per_model_coverage = {mid: frozenset() for mid in score_df.index}
+
+    for depth in range(max_depth, -1, -1):
+        for ident in depth_groups.get(depth, []):
+            if ident not in existing or ident in benchmark_cols:
+                continue
+            children = [c for c in parent_child_map.get(ident, []) if c in existing]
+            children = [c for c in children if c in agg_df.columns]
+            if not children:
+                continue
+            agg_df[ident] = agg_df[children].fillna(0).mean(axis=1)
+
+    leaf_set = {b for b in existing if b in benchmark_cols}
+    out_scores = dict(empty_scores)
+    out_coverage = dict(empty_cov)
+    if agg_root in agg_df.columns:
+        for mid, val in agg_df[agg_root].fillna(0.0).items():
+            out_scores[mid] = float(val)
+    for mid, cov in per_model_coverage.items():
+        out_coverage[mid] = cov
+    return out_scores, leaf_set, out_coverage
@@ -0,0 +1,62 @@
+"""
+Reference copy of the model card's cell color function as it was before the lookup
+tables in ``benchmarks.views.palette``, kept for parity tests.
+"""
+from benchmarks.views.palette import REDGREEN_COLORS, GRAY_COLORS
+
+GAMMA = 0.5
+
+
+def calculate_representative_color(value, min_value, max_value, is_engineering):
+    """
+    Calculate representative color for a score value.
+    Replicates the JavaScript calculateRepresentativeColor function.
+
+    Args:
+        value: The score value
+        min_value: Minimum value in the distribution
+        max_value: Maximum value in the distribution
+        is_engineering: Whether this is an engineering benchmark (uses grayscale)
+
+    Returns:
+        CSS color string with RGBA (e.g., 'rgba(255, 0, 0, 0.85)')
+    """
+    # Normalize the input value between 0 and 1
+    if max_value - min_value == 0:
+        normalized_value = 0.5
+    else:
+        normalized_value = (value - min_value) / (max_value - min_value)
+    normalized_value = max(0.0, min(1.0, normalized_value))
+
+    # Apply gamma correction to emphasize differences at the top-end
+    normalized_value = normalized_value ** (1.0 / GAMMA)
+
+    # Scale down the normalized value (0.8 factor)
+    normalized_value = 0.8 * normalized_value
+    normalized_value = max(0.0, min(1.0, normalized_value))
+
+    # Get color array index (0-100)
+    idx = int(100 * normalized_value)
+    if idx > 100:
+        idx = 100
+
+    # Determine color palette based on benchmark type
+    color_hex = GRAY_COLORS[idx] if is_engineering else REDGREEN_COLORS[idx]
+
+    # Extract RGB values from hex color
+    r = int(color_hex[1:3], 16)
+    g = int(color_hex[3:5], 16)
+    b = int(color_hex[5:7], 16)
+
+    # Calculate alpha based on value position
+    # Linear interpolation: alpha ranges from 0.1 (at min) to 1.0 (at max)
+    if max_value - min_value == 0:
+        alpha = 1.0
+    else:
+        slope = -0.9 / (min_value - max_value)
+        intercept = 0.1 - slope * min_value
+        alpha = slope * value + intercept
+    alpha = max(0.0, min(1.0, alpha))
+
+    # Return RGBA color string
+    return f'rgba({r}, {g}, {b}, {alpha:.2f})'
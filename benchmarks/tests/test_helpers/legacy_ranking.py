@@ -0,0 +1,238 @@
+"""
+Reference copies of the ranking functions as they were before ``benchmarks.views.ranking``
+(and the per-pair ``rank_transition_model_lines`` loop), kept for parity tests and the
+ranking micro-benchmarks.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.views.model import _AGG_ROOT_BENCHMARK_IDS
+from benchmarks.views.model_trends import _plural
+
+
+def filter_and_rank_models(models, domain: str = "vision"):
+    """
+    Filters out models without a valid average_{domain} score (must be a number or "X") and recalculates ranks.
+    Returns a list of models with updated ranks.
+    """
+    if not isinstance(models, list):
+        models = list(models)
+
+    model_scores = []
+    for model in models:
+        if model.scores is not None:
+            for score in model.scores:
+                benchmark_id = score.get("benchmark_type_id")
+                if benchmark_id == f"average_{domain}":
+                    val = score.get("score_ceiled")
+                    if val is None or val == "":
+                        # Exclude models with None or empty string
+                        break
+                    if val == "X":
+                        # "X" is valid, but always ranked at the bottom
+                        model_scores.append((model, None, True))
+                        break
+                    try:
+                        # Use ROUND_HALF_UP for consistent rounding
+                        # Round to 2 decimal places to match display precision
+                        val_str = str(val) if not isinstance(val, str) else val
+                        val_decimal = Decimal(val_str).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                        val_float = float(val_decimal)
+                        model_scores.append((model, val_float, False))
+                    except (ValueError, TypeError):
+                        # Exclude models with non-numeric, non-"X" values
+                        break
+                    break
+
+    # Sort: valid numbers (descending), then "X" at the bottom (tied), exclude None/null
+    model_scores.sort(
+        key=lambda x: (
+            1 if x[2] else 0,  # is_x: False (0) comes before True (1)
+            -(x[1] if x[1] is not None else 0),  # valid numbers descending, "X" as 0
+            getattr(x[0], "name", str(getattr(x[0], "model_id", "")))  # tiebreaker
+        )
+    )
+
+    # Assign ranks: valid numbers get ranks, all "X" get the same (last) rank
+    rank_map = {}
+    current_rank = 1
+    previous_score = None
+    tied_count = 0
+
+    for i, (model, score, is_x) in enumerate(model_scores):
+        if is_x:
+            # All "X" get the same rank (after all valids)
+            break
+
+        if i == 0 or score != previous_score:
+            # If we had a tie, increment rank by the number of tied models
+            if tied_count > 0:
+                current_rank += tied_count
+            tied_count = 1
+            rank_map[model.model_id] = current_rank
+        else:
+            # This is a tie, use the same rank as the previous model
+            tied_count += 1
+            rank_map[model.model_id] = rank_map[model_scores[i-1][0].model_id]
+
+        previous_score = score
+
+    # Assign the same rank to all "X" (after all valids)
+    x_rank = current_rank + tied_count
+    for model, score, is_x in model_scores:
+        if is_x:
+            model.rank = x_rank
+        else:
+            model.rank = rank_map[model.model_id]
+
+    # Return all models, sorted by rank
+    ranked_models = [model for model, _, _ in model_scores]
+    ranked_models.sort(key=lambda model: model.rank)
+    return ranked_models
+
+
+def wide_scores_and_rank_df(df, month_cols):
+    """Wide ``model_id × month`` score frame + same-shape rank frame (1 = best,
+    ties skip).
+
+    Score rounding mirrors the leaderboard's two-pass HALF_UP exactly: the MV
+    pre-rounds to 3dp via PostgreSQL ``ROUND(numeric, 3)`` ([mv.sql:1076]),
+    then ``_rank_models`` rounds to 2dp HALF_UP. A one-shot 2dp on the raw
+    float disagrees on values just under ``.xx5`` (e.g. ``0.3849...``)."""
+    wide_scores = df[['model_id'] + month_cols].copy()
+    for col in month_cols:
+        s = wide_scores[col].replace(0.0, np.nan).astype(float)
+        # floor(x*N + 0.5)/N = ROUND_HALF_UP for x >= 0; NaN propagates.
+        s_3dp = np.floor(s * 1000 + 0.5) / 1000
+        wide_scores[col] = np.floor(s_3dp * 100 + 0.5) / 100
+    rank_df = wide_scores[['model_id']].copy()
+    for col in month_cols:
+        # method='min' is competition ranking (1, 2, 2, 4, ...), which already
+        # matches the leaderboard's tie handling; no remap needed.
+        rank_df[col] = wide_scores[col].rank(method='min', ascending=False, na_option='keep')
+    return wide_scores, rank_df
+
+
+def _round_half_up_2dp(x):
+    return float(Decimal(str(x)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+
+def add_benchmark_rankings(model, reference_context):
+    """
+    Add per-benchmark ranking information to each score in the model.
+    For both public and private models: compute rank against public models + self
+    """
+    # Get all public models for comparison
+    public_models = [m for m in reference_context['models'] if getattr(m, 'public', True)]
+    # Pre-compute scores for each benchmark to avoid repeated lookups
+    benchmark_scores = {}
+    for other_model in public_models + [model]:
+        if getattr(other_model, 'model_id', None) == getattr(model, 'model_id', None):
+            continue
+        for other_score in getattr(other_model, 'scores', []) or []:
+            if not isinstance(other_score, dict):
+                continue
+            versioned_id = other_score.get('versioned_benchmark_identifier')
+            if not versioned_id:
+                continue
+            score_value = other_score.get('score_ceiled')
+            if score_value in ('', 'X', None):
+                continue
+            try:
+                score_float = float(score_value)
+                if versioned_id not in benchmark_scores:
+                    benchmark_scores[versioned_id] = []
+                benchmark_scores[versioned_id].append(score_float)
+            except (ValueError, TypeError):
+                continue
+    # Process scores
+    for score in model.scores:
+        if not isinstance(score, dict):
+            continue
+        versioned_benchmark_id = score.get('versioned_benchmark_identifier')
+        if not versioned_benchmark_id:
+            continue
+        # If score is invalid, set rank to be same as invalid score
+        # i.e., if score is empty, rank is empty. If score is "X", rank is "X", if score is nan, rank is nan
+        # Allows us to preserve invalid state in the rank and avoid casting invalid score to float
+        score_ceiled = score.get('score_ceiled')
+        if score_ceiled in ('', 'X', None):
+            score['rank'] = score_ceiled
+            continue
+        try:
+            score_value = float(score_ceiled)
+            all_scores = benchmark_scores.get(versioned_benchmark_id, [])
+            # For aggregate roots, round both target and comparators to the same
+            # 2-decimal ROUND_HALF_UP that the leaderboard's _rank_models uses, so
+            # the displayed rank agrees with the leaderboard. Leaf benchmarks keep
+            # full precision (more informative ranks per benchmark).
+            if versioned_benchmark_id in _AGG_ROOT_BENCHMARK_IDS:
+                target = _round_half_up_2dp(score_value)
+                comparators = [_round_half_up_2dp(s) for s in all_scores]
+            else:
+                target = score_value
+                comparators = all_scores
+            # Sort scores in descending order and find the rank
+            sorted_scores = sorted(comparators, reverse=True)
+            # Find the position of the current score (1-indexed)
+            # If there are ties, all tied scores get the same rank
+            rank = 1
+            for i, s in enumerate(sorted_scores):
+                if s > target:
+                    rank = i + 2  # +2 because we want 1-indexed and we're looking for the next position
+                elif s == target:
+                    rank = i + 1  # +1 for 1-indexed
+                    break
+            score['rank'] = rank
+        except (ValueError, TypeError):
+            score['rank'] = 'N/A'
+
+
+def rank_transition_model_lines(model_id, ym_prev, ym_curr, rank1, rank2, rank_df):
+    """One-line summary of *which models* drove a month-to-month rank move,
+    counts only / third-person. Benchmark churn is shown separately (bullets),
+    so it is intentionally not repeated here. Per-model enumeration was dropped
+    because long model names widened the sidebar on narrow viewports."""
+    if ym_prev not in rank_df.columns or ym_curr not in rank_df.columns:
+        return []
+
+    rank_change = rank2 - rank1
+    focal = str(model_id)
+    ranks_indexed = rank_df.set_index('model_id')
+    ranks_t1 = ranks_indexed[ym_prev]
+    ranks_t2 = ranks_indexed[ym_curr]
+
+    moved_past = focal_past = new_above = 0
+    for om in ranks_t1.index:
+        if str(om) == focal:
+            continue
+        r1 = ranks_t1[om]
+        r2 = ranks_t2.get(om, np.nan)
+        if pd.isna(r1) or pd.isna(r2):
+            continue
+        or1, or2 = int(r1), int(r2)
+        if rank_change > 0 and ((or1 > rank1 and or2 <= rank2) or (or1 >= rank1 and or2 < rank2)):
+            moved_past += 1
+        elif rank_change < 0 and ((or1 < rank1 and or2 >= rank2) or (or1 <= rank1 and or2 > rank2)):
+            focal_past += 1
+    for om in ranks_t2.index:
+        if str(om) == focal:
+            continue
+        if pd.notna(ranks_t1.get(om, np.nan)) or pd.isna(ranks_t2[om]):
+            continue
+        if int(ranks_t2[om]) < rank2:
+            new_above += 1
+
+    bits = []
+    if focal_past:
+        bits.append(f'passed {_plural(focal_past, "model")}')
+    if moved_past:
+        bits.append(f'{_plural(moved_past, "model")} moved ahead')
+    if new_above:
+        bits.append(f'{_plural(new_above, "new model")} entered above')
+    if not bits:
+        return []
+    s = '; '.join(bits) + '.'
+    return [s[0].upper() + s[1:]]
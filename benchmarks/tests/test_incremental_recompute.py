@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase
+
+from .test_views import BaseTestCase
+from benchmarks.models import Model, ModelMonthlyAggregate, ModelMonthlyRank, Score
+from benchmarks.management.commands.recompute_score_trends import (
+    _aggregate_for_month_fast, _depth_groups, _incremental_plan, _month_end_utc, _month_iter,
+    build_parent_child_map,
+)
+
+
+def _tree():
+    return pd.DataFrame([
+        {'identifier': 'average_vision', 'parent_id': None, 'depth': 0},
+        {'identifier': 'group_a', 'parent_id': 'average_vision', 'depth': 1},
+        {'identifier': 'group_b', 'parent_id': 'average_vision', 'depth': 1},
+        {'identifier': 'leaf_w', 'parent_id': 'group_a', 'depth': 2},
+        {'identifier': 'leaf_x', 'parent_id': 'group_a', 'depth': 2},
+        {'identifier': 'leaf_y', 'parent_id': 'group_b', 'depth': 2},
+        {'identifier': 'leaf_z', 'parent_id': 'group_b', 'depth': 2},
+    ])
+
+
+def _scores(seed=0, n=600):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'model_id': rng.integers(1, 60, size=n),
+        'benchmark': rng.choice(['leaf_w', 'leaf_x', 'leaf_y', 'leaf_z'], size=n, p=[.4, .3, .2, .1]),
+        'score_ceiled': np.round(rng.random(size=n), 3),
+        'end_timestamp': pd.Timestamp('2023-01-01', tz='UTC')
+        + pd.to_timedelta(rng.integers(0, 730, size=n), unit='D'),
+    })
+
+
+def _first_months(long_df):
+    """What ``_leaf_first_months`` returns for these rows."""
+    return long_df.groupby('benchmark')['end_timestamp'].min().dt.strftime('%Y-%m').to_dict()
+
+
+class TestKnownLeaves(SimpleTestCase):
+    """Recomputing a subset of models against the global leaf set must give the
+    same aggregates and coverage as the full recompute."""
+
+    def test_subset_matches_full_recompute(self):
+        tree = _tree()
+        args = (build_parent_child_map(tree), _depth_groups(tree), 2)
+        long_df = _scores()
+        all_ids = sorted(long_df['model_id'].unique().tolist())
+        subset = all_ids[::7]
+        first_months = _first_months(long_df)
+        for month in _month_iter('2022-12', '2025-01'):
+            month_end = _month_end_utc(month)
+            scores, leaves, coverage = _aggregate_for_month_fast(
+                long_df, all_ids, *args, month_end, 'average_vision')
+            known = {leaf for leaf, first in first_months.items() if first <= month}
+            sub_scores, sub_leaves, sub_coverage = _aggregate_for_month_fast(
+                long_df[long_df['model_id'].isin(subset)], subset, *args, month_end, 'average_vision',
+                known_leaves=known)
+            self.assertEqual(sub_leaves, leaves, month)
+            self.assertEqual(sub_scores, {mid: scores[mid] for mid in subset}, month)
+            self.assertEqual(sub_coverage, {mid: coverage[mid] for mid in subset}, month)
+
+
+class TestIncrementalPlan(SimpleTestCase):
+    def test_up_to_date(self):
+        months = {'leaf_x': '2024-01'}
+        self.assertEqual(_incremental_plan('2024-05', '2024-05', set(), months, months), (None, False))
+
+    def test_new_month_without_new_scores_carries_forward(self):
+        months = {'leaf_x': '2024-01'}
+        self.assertEqual(_incremental_plan('2024-04', '2024-05', set(), months, months), ('2024-05', False))
+
+    def test_changed_models_from_earliest_changed_month(self):
+        months = {'leaf_x': '2024-01'}
+        self.assertEqual(_incremental_plan('2024-05', '2024-05', {'2024-05', '2024-03'}, months, months),
+                         ('2024-03', False))
+
+    def test_new_leaf_recomputes_all_models(self):
+        self.assertEqual(_incremental_plan('2024-05', '2024-05', {'2024-05'},
+                                           {'leaf_x': '2024-01', 'leaf_y': '2024-05'}, {'leaf_x': '2024-01'}),
+                         ('2024-05', True))
+
+    def test_backdated_score_on_leaf_moves_its_first_month(self):
+        self.assertEqual(_incremental_plan('2024-05', '2024-05', {'2024-02'},
+                                           {'leaf_x': '2024-02'}, {'leaf_x': '2024-04'}),
+                         ('2024-02', True))
+
+
+class TestIncrementalNewModel(BaseTestCase):
+    """A model's first-ever score, picked up incrementally, must give the rows a backfill writes."""
+
+    def _recompute(self, mode):
+        call_command('recompute_score_trends', domain='vision', mode=mode, stdout=StringIO())
+        return (sorted(ModelMonthlyAggregate.objects.filter(domain='vision').values_list(
+                    'model_id', 'month', 'score', 'coverage_leaves_added_vs_prev')),
+                sorted(ModelMonthlyRank.objects.filter(domain='vision').values_list(
+                    'model_id', 'month', 'rank', 'cohort_size')))
+
+    def _add_model_with_first_score(self):
+        score = (Score.objects.filter(benchmark__benchmark_type__domain='vision',
+                                      benchmark__benchmark_type__visible=True, score_ceiled__gt=0)
+                 .select_related('model').order_by('id').first())
+        model = score.model
+        # Private, so the public model set (and with it the watermark) is unchanged
+        model.pk, model.name, model.public = None, f'{model.name} (incremental)', False
+        model.save()
+        new_score = Score.objects.create(benchmark_id=score.benchmark_id, model=model, score_ceiled=0.5,
+                                         score_raw=0.5, start_timestamp=score.start_timestamp)
+        # end_timestamp is auto_now_add: backdate it after the insert
+        Score.objects.filter(pk=new_score.pk).update(end_timestamp=datetime(2019, 6, 15, tzinfo=timezone.utc))
+        return model.pk
+
+    def test_incremental_matches_backfill(self):
+        with transaction.atomic():
+            self._recompute('backfill')
+            model_id = self._add_model_with_first_score()
+            incremental = self._recompute('incremental')
+            backfill = self._recompute('backfill')
+            self.assertIn(model_id, {mid for mid, *_ in incremental[0]})
+            self.assertEqual(incremental, backfill)
+            transaction.set_rollback(True)
@@ -0,0 +1,78 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from benchmarks.views.index import _build_comparison_data, _build_csv_data
+
+
+def _score(type_id, version, value, error=None, complete=True):
+    return {
+        "benchmark_type_id": type_id,
+        "versioned_benchmark_identifier": f"{type_id}_v{version}",
+        "score_ceiled": value,
+        "error": error,
+        "is_complete": complete,
+    }
+
+
+class TestLazyContextFields(SimpleTestCase):
+    def setUp(self):
+        self.benchmarks = [SimpleNamespace(benchmark_type_id="average_vision"),
+                           SimpleNamespace(benchmark_type_id="Example.V1-pls")]
+        self.models = [
+            SimpleNamespace(name="alexnet", layers={"V1": "features.2"}, scores=[
+                _score("average_vision", 0, ".50"),
+                _score("Example.V1-pls", 1, ".40", error=0.01),
+                _score("Hidden.IT-pls", 0, ".30", complete=False),
+            ]),
+            SimpleNamespace(name="no_scores", layers=None, scores=None),
+        ]
+
+    def test_comparison_data_records(self):
+        data = _build_comparison_data(self.models)
+
+        self.assertEqual(len(data), 1)  # models without scores are skipped
+        self.assertEqual(data[0]["model"], "alexnet")
+        self.assertEqual(data[0]["Example.V1-pls_v1-score"], ".40")
+        self.assertEqual(data[0]["Example.V1-pls_v1-error"], 0.01)
+        self.assertFalse(data[0]["Hidden.IT-pls_v0-is_complete"])
+
+    def test_csv_data_only_has_context_benchmark_columns(self):
+        csv_data = _build_csv_data(self.benchmarks, self.models)
+        header, row = csv_data.strip().splitlines()
+
+        self.assertEqual(header, "model_name,layers,average_vision,Example.V1-pls")
+        self.assertTrue(row.startswith("alexnet,"))
+        self.assertNotIn("Hidden.IT-pls", header)
+
+    def test_csv_data_without_models(self):
+        self.assertEqual(_build_csv_data(self.benchmarks, []), "No models submitted yet.")
+
+    @patch("benchmarks.views.leaderboard.get_csv_data")
+    def test_csv_endpoint_serves_public_csv(self, get_csv_data):
+        get_csv_data.return_value = "model_name\nalexnet\n"
+        request = SimpleNamespace(method="GET", GET={}, user=SimpleNamespace(is_authenticated=False))
+
+        from benchmarks.views.leaderboard import csv_download
+
+        response = csv_download(request, "vision")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("vision_benchmark_scores.csv", response["Content-Disposition"])
+        self.assertEqual(response.content.decode(), "model_name\nalexnet\n")
+        get_csv_data.assert_called_once_with(user=None, domain="vision", show_public=True)
+
+    @patch("benchmarks.views.compare.get_comparison_data")
+    def test_comparison_data_endpoint(self, get_comparison_data):
+        get_comparison_data.return_value = [{"model": "alexnet", "average_vision_v0-score": ".50"}]
+
+        from benchmarks.views.compare import comparison_data
+
+        response = comparison_data(SimpleNamespace(method="GET"), "vision")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), get_comparison_data.return_value)
+        get_comparison_data.assert_called_once_with(show_public=True, domain="vision")
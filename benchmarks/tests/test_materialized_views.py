@@ -1,6 +1,8 @@
 from django.test import TestCase
-from django.db import connection
+from django.db import DatabaseError, OperationalError, connection, transaction
 from .test_views import BaseTestCase
+import threading
+import time
 import unittest
 
 
@@ -225,3 +227,493 @@ class TestMaterializedViews(BaseTestCase):
             legacy_score.benchmark.identifier,
             "Benchmark identifier mismatch between new and legacy implementation"
         )
+
+
+class TestBenchmarkClosure(BaseTestCase):
+    """The score roll-up joins parents to children through mv_benchmark_closure instead of
+    the children lists of mv_benchmark_children; both must describe the same tree."""
+
+    def test_direct_edges_match_children_lists(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT bc.parent_id, child
+                FROM mv_benchmark_children bc, jsonb_array_elements_text(bc.children) child
+            """)
+            children = set(cursor.fetchall())
+            cursor.execute("""
+                SELECT ancestor_identifier, descendant_identifier
+                FROM mv_benchmark_closure
+                WHERE distance = 1
+            """)
+            edges = set(cursor.fetchall())
+        self.assertGreater(len(edges), 0)
+        self.assertEqual(edges, children)
+
+    def test_aggregated_rows_carry_their_root(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*)
+                FROM final_agg_scores f
+                LEFT JOIN mv_benchmark_closure c
+                  ON c.descendant_identifier = f.benchmark
+                 AND c.ancestor_identifier = f.root_parent
+                LEFT JOIN mv_benchmark_tree r
+                  ON r.identifier = c.ancestor_identifier AND r.depth = 0
+                WHERE r.identifier IS NULL
+            """)
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+class TestParentScores(BaseTestCase):
+    def test_parents_without_real_child_scores_are_nan_or_null(self):
+        """A parent whose children are all NaN/NULL must not be averaged to 0."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT p.model_id, p.benchmark
+                FROM final_agg_scores p
+                JOIN mv_benchmark_closure c
+                  ON c.ancestor_identifier = p.benchmark AND c.distance = 1
+                JOIN final_agg_scores ch
+                  ON ch.benchmark = c.descendant_identifier AND ch.model_id = p.model_id
+                WHERE NOT p.is_leaf
+                GROUP BY p.model_id, p.benchmark, p.score_ceiled
+                HAVING p.score_ceiled = 0
+                   AND COUNT(*) FILTER (WHERE ch.score_ceiled <> 'NaN') = 0
+            """)
+            self.assertEqual(cursor.fetchall(), [])
+
+
+class TestSparseScores(BaseTestCase):
+    """Score tables hold only scored cells; the JSON still has a cell per scored benchmark."""
+
+    def test_base_scores_have_no_placeholder_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM mv_base_scores WHERE id IS NULL")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_json_has_a_cell_per_scored_benchmark_of_the_domain(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT j.model_id
+                FROM mv_model_scores_json j
+                JOIN brainscore_model m ON m.id = j.model_id
+                WHERE jsonb_array_length(j.scores) <> (
+                    SELECT COUNT(*)
+                    FROM mv_scored_benchmarks sb
+                    JOIN mv_final_benchmark_context fbc ON fbc.benchmark_type_id = sb.benchmark_type_id
+                    WHERE fbc.domain = m.domain
+                )
+            """)
+            self.assertEqual(cursor.fetchall(), [])
+
+    def test_every_public_model_is_ranked(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*)
+                FROM mv_final_model_context f
+                JOIN mv_scored_benchmarks sb ON sb.benchmark_type_id = 'average_' || f.domain
+                WHERE f.public AND f.rank IS NULL
+            """)
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+class TestHistoricalVersions(BaseTestCase):
+    def test_only_versions_older_than_current(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*)
+                FROM mv_historical_versions h
+                JOIN mv_final_benchmark_context fbc ON fbc.benchmark_type_id = h.benchmark_type_id
+                WHERE h.version >= fbc.version
+            """)
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_json_carries_historical_versions_only_where_present(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*) FILTER (WHERE score->'historical_versions' = 'null'::jsonb),
+                       COUNT(*) FILTER (WHERE score ? 'historical_versions')
+                FROM mv_model_scores_json j, jsonb_array_elements(j.scores) score
+            """)
+            nulls, present = cursor.fetchone()
+            cursor.execute("""
+                SELECT COUNT(*)
+                FROM (SELECT DISTINCT model_id, benchmark_type_id FROM mv_historical_versions) h
+                JOIN brainscore_model m ON m.id = h.model_id
+                JOIN mv_final_benchmark_context fbc
+                  ON fbc.benchmark_type_id = h.benchmark_type_id AND fbc.domain = m.domain
+            """)
+            cells_with_history = cursor.fetchone()[0]
+        self.assertEqual(nulls, 0)
+        self.assertEqual(present, cells_with_history)
+
+
+class TestLeaderboardGenerations(BaseTestCase):
+    """Pages read the "leaderboard_*" views over the published generation, not the chain."""
+
+    def _publish(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT publish_leaderboard_generation()")
+            return cursor.fetchone()[0]
+
+    def _served_name(self, model_id):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM leaderboard_final_model_context WHERE model_id = %s", [model_id])
+            return cursor.fetchone()[0]
+
+    def _rollback(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT rollback_leaderboard_generation()")
+
+    def _rename_first_model(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT model_id, name FROM mv_final_model_context ORDER BY model_id LIMIT 1")
+            model_id, name = cursor.fetchone()
+            cursor.execute("UPDATE mv_final_model_context SET name = name || ' (next)' WHERE model_id = %s",
+                           [model_id])
+        return model_id, name
+
+    def test_views_read_the_live_generation(self):
+        with connection.cursor() as cursor:
+            for view, relation in (('leaderboard_final_model_context', 'mv_final_model_context'),
+                                   ('leaderboard_final_benchmark_context', 'mv_final_benchmark_context'),
+                                   ('leaderboard_benchmark_minmax', 'mv_benchmark_minmax')):
+                cursor.execute("SELECT pg_get_viewdef(%s::regclass)", [view])
+                self.assertIn(f'leaderboard_live.{relation}', cursor.fetchone()[0])
+                cursor.execute(f"SELECT (SELECT COUNT(*) FROM {view}), (SELECT COUNT(*) FROM {relation})")
+                served, built = cursor.fetchone()
+                self.assertEqual(served, built, view)
+
+    def test_unchanged_generation_is_not_published(self):
+        with transaction.atomic():
+            self.assertEqual(self._publish(), 'unchanged')
+            transaction.set_rollback(True)
+
+    def test_publish_then_roll_back_and_forth(self):
+        with transaction.atomic():
+            model_id, name = self._rename_first_model()
+            self.assertEqual(self._served_name(model_id), name)
+            self.assertEqual(self._publish(), 'published')
+            self.assertEqual(self._served_name(model_id), f'{name} (next)')
+            self._rollback()
+            self.assertEqual(self._served_name(model_id), name)
+            self._rollback()
+            self.assertEqual(self._served_name(model_id), f'{name} (next)')
+            transaction.set_rollback(True)
+
+    def test_dropped_rows_are_not_published(self):
+        with transaction.atomic():
+            model_id, name = self._rename_first_model()
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM mv_final_model_context WHERE model_id <> %s", [model_id])
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                self._publish()
+            self.assertEqual(self._served_name(model_id), name)
+            transaction.set_rollback(True)
+
+    def test_emptied_generation_is_not_published(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM mv_final_model_context")
+            with self.assertRaisesMessage(DatabaseError, 'mv_final_model_context is empty'), transaction.atomic():
+                self._publish()
+            transaction.set_rollback(True)
+
+    def test_first_generation_may_be_empty(self):
+        """A freshly migrated database has no live generation and nothing to serve yet."""
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DROP SCHEMA leaderboard_live CASCADE")
+                cursor.execute("DELETE FROM mv_final_model_context")
+                self.assertEqual(self._publish(), 'published')
+                cursor.execute("SELECT COUNT(*) FROM leaderboard_final_model_context")
+                self.assertEqual(cursor.fetchone()[0], 0)
+            transaction.set_rollback(True)
+
+
+class TestModelRefresh(BaseTestCase):
+    """After a score change, ``refresh_model_rows()`` of the model must leave what a full refresh would."""
+
+    RELATIONS = (('mv_model_scores_json', 'model_id'), ('mv_final_model_context', 'model_id'),
+                 ('leaderboard_final_model_context', 'model_id'))
+
+    def _snapshot(self, cursor):
+        snapshot = {}
+        for relation, key in self.RELATIONS:
+            cursor.execute(f"SELECT t::text FROM {relation} t ORDER BY {key}")
+            snapshot[relation] = [row for row, in cursor.fetchall()]
+        return snapshot
+
+    def test_matches_full_refresh_after_score_change(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT s.id, s.model_id FROM brainscore_score s
+                    JOIN mv_final_model_context m ON m.model_id = s.model_id
+                    WHERE s.score_ceiled > 0 ORDER BY s.id LIMIT 1
+                """)
+                score_id, model_id = cursor.fetchone()
+                before = self._snapshot(cursor)
+                cursor.execute("UPDATE brainscore_score SET score_ceiled = score_ceiled / 2, "
+                               "score_raw = score_raw / 2 WHERE id = %s", [score_id])
+                cursor.execute("SELECT refresh_model_rows(%s::integer[])", [[model_id]])
+                per_model = self._snapshot(cursor)
+                cursor.execute("SELECT refresh_all_materialized_views(false)")
+                full = self._snapshot(cursor)
+            transaction.set_rollback(True)
+        self.assertNotEqual(before, full)
+        for relation, _ in self.RELATIONS:
+            self.assertEqual(per_model[relation], full[relation], relation)
+
+
+class TestRefreshLog(BaseTestCase):
+    def _last_run(self, cursor):
+        cursor.execute("SELECT id, kind, model_count FROM mv_refresh_run ORDER BY id DESC LIMIT 1")
+        run_id, kind, model_count = cursor.fetchone()
+        cursor.execute("SELECT step, row_count, relation_bytes, finished_at >= started_at "
+                       "FROM mv_refresh_step WHERE run_id = %s ORDER BY id", [run_id])
+        return kind, model_count, cursor.fetchall()
+
+    def test_full_refresh_logs_every_step(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT refresh_all_materialized_views(false)")
+                kind, _, steps = self._last_run(cursor)
+                cursor.execute("SELECT COUNT(*) FROM mv_final_model_context")
+                models = cursor.fetchone()[0]
+            transaction.set_rollback(True)
+        self.assertEqual(kind, 'full')
+        logged = {step: (row_count, size) for step, row_count, size, _ in steps}
+        for step in ('mv_benchmark_tree', 'mv_base_scores', 'final_agg_scores', 'mv_final_model_context',
+                     'mv_benchmark_minmax', 'publish_leaderboard_generation'):
+            self.assertIn(step, logged)
+        self.assertEqual(logged['mv_final_model_context'][0], models)
+        self.assertGreater(logged['mv_final_model_context'][1], 0)
+        self.assertTrue(all(ordered for *_, ordered in steps))
+
+    def test_model_refresh_is_its_own_kind_of_run(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT MIN(model_id) FROM mv_final_model_context")
+                model_id = cursor.fetchone()[0]
+                cursor.execute("SELECT refresh_model_rows(%s::integer[])", [[model_id]])
+                kind, model_count, steps = self._last_run(cursor)
+            transaction.set_rollback(True)
+        self.assertEqual((kind, model_count), ('models', 1))
+        logged = {step: row_count for step, row_count, *_ in steps}
+        self.assertEqual(logged['mv_final_model_context'], 1)
+        self.assertIn('domain ranks', logged)
+
+    def test_old_runs_of_the_same_kind_are_pruned(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    WITH runs AS (
+                        INSERT INTO mv_refresh_run (kind, started_at)
+                        SELECT 'retention test', now() FROM generate_series(1, 205)
+                        RETURNING id
+                    )
+                    INSERT INTO mv_refresh_step (run_id, step, started_at, finished_at)
+                    SELECT id, 'step', now(), now() FROM runs
+                """)
+                cursor.execute("INSERT INTO mv_refresh_run (kind, started_at) VALUES ('other kind', now())")
+                cursor.execute("SELECT start_refresh_run('retention test')")
+                latest = cursor.fetchone()[0]
+                cursor.execute("SELECT kind, COUNT(*), MAX(id) FROM mv_refresh_run "
+                               "WHERE kind IN ('retention test', 'other kind') GROUP BY kind ORDER BY kind")
+                runs = cursor.fetchall()
+                cursor.execute("SELECT COUNT(*) FROM mv_refresh_step s JOIN mv_refresh_run r ON r.id = s.run_id "
+                               "WHERE r.kind = 'retention test'")
+                steps = cursor.fetchone()[0]
+            transaction.set_rollback(True)
+        self.assertEqual(runs[1], ('retention test', 200, latest))
+        self.assertEqual(runs[0][1], 1)
+        self.assertEqual(steps, 199)
+
+
+class TestBenchmarkMetadataRefresh(BaseTestCase):
+    def _refresh(self, cursor):
+        cursor.execute("SELECT refresh_benchmark_metadata(false)")
+        return cursor.fetchone()[0]
+
+    def test_metadata_edit_skips_the_score_refresh(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT fbc.benchmark_type_id, fbc.benchmark_reference_id
+                    FROM mv_final_benchmark_context fbc
+                    JOIN mv_model_scores ms ON ms.benchmark_identifier = fbc.benchmark_type_id
+                    WHERE fbc.benchmark_reference_id IS NOT NULL
+                    LIMIT 1
+                """)
+                benchmark, reference_id = cursor.fetchone()
+                cursor.execute("UPDATE brainscore_reference SET bibtex = 'edited' WHERE id = %s", [reference_id])
+                self.assertEqual(self._refresh(cursor), 'metadata')
+                cursor.execute("SELECT DISTINCT benchmark_bibtex FROM mv_model_scores WHERE benchmark_identifier = %s",
+                               [benchmark])
+                self.assertEqual(cursor.fetchall(), [('edited',)])
+                cursor.execute("SELECT benchmark_bibtex FROM leaderboard_final_benchmark_context "
+                               "WHERE benchmark_type_id = %s", [benchmark])
+                self.assertEqual(cursor.fetchone()[0], 'edited')
+                cursor.execute("SELECT step FROM mv_refresh_step WHERE run_id = (SELECT MAX(id) FROM mv_refresh_run)")
+                steps = [step for step, in cursor.fetchall()]
+            transaction.set_rollback(True)
+        self.assertIn('mv_model_scores metadata', steps)
+        self.assertNotIn('mv_base_scores', steps)
+
+    def test_tree_change_falls_back_to_full_refresh(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE brainscore_benchmarktype SET "order" = "order" + 1
+                    WHERE identifier = (SELECT benchmark_type_id FROM mv_scored_benchmarks WHERE is_leaf LIMIT 1)
+                """)
+                self.assertEqual(self._refresh(cursor), 'full')
+                cursor.execute("SELECT kind FROM mv_refresh_run ORDER BY id DESC LIMIT 1")
+                self.assertEqual(cursor.fetchone()[0], 'full')
+            transaction.set_rollback(True)
+
+
+class TestRefreshLockOrder(BaseTestCase):
+    """A full refresh started while a metadata refresh holds its locks must queue on the
+    advisory lock before taking any view lock, not deadlock against it."""
+
+    DEADLINE = 120
+
+    def test_full_refresh_waits_for_metadata_refresh(self):
+        # Own connections: the test's connection runs inside the per-test transaction.
+        metadata = connection.copy()
+        self.addCleanup(metadata.close)
+        started, errors, pids = threading.Event(), [], []
+
+        def full_refresh():
+            try:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT pg_backend_pid()")
+                        pids.append(cursor.fetchone()[0])
+                        cursor.execute("SET LOCAL lock_timeout = '60s'")
+                        started.set()
+                        cursor.execute("SELECT refresh_all_materialized_views()")
+                    transaction.set_rollback(True)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                started.set()
+                connection.close()
+
+        thread = threading.Thread(target=full_refresh, daemon=True)
+        with metadata.cursor() as cursor:
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute("SELECT refresh_benchmark_metadata()")
+                thread.start()
+                started.wait(timeout=self.DEADLINE)
+                deadline = time.monotonic() + self.DEADLINE
+                waiting = []
+                while not waiting and thread.is_alive():
+                    self.assertLess(time.monotonic(), deadline, 'full refresh never waited')
+                    cursor.execute("SELECT locktype FROM pg_locks WHERE pid = %s AND NOT granted", pids)
+                    waiting = [locktype for locktype, in cursor.fetchall()]
+                self.assertEqual(waiting, ['advisory'])
+            finally:
+                cursor.execute("ROLLBACK")
+        thread.join(timeout=self.DEADLINE)
+        self.assertFalse(thread.is_alive(), 'full refresh did not finish')
+        self.assertEqual(errors, [])
+
+
+class TestConcurrentRefresh(BaseTestCase):
+    """Leaderboard reads issued while a full refresh runs must not wait for it to commit."""
+
+    READS = (
+        "SELECT COUNT(*) FROM mv_final_model_context",
+        "SELECT COUNT(*) FROM mv_final_benchmark_context",
+        "SELECT COUNT(*) FROM mv_model_scores_json",
+    )
+    # What pages read: the published generation
+    VIEW_READS = (
+        "SELECT COUNT(*) FROM leaderboard_final_model_context",
+        "SELECT COUNT(*) FROM leaderboard_final_benchmark_context",
+    )
+
+    # Reads give up after READ_LOCK_TIMEOUT, the refresh after REFRESH_LOCK_TIMEOUT, and the
+    # read loop after DEADLINE seconds, so a lock that is never released fails the test.
+    READ_LOCK_TIMEOUT = '2s'
+    REFRESH_LOCK_TIMEOUT = '10s'
+    DEADLINE = 120
+
+    def setUp(self):
+        # Reads go through their own autocommit connection: the test's connection runs
+        # inside the per-test transaction and would keep its locks until the test ends.
+        self.reader = connection.copy()
+        with self.reader.cursor() as cursor:
+            cursor.execute(f"SET lock_timeout = '{self.READ_LOCK_TIMEOUT}'")
+
+    def tearDown(self):
+        self.reader.close()
+
+    def _read_counts(self, reads=READS):
+        with self.reader.cursor() as cursor:
+            counts = []
+            for query in reads:
+                cursor.execute(query)
+                counts.append(cursor.fetchone()[0])
+            return counts
+
+    def _read_during_refresh(self, concurrently, reads=READS):
+        """Run the refresh in a second connection whose transaction stays open (holding its
+        locks) until the reads are done, then roll it back to leave web_tests unchanged.
+        Returns the counts read while the refresh ran and after it finished."""
+        refreshed, done, errors = threading.Event(), threading.Event(), []
+
+        def refresh():
+            try:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"SET LOCAL lock_timeout = '{self.REFRESH_LOCK_TIMEOUT}'")
+                        cursor.execute("SELECT refresh_all_materialized_views(%s)", [concurrently])
+                    refreshed.set()
+                    done.wait(timeout=self.DEADLINE)
+                    transaction.set_rollback(True)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                refreshed.set()
+                connection.close()
+
+        thread = threading.Thread(target=refresh, daemon=True)
+        thread.start()
+        try:
+            deadline = time.monotonic() + self.DEADLINE
+            during = []
+            while not refreshed.is_set():
+                self.assertLess(time.monotonic(), deadline, 'refresh did not finish')
+                during.append(self._read_counts(reads))
+            after = self._read_counts(reads)
+        finally:
+            done.set()
+            thread.join(timeout=self.DEADLINE)
+        self.assertFalse(thread.is_alive(), 'refresh did not finish')
+        self.assertEqual(errors, [])
+        return during, after
+
+    def test_reads_do_not_block_on_concurrent_refresh(self):
+        before = self._read_counts()
+        during, after = self._read_during_refresh(concurrently=True)
+        # Readers keep seeing the committed rows until the refresh commits.
+        self.assertGreater(len(during), 0)
+        for counts in during + [after]:
+            self.assertEqual(counts, before)
+
+    def test_plain_refresh_blocks_reads(self):
+        """Guards the test above: without CONCURRENTLY the same read times out on the lock."""
+        with self.assertRaises(OperationalError):
+            self._read_during_refresh(concurrently=False)
+
+    def test_leaderboard_views_do_not_block_on_plain_refresh(self):
+        before = self._read_counts(self.VIEW_READS)
+        during, after = self._read_during_refresh(concurrently=False, reads=self.VIEW_READS)
+        self.assertGreater(len(during), 0)
+        for counts in during + [after]:
+            self.assertEqual(counts, before)
@@ -19,7 +19,7 @@ class MaterializedViewMigrationTests(TestCase):
 
     def test_latest_snapshot_matches_current_definition(self):
         migration = import_module(
-            'benchmarks.migrations.0027_refresh_materialized_view_definitions'
+            'benchmarks.migrations.0044_refresh_log_retention'
         )
         current_sql = (
             MIGRATIONS_DIR.parent / 'sql' / 'mv.sql'
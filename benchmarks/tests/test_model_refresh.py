@@ -0,0 +1,189 @@
+import json
+import re
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.test import RequestFactory, SimpleTestCase
+
+from benchmarks import utils
+from benchmarks.models import BenchmarkMinMax, FinalBenchmarkContext, FinalModelContext
+
+MV_SQL = (Path(__file__).resolve().parents[1] / 'sql' / 'mv.sql').read_text(encoding='utf-8')
+
+
+class TestPerModelChainDefinition(SimpleTestCase):
+    """The tables ``refresh_model_rows()`` rewrites must be tables filled from their view,
+    never materialized views refreshed on the side."""
+
+    def setUp(self):
+        body = MV_SQL[MV_SQL.index('CREATE OR REPLACE FUNCTION refresh_model_rows'):]
+        self.pairs = re.findall(r"refresh_model_table\('(\w+)', '(\w+)', p_model_ids, p_concurrently\)", body)
+
+    def test_every_table_is_created_from_its_view(self):
+        self.assertEqual([table for table, _ in self.pairs], [
+            'mv_base_scores', 'mv_base_scores_fixed_engineering', 'mv_model_scores',
+            'mv_historical_versions', 'mv_model_scores_json', 'mv_final_model_context'])
+        for table, view in self.pairs:
+            self.assertIn(f'CREATE VIEW {view} AS', MV_SQL)
+            self.assertIn(f'CREATE TABLE {table} AS SELECT * FROM {view} WITH NO DATA;', MV_SQL)
+            self.assertNotIn(f'MATERIALIZED VIEW {table};', MV_SQL)
+            self.assertNotIn(f'CREATE MATERIALIZED VIEW {table} ', MV_SQL)
+
+    def test_transition_drops_every_table(self):
+        drop_block = MV_SQL[MV_SQL.index('DO $$'):MV_SQL.index('END $$;')]
+        for table, _ in self.pairs:
+            self.assertIn(f"'{table}'", drop_block)
+
+    def test_full_refresh_goes_through_the_same_path(self):
+        full = MV_SQL[MV_SQL.index('CREATE OR REPLACE FUNCTION refresh_all_materialized_views'):]
+        self.assertIn('PERFORM refresh_model_rows(NULL, p_concurrently);', full)
+
+
+class TestConcurrentRefreshDefinition(SimpleTestCase):
+    """``REFRESH ... CONCURRENTLY`` fails on a materialized view without a unique index."""
+
+    def setUp(self):
+        self.full = MV_SQL[MV_SQL.index('CREATE OR REPLACE FUNCTION refresh_all_materialized_views'):]
+
+    def test_concurrently_refreshed_views_have_unique_index(self):
+        views = re.findall(r"refresh_materialized_view\('(\w+)', p_concurrently\)", self.full)
+        self.assertIn('mv_final_benchmark_context', views)
+        for view in views:
+            self.assertRegex(MV_SQL, rf'CREATE UNIQUE INDEX \w+\s+ON {view} \(')
+
+    def test_read_facing_tables_have_primary_key(self):
+        for table in ('mv_model_scores_json', 'mv_final_model_context'):
+            self.assertIn(f'ALTER TABLE {table} ADD PRIMARY KEY (model_id);', MV_SQL)
+
+    def test_no_plain_refresh_of_read_facing_views(self):
+        plain = re.findall(r'REFRESH MATERIALIZED VIEW (\w+);', self.full)
+        self.assertEqual(plain, ['mv_model_scores_enriched'])
+
+
+class TestLeaderboardGenerationDefinition(SimpleTestCase):
+    """Pages read the published generation through views; a full refresh publishes last."""
+
+    def setUp(self):
+        self.served = re.findall(r"\('(\w+)', '(\w+)', '(\w+)'\)", MV_SQL[
+            MV_SQL.index('CREATE OR REPLACE FUNCTION leaderboard_served_relations'):
+            MV_SQL.index('LANGUAGE sql IMMUTABLE')])
+
+    def test_models_read_the_views(self):
+        views = {view: relation for relation, _, view in self.served}
+        for model in (FinalModelContext, FinalBenchmarkContext, BenchmarkMinMax):
+            self.assertIn(model._meta.db_table, views)
+            self.assertIn(f'CREATE VIEW {model._meta.db_table} AS SELECT * FROM {views[model._meta.db_table]};',
+                          MV_SQL)
+
+    def test_served_relations_have_their_key(self):
+        for relation, key, _ in self.served:
+            self.assertRegex(MV_SQL, rf'(CREATE UNIQUE INDEX \w+\s+ON|ALTER TABLE) {relation} (ADD PRIMARY KEY )?\({key}\)')
+
+    def test_full_refresh_publishes_last(self):
+        full = MV_SQL[MV_SQL.index('CREATE OR REPLACE FUNCTION refresh_all_materialized_views'):]
+        body = re.sub(r'\s*PERFORM log_refresh_step\(.*', '', full[:full.index('$$ LANGUAGE plpgsql;')])
+        self.assertRegex(body, r"PERFORM publish_leaderboard_generation\(p_max_row_drop\);\s+RAISE NOTICE 'Completed';")
+
+
+class TestRefreshModelsEndpoint(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _post(self, **params):
+        qs = '&'.join(f'{k}={v}' for k, v in params.items())
+        return self.factory.post(f'/refresh_models/vision/?{qs}')
+
+    def test_rejects_invalid_token(self):
+        with patch.object(utils, 'refresh_model_rows') as refresh:
+            resp = utils.refresh_models(self._post(token='wrong', model_ids='1'), domain='vision')
+        self.assertEqual(resp.status_code, 403)
+        refresh.assert_not_called()
+
+    def test_rejects_missing_or_malformed_ids(self):
+        for model_ids in ('', '1,x', ','):
+            with patch.object(utils, 'refresh_model_rows') as refresh:
+                resp = utils.refresh_models(self._post(token=settings.CACHE_REFRESH_TOKEN, model_ids=model_ids),
+                                            domain='vision')
+            self.assertEqual(resp.status_code, 400, model_ids)
+            refresh.assert_not_called()
+
+    def test_refreshes_rows_then_invalidates_domain_in_background(self):
+        calls = []
+        with patch.object(utils, 'refresh_model_rows', side_effect=lambda ids: calls.append(('rows', ids))), \
+                patch.object(utils, 'invalidate_domain_cache',
+                             side_effect=lambda domain: calls.append(('cache', domain)) or {'version': 4}):
+            resp = utils.refresh_models(self._post(token=settings.CACHE_REFRESH_TOKEN, model_ids='7,3,7'),
+                                        domain='vision')
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(json.loads(resp.content)['model_ids'], [3, 7])
+            with utils._model_refresh_lock:  # blocks until the worker releases it
+                pass
+        self.assertEqual(calls, [('rows', [3, 7]), ('cache', 'vision')])
+
+    def test_concurrent_trigger_returns_409(self):
+        with utils._model_refresh_lock, patch.object(utils, 'refresh_model_rows') as refresh:
+            resp = utils.refresh_models(self._post(token=settings.CACHE_REFRESH_TOKEN, model_ids='1'),
+                                        domain='vision')
+        self.assertEqual(resp.status_code, 409)
+        refresh.assert_not_called()
+
+
+class TestBenchmarkMetadataDefinition(SimpleTestCase):
+    def setUp(self):
+        body = MV_SQL[MV_SQL.index('CREATE OR REPLACE FUNCTION refresh_benchmark_metadata'):]
+        self.body = body[:body.index('$$ LANGUAGE plpgsql;')]
+
+    def test_patched_columns_are_model_score_columns_from_the_context(self):
+        view = MV_SQL[MV_SQL.index('CREATE VIEW v_model_scores AS'):MV_SQL.index('FROM final_agg_scores fa')]
+        for column, source in re.findall(r'(\w+) = fbc\.(\w+)', self.body):
+            self.assertRegex(view, rf'fbc\.{source}(\s+AS {column})?,')
+        for column in ('meta_id', 'ceiling', 'benchmark_bibtex', 'benchmark_reference_identifier'):
+            self.assertIn(f'{column} = fbc.', self.body)
+
+    def test_falls_back_to_full_refresh_when_the_tree_changes(self):
+        self.assertRegex(self.body, r"IF benchmark_tree_signature\(\) IS DISTINCT FROM signature THEN[^;]*;"
+                                    r"\s+UPDATE mv_refresh_run[^;]*;\s+PERFORM refresh_all_materialized_views")
+
+
+class TestRefreshBenchmarksEndpoint(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_rejects_invalid_token(self):
+        with patch.object(utils, 'refresh_benchmark_metadata') as refresh:
+            resp = utils.refresh_benchmarks(self.factory.post('/refresh_benchmarks/vision/?token=wrong'),
+                                            domain='vision')
+        self.assertEqual(resp.status_code, 403)
+        refresh.assert_not_called()
+
+    def test_refreshes_then_invalidates_domain_in_background(self):
+        calls = []
+        with patch.object(utils, 'refresh_benchmark_metadata', side_effect=lambda: calls.append('refresh') or 'full'), \
+                patch.object(utils, 'invalidate_domain_cache',
+                             side_effect=lambda domain: calls.append(domain) or {'version': 2}):
+            resp = utils.refresh_benchmarks(
+                self.factory.post(f'/refresh_benchmarks/language/?token={settings.CACHE_REFRESH_TOKEN}'),
+                domain='language')
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(json.loads(resp.content)['status'], 'started')
+            with utils._benchmark_refresh_lock:  # blocks until the worker releases it
+                pass
+        self.assertEqual(calls, ['refresh', 'language'])
+
+    def test_concurrent_trigger_returns_409(self):
+        with utils._benchmark_refresh_lock, patch.object(utils, 'refresh_benchmark_metadata') as refresh:
+            resp = utils.refresh_benchmarks(
+                self.factory.post(f'/refresh_benchmarks/vision/?token={settings.CACHE_REFRESH_TOKEN}'),
+                domain='vision')
+        self.assertEqual(resp.status_code, 409)
+        refresh.assert_not_called()
+
+
+class TestRefreshModelRows(SimpleTestCase):
+    def test_calls_sql_function_with_id_array(self):
+        connection = MagicMock()
+        with patch.object(utils, 'connection', connection):
+            utils.refresh_model_rows((5, 9))
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with('SELECT refresh_model_rows(%s::integer[])', [[5, 9]])
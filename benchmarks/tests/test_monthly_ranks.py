@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from benchmarks.management.commands.recompute_score_trends import _public_month_ranks
+from benchmarks.views import model_trends
+
+MONTHS = [f"2024-{m:02d}" for m in range(1, 7)]
+
+
+def _public_rows(rng, n_models=60):
+    rows = []
+    for model_id in range(1, n_models + 1):
+        for month in MONTHS[rng.integers(0, 4):]:
+            # 3dp scores with plenty of ties, some just below a rounding tie, some unscored months
+            score = rng.choice([0.0, float(np.round(rng.random(), 3)), 0.3849999, 0.385])
+            rows.append((model_id, month, score))
+    return rows
+
+
+class TestPublicMonthRanks(SimpleTestCase):
+    def test_matches_rank_frame(self):
+        rows = _public_rows(np.random.default_rng(0))
+        wide = (pd.DataFrame(rows, columns=['model_id', 'month', 'score'])
+                .pivot(index='model_id', columns='month', values='score').reset_index())
+        _, rank_df = model_trends.wide_scores_and_rank_df(wide, MONTHS)
+        for month in MONTHS:
+            month_rows = {mid: score for mid, m, score in rows if m == month}
+            private = {10_000 + mid: score for mid, score in month_rows.items()}  # never ranked
+            ranked, cohort_size = _public_month_ranks({**month_rows, **private}, set(month_rows))
+            expected = rank_df.set_index('model_id')[month].dropna()
+            self.assertEqual(dict(ranked), {mid: int(rank) for mid, rank in expected.items()})
+            self.assertEqual(cohort_size, len(expected))
+
+
+class TestRankIfInserted(SimpleTestCase):
+    def setUp(self):
+        model_trends.clear_trend_cache()
+        self.addCleanup(model_trends.clear_trend_cache)
+        shared_cache = LocMemCache('monthly-ranks-test', {})
+        shared_cache.clear()
+        self.rows = _public_rows(np.random.default_rng(1))
+        aggregates = MagicMock()
+        aggregates.objects.filter.return_value.values_list.return_value = self.rows
+        for patcher in (patch.object(model_trends, 'ModelMonthlyAggregate', aggregates),
+                        patch.object(model_trends, '_trend_data_version', return_value=1),
+                        patch.object(model_trends, 'get_domain_cache', return_value=(shared_cache, 1))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _rerank_with(self, scores_by_model):
+        """The previous read path: concat the models onto the public frame and re-rank everything."""
+        public_wide, _ = model_trends._load_public_wide_scores('vision')
+        focal = [{'model_id': model_id, **{m: scores.get(m) for m in MONTHS}}
+                 for model_id, scores in scores_by_model.items()]
+        df = pd.concat([public_wide, pd.DataFrame(focal)], ignore_index=True)
+        _, rank_df = model_trends.wide_scores_and_rank_df(df, MONTHS)
+        return rank_df
+
+    @staticmethod
+    def _random_scores(rng):
+        return {m: rng.choice([0.0, float(np.round(rng.random(), 3)), 0.385, 0.3849999])
+                for m in MONTHS[rng.integers(0, 6):]}
+
+    def test_matches_rerank(self):
+        rng = np.random.default_rng(2)
+        for trial in range(50):
+            model_id = 90_000 + trial
+            scores = self._random_scores(rng)
+            expected = self._rerank_with({model_id: scores})
+
+            focal_ranks = expected.iloc[-1][MONTHS].dropna()
+            self.assertEqual(model_trends.rank_if_inserted(scores, 'vision'),
+                             {m: int(r) for m, r in focal_ranks.items()})
+            pd.testing.assert_frame_equal(model_trends._spliced_rank_df({model_id: scores}, 'vision'), expected,
+                                          check_dtype=False)
+
+    def test_pair_matches_rerank(self):
+        rng = np.random.default_rng(3)
+        for trial in range(50):
+            pair = {90_000 + trial: self._random_scores(rng), 95_000 + trial: self._random_scores(rng)}
+            pd.testing.assert_frame_equal(model_trends._spliced_rank_df(pair, 'vision'), self._rerank_with(pair),
+                                          check_dtype=False)
+
+    def test_pair_plot_reads_the_narrative_frame(self):
+        """With one model of a compared pair private, the plotted ranks of both
+        models come from the spliced frame the hover narrative explains."""
+        private = self._random_scores(np.random.default_rng(4))
+        rank_df = model_trends._spliced_rank_df({90_000: private}, 'vision')
+        with patch.object(model_trends, '_load_model_names', return_value=({}, 1)):
+            dates, series_a, series_b, _, _ = model_trends._aligned_pair_series(
+                5, 90_000, 'vision', 'rank', rank_df=rank_df)
+        months = [d[:7] for d in dates]
+        expected = rank_df.set_index('model_id').loc[[5, 90_000], months]
+        for series, (_, row) in zip((series_a, series_b), expected.iterrows()):
+            self.assertEqual(series, [None if np.isnan(r) else int(r) for r in row])
+
+    def test_months_outside_public_frame_are_skipped(self):
+        self.assertEqual(model_trends.rank_if_inserted({'1999-01': .5, MONTHS[-1]: 0.0}, 'vision'), {})
+
+
+class TestLoadRankSeries(SimpleTestCase):
+    def setUp(self):
+        self.models = MagicMock()
+        persisted = MagicMock()
+        persisted.objects.filter.return_value.values_list.return_value = [('2024-01', 3)]
+        aggregates = MagicMock()
+        aggregates.objects.filter.return_value.values_list.return_value = [('2024-01', .5)]
+        for patcher in (patch.object(model_trends, 'Model', self.models),
+                        patch.object(model_trends, 'ModelMonthlyRank', persisted),
+                        patch.object(model_trends, 'ModelMonthlyAggregate', aggregates),
+                        patch.object(model_trends, 'rank_if_inserted', return_value={'2024-01': 7})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.persisted = persisted
+
+    def _is_public(self, public):
+        self.models.objects.filter.return_value.exists.return_value = public
+
+    def test_public_model_reads_persisted_ranks(self):
+        self._is_public(True)
+        self.assertEqual(model_trends._load_rank_series(5, 'vision'), {'2024-01': 3})
+
+    def test_model_made_private_ignores_its_stale_rows(self):
+        self._is_public(False)
+        self.assertEqual(model_trends._load_rank_series(5, 'vision'), {'2024-01': 7})
+        self.persisted.objects.filter.assert_not_called()
+
+    def test_public_model_without_rows_yet_is_inserted(self):
+        self._is_public(True)
+        self.persisted.objects.filter.return_value.values_list.return_value = []
+        self.assertEqual(model_trends._load_rank_series(5, 'vision'), {'2024-01': 7})
@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from benchmarks.management.commands.recompute_score_trends import (
+    _MonthlySweep, _depth_groups, _month_chunks, _month_end_utc, _month_iter, _sweep_months,
+    build_parent_child_map,
+)
+from benchmarks.tests.test_helpers.benchmarking import benchmark, logger, timed
+from benchmarks.tests.test_helpers.legacy_aggregate import _aggregate_for_month_fast as legacy_aggregate
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'fixtures'
+
+
+def _fixture_frames():
+    """``(tree_df, long_df)`` from the vision fixtures, shaped like the DB loaders' output."""
+    types = [row['fields'] for row in json.loads((FIXTURES / 'fixture-benchmarktypes.json').read_text())]
+    parent_of = {t['identifier']: t.get('parent') for t in types}
+
+    def depth(ident):
+        parent = parent_of.get(ident)
+        return 0 if parent is None or parent not in parent_of else depth(parent) + 1
+
+    tree_df = pd.DataFrame([{'identifier': i, 'parent_id': p, 'depth': depth(i)} for i, p in parent_of.items()])
+    scores = [row['fields'] for row in json.loads((FIXTURES / 'fixture-scores.json').read_text())]
+    model_ids = {}
+    long_df = pd.DataFrame({
+        'model_id': [model_ids.setdefault(tuple(s['model']), len(model_ids) + 1) for s in scores],
+        'benchmark': [s['benchmark'][0] for s in scores],
+        'score_ceiled': [s['score_ceiled'] for s in scores],
+        'end_timestamp': pd.to_datetime([s['end_timestamp'] for s in scores], utc=True),
+    })
+    return tree_df, long_df
+
+
+def _synthetic_history(seed=0, n_models=300, n_scores=40_000, years=10):
+    """A tree with 6 groups of 5 leaves under ``average_vision``, one group also scored
+    directly; models and leaves arrive over time; NaN scores, re-scores and ties."""
+    rng = np.random.default_rng(seed)
+    rows = [{'identifier': 'average_vision', 'parent_id': None, 'depth': 0}]
+    leaves = []
+    for g in range(6):
+        rows.append({'identifier': f'group_{g}', 'parent_id': 'average_vision', 'depth': 1})
+        for leaf in range(5):
+            leaves.append(f'leaf_{g}_{leaf}')
+            rows.append({'identifier': leaves[-1], 'parent_id': f'group_{g}', 'depth': 2})
+    leaves.append('group_5')  # a parent with its own scores
+    tree_df = pd.DataFrame(rows)
+
+    start = pd.Timestamp('2015-01-01', tz='UTC')
+    days = years * 365
+    model_start = rng.integers(0, days, size=n_models)
+    leaf_start = rng.integers(0, days, size=len(leaves))
+    model_idx = rng.integers(0, n_models, size=n_scores)
+    leaf_idx = rng.integers(0, len(leaves), size=n_scores)
+    day = np.maximum(model_start[model_idx], leaf_start[leaf_idx]) + rng.integers(0, 400, size=n_scores)
+    scores = np.round(rng.random(size=n_scores), 3)
+    scores[rng.random(size=n_scores) < .03] = np.nan
+    long_df = pd.DataFrame({
+        'model_id': model_idx + 1,
+        'benchmark': np.asarray(leaves)[leaf_idx],
+        'score_ceiled': scores,
+        # whole days, so re-scores on the same day tie on end_timestamp
+        'end_timestamp': start + pd.to_timedelta(np.minimum(day, days - 1), unit='D'),
+    })
+    return tree_df, long_df
+
+
+def _tree_args(tree_df):
+    return build_parent_child_map(tree_df), _depth_groups(tree_df), int(tree_df['depth'].max())
+
+
+class TestMonthlySweepParity(SimpleTestCase):
+    def assert_matches_legacy(self, tree_df, long_df, months, model_ids=None, known_leaves_at=None):
+        args = _tree_args(tree_df)
+        model_ids = sorted(long_df['model_id'].unique().tolist()) if model_ids is None else model_ids
+        sweep = _MonthlySweep(long_df, model_ids, *args, 'average_vision')
+        for month in months:
+            month_end = _month_end_utc(month)
+            known = known_leaves_at(month) if known_leaves_at else None
+            expected = legacy_aggregate(long_df, model_ids, *args, month_end, 'average_vision', known_leaves=known)
+            self.assertEqual(sweep.advance(month_end, known_leaves=known), expected, month)
+
+    def test_fixture_scores(self):
+        tree_df, long_df = _fixture_frames()
+        self.assert_matches_legacy(tree_df, long_df, ['2018-08', '2018-09', '2018-10'])
+
+    def test_fixture_scores_spread_over_months(self):
+        tree_df, long_df = _fixture_frames()
+        long_df['end_timestamp'] += pd.to_timedelta(np.arange(len(long_df)) % 97 * 11, unit='D')
+        self.assert_matches_legacy(tree_df, long_df, _month_iter('2018-08', '2021-12'))
+
+    def test_synthetic_ten_years(self):
+        tree_df, long_df = _synthetic_history()
+        self.assert_matches_legacy(tree_df, long_df, _month_iter('2014-12', '2026-01'))
+
+    def test_model_subset_with_known_leaves(self):
+        tree_df, long_df = _synthetic_history(seed=1, n_scores=10_000)
+        first = long_df.groupby('benchmark')['end_timestamp'].min().dt.strftime('%Y-%m').to_dict()
+        subset = list(range(1, 301, 9)) + [1000]  # 1000 has no scores at all
+        self.assert_matches_legacy(
+            tree_df, long_df[long_df['model_id'].isin(subset)], _month_iter('2014-12', '2026-01'),
+            model_ids=subset, known_leaves_at=lambda month: {leaf for leaf, m in first.items() if m <= month})
+
+    def test_empty_and_before_first_score(self):
+        tree_df, long_df = _fixture_frames()
+        args = _tree_args(tree_df)
+        sweep = _MonthlySweep(long_df.iloc[:0], [1, 2], *args, 'average_vision')
+        self.assertEqual(sweep.advance(_month_end_utc('2020-01'), known_leaves={'V1'}),
+                         ({1: 0.0, 2: 0.0}, {'V1'}, {1: frozenset(), 2: frozenset()}))
+        sweep = _MonthlySweep(long_df, [1], *args, 'average_vision')
+        self.assertEqual(sweep.advance(_month_end_utc('2018-08'))[0], {1: 0.0})
+
+
+@benchmark
+class TestMonthlySweepBenchmark(SimpleTestCase):
+    def test_ten_year_backfill(self):
+        tree_df, long_df = _synthetic_history(n_models=1000, n_scores=100_000)
+        args = _tree_args(tree_df)
+        model_ids = sorted(long_df['model_id'].unique().tolist())
+        months = _month_iter('2015-01', '2025-12')
+
+        def per_month():
+            for month in months:
+                legacy_aggregate(long_df, model_ids, *args, _month_end_utc(month), 'average_vision')
+
+        def swept():
+            sweep = _MonthlySweep(long_df, model_ids, *args, 'average_vision')
+            for month in months:
+                sweep.advance(_month_end_utc(month))
+
+        _, legacy = timed(per_month)
+        _, sweep = timed(swept)
+        logger.info('monthly aggregation, 1k models x 100k scores x %d months: legacy %.2fs, sweep %.2fs',
+                    len(months), legacy, sweep)
+
+
+class TestParallelSweep(SimpleTestCase):
+    def test_month_chunks_are_contiguous_and_balanced(self):
+        months = _month_iter('2015-01', '2016-10')
+        chunks = _month_chunks(months, 5)
+        self.assertEqual(sum(chunks, []), months)
+        self.assertEqual(sorted({len(chunk) for chunk in chunks}), [4, 5])
+        self.assertEqual(_month_chunks(months[:2], 8), [months[:1], months[1:2]])
+
+    def test_workers_match_serial_sweep(self):
+        tree_df, long_df = _synthetic_history(seed=2, n_scores=20_000)
+        model_ids = sorted(long_df['model_id'].unique().tolist())
+        args = (model_ids, _tree_args(tree_df), 'average_vision', _month_iter('2014-12', '2026-01'))
+        serial = list(_sweep_months(long_df, *args, workers=1))
+
+        parallel = list(_sweep_months(long_df, *args, workers=3))
+        self.assertEqual([month for month, _ in parallel], [month for month, _ in serial])
+        self.assertEqual(parallel, serial)
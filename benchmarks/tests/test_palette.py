@@ -0,0 +1,62 @@
+import random
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from benchmarks.tests.test_helpers.legacy_colors import calculate_representative_color
+from benchmarks.tests.test_helpers.legacy_index import representative_color as legacy_index_color, colors_gray
+from benchmarks.views.palette import (
+    COLOR_NONE, legacy_representative_color, legacy_representative_colors,
+    representative_color, representative_colors,
+)
+
+
+class TestLeaderboardPalette(SimpleTestCase):
+    def test_parity_with_previous_model_card_colors(self):
+        rng = random.Random(0)
+        values, mins, maxs, engineering = [], [], [], []
+        for _ in range(5000):
+            low, high = sorted((rng.uniform(-1, 2), rng.uniform(-1, 2)))
+            if rng.random() < .05:
+                high = low  # flat distributions
+            values.append(rng.uniform(low - .1, high + .1))
+            mins.append(low)
+            maxs.append(high)
+            engineering.append(rng.random() < .3)
+        expected = [calculate_representative_color(*args) for args in zip(values, mins, maxs, engineering)]
+
+        self.assertEqual(representative_colors(values, mins, maxs, engineering), expected)
+        self.assertEqual(representative_color(values[0], mins[0], maxs[0], engineering[0]), expected[0])
+
+    def test_grid_of_normalized_scores(self):
+        values = np.linspace(0, 1, 1001)
+        expected = [calculate_representative_color(value, 0.0, 1.0, False) for value in values]
+        self.assertEqual(representative_colors(values, 0.0, 1.0), expected)
+
+    def test_nan_is_none_color(self):
+        self.assertEqual(representative_colors([float('nan'), .5], 0, 1), [COLOR_NONE, 'rgba(244, 66, 4, 0.55)'])
+
+
+class TestLegacyPalette(SimpleTestCase):
+    def test_parity_with_legacy_representative_color(self):
+        rng = random.Random(1)
+        for _ in range(2000):
+            low, high = sorted((rng.uniform(-1, 2), rng.uniform(-1, 2)))
+            value = rng.uniform(low, high)
+            self.assertEqual(legacy_representative_color(value, low, high),
+                             legacy_index_color(value, min_value=low, max_value=high))
+            self.assertEqual(legacy_representative_color(value, low, high, scheme='gray'),
+                             legacy_index_color(value, min_value=low, max_value=high, colors=colors_gray))
+
+    def test_vectorized_matches_scalar(self):
+        values = [0.1, 0.35, float('nan'), 0.9]
+        self.assertEqual(legacy_representative_colors(values, 0.1, 0.9),
+                         [legacy_representative_color(value, 0.1, 0.9) for value in values])
+
+    def test_missing_values_are_gray(self):
+        gray = f"background-color: {COLOR_NONE}"
+        self.assertEqual(legacy_representative_color(None, 0.0, 1.0), gray)
+        self.assertEqual(legacy_representative_color(float('nan'), 0.0, 1.0), gray)
+        self.assertEqual(legacy_representative_color(0.5, None, None), gray)
+        # a single distinct score has no range to color against
+        self.assertEqual(legacy_representative_color(0.5, 0.5, 0.5), gray)
@@ -0,0 +1,255 @@
+import copy
+import random
+from decimal import Decimal, ROUND_HALF_UP
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from hypothesis import given, settings, strategies as st
+
+from benchmarks.tests.test_helpers import legacy_ranking
+from benchmarks.tests.test_helpers.benchmarking import benchmark, logger, timed
+from benchmarks.views.index import filter_and_rank_models
+from benchmarks.views.model import add_benchmark_rankings
+from benchmarks.views.model_trends import (
+    rank_transition_counts, rank_transition_lines, rank_transition_model_lines, wide_scores_and_rank_df,
+)
+from benchmarks.views.ranking import insertion_rank, min_rank, rank_scores, round_half_up
+
+
+def _exact_round(x, decimals):
+    return float(Decimal(repr(float(x))).quantize(Decimal(1).scaleb(-decimals), rounding=ROUND_HALF_UP))
+
+
+# scores as they come out of the MVs (3dp) plus their float neighbours, where a float trick would slip
+_three_decimals = st.integers(min_value=-100_000, max_value=100_000).map(lambda i: i / 1000)
+_scores = st.one_of(
+    st.floats(min_value=-1e6, max_value=1e6, allow_nan=False),
+    _three_decimals,
+    _three_decimals.map(lambda x: float(np.nextafter(x, np.inf))),
+    _three_decimals.map(lambda x: float(np.nextafter(x, -np.inf))),
+)
+
+
+def _leaderboard_models(rng, n):
+    models = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < .05:
+            value = 'X'
+        elif roll < .08:
+            value = rng.choice(['', None])
+        else:
+            value = f"{rng.randint(0, 1000) / 1000:.3f}"  # the MV pre-rounds to 3dp
+        scores = [{'benchmark_type_id': 'neural_vision', 'score_ceiled': '0.1'},
+                  {'benchmark_type_id': 'average_vision', 'score_ceiled': value}]
+        if rng.random() < .02:
+            scores = None
+        models.append(SimpleNamespace(model_id=i, name=f"model-{i:05d}", scores=scores))
+    return models
+
+
+def _trend_frame(rng, n_models, n_months):
+    month_cols = [f"{2018 + i // 12}-{i % 12 + 1:02d}" for i in range(n_months)]
+    values = rng.random((n_models, n_months))
+    precision = rng.random(values.shape)
+    values = np.where(precision < .5, np.round(values, 3), np.where(precision < .7, np.round(values, 4), values))
+    values[rng.random(values.shape) < .2] = 0.0  # no score that month
+    values[rng.random(values.shape) < .05] = np.nan
+    df = pd.DataFrame(values, columns=month_cols)
+    df.insert(0, 'model_id', np.arange(n_models))
+    return df, month_cols
+
+
+class TestRoundHalfUp(SimpleTestCase):
+    @settings(max_examples=2000, deadline=None)
+    @given(_scores, st.integers(min_value=0, max_value=4))
+    def test_matches_decimal(self, x, decimals):
+        self.assertEqual(round_half_up(x, decimals), _exact_round(x, decimals))
+
+    @settings(max_examples=200, deadline=None)
+    @given(st.lists(_scores, min_size=1, max_size=50))
+    def test_array_matches_scalar(self, values):
+        np.testing.assert_array_equal(round_half_up(values, 2), [round_half_up(x, 2) for x in values])
+
+    def test_ties_round_away_from_zero(self):
+        np.testing.assert_array_equal(round_half_up([0.125, 0.385, -0.125, 2.675, 1.005]),
+                                      [0.13, 0.39, -0.13, 2.68, 1.01])
+
+    def test_nan_passes_through(self):
+        self.assertTrue(np.isnan(round_half_up(float('nan'))))
+
+
+class TestMinRank(SimpleTestCase):
+    @settings(max_examples=300, deadline=None)
+    @given(st.lists(st.one_of(st.sampled_from([np.nan, 0.5, 0.25]), _three_decimals), min_size=1, max_size=40))
+    def test_matches_pandas(self, values):
+        expected = pd.Series(values, dtype=float).rank(method='min', ascending=False, na_option='keep')
+        np.testing.assert_array_equal(min_rank(values), expected.to_numpy())
+
+    def test_columns(self):
+        values = np.array([[.5, np.nan], [.7, .1], [.5, .1], [np.nan, .3]])
+        np.testing.assert_array_equal(min_rank(values, axis=0), [[2, np.nan], [1, 2], [2, 2], [np.nan, 1]])
+        np.testing.assert_array_equal(min_rank(values.T, axis=1), min_rank(values, axis=0).T)
+
+    def test_rank_scores(self):
+        rounded, ranks = rank_scores(['0.385', 'X', '', None, '0.39', 'abc', 0.2])
+        np.testing.assert_array_equal(rounded, [.39, np.nan, np.nan, np.nan, .39, np.nan, .2])
+        np.testing.assert_array_equal(ranks, [1, 4, np.nan, np.nan, 1, np.nan, 3])
+
+    def test_insertion_rank(self):
+        pool = [.9, .5, .5, np.nan, .1]
+        np.testing.assert_array_equal(insertion_rank([1., .9, .5, .3, 0., np.nan], pool), [1, 1, 2, 4, 5, np.nan])
+        self.assertEqual(insertion_rank(.5, []), 1.)
+
+
+class TestLeaderboardParity(SimpleTestCase):
+    def test_filter_and_rank_models(self):
+        for seed in range(20):
+            models = _leaderboard_models(random.Random(seed), 300)
+            legacy_models, new_models = copy.deepcopy(models), copy.deepcopy(models)
+            expected = legacy_ranking.filter_and_rank_models(legacy_models, 'vision')
+            actual = filter_and_rank_models(new_models, 'vision')
+            self.assertEqual([(m.model_id, m.rank) for m in actual], [(m.model_id, m.rank) for m in expected])
+
+    def test_ties_and_x(self):
+        models = [SimpleNamespace(model_id=i, name=name, scores=[{'benchmark_type_id': 'average_vision',
+                                                                  'score_ceiled': value}])
+                  for i, (name, value) in enumerate([('b', '0.385'), ('a', '0.39'), ('c', 'X'), ('d', '0.2')])]
+        ranked = filter_and_rank_models(models, 'vision')
+        self.assertEqual([(m.name, m.rank) for m in ranked], [('a', 1), ('b', 1), ('d', 3), ('c', 4)])
+
+
+class TestWideScoresParity(SimpleTestCase):
+    def test_exact_two_pass_rounding(self):
+        df, month_cols = _trend_frame(np.random.default_rng(0), 200, 12)
+        wide, _ = wide_scores_and_rank_df(df, month_cols)
+        raw = df[month_cols].to_numpy()
+        expected = np.vectorize(lambda x: np.nan if x != x or x == 0 else _exact_round(_exact_round(x, 3), 2))(raw)
+        np.testing.assert_array_equal(wide[month_cols].to_numpy(), expected)
+
+    def test_matches_legacy(self):
+        df, month_cols = _trend_frame(np.random.default_rng(1), 500, 24)
+        legacy_wide, legacy_rank = legacy_ranking.wide_scores_and_rank_df(df, month_cols)
+        wide, rank = wide_scores_and_rank_df(df, month_cols)
+        # the legacy float trick is off by 0.01 on some values just below a tie; compare where it was exact
+        raw = df[month_cols].to_numpy()
+        exact = np.vectorize(lambda x: np.nan if x != x or x == 0 else _exact_round(_exact_round(x, 3), 2))(raw)
+        legacy_values = legacy_wide[month_cols].to_numpy()
+        agree = (legacy_values == exact) | np.isnan(exact)
+        self.assertGreater(agree.mean(), .99)
+        np.testing.assert_array_equal(wide[month_cols].to_numpy()[agree], legacy_values[agree])
+        columns_agree = agree.all(axis=0)
+        self.assertTrue(columns_agree.any())
+        pd.testing.assert_frame_equal(rank[['model_id'] + list(np.array(month_cols)[columns_agree])],
+                                      legacy_rank[['model_id'] + list(np.array(month_cols)[columns_agree])])
+
+    def test_empty(self):
+        df = pd.DataFrame({'model_id': [1, 2]})
+        wide, rank = wide_scores_and_rank_df(df, [])
+        self.assertEqual(list(rank.columns), ['model_id'])
+        self.assertEqual(list(wide['model_id']), [1, 2])
+
+
+class TestBenchmarkRankingsParity(SimpleTestCase):
+    def test_add_benchmark_rankings(self):
+        rng = random.Random(0)
+        benchmarks = ['average_vision_v0', 'MajajHong2015.IT-pls_v3']
+
+        def model(model_id, public=True):
+            scores = []
+            for benchmark in benchmarks:
+                roll = rng.random()
+                value = (rng.choice(['', 'X', None]) if roll < .1
+                         else f"{rng.randint(0, 200) / 200:.3f}" if roll < .6 else rng.randint(0, 1000) / 1000)
+                scores.append({'versioned_benchmark_identifier': benchmark, 'score_ceiled': value})
+            return SimpleNamespace(model_id=model_id, public=public, scores=scores)
+
+        for _ in range(50):
+            models = [model(i, public=rng.random() < .9) for i in range(60)]
+            target = model(1000, public=False)
+            legacy_target, new_target = copy.deepcopy(target), copy.deepcopy(target)
+            legacy_ranking.add_benchmark_rankings(legacy_target, {'models': models})
+            add_benchmark_rankings(new_target, {'models': models})
+            self.assertEqual([score.get('rank') for score in new_target.scores],
+                             [score.get('rank') for score in legacy_target.scores])
+
+    def test_nan_score_keeps_its_value_as_rank(self):
+        target = SimpleNamespace(model_id=1, public=True,
+                                 scores=[{'versioned_benchmark_identifier': 'b_v1', 'score_ceiled': 'nan'}])
+        add_benchmark_rankings(target, {'models': []})
+        self.assertEqual(target.scores[0]['rank'], 'nan')
+
+
+class TestRankTransitionParity(SimpleTestCase):
+    def _rank_df(self, seed, n_models=80, n_months=24):
+        df, month_cols = _trend_frame(np.random.default_rng(seed), n_models, n_months)
+        # coarse scores so that ties and entering/leaving models are common
+        df[month_cols] = np.round(df[month_cols] * 20) / 20
+        _, rank_df = wide_scores_and_rank_df(df, month_cols)
+        return rank_df, month_cols
+
+    def test_matches_per_pair_loop(self):
+        for seed in range(10):
+            rank_df, month_cols = self._rank_df(seed)
+            rng = random.Random(seed)
+            for model_id in rng.sample(list(rank_df['model_id']), 5) + [-1]:  # -1: not in the frame
+                for _ in range(20):
+                    ym_prev, ym_curr = sorted(rng.sample(month_cols, 2))
+                    rank1, rank2 = rng.randint(1, 80), rng.randint(1, 80)
+                    self.assertEqual(
+                        rank_transition_model_lines(model_id, ym_prev, ym_curr, rank1, rank2, rank_df),
+                        legacy_ranking.rank_transition_model_lines(model_id, ym_prev, ym_curr, rank1, rank2, rank_df))
+
+    def test_series_matches_per_point_calls(self):
+        rank_df, month_cols = self._rank_df(0)
+        for model_id in rank_df['model_id'][:20]:
+            row = rank_df.loc[rank_df['model_id'] == model_id, month_cols].iloc[0]
+            dates = [f'{month}-28' for month in month_cols]
+            values = [None if np.isnan(r) else float(r) for r in row]
+            expected = {}
+            for i in range(1, len(dates)):
+                if values[i] is None or values[i - 1] is None or int(values[i]) == int(values[i - 1]):
+                    continue
+                expected[(month_cols[i - 1], month_cols[i])] = legacy_ranking.rank_transition_model_lines(
+                    model_id, month_cols[i - 1], month_cols[i], int(values[i - 1]), int(values[i]), rank_df)
+            self.assertEqual(rank_transition_lines(model_id, dates, values, rank_df), expected)
+
+    def test_no_transitions(self):
+        rank_df, _ = self._rank_df(0)
+        self.assertEqual([len(counts) for counts in rank_transition_counts(1, [], rank_df)], [0, 0, 0])
+
+
+@benchmark
+class TestRankingBenchmark(SimpleTestCase):
+    """Micro-benchmarks on a 10k model leaderboard and 10k model trend frames (parity with
+    the legacy implementations is tested above)."""
+
+    def test_10k_models(self):
+        models = _leaderboard_models(random.Random(0), 10_000)
+        _, legacy = timed(legacy_ranking.filter_and_rank_models, copy.deepcopy(models), 'vision')
+        _, vectorized = timed(filter_and_rank_models, copy.deepcopy(models), 'vision')
+        logger.info('filter_and_rank_models, 10k models: legacy %.0fms, vectorized %.0fms',
+                    legacy * 1000, vectorized * 1000)
+
+        df, month_cols = _trend_frame(np.random.default_rng(0), 10_000, 120)
+        _, legacy = timed(legacy_ranking.wide_scores_and_rank_df, df, month_cols)
+        _, vectorized = timed(wide_scores_and_rank_df, df, month_cols)
+        logger.info('wide_scores_and_rank_df, 10k x 120: legacy %.0fms, vectorized %.0fms',
+                    legacy * 1000, vectorized * 1000)
+
+    def test_rank_transitions_60_months(self):
+        df, month_cols = _trend_frame(np.random.default_rng(0), 10_000, 60)
+        _, rank_df = wide_scores_and_rank_df(df, month_cols)
+        model_id = int(rank_df['model_id'][0])
+        dates = [f'{month}-28' for month in month_cols]
+        values = [float(r) if r == r else None for r in rank_df.iloc[0][month_cols]]
+        transitions = [(month_cols[i - 1], month_cols[i], int(values[i - 1]), int(values[i]))
+                       for i in range(1, len(dates))
+                       if values[i] is not None and values[i - 1] is not None and values[i] != values[i - 1]]
+        _, legacy = timed(lambda: [legacy_ranking.rank_transition_model_lines(model_id, *t, rank_df)
+                                   for t in transitions])
+        _, vectorized = timed(rank_transition_lines, model_id, dates, values, rank_df)
+        logger.info('rank transition lines, 10k models x 60 months: legacy %.0fms, vectorized %.0fms',
+                    legacy * 1000, vectorized * 1000)
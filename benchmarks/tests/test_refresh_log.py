@@ -0,0 +1,99 @@
+import re
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from benchmarks.management.commands import refresh_leaderboard
+from benchmarks.management.commands.refresh_leaderboard import compare_steps
+
+MV_SQL = (Path(__file__).resolve().parents[1] / 'sql' / 'mv.sql').read_text(encoding='utf-8')
+
+
+def _step(step, seconds, run_id=1):
+    return {'run_id': run_id, 'step': step, 'seconds': seconds, 'row_count': 10, 'relation_bytes': 8192}
+
+
+class TestRefreshLogDefinition(SimpleTestCase):
+    def _function(self, name):
+        body = MV_SQL[MV_SQL.index(f'CREATE OR REPLACE FUNCTION {name}('):]
+        return body[:body.index('$$ LANGUAGE')]
+
+    def test_refresh_helpers_log_their_step(self):
+        self.assertIn('PERFORM log_refresh_step(target::text, started, target);',
+                      self._function('refresh_materialized_view'))
+        self.assertIn('PERFORM log_refresh_step(target::text, started, target, written);',
+                      self._function('refresh_model_table'))
+
+    def test_refreshes_start_a_run(self):
+        self.assertIn("PERFORM start_refresh_run('full');", self._function('refresh_all_materialized_views'))
+        self.assertIn('PERFORM start_refresh_run(', self._function('refresh_model_rows'))
+
+    def test_log_survives_migrations(self):
+        for table in ('mv_refresh_run', 'mv_refresh_step'):
+            self.assertIn(f'CREATE TABLE IF NOT EXISTS {table} (', MV_SQL)
+            self.assertIsNone(re.search(rf'DROP TABLE[^;]*\b{table}\b', MV_SQL))
+
+
+class TestCompareSteps(SimpleTestCase):
+    def test_median_of_earlier_runs(self):
+        history = [_step('mv_base_scores', s, run_id) for run_id, s in enumerate((1., 3., 2.), start=2)]
+        [row] = compare_steps([_step('mv_base_scores', 2.5)], history, threshold=1.5)
+        self.assertEqual((row['median'], row['regression']), (2., False))
+
+    def test_flags_slower_steps_beyond_noise(self):
+        history = [_step('mv_model_scores_json', 2.), _step('mv_benchmark_tree', .1)]
+        rows = compare_steps([_step('mv_model_scores_json', 3.1), _step('mv_benchmark_tree', .3)],
+                             history, threshold=1.5)
+        # The tree is 3x slower, but by less than MIN_REGRESSION_SECONDS.
+        self.assertEqual([row['regression'] for row in rows], [True, False])
+
+    def test_new_steps_have_no_median(self):
+        [row] = compare_steps([_step('domain ranks', 9.)], [], threshold=1.5)
+        self.assertEqual((row['median'], row['regression']), (None, False))
+
+
+class TestRefreshLeaderboardCommand(SimpleTestCase):
+    def _call(self, *args, steps=(), history=(), refreshed=None):
+        connection = MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (refreshed,)
+        run = (7, datetime(2026, 1, 1, tzinfo=timezone.utc), None)
+        out = StringIO()
+        with patch.object(refresh_leaderboard, 'connection', connection), \
+                patch.object(refresh_leaderboard, 'load_runs', side_effect=[[run], [(6, None, None)]]) as load_runs, \
+                patch.object(refresh_leaderboard, 'load_steps', side_effect=[list(steps), list(history)]):
+            call_command('refresh_leaderboard', *args, stdout=out)
+        self.load_runs = load_runs
+        return cursor, out.getvalue()
+
+    def test_full_refresh_then_breakdown(self):
+        cursor, out = self._call(steps=[_step('mv_benchmark_tree', .2)], history=[_step('mv_benchmark_tree', .2, 6)])
+        cursor.execute.assert_called_once_with('SELECT refresh_all_materialized_views(%s)', [True])
+        self.assertIn('mv_benchmark_tree', out)
+        self.assertIn('No step slower than its history', out)
+
+    def test_model_refresh_and_report_only(self):
+        cursor, _ = self._call('--model-ids', '5,3', '--plain')
+        cursor.execute.assert_called_once_with('SELECT refresh_model_rows(%s::integer[])', [[3, 5]])
+        cursor, _ = self._call('--report-only')
+        cursor.execute.assert_not_called()
+
+    def test_metadata_refresh_reports_the_refresh_that_ran(self):
+        for refreshed in ('metadata', 'full'):
+            cursor, _ = self._call('--metadata', refreshed=refreshed)
+            cursor.execute.assert_called_once_with('SELECT refresh_benchmark_metadata(%s)', [True])
+            self.assertEqual(self.load_runs.call_args_list[0].args[1:], (refreshed, 1))
+        with self.assertRaises(CommandError):
+            self._call('--metadata', '--model-ids', '1')
+
+    def test_fail_on_regression(self):
+        kwargs = dict(steps=[_step('final_agg_scores', 10.)], history=[_step('final_agg_scores', 2., 6)])
+        _, out = self._call(**kwargs)
+        self.assertIn('final_agg_scores', out.splitlines()[-1])
+        with self.assertRaisesMessage(CommandError, 'final_agg_scores'):
+            self._call('--fail-on-regression', **kwargs)
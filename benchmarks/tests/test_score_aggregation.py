@@ -0,0 +1,149 @@
+import math
+
+import numpy as np
+from django.db import connection
+from django.test import SimpleTestCase
+
+from .test_views import BaseTestCase
+from benchmarks.score_aggregation import BenchmarkTree, ScoreRows, aggregate_scores, load_inputs
+from benchmarks.tests.test_helpers.benchmarking import benchmark, logger, timed
+
+
+def _toy_tree():
+    """
+       average_vision                        engineering_vision
+            |-- behavior_vision                   |-- ImageNet-top1 (5)
+            |     |-- Rajalingham2018 (1)
+            |     |-- Geirhos2021 (2)
+            |     |-- Hidden2020 (3, not visible)
+            |     |-- Upcoming2026 (no instance)
+            |-- neural_vision
+                  |-- V1.Marques2020 (4)
+    """
+    types = [
+        ('average_vision', None, True), ('behavior_vision', 'average_vision', True),
+        ('neural_vision', 'average_vision', True), ('Rajalingham2018', 'behavior_vision', True),
+        ('Geirhos2021', 'behavior_vision', True), ('Hidden2020', 'behavior_vision', False),
+        ('Upcoming2026', 'behavior_vision', True), ('V1.Marques2020', 'neural_vision', True),
+        ('engineering_vision', None, True), ('ImageNet-top1', 'engineering_vision', True),
+    ]
+    instances = {'Rajalingham2018': 1, 'Geirhos2021': 2, 'Hidden2020': 3, 'V1.Marques2020': 4, 'ImageNet-top1': 5}
+    return BenchmarkTree.build(types, instances)
+
+
+def _aggregate(*records):
+    """``{(model_id, benchmark): (score_raw, score_ceiled)}``"""
+    aggregated = aggregate_scores(_toy_tree(), ScoreRows.from_records(records))
+    return {(model_id, benchmark): (raw, ceiled) for model_id, benchmark, raw, ceiled, *_ in aggregated.records()}
+
+
+class TestBenchmarkTree(SimpleTestCase):
+    def test_scored_children_count_visible_leaves_with_an_instance(self):
+        tree = _toy_tree()
+        scored_children = dict(zip(tree.identifiers, tree.scored_children))
+        self.assertEqual([scored_children[identifier] for identifier in (
+            'average_vision', 'behavior_vision', 'neural_vision', 'engineering_vision', 'Hidden2020')],
+            [2, 2, 1, 1, 0])
+        self.assertEqual(dict(zip(tree.identifiers, tree.depth))['V1.Marques2020'], 2)
+
+
+class TestAggregateScores(SimpleTestCase):
+    def test_parents_average_over_scored_children(self):
+        scores = _aggregate((1, 1, .8, .6, None), (1, 4, .5, .4, None))
+        self.assertEqual(scores[1, 'behavior_vision'], (.4, .3))
+        self.assertEqual(scores[1, 'neural_vision'], (.5, .4))
+        self.assertEqual(scores[1, 'average_vision'], ((.4 + .5) / 2, (.3 + .4) / 2))
+        self.assertNotIn((1, 'engineering_vision'), scores)
+
+    def test_nan_and_null_children(self):
+        scores = _aggregate((2, 1, math.nan, math.nan, None),
+                            (3, 1, None, None, None),
+                            (4, 1, None, None, 'Error: out of memory'))
+        raw, ceiled = scores[2, 'behavior_vision']
+        # A NaN score_raw still counts as a number (as 0), a NaN score_ceiled does not
+        self.assertEqual(raw, 0)
+        self.assertTrue(math.isnan(ceiled))
+        self.assertEqual(scores[3, 'behavior_vision'], (None, None))
+        self.assertEqual(scores[3, 'average_vision'], (None, None))
+        self.assertTrue(math.isnan(scores[4, 'Rajalingham2018'][1]))
+        self.assertTrue(math.isnan(scores[4, 'average_vision'][1]))
+
+    def test_best_duplicate_is_clamped(self):
+        scores = _aggregate((5, 1, None, .9, None), (5, 1, .5, 1.4, None), (5, 1, .4, .3, None),
+                            (5, 2, math.nan, -.2, None), (5, 2, .9, .9, None))
+        self.assertEqual(scores[5, 'Rajalingham2018'], (.5, 1.))
+        raw, ceiled = scores[5, 'Geirhos2021']
+        self.assertTrue(math.isnan(raw))
+        self.assertEqual(ceiled, 0.)
+
+    def test_engineering_scores_are_raw(self):
+        self.assertEqual(_aggregate((6, 5, .7, .2, None))[6, 'engineering_vision'], (.7, .7))
+
+    def test_invisible_and_unknown_benchmarks_are_ignored(self):
+        self.assertEqual(_aggregate((7, 3, .5, .5, None), (7, 99, .5, .5, None)), {})
+
+
+class TestAggregationMatchesSql(BaseTestCase):
+    """The reference implementation and ``populate_final_agg_scores()`` agree on the test database."""
+
+    def test_final_agg_scores(self):
+        tree, scores = load_inputs()
+        expected = {(model_id, benchmark): (raw, ceiled, depth, is_leaf)
+                    for model_id, benchmark, raw, ceiled, depth, is_leaf in aggregate_scores(tree, scores).records()}
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT model_id, benchmark, score_raw, score_ceiled, depth, is_leaf FROM final_agg_scores")
+            actual = {(model_id, benchmark): (None if raw is None else float(raw),
+                                              None if ceiled is None else float(ceiled), depth, is_leaf)
+                      for model_id, benchmark, raw, ceiled, depth, is_leaf in cursor.fetchall()}
+        self.assertGreater(len(actual), 0)
+        self.assertEqual(set(actual), set(expected))
+        for key, (raw, ceiled, depth, is_leaf) in actual.items():
+            expected_raw, expected_ceiled, expected_depth, expected_is_leaf = expected[key]
+            self.assertEqual((depth, is_leaf), (expected_depth, expected_is_leaf), key)
+            for value, expected_value in ((raw, expected_raw), (ceiled, expected_ceiled)):
+                if value is None or expected_value is None or math.isnan(expected_value):
+                    self.assertEqual(str(value), str(expected_value), key)
+                else:
+                    self.assertAlmostEqual(value, expected_value, places=9, msg=key)
+
+
+@benchmark
+class TestAggregationThroughput(SimpleTestCase):
+    """10,000 models scored on a quarter of 2,000 leaves, under 100 parents in 3 levels."""
+
+    def test_benchmark(self):
+        types = [('average_vision', None, True)]
+        instances = {}
+        for group in range(10):
+            types.append((f'group{group}', 'average_vision', True))
+            for subgroup in range(10):
+                types.append((f'group{group}.{subgroup}', f'group{group}', True))
+                for leaf in range(20):
+                    identifier = f'leaf{group}.{subgroup}.{leaf}'
+                    types.append((identifier, f'group{group}.{subgroup}', True))
+                    instances[identifier] = len(instances) + 1
+        tree = BenchmarkTree.build(types, instances)
+
+        rng = np.random.default_rng(0)
+        n_models, n_leaves = 10_000, len(instances)
+        cells = rng.random((n_models, n_leaves)) < .25
+        model_id, leaf = np.nonzero(cells)
+        size = len(model_id)
+        score_ceiled = rng.random(size)
+        scores = ScoreRows(model_id=model_id + 1, benchmark_id=leaf + 1, score_raw=score_ceiled * 2,
+                           score_ceiled=score_ceiled, raw_null=np.zeros(size, dtype=bool),
+                           ceiled_null=rng.random(size) < .01, error_comment=np.zeros(size, dtype=bool))
+
+        aggregated, elapsed = timed(aggregate_scores, tree, scores)
+        logger.info('aggregate %d scores of %d models x %d leaves into %d rows: %.2fs (%.0f scores/s)',
+                    size, n_models, n_leaves, len(aggregated), elapsed, size / elapsed)
+
+        # A model has a row under each parent it has a leaf score under
+        subgroups = cells.reshape(n_models, 100, 20).any(axis=2)
+        groups = subgroups.reshape(n_models, 10, 10).any(axis=2)
+        self.assertEqual(len(aggregated) - size, subgroups.sum() + groups.sum() + groups.any(axis=1).sum())
+        root = tree.identifiers[aggregated.benchmark] == 'average_vision'
+        self.assertEqual(root.sum(), n_models)
+        expected = np.where(scores.ceiled_null, 0, score_ceiled)
+        expected = np.bincount(model_id, weights=expected, minlength=n_models) / n_leaves
+        np.testing.assert_allclose(aggregated.score_ceiled[root][np.argsort(aggregated.model_id[root])], expected)
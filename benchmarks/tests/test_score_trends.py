@@ -20,7 +20,7 @@ from benchmarks.management.commands.recompute_score_trends import (
 from benchmarks.utils import refresh_score_trends
 from benchmarks.views import model_trends as model_views
 from benchmarks.views.model_trends import (
-    clear_trend_cache, load_and_build_comparison_trend,
+    TREND_BATCH_MAX_MODELS, clear_trend_cache, load_and_build_comparison_trend,
     rank_transition_model_lines, wide_scores_and_rank_df,
 )
 
@@ -73,6 +73,8 @@ class TestAggregationHelpers(BaseTestCase):
             def filter(self, **_kw):
                 # Mirror the real queryset's NOT-NULL guards so we exercise the same path.
                 return _FakeQS()
+            def order_by(self, *_args):
+                return self
             def values(self, *_args):
                 return [r for r in fake_rows
                         if r['score_ceiled'] is not None and r['end_timestamp'] is not None]
@@ -173,13 +175,14 @@ class TestRankNarrative(BaseTestCase):
         self.assertTrue(lines and 'passed' in lines[0].lower(), lines)
 
     def test_clear_trend_cache_drops_all_entries(self):
-        model_views._TREND_CACHE[('public_wide', 'vision', 12345)] = 'sentinel'
-        model_views._TREND_CACHE[('names', 'vision', 12345)] = 'sentinel'
+        model_views._TREND_CACHE.put(('public_wide', 'vision', 12345), 'sentinel')
+        model_views._TREND_CACHE.put(('names', 'vision', 12345), 'sentinel')
         # Also memoized so the recomputing process re-reads the version instead
         # of serving the stale one until the TTL expires.
         model_views._version_memo['vision'] = (12345, float('inf'))
         clear_trend_cache()
-        self.assertEqual(model_views._TREND_CACHE, {})
+        self.assertEqual(len(model_views._TREND_CACHE), 0)
+        self.assertEqual(model_views._TREND_CACHE.bytes, 0)
         self.assertEqual(model_views._version_memo, {})
 
     def test_rank_line_omits_benchmark_churn(self):
@@ -398,6 +401,51 @@ class TestComparisonTrendEndpoint(BaseTestCase):
             agg.assert_not_called()
 
 
+
+class TestTrendBatchEndpoint(BaseTestCase):
+    """``compare.trend_batch`` JSON endpoint."""
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def _get(self, ids):
+        return self.factory.get(f'/vision/compare/trend_batch/?ids={ids}')
+
+    def test_rejects_bad_ids(self):
+        from benchmarks.views.compare import trend_batch
+        for ids in ('1,foo', '', ','.join(str(i) for i in range(TREND_BATCH_MAX_MODELS + 1))):
+            with patch('benchmarks.views.compare.load_trend_batch') as loader:
+                self.assertEqual(trend_batch(self._get(ids), domain='vision').status_code, 400)
+                loader.assert_not_called()
+
+    def test_passes_ids_in_order(self):
+        from benchmarks.views.compare import trend_batch
+        payload = {'months': ['2024-01'], 'model_ids': [3, 1], 'scores': [[.5], [None]],
+                   'ranks': [[1], [None]], 'missing': []}
+        with patch('benchmarks.views.compare.load_trend_batch', return_value=payload) as loader, \
+                self._public_ids(1, 3):
+            resp = trend_batch(self._get('3,1'), domain='vision')
+        loader.assert_called_once_with([3, 1], 'vision')
+        self.assertEqual(json.loads(resp.content), payload)
+
+    def test_ids_no_longer_public_are_missing(self):
+        """A model made private after the last recompute is still in the cached
+        frames; the endpoint must not serve it."""
+        from benchmarks.views.compare import trend_batch
+        payload = {'months': ['2024-01'], 'model_ids': [3], 'scores': [[.5]], 'ranks': [[1]], 'missing': []}
+        with patch('benchmarks.views.compare.load_trend_batch', return_value=payload) as loader, \
+                self._public_ids(3):
+            resp = trend_batch(self._get('1,3,7'), domain='vision')
+        loader.assert_called_once_with([3], 'vision')
+        body = json.loads(resp.content)
+        self.assertEqual((body['model_ids'], body['missing']), ([3], [1, 7]))
+
+    @staticmethod
+    def _public_ids(*model_ids):
+        return patch('benchmarks.views.compare.FinalModelContext',
+                     **{'objects.filter.return_value.values_list.return_value': list(model_ids)})
+
 class TestRefreshEndpoint(BaseTestCase):
     """Auth, mode parsing, and lock contention. ``call_command`` is patched so
     no real recompute runs."""
@@ -0,0 +1,125 @@
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from benchmarks.views import search as search_views
+from benchmarks.views.search import SearchIndex, clear_search_index, get_search_index
+
+
+def _index():
+    return SearchIndex([
+        ('model', 1, 'alexnet'),
+        ('model', 2, 'alexnet_finetuned'),
+        ('model', 3, 'resnet-50-robust'),
+        ('model', 4, 'resnet-50'),
+        ('model', 5, 'cornet_s'),
+        ('benchmark', 10, 'MajajHong2015.IT-pls'),
+        ('benchmark', 11, 'Rajalingham2018-i2n'),
+    ])
+
+
+class TestSearchIndex(SimpleTestCase):
+    def test_exact_then_prefix_ordered_by_length(self):
+        names = [r['name'] for r in _index().search('alexnet')]
+        self.assertEqual(names, ['alexnet', 'alexnet_finetuned'])
+        names = [r['name'] for r in _index().search('res')]
+        self.assertEqual(names, ['resnet-50', 'resnet-50-robust'])
+
+    def test_token_prefix_and_substring(self):
+        results = _index().search('it')
+        self.assertEqual([(r['kind'], r['id']) for r in results], [('benchmark', 10)])
+        # "robust" only appears inside a name token: substring match via trigram postings
+        self.assertEqual([r['id'] for r in _index().search('obus')], [3])
+        # name prefix, then token prefix, then substring, regardless of length
+        index = SearchIndex([('model', 1, 'af'), ('model', 2, 'xfinx'), ('model', 3, 'a-fin'),
+                             ('model', 4, 'fine-tuned-model')])
+        self.assertEqual([r['id'] for r in index.search('fin')], [4, 3, 2])
+
+    def test_case_insensitive_kind_filter_and_limit(self):
+        self.assertEqual([r['id'] for r in _index().search('MAJAJ')], [10])
+        self.assertEqual(_index().search('2015', kind='model'), [])
+        self.assertEqual(len(_index().search('net', limit=2)), 2)
+        self.assertEqual(_index().search('   '), [])
+
+    def test_no_false_positive_from_shared_trigrams(self):
+        # every trigram of "netres" occurs somewhere, but not contiguously
+        self.assertEqual(_index().search('netres'), [])
+
+    @patch('benchmarks.views.search.get_search_index')
+    def test_endpoint(self, get_search_index):
+        get_search_index.return_value = _index()
+
+        from benchmarks.views.search import search
+
+        response = search(SimpleNamespace(method='GET', GET={'q': 'alex', 'kind': 'model', 'limit': '1'}), 'vision')
+        payload = json.loads(response.content)
+        self.assertEqual(payload['results'], [{'kind': 'model', 'id': 1, 'name': 'alexnet',
+                                               'url': '/model/vision/1'}])
+
+        response = search(SimpleNamespace(method='GET', GET={'q': 'alex', 'kind': 'user'}), 'vision')
+        self.assertEqual(response.status_code, 400)
+
+
+class TestGetSearchIndex(SimpleTestCase):
+    def setUp(self):
+        clear_search_index()
+        self.addCleanup(clear_search_index)
+        self.entries = [('model', 1, 'alexnet')]
+        patcher = patch.object(search_views, '_load_entries', side_effect=lambda domain: list(self.entries))
+        self.load_entries = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reused_until_recheck(self):
+        index = get_search_index('vision')
+        self.entries = [('model', 1, 'resnet')]
+        self.assertIs(get_search_index('vision'), index)
+        self.assertEqual(self.load_entries.call_count, 1)
+
+    def test_rebuilt_only_when_names_change(self):
+        with patch.object(search_views, '_RECHECK_SECONDS', 0):
+            index = get_search_index('vision')
+            self.assertIs(get_search_index('vision'), index)
+            self.entries = [('model', 1, 'resnet')]
+            self.assertEqual(get_search_index('vision').search('resnet')[0]['id'], 1)
+
+    def test_cache_invalidation_clears_the_index(self):
+        from benchmarks.utils import invalidate_domain_cache
+
+        index = get_search_index('vision')
+        self.entries = [('model', 1, 'resnet')]
+        invalidate_domain_cache('vision')
+        self.assertIsNot(get_search_index('vision'), index)
+
+    def test_slow_load_does_not_block_other_domains(self):
+        loading, release = threading.Event(), threading.Event()
+
+        def load_entries(domain):
+            if domain == 'language':
+                loading.set()
+                release.wait(5)
+            return list(self.entries)
+
+        self.load_entries.side_effect = load_entries
+        worker = threading.Thread(target=get_search_index, args=('language',))
+        worker.start()
+        self.addCleanup(worker.join)
+        self.addCleanup(release.set)
+        self.assertTrue(loading.wait(5))
+        reader = threading.Thread(target=get_search_index, args=('vision',))
+        reader.start()
+        reader.join(2)
+        self.assertFalse(reader.is_alive())
+
+    def test_load_overtaken_by_invalidation_is_not_stored(self):
+        def load_entries(domain):
+            entries = list(self.entries)
+            clear_search_index()  # a rename lands while these names are being read
+            return entries
+
+        self.load_entries.side_effect = load_entries
+        stale = get_search_index('vision')
+        self.load_entries.side_effect = lambda domain: list(self.entries)
+        self.assertIsNot(get_search_index('vision'), stale)
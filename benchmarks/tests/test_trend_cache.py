@@ -0,0 +1,137 @@
+import random
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from benchmarks.views import model_trends
+from benchmarks.views.trend_cache import TrendCache, approx_size
+
+
+class TestTrendCache(SimpleTestCase):
+    def test_lru_eviction_by_bytes(self):
+        value = np.zeros(100)  # 800 bytes
+        cache = TrendCache(max_bytes=3 * approx_size(value))
+        for kind in 'abc':
+            cache.put((kind, 'vision', 1), value)
+        cache.get(('a', 'vision', 1))  # 'b' is now the least recently used
+        cache.put(('d', 'vision', 1), value)
+        self.assertNotIn(('b', 'vision', 1), cache)
+        self.assertIn(('a', 'vision', 1), cache)
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+        self.assertEqual(cache.stats()['evictions'], {'lru': 1})
+
+    def test_kind_limit_only_evicts_its_family(self):
+        cache = TrendCache(kind_limits={'focal_coverage': 2})
+        cache.put(('public_wide', 'vision', 1), pd.DataFrame({'model_id': [1]}))
+        for model_id in range(5):
+            cache.put((f'focal_coverage:{model_id}', 'vision', 1), {'2024-01': ['leaf']})
+        self.assertIn(('public_wide', 'vision', 1), cache)
+        self.assertEqual([key for key in ((f'focal_coverage:{i}', 'vision', 1) for i in range(5)) if key in cache],
+                         [('focal_coverage:3', 'vision', 1), ('focal_coverage:4', 'vision', 1)])
+        stats = cache.stats()
+        self.assertEqual(stats['families']['focal_coverage']['entries'], 2)
+        self.assertEqual(stats['evictions'], {'kind_limit': 3})
+
+    def test_new_version_evicts_domain(self):
+        cache = TrendCache()
+        cache.put(('names', 'vision', 1), {1: 'a'})
+        cache.put(('edges', 'vision', 1), {})
+        cache.put(('names', 'language', 1), {2: 'b'})
+        cache.put(('names', 'vision', 2), {1: 'a'})
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(('edges', 'vision', 1), cache)
+        self.assertIn(('names', 'language', 1), cache)
+        self.assertEqual(cache.bytes, approx_size({1: 'a'}) + approx_size({2: 'b'}))
+
+    def test_stale_version_put_is_dropped(self):
+        cache = TrendCache()
+        cache.put(('names', 'vision', None), {1: 'a'})
+        cache.put(('names', 'vision', 2), {1: 'b'})
+        cache.put(('edges', 'vision', 2), {})
+        cache.put(('names', 'vision', 1), {1: 'a'})  # a loader that read version 1 before the bump
+        cache.put(('edges', 'vision', None), {})
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(('names', 'vision', 2)), {1: 'b'})
+        self.assertIn(('edges', 'vision', 2), cache)
+        self.assertEqual(cache.stats()['evictions'], {'version': 1, 'stale_version': 2})
+
+    def test_stats(self):
+        cache = TrendCache()
+        self.assertIsNone(cache.get(('names', 'vision', 1)))
+        cache.put(('names', 'vision', 1), {1: 'a'})
+        self.assertEqual(cache.get(('names', 'vision', 1)), {1: 'a'})
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_value_larger_than_budget_is_not_cached(self):
+        cache = TrendCache(max_bytes=100)
+        cache.put(('public_wide', 'vision', 1), np.zeros(1000))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+    def test_concurrent_access(self):
+        value = np.zeros(10)
+        cache = TrendCache(max_bytes=50 * approx_size(value), kind_limits={'focal_coverage': 20})
+        errors, gets = [], []
+
+        def worker(seed):
+            rng = random.Random(seed)
+            count = 0
+            try:
+                for _ in range(3000):
+                    domain = rng.choice(['vision', 'language'])
+                    version = rng.choice([1, 1, 1, 2])
+                    kind = rng.choice(['names', 'edges', f'focal_coverage:{rng.randrange(100)}'])
+                    if rng.random() < .5:
+                        cache.put((kind, domain, version), value)
+                    else:
+                        cache.get((kind, domain, version))
+                        count += 1
+            except Exception as e:  # surfaced below, threads swallow exceptions
+                errors.append(e)
+            gets.append(count)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        stats = cache.stats()
+        self.assertLessEqual(stats['bytes'], cache.max_bytes)
+        self.assertEqual(stats['bytes'], len(cache) * approx_size(value))
+        self.assertEqual(stats['entries'], sum(family['entries'] for family in stats['families'].values()))
+        self.assertLessEqual(stats['families'].get('focal_coverage', {}).get('entries', 0), 20)
+        self.assertEqual(stats['hits'] + stats['misses'], sum(gets))
+
+
+class TestModelCardCrawl(SimpleTestCase):
+    """Crawling every model card must not grow the per-worker trend cache without bound."""
+
+    def setUp(self):
+        model_trends.clear_trend_cache()
+        self.addCleanup(model_trends.clear_trend_cache)
+
+    def test_memory_is_bounded(self):
+        aggregates = MagicMock()
+        aggregates.objects.filter.return_value.values_list.side_effect = lambda *args: [
+            (f'2024-{month:02d}', [f'leaf_{month}_{i}' for i in range(5)]) for month in range(1, 13)]
+        limit = model_trends._TREND_CACHE.kind_limits['focal_coverage']
+        with patch.object(model_trends, 'ModelMonthlyAggregate', aggregates), \
+                patch.object(model_trends, '_trend_data_version', return_value=7):
+            for model_id in range(3 * limit):
+                model_trends._load_focal_coverage_deltas(model_id, 'vision')
+            entry_bytes = approx_size(model_trends._load_focal_coverage_deltas(0, 'vision'))
+            stats = model_trends.trend_cache_stats()
+            self.assertEqual(stats['families']['focal_coverage']['entries'], limit)
+            self.assertLessEqual(stats['bytes'], limit * entry_bytes)
+            self.assertEqual(stats['evictions']['kind_limit'], 2 * limit + 1)
+
+            # recently viewed cards are still served from the cache
+            calls = aggregates.objects.filter.call_count
+            model_trends._load_focal_coverage_deltas(3 * limit - 1, 'vision')
+            self.assertEqual(aggregates.objects.filter.call_count, calls)
@@ -0,0 +1,146 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from benchmarks.views import model_trends
+from benchmarks.views.trend_frames import frames_from_blob, pack_frames, unpack_frames
+
+
+def _aggregate_rows():
+    rng = np.random.default_rng(0)
+    months = [f"2024-{m:02d}" for m in range(1, 7)]
+    rows = []
+    for model_id in range(1, 41):
+        for month in months[rng.integers(0, 4):]:
+            rows.append((model_id, month, 0.0 if rng.random() < .1 else float(np.round(rng.random(), 3))))
+    return rows
+
+
+def _legacy_frames(rows):
+    """The frames as the trend loaders built them before they were shared."""
+    df = pd.DataFrame(rows, columns=['model_id', 'month', 'score'])
+    wide = df.pivot(index='model_id', columns='month', values='score').reset_index()
+    wide.columns.name = None
+    month_cols = [c for c in wide.columns if c != 'model_id']
+    _, rank_df = model_trends.wide_scores_and_rank_df(wide, month_cols)
+    return wide, rank_df
+
+
+class TestTrendFrameBlob(SimpleTestCase):
+    def test_round_trip_is_read_only_and_zero_copy(self):
+        scores = np.array([[.5, np.nan, .1], [.2, .3, np.nan]])
+        ranks = np.array([[1, np.nan, 1], [2, 1, np.nan]])
+        blob = pack_frames([7, 9], ['2024-01', '2024-02', '2024-03'], scores, ranks)
+        model_ids, months, decoded_scores, decoded_ranks = unpack_frames(blob)
+        np.testing.assert_array_equal(model_ids, [7, 9])
+        self.assertEqual(months, ['2024-01', '2024-02', '2024-03'])
+        np.testing.assert_array_equal(decoded_scores, scores)
+        np.testing.assert_array_equal(decoded_ranks, ranks)
+
+        wide, rank_df = frames_from_blob(blob)
+        column = wide['2024-01'].to_numpy()
+        self.assertFalse(column.flags.writeable)
+        self.assertTrue(np.shares_memory(column, decoded_scores) or
+                        np.shares_memory(column, np.frombuffer(blob, dtype=np.uint8)))
+        self.assertEqual(list(rank_df.columns), ['model_id', '2024-01', '2024-02', '2024-03'])
+
+    def test_empty(self):
+        wide, rank_df = frames_from_blob(pack_frames([], [], np.empty((0, 0)), np.empty((0, 0))))
+        self.assertEqual(list(wide.columns), ['model_id'])
+        self.assertTrue(rank_df.empty)
+
+    def test_rejects_foreign_bytes(self):
+        with self.assertRaises(ValueError):
+            unpack_frames(b'not a blob')
+
+
+class TestSharedPublicFrames(SimpleTestCase):
+    def setUp(self):
+        model_trends.clear_trend_cache()
+        self.addCleanup(model_trends.clear_trend_cache)
+        self.shared_cache = LocMemCache('trend-frames-test', {})
+        self.shared_cache.clear()
+        self.rows = _aggregate_rows()
+        self.aggregates = MagicMock()
+        self.aggregates.objects.filter.return_value.values_list.return_value = self.rows
+        for patcher in (patch.object(model_trends, 'ModelMonthlyAggregate', self.aggregates),
+                        patch.object(model_trends, '_trend_data_version', return_value=3),
+                        patch.object(model_trends, 'get_domain_cache', return_value=(self.shared_cache, 1))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_frames_match_previous_loaders(self):
+        expected_wide, expected_rank = _legacy_frames(self.rows)
+        wide, _ = model_trends._load_public_wide_scores('vision')
+        rank_df, _ = model_trends._load_public_rank_df('vision')
+        pd.testing.assert_frame_equal(wide, expected_wide, check_dtype=False)
+        pd.testing.assert_frame_equal(rank_df, expected_rank, check_dtype=False)
+
+    def test_restarted_worker_maps_shared_frames(self):
+        model_trends._load_public_wide_scores('vision')
+        self.assertEqual(self.aggregates.objects.filter.call_count, 1)
+
+        model_trends.clear_trend_cache()  # a fresh worker: empty local cache, same shared cache
+        wide, version = model_trends._load_public_wide_scores('vision')
+        self.assertEqual(version, 3)
+        self.assertEqual(self.aggregates.objects.filter.call_count, 1)
+        self.assertFalse(wide['2024-06'].to_numpy().flags.writeable)
+
+        # warm hits hand out the same frames instead of copies
+        again, _ = model_trends._load_public_wide_scores('vision')
+        self.assertIs(again, wide)
+
+    def test_prime_builds_once_for_all_workers(self):
+        model_trends.prime_public_trend_frames('vision')
+        self.assertIsNotNone(self.shared_cache.get(model_trends._public_frames_cache_key('vision', 3)))
+        model_trends.clear_trend_cache()
+        model_trends._load_public_rank_df('vision')
+        self.assertEqual(self.aggregates.objects.filter.call_count, 1)
+
+
+class TestTrendBatch(SimpleTestCase):
+    def setUp(self):
+        model_trends.clear_trend_cache()
+        self.addCleanup(model_trends.clear_trend_cache)
+        self.shared_cache = LocMemCache('trend-batch-test', {})
+        self.shared_cache.clear()
+        self.rows = _aggregate_rows()
+        self.aggregates = MagicMock()
+        self.aggregates.objects.filter.return_value.values_list.return_value = self.rows
+        for patcher in (patch.object(model_trends, 'ModelMonthlyAggregate', self.aggregates),
+                        patch.object(model_trends, '_trend_data_version', return_value=3),
+                        patch.object(model_trends, 'get_domain_cache', return_value=(self.shared_cache, 1))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_series_match_frames(self):
+        expected_wide, expected_rank = _legacy_frames(self.rows)
+        batch = model_trends.load_trend_batch([12, 3, 40, 3], 'vision')
+        self.assertEqual(batch['model_ids'], [12, 3, 40])
+        self.assertEqual(batch['missing'], [])
+        for i, model_id in enumerate(batch['model_ids']):
+            scores = expected_wide.set_index('model_id').loc[model_id, batch['months']]
+            ranks = expected_rank.set_index('model_id').loc[model_id, batch['months']]
+            self.assertEqual(batch['scores'][i], [s if s > 0 else None for s in scores])
+            self.assertEqual(batch['ranks'][i], [None if np.isnan(r) else int(r) for r in ranks])
+
+    def test_one_lookup_for_many_models(self):
+        batch = model_trends.load_trend_batch(list(range(1, 41)), 'vision')
+        self.assertEqual(len(batch['scores']), 40)
+        model_trends.load_trend_batch(list(range(40, 0, -1)), 'vision')
+        self.assertEqual(self.aggregates.objects.filter.call_count, 1)
+
+    def test_unknown_ids_are_missing(self):
+        batch = model_trends.load_trend_batch([5, 999], 'vision')
+        self.assertEqual((batch['model_ids'], batch['missing']), ([5], [999]))
+        self.assertTrue(all(len(row) == len(batch['months']) for row in batch['scores'] + batch['ranks']))
+
+    def test_month_axis_trimmed_to_requested_models(self):
+        self.aggregates.objects.filter.return_value.values_list.return_value = [
+            (1, '2024-01', .5), (1, '2024-02', .6), (2, '2024-02', 0.0), (2, '2024-03', .4)]
+        batch = model_trends.load_trend_batch([2], 'vision')
+        self.assertEqual(batch['months'], ['2024-03'])
+        self.assertEqual((batch['scores'], batch['ranks']), ([[.4]], [[1]]))
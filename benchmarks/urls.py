@@ -3,8 +3,8 @@ from django.conf import settings
 from django.urls import path
 from django.views.generic import RedirectView
 from .views import user, model, competition2022, competition2024, compare, community, \
-    release2_0, brain_model, content_utils, benchmark, explore, leaderboard, report_issue, blog, tutorials
-from .utils import show_token, refresh_cache, refresh_score_trends
+    release2_0, brain_model, content_utils, benchmark, explore, leaderboard, report_issue, blog, tutorials, search
+from .utils import show_token, refresh_cache, refresh_models, refresh_benchmarks, refresh_score_trends
 
 
 # all currently supported Brain-Score domains:
@@ -85,6 +85,8 @@ non_domain_urls = [
     # Triggers the refresh_cache function in utils.py when URL is visited
     path('refresh_cache/<str:domain>/', refresh_cache, name='refresh_cache'),
     path('refresh_score_trends/<str:domain>/', refresh_score_trends, name='refresh_score_trends'),
+    path('refresh_models/<str:domain>/', refresh_models, name='refresh_models'),
+    path('refresh_benchmarks/<str:domain>/', refresh_benchmarks, name='refresh_benchmarks'),
     
     # Report issue endpoint
     path('report-issue/', report_issue.report_issue_view, name='report_issue'),
@@ -105,19 +107,26 @@ for domain in supported_domains:
              name=f'{domain}-leaderboard'),
         path(f'{domain}/leaderboard/content/', partial(leaderboard.ag_grid_leaderboard_content, domain=domain),
              name=f'{domain}-leaderboard-content'),
+        path(f'{domain}/leaderboard/csv/', partial(leaderboard.csv_download, domain=domain),
+             name=f'{domain}-leaderboard-csv'),
         path(f'profile/{domain}/', user.Profile.as_view(domain=domain), name=f'{domain}-information'),
         path(f'profile/{domain}/submit/', user.Upload.as_view(domain=domain), name=f'{domain}-submit'),
         path(f'profile/<str:domain>/resubmit/', partial(user.resubmit, domain=domain), name=f'resubmit'),
         path(f'profile/{domain}/logout/', user.Logout.as_view(domain=domain), name=f'{domain}-logout'),
 
         path(f'{domain}/explore/', partial(explore.view, domain=domain), name=f'{domain}-explore'),
+        path(f'{domain}/search/', partial(search.search, domain=domain), name=f'{domain}-search'),
         path(f'model/<str:domain>/<int:id>', partial(model.view, domain=domain), name='model-view'),
         path(f'benchmark/<str:domain>/<int:id>', partial(benchmark.view, domain=domain), name='benchmark-view'),
         path(f'{domain}/compare/', partial(compare.view, domain=domain), name='{domain}-compare'),
         path(f'{domain}/compare/data/', partial(compare.dashboard_data, domain=domain),
              name=f'{domain}-compare-data'),
+        path(f'{domain}/compare/comparison_data/', partial(compare.comparison_data, domain=domain),
+             name=f'{domain}-compare-comparison-data'),
         path(f'{domain}/compare/trend_pair/', partial(compare.trend_pair, domain=domain),
              name=f'{domain}-compare-trend-pair'),
+        path(f'{domain}/compare/trend_batch/', partial(compare.trend_batch, domain=domain),
+             name=f'{domain}-compare-trend-batch'),
     ]
     all_domain_urls.append(domain_urls)
 
@@ -7,6 +7,7 @@ import threading
 from functools import wraps
 from django.core.cache import caches, cache as default_cache
 from django.conf import settings
+from django.db import connection
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import cache_page
@@ -104,6 +105,19 @@ def estimate_size(obj: Any) -> int:
         return 0
 
 # Cache utility functions and decorators
+def get_domain_cache(domain: str = "vision"):
+    """
+    Return ``(cache_backend, cache_version)`` for a domain: Redis if configured, otherwise the
+    default cache, and the current ``cache_version_{domain}`` bumped by invalidate_domain_cache.
+    For views that cache outside of cache_get_context but must be invalidated with it.
+    """
+    try:
+        cache_backend = caches["redis"]
+    except Exception:
+        cache_backend = default_cache
+    return cache_backend, cache_backend.get(f"cache_version_{domain}", 1)
+
+
 def cache_get_context(timeout=24 * 60 * 60, key_prefix: Optional[str] = None, use_compression: bool = False) -> Callable:
     """
     Decorator that caches get_context-like functions in Redis under a versioned key prefix.
@@ -267,6 +281,10 @@ def invalidate_domain_cache(domain: str = "vision", preserve_sessions: bool = Tr
     new_version = current_version + 1
     cache_backend.set(version_key, new_version)
 
+    # Other processes notice changed names on their own (see benchmarks.views.search)
+    from benchmarks.views.search import clear_search_index
+    clear_search_index()
+
     # If Redis client is unavailable, return warning but still bump version
     if not client:
         return {
@@ -440,13 +458,14 @@ def refresh_score_trends(request: HttpRequest, domain: str = "vision") -> JsonRe
     Usage:
         POST /benchmarks/refresh_score_trends/vision/?token=...&mode=latest
         POST /benchmarks/refresh_score_trends/vision/?token=...&mode=backfill&since=2024-01
+        POST /benchmarks/refresh_score_trends/vision/?token=...&mode=incremental
     """
     if request.GET.get('token') != settings.CACHE_REFRESH_TOKEN:
         logger.warning(f"Invalid token attempt for score-trend refresh: {domain}")
         return JsonResponse({"status": "error", "message": "Invalid authentication token"}, status=403)
 
     mode = request.GET.get('mode', 'latest')
-    if mode not in ('latest', 'backfill'):
+    if mode not in ('latest', 'backfill', 'incremental'):
         return JsonResponse({"status": "error", "message": f"invalid mode={mode}"}, status=400)
     since = request.GET.get('since')
 
@@ -477,6 +496,123 @@ def refresh_score_trends(request: HttpRequest, domain: str = "vision") -> JsonRe
     }, status=202)
 
 
+def refresh_model_rows(model_ids: List[int]) -> None:
+    """
+    Rebuild the leaderboard rows of ``model_ids`` -- base scores through aggregation to the
+    ``mv_final_model_context`` row, also in the published leaderboard generation -- with the
+    ``refresh_model_rows()`` SQL function, instead of
+    ``refresh_all_materialized_views()``. Enough after new scores for existing benchmarks; new
+    benchmarks or benchmark versions still need the full refresh.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT refresh_model_rows(%s::integer[])", [list(model_ids)])
+
+
+# Process-local lock so concurrent triggers don't rebuild the same rows at once.
+_model_refresh_lock = threading.Lock()
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def refresh_models(request: HttpRequest, domain: str = "vision") -> JsonResponse:
+    """Token-gated per-model leaderboard refresh, followed by a domain cache invalidation.
+
+    Runs in a daemon thread so the request returns immediately, like ``refresh_score_trends``.
+    Reuses ``settings.CACHE_REFRESH_TOKEN`` (the same token as ``refresh_cache``).
+
+    Usage:
+        POST /benchmarks/refresh_models/vision/?token=...&model_ids=123,456
+    """
+    if request.GET.get('token') != settings.CACHE_REFRESH_TOKEN:
+        logger.warning(f"Invalid token attempt for model refresh: {domain}")
+        return JsonResponse({"status": "error", "message": "Invalid authentication token"}, status=403)
+
+    try:
+        model_ids = sorted({int(part) for part in request.GET.get('model_ids', '').split(',') if part.strip()})
+    except ValueError:
+        model_ids = []
+    if not model_ids:
+        return JsonResponse({"status": "error", "message": "model_ids must be a comma-separated list of ids"},
+                            status=400)
+
+    if not _model_refresh_lock.acquire(blocking=False):
+        return JsonResponse({"status": "already_running", "domain": domain}, status=409)
+
+    def _run():
+        try:
+            start = time.time()
+            refresh_model_rows(model_ids)
+            logger.info(f"Refreshed leaderboard rows of {len(model_ids)} model(s) in {time.time() - start:.2f}s")
+            invalidate_domain_cache(domain=domain)
+        except Exception:
+            logger.exception(f"Leaderboard refresh of models {model_ids} failed")
+        finally:
+            _model_refresh_lock.release()
+
+    threading.Thread(target=_run, daemon=True).start()
+
+    return JsonResponse({
+        "status": "started",
+        "domain": domain,
+        "model_ids": model_ids,
+    }, status=202)
+
+
+def refresh_benchmark_metadata() -> str:
+    """
+    Publish edits of benchmark metadata (meta tables, references, ceilings) with the
+    ``refresh_benchmark_metadata()`` SQL function, which leaves scores alone. Falls back to
+    ``refresh_all_materialized_views()`` when the benchmark tree changed.
+
+    :return: the refresh that ran, ``'metadata'`` or ``'full'``
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT refresh_benchmark_metadata()")
+        return cursor.fetchone()[0]
+
+
+# Process-local lock so concurrent triggers don't both kick off a refresh.
+_benchmark_refresh_lock = threading.Lock()
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def refresh_benchmarks(request: HttpRequest, domain: str = "vision") -> JsonResponse:
+    """Token-gated benchmark-metadata refresh, followed by a domain cache invalidation.
+
+    Runs in a daemon thread so the request returns immediately, like ``refresh_models``: the
+    refresh falls back to a full one when the benchmark tree changed.
+    Reuses ``settings.CACHE_REFRESH_TOKEN`` (the same token as ``refresh_cache``).
+
+    Usage:
+        POST /benchmarks/refresh_benchmarks/vision/?token=...
+    """
+    if request.GET.get('token') != settings.CACHE_REFRESH_TOKEN:
+        logger.warning(f"Invalid token attempt for benchmark refresh: {domain}")
+        return JsonResponse({"status": "error", "message": "Invalid authentication token"}, status=403)
+
+    if not _benchmark_refresh_lock.acquire(blocking=False):
+        return JsonResponse({"status": "already_running", "domain": domain}, status=409)
+
+    def _run():
+        try:
+            start = time.time()
+            refresh = refresh_benchmark_metadata()
+            logger.info(f"Refreshed benchmark metadata ({refresh} refresh) in {time.time() - start:.2f}s")
+            invalidate_domain_cache(domain=domain)
+        except Exception:
+            logger.exception("Benchmark metadata refresh failed")
+        finally:
+            _benchmark_refresh_lock.release()
+
+    threading.Thread(target=_run, daemon=True).start()
+
+    return JsonResponse({
+        "status": "started",
+        "domain": domain,
+    }, status=202)
+
+
 def trigger_recache(domain: str = "vision", rebuild: bool = True, base_url: str = "http://localhost:8000") -> dict:
     """
     Trigger cache refresh via code. Not used in production.
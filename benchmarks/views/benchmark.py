@@ -1,14 +1,150 @@
 import logging
+import math
 from collections import namedtuple
 
-from django.db.models import F
+from django.core.paginator import Paginator
+from django.db.models import Case, F, FloatField, Max, Min, Value, When, Window
+from django.db.models.functions import RowNumber
 from django.shortcuts import render
 
 from benchmarks.models import BenchmarkInstance, Score
-from benchmarks.views.index import represent, representative_color, reference_identifier, ENGINEERING_ROOT
+from benchmarks.utils import get_domain_cache
+from benchmarks.views.index import represent, reference_identifier, ENGINEERING_ROOT
+from benchmarks.views.palette import legacy_representative_colors
 
 _logger = logging.getLogger(__name__)
 
+SCORES_PER_PAGE = 100
+SCORES_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+# Module-level so that rows can be pickled into the cache
+BenchmarkDisplay = namedtuple('BenchmarkDisplay', field_names=[
+    'short_name', 'depth'])
+ScoreDisplay = namedtuple('ScoreDisplay', field_names=[
+    'score_ceiled', 'score_raw', 'color', 'versioned_benchmark_identifier', 'benchmark'])
+ModelRow = namedtuple('ModelRow', field_names=[
+    'id', 'name', 'rank', 'public', 'competition', 'scores', 'reference_identifier',
+    'owner', 'primary_model_id', 'num_secondary_models'])
+
+
+class PageInfo(namedtuple('PageInfo', field_names=['number', 'num_pages', 'count', 'per_page'])):
+    """Picklable stand-in for django.core.paginator.Page, exposing what the template needs."""
+
+    @property
+    def has_previous(self):
+        return self.number > 1
+
+    @property
+    def has_next(self):
+        return self.number < self.num_pages
+
+    @property
+    def has_other_pages(self):
+        return self.num_pages > 1
+
+    @property
+    def previous_page_number(self):
+        return self.number - 1
+
+    @property
+    def next_page_number(self):
+        return self.number + 1
+
+    @property
+    def start_index(self):
+        return (self.number - 1) * self.per_page + 1 if self.count else 0
+
+
+def _ranked_score_rows(benchmark: BenchmarkInstance, domain: str, is_engineering: bool, page_number):
+    """
+    One page of public model scores on ``benchmark``, ranked by ``score_raw`` (NULL/NaN last).
+    Rank and min/max are computed in SQL with window functions over the whole benchmark, so
+    only the requested page is fetched. Pages, and the public score count that clamps the page
+    number, are cached per (benchmark instance, domain cache version).
+    """
+    try:
+        page_number = max(int(page_number), 1)
+    except (TypeError, ValueError):
+        page_number = 1
+    cache_backend, cache_version = get_domain_cache(domain)
+    key_prefix = f"{domain}:benchmark:{benchmark.id}:v{cache_version}"
+    public_scores = Score.objects.filter(benchmark_id=benchmark.id, model__public=True)
+    count = _cache_get(cache_backend, f"{key_prefix}:count")
+    if count is None:
+        count = public_scores.count()
+        _cache_set(cache_backend, f"{key_prefix}:count", count)
+    # clamp like Paginator.get_page before keying, so out-of-range page numbers share the last page's entry
+    page_number = min(page_number, max(math.ceil(count / SCORES_PER_PAGE), 1))
+    cache_key = f"{key_prefix}:page:{page_number}"
+    cached = _cache_get(cache_backend, cache_key)
+    if cached is not None:
+        return cached
+
+    # NaN sorts above every number in Postgres; treat it like NULL for ranking and min/max
+    valid_score = Case(When(score_raw__isnull=True, then=Value(None)),
+                       When(score_raw=float('nan'), then=Value(None)),
+                       default=F('score_raw'), output_field=FloatField())
+    scores = (public_scores
+              .annotate(valid_score=valid_score)
+              .annotate(rank=Window(RowNumber(), order_by=[F('valid_score').desc(nulls_last=True), F('id').asc()]),
+                        benchmark_min=Window(Min('valid_score')),
+                        benchmark_max=Window(Max('valid_score')))
+              .order_by('rank')
+              .values('rank', 'score_raw', 'score_ceiled', 'benchmark_min', 'benchmark_max',
+                      'model__id', 'model__name', 'model__public', 'model__competition',
+                      'model__reference__author', 'model__reference__year'))
+    paginator = Paginator(scores, SCORES_PER_PAGE)
+    page_obj = paginator.get_page(page_number)
+
+    benchmark_identifier = benchmark.benchmark_type.identifier
+    versioned_benchmark_identifier = f'{benchmark_identifier}_v{benchmark.version}'
+    benchmark_display = BenchmarkDisplay(short_name=benchmark_identifier, depth=0)
+    rows = list(page_obj.object_list)
+    benchmark_min = rows[0]['benchmark_min'] if rows else None
+    benchmark_max = rows[0]['benchmark_max'] if rows else None
+    colors = legacy_representative_colors([row['score_raw'] if row['score_raw'] is not None else float('nan')
+                                           for row in rows], benchmark_min, benchmark_max)
+    models = []
+    for row, color in zip(rows, colors):
+        models.append(ModelRow(
+            id=row['model__id'],
+            name=row['model__name'],
+            rank=row['rank'],
+            public=row['model__public'], competition=row['model__competition'],
+            scores=[ScoreDisplay(
+                score_ceiled=represent(row['score_raw'] if is_engineering else row['score_ceiled']),
+                score_raw=row['score_raw'],
+                color=color,
+                versioned_benchmark_identifier=versioned_benchmark_identifier,
+                benchmark=benchmark_display,
+            )],
+            # make table-body.html happy
+            owner=None, primary_model_id=None, num_secondary_models=None,
+            reference_identifier=(f"{row['model__reference__author']} et al., {row['model__reference__year']}"
+                                  if row['model__reference__author'] is not None else None),
+        ))
+    # Paginator/Page hold the lazy queryset; cache plain page metadata instead
+    page_info = PageInfo(number=page_obj.number, num_pages=paginator.num_pages, count=paginator.count,
+                         per_page=SCORES_PER_PAGE)
+    result = (models, page_info)
+    _cache_set(cache_backend, cache_key, result)
+    return result
+
+
+def _cache_get(cache_backend, key):
+    try:
+        return cache_backend.get(key)
+    except Exception as e:
+        _logger.warning(f"Cache GET error for {key}: {e}")
+        return None
+
+
+def _cache_set(cache_backend, key, value):
+    try:
+        cache_backend.set(key, value, SCORES_CACHE_TIMEOUT)
+    except Exception as e:
+        _logger.warning(f"Cache SET error for {key}: {e}")
+
 
 def view(request, id: int, domain: str):
     # benchmark
@@ -28,69 +164,7 @@ def view(request, id: int, domain: str):
         # Fallback: check if the identifier itself contains 'engineering'
         is_engineering = ENGINEERING_ROOT in benchmark_identifier
 
-    # scores
-    filtered_scores = (Score.objects
-                       .filter(benchmark_id=id, model__public=True))
-    # Get raw scores excluding null and NaN values
-    import math
-    all_raw_scores = (filtered_scores
-                     .values_list('score_raw', flat=True)
-                     .exclude(score_raw__isnull=True))
-    
-    # Filter out NaN values that Django might not exclude automatically
-    valid_scores = [score for score in all_raw_scores if not (isinstance(score, float) and math.isnan(score))]
-    
-    if valid_scores:
-        benchmark_max = max(valid_scores)
-        benchmark_min = min(valid_scores)
-    else:
-        # No valid scores available
-        benchmark_min = None
-        benchmark_max = None
-
-    # score display - get all scores and sort them properly in Python to handle NaN values
-    scores = (filtered_scores
-              .select_related('model', 'model__reference'))
-    BenchmarkDisplay = namedtuple('BenchmarkDisplay', field_names=[
-        'short_name', 'depth'])
-    ScoreDisplay = namedtuple('ScoreDisplay', field_names=[
-        'score_ceiled', 'score_raw', 'color', 'versioned_benchmark_identifier', 'benchmark'])
-    ModelRow = namedtuple('ModelRow', field_names=[
-        'id', 'name', 'rank', 'public', 'competition', 'scores', 'reference_identifier',
-        'owner', 'primary_model_id', 'num_secondary_models'])
-    # Sort scores properly in Python to handle NaN values correctly
-    # Convert to list and sort with custom key that puts valid scores first, then NaN/None
-    scores_list = list(scores)
-    
-    def sort_key(score_row):
-        score = score_row.score_raw
-        if score is None:
-            return (1, 0)  # None values last
-        elif isinstance(score, float) and math.isnan(score):
-            return (1, 0)  # NaN values last  
-        else:
-            return (0, -score)  # Valid scores first, sorted in descending order
-    
-    sorted_scores = sorted(scores_list, key=sort_key)
-    
-    models = []
-    for model_rank, score_row in enumerate(sorted_scores, start=1):
-        models.append(ModelRow(
-            id=score_row.model.id,
-            name=score_row.model.name,
-            rank=model_rank,
-            public=score_row.model.public, competition=score_row.model.competition,
-            scores=[ScoreDisplay(
-                score_ceiled=represent(score_row.score_raw if is_engineering else score_row.score_ceiled),
-                score_raw=score_row.score_raw,
-                color=representative_color(score_row.score_raw, min_value=benchmark_min, max_value=benchmark_max),
-                versioned_benchmark_identifier=versioned_benchmark_identifier,
-                benchmark=BenchmarkDisplay(short_name=benchmark_identifier, depth=0),
-            )],
-            # make table-body.html happy
-            owner=None, primary_model_id=None, num_secondary_models=None,
-            reference_identifier=reference_identifier(score_row.model.reference)
-        ))
+    models, page_obj = _ranked_score_rows(benchmark, domain, is_engineering, request.GET.get('page'))
 
     data_identifier, metric_identifier = benchmark_identifier.rsplit('-', 1)
     reference = benchmark.benchmark_type.reference
@@ -101,7 +175,7 @@ def view(request, id: int, domain: str):
                'reference_url': reference.url if reference is not None else None,
                'reference_bibtex': reference.bibtex if reference is not None else None,
                # scores
-               'models': models,
+               'models': models, 'page_obj': page_obj,
                # make table-body.html happy
                'has_user': False, 'not_shown_set': set(), 'benchmark_parents': None}
 
@@ -6,14 +6,14 @@ from django.shortcuts import render
 from django.urls import reverse
 from django.views.decorators.http import require_GET
 
-from .index import get_context, get_datetime_range
+from .index import get_context, get_comparison_data, get_datetime_range
 from .compare_models import (
     _build_benchmark_domain_map,
     _build_compare_dashboard_payload,
     _build_model_metadata,
     _build_benchmark_url_map,
 )
-from .model_trends import load_and_build_comparison_trend
+from .model_trends import TREND_BATCH_MAX_MODELS, load_and_build_comparison_trend, load_trend_batch
 from ..models import FinalModelContext
 
 
@@ -61,6 +61,16 @@ def dashboard_data(request, domain: str):
     )
 
 
+@require_GET
+def comparison_data(request, domain: str):
+    """Legacy per-model score matrix (see index.get_comparison_data), computed on first request."""
+    return JsonResponse(
+        get_comparison_data(show_public=True, domain=domain),
+        safe=False,
+        json_dumps_params={"separators": (",", ":")},
+    )
+
+
 @require_GET
 def trend_pair(request, domain: str):
     """JSON for the compare-page overlaid trend. Query: ``mid_a``, ``mid_b``."""
@@ -79,3 +89,25 @@ def trend_pair(request, domain: str):
     if mid_a not in public_ids or mid_b not in public_ids:
         raise Http404('unknown or non-public model id')
     return JsonResponse(load_and_build_comparison_trend(mid_a, mid_b, domain))
+
+
+@require_GET
+def trend_batch(request, domain: str):
+    """JSON score and rank series for many public models on one month axis.
+    Query: ``ids`` (comma-separated model ids, at most ``TREND_BATCH_MAX_MODELS``).
+    The shared frames can be up to a recompute behind, so ids that aren't
+    currently public come back under ``missing`` like unknown ones."""
+    try:
+        model_ids = [int(mid) for mid in request.GET.get('ids', '').split(',') if mid.strip()]
+    except ValueError:
+        return HttpResponseBadRequest('ids must be comma-separated integer model ids')
+    if not model_ids:
+        return HttpResponseBadRequest('ids is required')
+    if len(model_ids) > TREND_BATCH_MAX_MODELS:
+        return HttpResponseBadRequest(f'at most {TREND_BATCH_MAX_MODELS} model ids per request')
+    public_ids = set(FinalModelContext.objects.filter(
+        domain=domain, model_id__in=model_ids, public=True).values_list('model_id', flat=True))
+    batch = load_trend_batch([mid for mid in model_ids if mid in public_ids], domain)
+    found = set(batch['model_ids'])
+    batch['missing'] = [mid for mid in dict.fromkeys(model_ids) if mid not in found]
+    return JsonResponse(batch, json_dumps_params={"separators": (",", ":")})
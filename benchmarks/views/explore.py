@@ -1,4 +1,5 @@
 from django.shortcuts import render
+from django.urls import reverse
 
 from benchmarks.models import Model, BenchmarkInstance
 
@@ -19,10 +20,7 @@ def view(request, domain):
                         .order_by('name')
                         .values('name', 'id'))
 
-    other_models = (base_query
-                    .filter(group__isnull=True)
-                    .order_by('name')
-                    .values('name', 'id'))
+    # The full model list is no longer rendered; it is searched through views.search instead
 
     total_model_count = base_query.count()
 
@@ -35,7 +33,7 @@ def view(request, domain):
     context = {
         'domain': domain,
         'reference_models': reference_models,
-        'other_models': other_models,
+        'search_url': reverse(f'{domain}-search'),
         'total_model_count': total_model_count,
         'benchmarks': benchmarks,
     }
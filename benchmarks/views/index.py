@@ -8,13 +8,14 @@ from django.db.models import Q
 from django.core.cache import cache
 import numpy as np
 import pandas as pd
-from colour import Color
 from django.shortcuts import render
 from django.template.defaulttags import register
 from django.views.decorators.cache import cache_page
 
 from benchmarks.models import Score, FinalBenchmarkContext, FinalModelContext, Reference
 from ..utils import cache_get_context
+from .ranking import rank_scores
+from .palette import colors_redgreen, colors_gray, COLOR_NONE as color_None, legacy_representative_color
 from datetime import datetime
 
 _logger = logging.getLogger(__name__)
@@ -22,18 +23,8 @@ _logger = logging.getLogger(__name__)
 BASE_DEPTH = 1
 ENGINEERING_ROOT = 'engineering'
 
-'''
-Reference for previous color scheme
-Used for benchmark cards
-'''
-colors_redgreen = list(Color('red').range_to(Color('#1BA74D'), 101))
-colors_gray = list(Color('#f2f2f2').range_to(Color('#404040'), 101))
-# scale colors: highlight differences at the top-end of the spectrum more than at the lower end
-a, b = 0.2270617, 1.321928  # fit to (0, 0), (60, 50), (100, 100)
-colors_redgreen = [colors_redgreen[int(a * np.power(i, b))] for i in range(len(colors_redgreen))]
-colors_gray = [colors_gray[int(a * np.power(i, b))] for i in range(len(colors_gray))]
+# Legacy color scheme, used for benchmark cards. See views.palette.
 color_suffix = '_color'
-color_None = '#e0e1e2'
 
 
 def get_datetime_range(models=None, domain="vision"):
@@ -134,9 +125,9 @@ def get_context(user=None, domain="vision", benchmark_filter=None, model_filter=
     # Add submittable benchmarks for authenticated users
     submittable_benchmarks = _collect_submittable_benchmarks(benchmarks=benchmarks, user=user) if user else None
 
-    # Build CSV data and comparison data
-    # Combined to a single pass through models to avoid redundant calculations.
-    csv_data, comparison_data = _build_model_data(benchmarks, model_rows_reranked)
+    # CSV data and comparison data are not built here: they are only needed by the
+    # download and compare endpoints, which compute them lazily (see get_csv_data and
+    # get_comparison_data) and cache them under their own keys.
 
     # ------------------------------------------------------------------
     # 3) PREPARE FINAL CONTEXT
@@ -152,7 +143,6 @@ def get_context(user=None, domain="vision", benchmark_filter=None, model_filter=
         'not_shown_set': not_shown_set,
         'BASE_DEPTH': BASE_DEPTH,
         'has_user': user is not None,
-        'comparison_data': json.dumps(comparison_data),
         'citation_general_url': 'https://www.cell.com/neuron/fulltext/S0896-6273(20)30605-X',
         'citation_general_title': 'Integrative Benchmarking to Advance Neurally Mechanistic Models of Human Intelligence',
         'citation_general_bibtex': (
@@ -204,13 +194,34 @@ def get_context(user=None, domain="vision", benchmark_filter=None, model_filter=
             'citation_domain_bibtex': ''
         })
 
-    context['csv_downloadable'] = csv_data
     # PERF: Commented out - not currently used by any view/template
     # context['model_leaf_benchmark_scores_df'] = model_score_df
     # context['model_leaf_benchmark_timestamps_df'] = model_timestamp_df
     return context
 
 
+@cache_get_context(timeout=7 * 24 * 60 * 60, key_prefix="csv_data", use_compression=True)
+def get_csv_data(user=None, domain="vision", benchmark_filter=None, model_filter=None, show_public=False, force_user_cache=False):
+    """
+    CSV download of the leaderboard scores, built on first access from the (cached) get_context
+    rows and cached under its own key so that it is not carried around in every leaderboard payload.
+    """
+    context = get_context(user=user, domain=domain, benchmark_filter=benchmark_filter, model_filter=model_filter,
+                          show_public=show_public, force_user_cache=force_user_cache)
+    return _build_csv_data(context['benchmarks'], context['models'])
+
+
+@cache_get_context(timeout=7 * 24 * 60 * 60, key_prefix="comparison_data", use_compression=True)
+def get_comparison_data(user=None, domain="vision", benchmark_filter=None, model_filter=None, show_public=False, force_user_cache=False):
+    """
+    Per-model score/error/completeness records for the compare page, built on first access and
+    cached under its own key. See _build_comparison_data for the record format.
+    """
+    context = get_context(user=user, domain=domain, benchmark_filter=benchmark_filter, model_filter=model_filter,
+                          show_public=show_public, force_user_cache=force_user_cache)
+    return _build_comparison_data(context['models'])
+
+
 def filter_and_rank_models(models, domain: str = "vision"):
     """
     Filters out models without a valid average_{domain} score (must be a number or "X") and recalculates ranks.
@@ -219,86 +230,32 @@ def filter_and_rank_models(models, domain: str = "vision"):
     if not isinstance(models, list):
         models = list(models)
 
-    model_scores = []
+    # First average_{domain} score per model; models without one are excluded
+    benchmark_type_id = f"average_{domain}"
+    candidates, values = [], []
     for model in models:
         if model.scores is not None:
             for score in model.scores:
-                benchmark_id = score.get("benchmark_type_id")
-                if benchmark_id == f"average_{domain}":
-                    val = score.get("score_ceiled")
-                    if val is None or val == "":
-                        # Exclude models with None or empty string
-                        break
-                    if val == "X":
-                        # "X" is valid, but always ranked at the bottom
-                        model_scores.append((model, None, True))
-                        break
-                    try:
-                        # Use ROUND_HALF_UP for consistent rounding
-                        # Round to 2 decimal places to match display precision
-                        val_str = str(val) if not isinstance(val, str) else val
-                        val_decimal = Decimal(val_str).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                        val_float = float(val_decimal)
-                        model_scores.append((model, val_float, False))
-                    except (ValueError, TypeError):
-                        # Exclude models with non-numeric, non-"X" values
-                        break
+                if score.get("benchmark_type_id") == benchmark_type_id:
+                    candidates.append(model)
+                    values.append(score.get("score_ceiled"))
                     break
 
-    # Sort: valid numbers (descending), then "X" at the bottom (tied), exclude None/null
-    model_scores.sort(
-        key=lambda x: (
-            1 if x[2] else 0,  # is_x: False (0) comes before True (1)
-            -(x[1] if x[1] is not None else 0),  # valid numbers descending, "X" as 0
-            getattr(x[0], "name", str(getattr(x[0], "model_id", "")))  # tiebreaker
-        )
-    )
-
-    # Assign ranks: valid numbers get ranks, all "X" get the same (last) rank
-    rank_map = {}
-    current_rank = 1
-    previous_score = None
-    tied_count = 0
-
-    for i, (model, score, is_x) in enumerate(model_scores):
-        if is_x:
-            # All "X" get the same rank (after all valids)
-            break
-
-        if i == 0 or score != previous_score:
-            # If we had a tie, increment rank by the number of tied models
-            if tied_count > 0:
-                current_rank += tied_count
-            tied_count = 1
-            rank_map[model.model_id] = current_rank
-        else:
-            # This is a tie, use the same rank as the previous model
-            tied_count += 1
-            rank_map[model.model_id] = rank_map[model_scores[i-1][0].model_id]
-
-        previous_score = score
-
-    # Assign the same rank to all "X" (after all valids)
-    x_rank = current_rank + tied_count
-    for model, score, is_x in model_scores:
-        if is_x:
-            model.rank = x_rank
-        else:
-            model.rank = rank_map[model.model_id]
+    # Round to 2 decimal places (ROUND_HALF_UP) to match display precision; "X" is ranked
+    # last (tied), None/empty/non-numeric values are excluded
+    rounded, ranks = rank_scores(values, decimals=2)
+    ranked = [(model, score, int(rank)) for model, score, rank in zip(candidates, rounded.tolist(), ranks.tolist())
+              if rank == rank]
+    # Sort by rank, ties by name
+    ranked.sort(key=lambda x: (x[2], getattr(x[0], "name", str(getattr(x[0], "model_id", "")))))
+    for model, _, rank in ranked:
+        model.rank = rank
+    return [model for model, _, _ in ranked]
 
-    # Return all models, sorted by rank
-    ranked_models = [model for model, _, _ in model_scores]
-    ranked_models.sort(key=lambda model: model.rank)
-    return ranked_models
 
-
-def _build_model_data(benchmarks: List[FinalBenchmarkContext], 
-                      models: List[FinalModelContext]
-                      ) -> Tuple[Union[str, pd.DataFrame], List[Dict[str, Any]]]:
+def _build_comparison_data(models: List[FinalModelContext]) -> List[Dict[str, Any]]:
     """
-    Build both comparison data and scores dataframe in a single pass through models.
-    Returns: (csv_data, comparison_data) tuple
-    comparison_data: Build an array object for use by the JavaScript frontend to dynamically compare trends across benchmarks.
+    Build an array object for use by the JavaScript frontend to dynamically compare trends across benchmarks.
         ```
         [
             {"dicarlo.Rajalingham2018-i2n_v2-score": .521,
@@ -310,53 +267,52 @@ def _build_model_data(benchmarks: List[FinalBenchmarkContext],
             ...
         ]
         ```
-    csv_data: Build a dataframe of model scores for download as CSV.
+    """
+    comparison_data = []
+    for model in models:
+        if model.scores is None:
+            continue
+        model_data = {
+            "model": model.name
+        }
+        for score in model.scores:
+            versioned_benchmark_id = score["versioned_benchmark_identifier"]
+            model_data.update({
+                f"{versioned_benchmark_id}-score": score['score_ceiled'],
+                f"{versioned_benchmark_id}-error": score.get('error', None),
+                f"{versioned_benchmark_id}-is_complete": score['is_complete']
+            })
+        comparison_data.append(model_data)
+    return comparison_data
+
+
+def _build_csv_data(benchmarks: List[FinalBenchmarkContext], models: List[FinalModelContext]) -> str:
+    """
+    Build a CSV of model scores (one row per model, one column per benchmark) for download.
     """
     # Pre-compute benchmark names set
     benchmark_names = {benchmark.benchmark_type_id for benchmark in benchmarks}
 
-    # Initialize lists of dictionaries to store data
-    records = []  # For CSV download
-    comparison_data = []  # For comparison page
-
-    # Single pass through models
+    records = []
     for model in models:
-        # Initialize both data structures for this model
+        if model.scores is None:
+            continue
         record = {
             "model_name": model.name,
             "layers": json.dumps(model.layers) if model.layers else ""  # Add layer map information to CSV download as a column
         }
-        model_data = {
-            "model": model.name
-        }
-
-        # Process all scores for this model
-        if model.scores is not None:
-            for score in model.scores:
-                benchmark_id = score["benchmark_type_id"]
-                versioned_benchmark_id = score["versioned_benchmark_identifier"]
-                # Add to scores dataframe if it's a relevant benchmark
-                if benchmark_id in benchmark_names:
-                    record[benchmark_id] = score["score_ceiled"]
-
-                model_data.update({
-                    f"{versioned_benchmark_id}-score": score['score_ceiled'],
-                    f"{versioned_benchmark_id}-error": score.get('error', None),
-                    f"{versioned_benchmark_id}-is_complete": score['is_complete']
-                })
-
-            # Add to both result sets
-            records.append(record)
-            comparison_data.append(model_data)
-
-    # Create DataFrame and convert to CSV
-    csv_data = "No models submitted yet."
-    if records:
-        df = pd.DataFrame.from_records(records)
-        df.set_index('model_name', inplace=True)
-        csv_data = df.to_csv(index=True)
-
-    return csv_data, comparison_data
+        for score in model.scores:
+            benchmark_id = score["benchmark_type_id"]
+            # Only keep columns for the benchmarks in this context
+            if benchmark_id in benchmark_names:
+                record[benchmark_id] = score["score_ceiled"]
+        records.append(record)
+
+    if not records:
+        return "No models submitted yet."
+    df = pd.DataFrame.from_records(records)
+    df.set_index('model_name', inplace=True)
+    return df.to_csv(index=True)
 
 # Resubmissions are currently not supported. Retaining for future use.
 def _collect_submittable_benchmarks(benchmarks: List[FinalBenchmarkContext], user: User) -> Dict:
@@ -393,43 +349,9 @@ def represent(value):
     elif value == "NaN":
         return "X"
 
-def normalize_value(value, min_value, max_value):
-    normalized_value = (value - min_value) / (max_value - min_value)
-    return .7 * normalized_value  # scale down to avoid extremely green colors
-
-def normalize_alpha(value, min_value, max_value):
-    # intercept and slope equations are from solving `y = slope * x + intercept`
-    # with points [min_value, 10] (10 instead of 0 to not make it completely transparent) and [max_value, 100].
-    slope = -.9 / (min_value - max_value)
-    intercept = .1 - slope * min_value
-    result = slope * value + intercept
-    return float(result)
-
 def representative_color(value, min_value=None, max_value=None, colors=colors_redgreen):
-    if not isinstance(value, (int, float)):    
-        return f"background-color: {color_None}"
-    if np.isnan(value):
-        return f"background-color: {color_None}"
-    # Check if min_value or max_value is NaN, which would cause normalize_value to return NaN
-    if min_value is not None and np.isnan(min_value):
-        return f"background-color: {color_None}"
-    if max_value is not None and np.isnan(max_value):
-        return f"background-color: {color_None}"
-    normalized_value = normalize_value(value, min_value=min_value, max_value=max_value)  # normalize to range
-    # Additional safety check in case normalized_value is NaN
-    if np.isnan(normalized_value):
-        return f"background-color: {color_None}"
-    step = int(100 * normalized_value)
-    try:
-        color = colors[step]
-    except IndexError:
-        color = colors[-1]
-    color = tuple(c * 255 for c in color.rgb)
-    fallback_color = tuple(round(c) for c in color)
-    normalized_alpha = normalize_alpha(value, min_value=min_value, max_value=max_value) \
-        if min_value is not None else (100 * value)
-    color += (normalized_alpha,)
-    return f"background-color: rgb{fallback_color}; background-color: rgba{color};"
+    scheme = 'gray' if colors is colors_gray else 'redgreen'
+    return legacy_representative_color(value, min_value=min_value, max_value=max_value, scheme=scheme)
 
 
 def get_visibility(model, user):
@@ -6,11 +6,13 @@ from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 
 import numpy as np
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.views.decorators.http import require_GET
 
 from ..models import Model
 from ..utils import cache_get_context, cache_page_for_public_only, load_news
-from .index import get_context, get_datetime_range
+from .index import get_context, get_csv_data, get_datetime_range
 
 logger = logging.getLogger(__name__)
 
@@ -763,3 +765,21 @@ def ag_grid_leaderboard_content(request, domain: str):
 
     # Return the full AG-Grid template
     return render(request, 'benchmarks/leaderboard/ag-grid-leaderboard-content.html', context)
+
+
+@require_GET
+def csv_download(request, domain: str):
+    """
+    CSV of leaderboard scores. Built lazily on first request (see index.get_csv_data) rather
+    than shipped inside every leaderboard payload. ``user_view=true`` returns the signed-in
+    user's models, with public models included when ``include_public`` is set.
+    """
+    user_view = request.GET.get('user_view', 'false').lower() == 'true'
+    if user_view and request.user.is_authenticated:
+        include_public = request.GET.get('include_public', 'false').lower() in ('1', 'true', 'yes')
+        csv_data = get_csv_data(user=request.user, domain=domain, show_public=include_public, force_user_cache=True)
+    else:
+        csv_data = get_csv_data(user=None, domain=domain, show_public=True)
+    response = HttpResponse(csv_data, content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{domain}_benchmark_scores.csv"'
+    return response
@@ -1,6 +1,5 @@
 import logging
 import threading
-from decimal import Decimal, ROUND_HALF_UP
 import numpy as np
 from django.http import Http404
 from django.shortcuts import render
@@ -9,6 +8,8 @@ from django.template.defaulttags import register
 from .index import get_context, display_model, display_submitter, get_visibility
 from .leaderboard import get_ag_grid_context
 from .model_trends import load_and_build_score_trend, load_and_build_rank_trend
+from .palette import COLOR_NONE, representative_colors
+from .ranking import insertion_rank, round_half_up
 from ..models import FinalModelContext, BenchmarkMeta
 from time import time
 _logger = logging.getLogger(__name__)
@@ -16,38 +17,6 @@ _logger = logging.getLogger(__name__)
 # Thread-local storage for benchmark lookup (used by template filters)
 _thread_locals = threading.local()
 
-# Precomputed color arrays matching JavaScript client-side logic
-REDGREEN_COLORS = [
-    '#ff0000', '#ff0000', '#ff0000', '#ff0000', '#fe0600', '#fe0600', '#fd0d01', '#fd0d01', '#fc1301', '#fb1901',
-    '#fb1901', '#fa1f02', '#f92502', '#f92502', '#f82b02', '#f73103', '#f73103', '#f63703', '#f53d03', '#f44204',
-    '#f44204', '#f44804', '#f34d04', '#f25305', '#f15805', '#f15805', '#f05e05', '#ef6306', '#ee6806', '#ed6e06',
-    '#ec7307', '#eb7807', '#ea7d07', '#e98208', '#e88708', '#e88708', '#e78c08', '#e69109', '#e69509', '#e59a09',
-    '#e49f0a', '#e3a30a', '#e2a80a', '#e1ac0a', '#e0b10b', '#dfb50b', '#deb90b', '#ddbe0c', '#dcc20c', '#dcc60c',
-    '#dbca0d', '#d9d20d', '#d8d60d', '#d4d70e', '#cfd60e', '#c9d50e', '#c4d40f', '#bed40f', '#b9d30f', '#b4d20f',
-    '#aed110', '#a4cf10', '#9fce10', '#9acd11', '#95cc11', '#90cc11', '#8bcb11', '#86ca12', '#7dc812', '#78c712',
-    '#74c613', '#6fc613', '#6ac513', '#66c413', '#5dc214', '#59c114', '#55c014', '#51c015', '#48be15', '#44bd15',
-    '#40bc16', '#3cbb16', '#38bb16', '#31b917', '#2db817', '#29b717', '#26b617', '#1eb518', '#1bb418', '#18b319',
-    '#18b21c', '#19b124', '#19b028', '#19af2b', '#19ad32', '#1aad36', '#1aac39', '#1aaa40', '#1aa943', '#1ba947',
-    '#1ba84a'
-]
-
-GRAY_COLORS = [
-    '#f2f2f2', '#f2f2f2', '#f2f2f2', '#f2f2f2', '#f0f0f0', '#f0f0f0', '#eeeeee', '#eeeeee', '#ededed', '#ebebeb',
-    '#ebebeb', '#e9e9e9', '#e7e7e7', '#e7e7e7', '#e6e6e6', '#e4e4e4', '#e4e4e4', '#e2e2e2', '#e0e0e0', '#dedede',
-    '#dedede', '#dddddd', '#dbdbdb', '#d9d9d9', '#d7d7d7', '#d7d7d7', '#d6d6d6', '#d4d4d4', '#d2d2d2', '#d0d0d0',
-    '#cecece', '#cdcdcd', '#cbcbcb', '#c9c9c9', '#c7c7c7', '#c7c7c7', '#c5c5c5', '#c4c4c4', '#c2c2c2', '#c0c0c0',
-    '#bebebe', '#bdbdbd', '#bbbbbb', '#b9b9b9', '#b7b7b7', '#b5b5b5', '#b4b4b4', '#b2b2b2', '#b0b0b0', '#aeaeae',
-    '#adadad', '#a9a9a9', '#a7a7a7', '#a5a5a5', '#a4a4a4', '#a2a2a2', '#a0a0a0', '#9e9e9e', '#9d9d9d', '#9b9b9b',
-    '#999999', '#959595', '#949494', '#929292', '#909090', '#8e8e8e', '#8d8d8d', '#8b8b8b', '#878787', '#858585',
-    '#848484', '#828282', '#808080', '#7e7e7e', '#7b7b7b', '#797979', '#777777', '#757575', '#727272', '#707070',
-    '#6e6e6e', '#6c6c6c', '#6b6b6b', '#676767', '#656565', '#646464', '#626262', '#5e5e5e', '#5c5c5c', '#5b5b5b',
-    '#595959', '#555555', '#545454', '#525252', '#4e4e4e', '#4c4c4c', '#4b4b4b', '#474747', '#454545', '#444444',
-    '#424242'
-]
-
-COLOR_NONE = '#e0e1e2'
-GAMMA = 0.5
-
 # Aggregate-root benchmarks rank against ``_rank_models``'s policy (ROUND_HALF_UP
 # @ 2 decimals) rather than full-precision floats, so the model card's rank for
 # these matches what the leaderboard shows for the same model. Leaf benchmark
@@ -60,10 +29,6 @@ _AGG_ROOT_BENCHMARK_IDS = frozenset({
 })
 
 
-def _round_half_up_2dp(x):
-    return float(Decimal(str(x)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
-
-
 def enrich_model_scores_with_benchmarks(model, benchmarks):
     """
     Enrich model scores with full benchmark metadata.
@@ -170,7 +135,10 @@ def compute_score_statistics(model, public_models):
             except (ValueError, TypeError):
                 continue
 
-    # Compute statistics for each score
+    benchmark_extrema = {benchmark_id: (min(scores), max(scores)) for benchmark_id, scores in benchmark_scores.items()}
+
+    # Compute statistics for each score; colors are looked up in one vectorized pass afterwards
+    colored_scores, values, min_scores, max_scores, engineering = [], [], [], [], []
     for score in model.scores:
         if not isinstance(score, dict):
             continue
@@ -180,34 +148,26 @@ def compute_score_statistics(model, public_models):
             continue
 
         score_value = score.get('score_ceiled')
+        all_scores = benchmark_scores.get(benchmark_id, [])
+        score['color'] = f'background-color: {COLOR_NONE}'
 
         # Compute color using same logic as JavaScript client-side
-        if score_value not in ('', 'X', None):
+        if score_value not in ('', 'X', None) and all_scores:
             try:
                 score_float = float(score_value)
-                all_scores = benchmark_scores.get(benchmark_id, [])
-                if all_scores:
-                    min_score = min(all_scores)
-                    max_score = max(all_scores)
-
-                    # Determine if this is an engineering benchmark
-                    root_parent = score.get('benchmark', {}).get('root_parent', '')
-                    is_engineering = 'engineering' in root_parent.lower() if root_parent else False
-
-                    # Calculate color using JavaScript logic (returns rgba string)
-                    color_rgba = calculate_representative_color(
-                        score_float, min_score, max_score, is_engineering
-                    )
-                    score['color'] = f'background-color: {color_rgba}'
-                else:
-                    score['color'] = f'background-color: {COLOR_NONE}'
             except (ValueError, TypeError):
-                score['color'] = f'background-color: {COLOR_NONE}'
-        else:
-            score['color'] = f'background-color: {COLOR_NONE}'
+                score_float = None
+            if score_float is not None:
+                # Determine if this is an engineering benchmark
+                root_parent = score.get('benchmark', {}).get('root_parent', '')
+                colored_scores.append(score)
+                values.append(score_float)
+                min_score, max_score = benchmark_extrema[benchmark_id]
+                min_scores.append(min_score)
+                max_scores.append(max_score)
+                engineering.append('engineering' in root_parent.lower() if root_parent else False)
 
         # Compute best and median from all public model scores
-        all_scores = benchmark_scores.get(benchmark_id, [])
         if all_scores:
             score['best'] = max(all_scores)
             score['median'] = np.median(all_scores)
@@ -215,60 +175,10 @@ def compute_score_statistics(model, public_models):
             score['best'] = 0
             score['median'] = 0
 
-
-def calculate_representative_color(value, min_value, max_value, is_engineering):
-    """
-    Calculate representative color for a score value.
-    Replicates the JavaScript calculateRepresentativeColor function.
-
-    Args:
-        value: The score value
-        min_value: Minimum value in the distribution
-        max_value: Maximum value in the distribution
-        is_engineering: Whether this is an engineering benchmark (uses grayscale)
-
-    Returns:
-        CSS color string with RGBA (e.g., 'rgba(255, 0, 0, 0.85)')
-    """
-    # Normalize the input value between 0 and 1
-    if max_value - min_value == 0:
-        normalized_value = 0.5
-    else:
-        normalized_value = (value - min_value) / (max_value - min_value)
-    normalized_value = max(0.0, min(1.0, normalized_value))
-
-    # Apply gamma correction to emphasize differences at the top-end
-    normalized_value = normalized_value ** (1.0 / GAMMA)
-
-    # Scale down the normalized value (0.8 factor)
-    normalized_value = 0.8 * normalized_value
-    normalized_value = max(0.0, min(1.0, normalized_value))
-
-    # Get color array index (0-100)
-    idx = int(100 * normalized_value)
-    if idx > 100:
-        idx = 100
-
-    # Determine color palette based on benchmark type
-    color_hex = GRAY_COLORS[idx] if is_engineering else REDGREEN_COLORS[idx]
-
-    # Extract RGB values from hex color
-    r = int(color_hex[1:3], 16)
-    g = int(color_hex[3:5], 16)
-    b = int(color_hex[5:7], 16)
-
-    # Calculate alpha based on value position
-    # Linear interpolation: alpha ranges from 0.1 (at min) to 1.0 (at max)
-    if max_value - min_value == 0:
-        alpha = 1.0
-    else:
-        slope = -0.9 / (min_value - max_value)
-        intercept = 0.1 - slope * min_value
-        alpha = slope * value + intercept
-    alpha = max(0.0, min(1.0, alpha))
-
-    # Return RGBA color string
-    return f'rgba({r}, {g}, {b}, {alpha:.2f})'
+    if colored_scores:
+        colors = representative_colors(values, min_scores, max_scores, engineering)
+        for score, color_rgba in zip(colored_scores, colors):
+            score['color'] = f'background-color: {color_rgba}'
 
 
 def view(request, id: int, domain: str):
@@ -464,31 +374,25 @@ def add_benchmark_rankings(model, reference_context):
             continue
         try:
             score_value = float(score_ceiled)
-            all_scores = benchmark_scores.get(versioned_benchmark_id, [])
-            # For aggregate roots, round both target and comparators to the same
-            # 2-decimal ROUND_HALF_UP that the leaderboard's _rank_models uses, so
-            # the displayed rank agrees with the leaderboard. Leaf benchmarks keep
-            # full precision (more informative ranks per benchmark).
-            if versioned_benchmark_id in _AGG_ROOT_BENCHMARK_IDS:
-                target = _round_half_up_2dp(score_value)
-                comparators = [_round_half_up_2dp(s) for s in all_scores]
-            else:
-                target = score_value
-                comparators = all_scores
-            # Sort scores in descending order and find the rank
-            sorted_scores = sorted(comparators, reverse=True)
-            # Find the position of the current score (1-indexed)
-            # If there are ties, all tied scores get the same rank
-            rank = 1
-            for i, s in enumerate(sorted_scores):
-                if s > target:
-                    rank = i + 2  # +2 because we want 1-indexed and we're looking for the next position
-                elif s == target:
-                    rank = i + 1  # +1 for 1-indexed
-                    break
-            score['rank'] = rank
         except (ValueError, TypeError):
             score['rank'] = 'N/A'
+            continue
+        if score_value != score_value:
+            score['rank'] = score_ceiled
+            continue
+        all_scores = benchmark_scores.get(versioned_benchmark_id, [])
+        # For aggregate roots, round both target and comparators to the same
+        # 2-decimal ROUND_HALF_UP that the leaderboard's _rank_models uses, so
+        # the displayed rank agrees with the leaderboard. Leaf benchmarks keep
+        # full precision (more informative ranks per benchmark).
+        if versioned_benchmark_id in _AGG_ROOT_BENCHMARK_IDS:
+            target = round_half_up(score_value, 2)
+            comparators = round_half_up(all_scores, 2)
+        else:
+            target = score_value
+            comparators = all_scores
+        # Tied scores share the best rank: 1 + number of strictly better comparators
+        score['rank'] = int(insertion_rank(target, comparators))
 
 
 def simplify_score(score):
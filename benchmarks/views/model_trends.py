@@ -1,25 +1,33 @@
 """Historical score / rank trend analysis for the model card and compare pages."""
 import logging
-import threading
 import time
 from datetime import date
 
 import numpy as np
 import pandas as pd
 
-from ..models import Model, ModelMonthlyAggregate, MonthBenchmarkEdge, Score
+from ..models import (
+    Model, ModelLeafFirstScore, ModelMonthlyAggregate, ModelMonthlyRank, MonthBenchmarkEdge, ScoreTrendVersion,
+)
+from ..utils import get_domain_cache
+from .ranking import min_rank, round_half_up
+from .trend_cache import TrendCache
+from .trend_frames import frames_from_blob, pack_frames
 
 _logger = logging.getLogger(__name__)
 
 
-# Cache is keyed on (kind, domain, data-version). data-version is the max
-# ModelMonthlyAggregate row id for the domain: recompute deletes and re-creates
-# each month's rows, so the max id increases on *every* run -- including a
+# Cache is keyed on (kind, domain, data-version). data-version is the domain's
+# ScoreTrendVersion counter, which recompute bumps on *every* run -- including a
 # same-month rerun -- and every worker (and every instance) reads that shared
 # value from the DB. So a recompute in any process invalidates all workers'
-# caches within the TTL, not just the one that ran it.
-_TREND_CACHE = {}
-_TREND_CACHE_LOCK = threading.Lock()
+# caches within the TTL, not just the one that ran it; the cache drops a domain's
+# old-version entries as soon as the first new-version entry lands.
+# Per-model kinds get one entry per model card viewed, so they are capped per
+# family (LRU) and cannot crowd out the shared per-domain frames.
+_TREND_CACHE = TrendCache(kind_limits={
+    'focal_coverage': 2000,
+})
 
 # Hover list cap for new-leaf / coverage-completion bullets on the model card.
 _COVERAGE_BULLET_CAP = 12
@@ -37,10 +45,9 @@ def _trend_data_version(domain):
     hit = _version_memo.get(domain)
     if hit is not None and hit[1] > now:
         return hit[0]
-    version = (ModelMonthlyAggregate.objects
+    version = (ScoreTrendVersion.objects
                .filter(domain=domain)
-               .order_by('-id')
-               .values_list('id', flat=True)
+               .values_list('version', flat=True)
                .first())
     _version_memo[domain] = (version, now + _VERSION_TTL_SECONDS)
     return version
@@ -52,21 +59,21 @@ def _trend_cache_get(kind, domain):
 
 
 def _trend_cache_put(kind, domain, version, value):
-    with _TREND_CACHE_LOCK:
-        for k in list(_TREND_CACHE):
-            if k[0] == kind and k[1] == domain:
-                del _TREND_CACHE[k]
-        _TREND_CACHE[(kind, domain, version)] = value
+    _TREND_CACHE.put((kind, domain, version), value)
+
+
+def trend_cache_stats():
+    """Hit/miss/eviction counters and sizes of this process's trend cache."""
+    return _TREND_CACHE.stats()
 
 
 def clear_trend_cache():
     """Immediate local bust for the process that just recomputed. Cross-worker
-    invalidation is handled by the data-version cache key (max
-    ``ModelMonthlyAggregate`` id) -- other workers pick up the new version
+    invalidation is handled by the data-version cache key (the domain's
+    ``ScoreTrendVersion`` counter) -- other workers pick up the new version
     within the TTL on their own. This just lets the recomputing process see it
     right away instead of waiting out the TTL."""
-    with _TREND_CACHE_LOCK:
-        _TREND_CACHE.clear()
+    _TREND_CACHE.clear()
     _version_memo.clear()
 
 
@@ -94,39 +101,207 @@ def _load_all_months(domain):
     return months
 
 
-def _load_public_wide_scores(domain):
-    """``model_id`` column + one ``YYYY-MM`` column per month, public models only."""
-    cached, version = _trend_cache_get('public_wide', domain)
-    if cached is not None:
-        return cached.copy(), version
-    qs = (ModelMonthlyAggregate.objects
-          .filter(domain=domain, model__public=True)
-          .values('model_id', 'month', 'score'))
-    df = pd.DataFrame(list(qs))
+# Public frames are shared across workers through the domain cache (Redis in
+# production), keyed on the trend data version, so each version is pivoted and
+# ranked once rather than once per worker (and again after every restart).
+_PUBLIC_FRAMES_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def _public_frames_cache_key(domain, version):
+    return f"{domain}:trends:public_frames:v{version}"
+
+
+def _build_public_frames_blob(domain):
+    """Pivot and rank the public ``ModelMonthlyAggregate`` rows into a ``trend_frames`` blob."""
+    rows = list(ModelMonthlyAggregate.objects
+                .filter(domain=domain, model__public=True)
+                .values_list('model_id', 'month', 'score'))
+    df = pd.DataFrame(rows, columns=['model_id', 'month', 'score'])
     if df.empty:
-        wide = pd.DataFrame(columns=['model_id'])
-    else:
-        wide = df.pivot(index='model_id', columns='month', values='score').reset_index()
-        wide.columns.name = None
-    _trend_cache_put('public_wide', domain, version, wide)
-    return wide.copy(), version
+        return pack_frames([], [], np.empty((0, 0)), np.empty((0, 0)))
+    wide = df.pivot(index='model_id', columns='month', values='score').reset_index()
+    wide.columns.name = None
+    month_cols = [c for c in wide.columns if c != 'model_id']
+    _, rank_df = wide_scores_and_rank_df(wide, month_cols)
+    return pack_frames(wide['model_id'].to_numpy(), month_cols,
+                       wide[month_cols].to_numpy(dtype=float), rank_df[month_cols].to_numpy(dtype=float))
+
+
+def _load_public_frames(domain):
+    """``((wide_scores, rank_df), version)`` for public models. Served from the
+    local trend cache, else mapped from the shared cache, else built and shared."""
+    cached, version = _trend_cache_get('public_frames', domain)
+    if cached is not None:
+        return cached, version
+    cache_backend, _ = get_domain_cache(domain)
+    cache_key = _public_frames_cache_key(domain, version)
+    blob = None
+    try:
+        blob = cache_backend.get(cache_key)
+    except Exception as e:
+        _logger.warning(f"Cache GET error for {cache_key}: {e}")
+    if blob is None:
+        blob = _build_public_frames_blob(domain)
+        try:
+            cache_backend.set(cache_key, blob, _PUBLIC_FRAMES_TIMEOUT)
+        except Exception as e:
+            _logger.warning(f"Cache SET error for {cache_key}: {e}")
+    frames = frames_from_blob(blob)
+    _trend_cache_put('public_frames', domain, version, frames)
+    return frames, version
+
+
+def _load_public_wide_scores(domain):
+    """``model_id`` column + one ``YYYY-MM`` column per month, public models only.
+    Backed by read-only shared arrays: do not modify in place."""
+    (wide, _rank_df), version = _load_public_frames(domain)
+    return wide, version
 
 
 def _load_public_rank_df(domain):
-    """Cached public-only rank frame (same index as ``_load_public_wide_scores``).
-    Recomputed only when a new month lands; the model card would otherwise rebuild
-    the full model x month rank matrix on every page load."""
-    cached, version = _trend_cache_get('public_rank', domain)
+    """Public-only rank frame (same index as ``_load_public_wide_scores``), computed
+    once per data version; the model card would otherwise rebuild the full
+    model x month rank matrix on every page load. Read-only, like the wide frame."""
+    (_wide, rank_df), version = _load_public_frames(domain)
+    return rank_df, version
+
+
+def prime_public_trend_frames(domain):
+    """Build and share the public frames for the current data version, so the first
+    model card after a recompute (in any worker) does not pay for the pivot."""
+    _load_public_frames(domain)
+
+
+def _load_public_ranking_scores(domain):
+    """``(month_index, scores, sorted_scores, counts)`` for the public frame:
+    ``scores`` are the ranking scores (``trend_ranking_scores``) in frame order,
+    ``sorted_scores`` each month column ascending with NaN last, and ``counts``
+    the number of ranked models per month."""
+    cached, version = _trend_cache_get('public_ranking_scores', domain)
     if cached is not None:
-        return cached.copy(), version
-    public_wide, _ = _load_public_wide_scores(domain)
-    month_cols = [c for c in public_wide.columns if c != 'model_id']
-    if not month_cols:
-        rank_df = public_wide[['model_id']].copy()
-    else:
-        _, rank_df = wide_scores_and_rank_df(public_wide, month_cols)
-    _trend_cache_put('public_rank', domain, version, rank_df)
-    return rank_df.copy(), version
+        return cached
+    wide, _ = _load_public_wide_scores(domain)
+    month_cols = [c for c in wide.columns if c != 'model_id']
+    scores = trend_ranking_scores(wide[month_cols].to_numpy(dtype=float)).reshape(len(wide), len(month_cols))
+    result = ({month: j for j, month in enumerate(month_cols)}, scores,
+              np.sort(scores, axis=0), np.count_nonzero(~np.isnan(scores), axis=0))
+    _trend_cache_put('public_ranking_scores', domain, version, result)
+    return result
+
+
+def rank_if_inserted(scores_by_month, domain):
+    """``{'YYYY-MM': rank}`` a model with these monthly aggregates holds against
+    the public models, as if it were added to the leaderboard: one binary search
+    per month over the sorted public scores instead of re-ranking the frame.
+    Months without a score, or outside the public frame, are left out."""
+    month_index, _scores, sorted_scores, counts = _load_public_ranking_scores(domain)
+    months = [m for m in scores_by_month if m in month_index]
+    targets = trend_ranking_scores([scores_by_month[m] for m in months])
+    ranks = {}
+    for month, target in zip(months, targets):
+        if np.isnan(target):
+            continue
+        j = month_index[month]
+        pool = sorted_scores[:counts[j], j]
+        ranks[month] = int(counts[j] - np.searchsorted(pool, target, side='right') + 1)
+    return ranks
+
+
+def _load_rank_series(model_id, domain):
+    """``{'YYYY-MM': rank}`` against the public pool: the ranks persisted by
+    ``recompute_score_trends`` for public models, ``rank_if_inserted`` on the
+    model's aggregates for everyone else. The model's current ``public`` flag
+    picks the path, not whether persisted rows exist: a model made private
+    keeps its rows until the next recompute."""
+    if Model.objects.filter(id=model_id, public=True).exists():
+        ranks = dict(ModelMonthlyRank.objects
+                     .filter(model_id=model_id, domain=domain)
+                     .values_list('month', 'rank'))
+        if ranks:
+            return ranks
+    scores = dict(ModelMonthlyAggregate.objects
+                  .filter(model_id=model_id, domain=domain)
+                  .values_list('month', 'score'))
+    return rank_if_inserted(scores, domain)
+
+
+def _spliced_rank_df(scores_by_model, domain):
+    """Public rank frame plus a few (private) models, equal to re-ranking the
+    concatenated frame: the public ranks only shift by one below each spliced
+    model's score, and each spliced model gets its insertion rank against the
+    public pool and the other spliced models.
+
+    :param scores_by_model: ``{model_id: {'YYYY-MM': score}}``, in row order
+    """
+    (wide, rank_df), _ = _load_public_frames(domain)
+    month_cols = [c for c in wide.columns if c != 'model_id']
+    _month_index, public_scores, _sorted, _counts = _load_public_ranking_scores(domain)
+    focal = np.array([trend_ranking_scores([scores.get(m) for m in month_cols])
+                      for scores in scores_by_model.values()]).reshape(len(scores_by_model), len(month_cols))
+    ranks = rank_df[month_cols].to_numpy(dtype=float) + (public_scores < focal[:, None]).sum(axis=0)
+    focal_ranks = np.where(np.isnan(focal), np.nan,
+                           1 + (public_scores > focal[:, None]).sum(axis=1) + (focal > focal[:, None]).sum(axis=1))
+    spliced = pd.DataFrame(np.vstack([ranks, focal_ranks]), columns=month_cols)
+    spliced.insert(0, 'model_id', np.append(wide['model_id'].to_numpy(), list(scores_by_model)))
+    return spliced
+
+
+# Upper bound on ids per batch request; a leaderboard page of sparklines fits well within it.
+TREND_BATCH_MAX_MODELS = 300
+
+
+def _load_public_row_index(domain):
+    """``{model_id: row}`` into the public frames."""
+    cached, version = _trend_cache_get('public_row_index', domain)
+    if cached is not None:
+        return cached
+    wide, _ = _load_public_wide_scores(domain)
+    row_index = {int(mid): i for i, mid in enumerate(wide['model_id'].to_numpy())}
+    _trend_cache_put('public_row_index', domain, version, row_index)
+    return row_index
+
+
+def load_trend_batch(model_ids, domain):
+    """
+    Monthly score and rank series of many public models on one shared month axis,
+    sliced straight out of the cached public frames (no per-model queries).
+
+    :param model_ids: model ids, in the order the series should come back
+    :return: ``{'months': ['YYYY-MM', ...], 'model_ids': [...], 'scores': [[...], ...],
+        'ranks': [[...], ...], 'missing': [...]}``; row ``i`` of ``scores``/``ranks``
+        belongs to ``model_ids[i]``, months without data are ``None``, and ids not in
+        the public frames are listed under ``missing``. The month axis is trimmed to
+        the span in which any requested model has a score.
+    """
+    (wide, rank_df), _ = _load_public_frames(domain)
+    row_index = _load_public_row_index(domain)
+    found, missing = [], []
+    for mid in dict.fromkeys(model_ids):
+        (found if mid in row_index else missing).append(mid)
+    month_cols = [c for c in wide.columns if c != 'model_id']
+    rows = [row_index[mid] for mid in found]
+    scores = wide[month_cols].to_numpy(dtype=float)[rows]
+    ranks = rank_df[month_cols].to_numpy(dtype=float)[rows]
+    # a zero aggregate means "not scored yet", as on the model card
+    has_score = ~np.isnan(scores) & (scores > 0)
+    present = np.flatnonzero(has_score.any(axis=0))
+    if not len(present):
+        return {'months': [], 'model_ids': found, 'scores': [[] for _ in found],
+                'ranks': [[] for _ in found], 'missing': missing}
+    span = slice(present[0], present[-1] + 1)
+    has_score = has_score[:, span]
+    scores = np.round(scores[:, span], 6)
+    ranks = ranks[:, span]
+    has_rank = ~np.isnan(ranks)
+    return {
+        'months': month_cols[span],
+        'model_ids': found,
+        'scores': [[float(v) if ok else None for v, ok in zip(row, mask)]
+                   for row, mask in zip(scores.tolist(), has_score.tolist())],
+        'ranks': [[int(v) if ok else None for v, ok in zip(row, mask)]
+                  for row, mask in zip(ranks.tolist(), has_rank.tolist())],
+        'missing': missing,
+    }
 
 
 def _load_model_names(domain):
@@ -162,66 +337,44 @@ def _month_end_utc_ts(month_str):
     return ts.tz_localize('UTC')
 
 
+def _load_first_positive_scores(model_id, domain, leaves):
+    """``{leaf: (first_positive_timestamp, first_positive_score)}`` for the
+    given leaves, from the table ``recompute_score_trends`` materializes (one
+    indexed query)."""
+    if not leaves:
+        return {}
+    rows = (ModelLeafFirstScore.objects
+            .filter(model_id=model_id, domain=domain)
+            .values_list('leaf', 'first_positive_timestamp', 'first_positive_score'))
+    leaves = set(leaves)
+    return {leaf: (ts, score) for leaf, ts, score in rows if leaf in leaves}
+
+
 def _load_focal_scored_new_leaves(model_id, domain, edges_map):
-    """per-model, per-month cache of "of the leaves newly counted in the
-    aggregate this month, which ones did this model actually get a nonzero
-    non-NaN score on by month-end?"""
-    kind = f'focal_scored_new:{model_id}'
-    cached, version = _trend_cache_get(kind, domain)
-    if cached is not None:
-        return cached
+    """Per-month "of the leaves newly counted in the aggregate this month,
+    which ones did this model actually get a nonzero non-NaN score on by
+    month-end?" """
     result = {}
-    all_added = sorted({leaf for added in edges_map.values() for leaf in (added or [])}) if edges_map else []
-    if all_added:
-        # One query for every relevant leaf, then bucket per month in Python
-        # (avoids one Score query per month-edge). ``score_ceiled__gt=0`` also
-        # matches NaN in Postgres ordering, so the NaN guard stays.
-        earliest = {}
-        rows = (Score.objects
-                .filter(model_id=model_id, benchmark__benchmark_type__identifier__in=all_added,
-                        end_timestamp__isnull=False, score_ceiled__isnull=False, score_ceiled__gt=0)
-                .values_list('benchmark__benchmark_type__identifier', 'score_ceiled', 'end_timestamp'))
-        for ident, sc, ts in rows:
-            if sc is None or (isinstance(sc, float) and np.isnan(sc)):
-                continue
-            if ident not in earliest or ts < earliest[ident]:
-                earliest[ident] = ts
+    all_added = {leaf for added in edges_map.values() for leaf in (added or [])} if edges_map else set()
+    earliest = _load_first_positive_scores(model_id, domain, all_added)
+    if earliest:
         for edge_key, added in edges_map.items():
             if not added:
                 continue
             _prev, curr = edge_key.split('|', 1)
             month_end = _month_end_utc_ts(curr)
             scored = sorted({ident for ident in added
-                             if ident in earliest and earliest[ident] <= month_end})
+                             if ident in earliest and earliest[ident][0] <= month_end})
             if scored:
                 result[curr] = scored
-    _trend_cache_put(kind, domain, version, result)
     return result # -> {'YYYY-MM': [leaf_ids]}
 
 
 def _load_scored_new_leaf_values(model_id, domain, edges_map):
     """``{leaf_id: score_ceiled}`` at the leaf's first qualifying score, so the
     compare narrative can say which of two models scored higher on it."""
-    kind = f'focal_scored_new_values:{model_id}'
-    cached, version = _trend_cache_get(kind, domain)
-    if cached is not None:
-        return cached
-    result = {}
-    all_added = sorted({leaf for added in edges_map.values() for leaf in (added or [])}) if edges_map else []
-    if all_added:
-        earliest = {}
-        rows = (Score.objects
-                .filter(model_id=model_id, benchmark__benchmark_type__identifier__in=all_added,
-                        end_timestamp__isnull=False, score_ceiled__isnull=False, score_ceiled__gt=0)
-                .values_list('benchmark__benchmark_type__identifier', 'score_ceiled', 'end_timestamp'))
-        for ident, sc, ts in rows:
-            if sc is None or (isinstance(sc, float) and np.isnan(sc)):
-                continue
-            if ident not in earliest or ts < earliest[ident][0]:
-                earliest[ident] = (ts, float(sc))
-        result = {ident: sc for ident, (_ts, sc) in earliest.items()}
-    _trend_cache_put(kind, domain, version, result)
-    return result
+    all_added = {leaf for added in edges_map.values() for leaf in (added or [])} if edges_map else set()
+    return {ident: score for ident, (_ts, score) in _load_first_positive_scores(model_id, domain, all_added).items()}
 
 
 def _load_new_models_by_month(domain):
@@ -287,6 +440,51 @@ def _rank_move(prev_rank, curr_rank):
     return 'no change'
 
 
+def rank_transition_counts(model_id, transitions, rank_df):
+    """Counts behind ``rank_transition_model_lines`` for many month pairs at
+    once, as a few array operations over the rank matrix.
+
+    :param transitions: ``(ym_prev, ym_curr, rank1, rank2)`` tuples whose months
+        are ``rank_df`` columns; ``rank1``/``rank2`` are the focal model's ranks
+    :return: ``(passed, moved_ahead, new_above)`` int arrays, one entry per transition:
+        models the focal model passed, models that moved ahead of it, and models
+        without a rank in ``ym_prev`` that entered above it
+    """
+    if not transitions:
+        empty = np.zeros(0, dtype=int)
+        return empty, empty, empty
+    months = sorted({m for ym_prev, ym_curr, _r1, _r2 in transitions for m in (ym_prev, ym_curr)})
+    column = {month: j for j, month in enumerate(months)}
+    others = (rank_df['model_id'].astype(str) != str(model_id)).to_numpy()
+    ranks = rank_df[months].to_numpy(dtype=float)[others]
+    prev = ranks[:, [column[t[0]] for t in transitions]]
+    curr = ranks[:, [column[t[1]] for t in transitions]]
+    rank1 = np.array([t[2] for t in transitions], dtype=float)
+    rank2 = np.array([t[3] for t in transitions], dtype=float)
+    rank_change = rank2 - rank1
+    ranked_both = ~np.isnan(prev) & ~np.isnan(curr)
+    moved_ahead = ranked_both & (rank_change > 0) & (((prev > rank1) & (curr <= rank2)) |
+                                                     ((prev >= rank1) & (curr < rank2)))
+    passed = ranked_both & (rank_change < 0) & (((prev < rank1) & (curr >= rank2)) |
+                                                ((prev <= rank1) & (curr > rank2)))
+    new_above = np.isnan(prev) & (curr < rank2)  # NaN compares False
+    return passed.sum(axis=0), moved_ahead.sum(axis=0), new_above.sum(axis=0)
+
+
+def _rank_transition_text(passed, moved_ahead, new_above):
+    bits = []
+    if passed:
+        bits.append(f'passed {_plural(int(passed), "model")}')
+    if moved_ahead:
+        bits.append(f'{_plural(int(moved_ahead), "model")} moved ahead')
+    if new_above:
+        bits.append(f'{_plural(int(new_above), "new model")} entered above')
+    if not bits:
+        return []
+    s = '; '.join(bits) + '.'
+    return [s[0].upper() + s[1:]]
+
+
 def rank_transition_model_lines(model_id, ym_prev, ym_curr, rank1, rank2, rank_df):
     """One-line summary of *which models* drove a month-to-month rank move,
     counts only / third-person. Benchmark churn is shown separately (bullets),
@@ -294,45 +492,25 @@ def rank_transition_model_lines(model_id, ym_prev, ym_curr, rank1, rank2, rank_d
     because long model names widened the sidebar on narrow viewports."""
     if ym_prev not in rank_df.columns or ym_curr not in rank_df.columns:
         return []
+    passed, moved_ahead, new_above = rank_transition_counts(model_id, [(ym_prev, ym_curr, rank1, rank2)], rank_df)
+    return _rank_transition_text(passed[0], moved_ahead[0], new_above[0])
 
-    rank_change = rank2 - rank1
-    focal = str(model_id)
-    ranks_indexed = rank_df.set_index('model_id')
-    ranks_t1 = ranks_indexed[ym_prev]
-    ranks_t2 = ranks_indexed[ym_curr]
-
-    moved_past = focal_past = new_above = 0
-    for om in ranks_t1.index:
-        if str(om) == focal:
-            continue
-        r1 = ranks_t1[om]
-        r2 = ranks_t2.get(om, np.nan)
-        if pd.isna(r1) or pd.isna(r2):
-            continue
-        or1, or2 = int(r1), int(r2)
-        if rank_change > 0 and ((or1 > rank1 and or2 <= rank2) or (or1 >= rank1 and or2 < rank2)):
-            moved_past += 1
-        elif rank_change < 0 and ((or1 < rank1 and or2 >= rank2) or (or1 <= rank1 and or2 > rank2)):
-            focal_past += 1
-    for om in ranks_t2.index:
-        if str(om) == focal:
-            continue
-        if pd.notna(ranks_t1.get(om, np.nan)) or pd.isna(ranks_t2[om]):
-            continue
-        if int(ranks_t2[om]) < rank2:
-            new_above += 1
 
-    bits = []
-    if focal_past:
-        bits.append(f'passed {_plural(focal_past, "model")}')
-    if moved_past:
-        bits.append(f'{_plural(moved_past, "model")} moved ahead')
-    if new_above:
-        bits.append(f'{_plural(new_above, "new model")} entered above')
-    if not bits:
-        return []
-    s = '; '.join(bits) + '.'
-    return [s[0].upper() + s[1:]]
+def rank_transition_lines(model_id, dates, values, rank_df):
+    """``{(ym_prev, ym_curr): lines}`` of ``rank_transition_model_lines`` for
+    every consecutive pair of a rank series where the rank changed, computed in
+    one ``rank_transition_counts`` pass instead of one frame scan per point."""
+    transitions = []
+    for i in range(1, len(dates)):
+        if values[i] is None or values[i - 1] is None:
+            continue
+        ym_prev, ym_curr = _date_to_month_key(dates[i - 1]), _date_to_month_key(dates[i])
+        rank1, rank2 = int(round(float(values[i - 1]))), int(round(float(values[i])))
+        if rank1 != rank2 and ym_prev in rank_df.columns and ym_curr in rank_df.columns:
+            transitions.append((ym_prev, ym_curr, rank1, rank2))
+    counts = rank_transition_counts(model_id, transitions, rank_df)
+    return {(ym_prev, ym_curr): _rank_transition_text(*point_counts)
+            for (ym_prev, ym_curr, _r1, _r2), point_counts in zip(transitions, zip(*counts))}
 
 
 def _overall_trend_lines(dates, values, kind):
@@ -394,7 +572,11 @@ def _point_attribution_lines(i, dates, values, kind, edges_map, overall_lines, r
         rdf = rank_explain.get('rank_df')
         mid_model = rank_explain.get('model_id')
         if rdf is not None and mid_model is not None and ym_prev in rdf.columns and ym_curr in rdf.columns:
-            model_lines = rank_transition_model_lines(mid_model, ym_prev, ym_curr, prev_v, curr_v, rdf)
+            precomputed = rank_explain.get('transition_lines')
+            if precomputed is not None:
+                model_lines = precomputed.get((ym_prev, ym_curr), [])
+            else:
+                model_lines = rank_transition_model_lines(mid_model, ym_prev, ym_curr, prev_v, curr_v, rdf)
     out.extend(model_lines)
 
     cap = _COVERAGE_BULLET_CAP
@@ -427,6 +609,10 @@ def _build_trend_meta(dates, values, kind, edges_map, extra_default_lines=None,
     ``defaultLines`` on idle, ``points[i].lines`` on hover."""
     base_overall = _overall_trend_lines(dates, values, kind)
     default_lines = base_overall + list(extra_default_lines or [])
+    if kind == 'rank' and rank_explain is not None and rank_explain.get('rank_df') is not None \
+            and rank_explain.get('model_id') is not None:
+        rank_explain = dict(rank_explain, transition_lines=rank_transition_lines(
+            rank_explain['model_id'], dates, values, rank_explain['rank_df']))
     points = []
     for i in range(len(dates)):
         points.append({
@@ -593,6 +779,14 @@ def _monthly_dates_until_today(last_date_str):
     return out
 
 
+def trend_ranking_scores(values):
+    """Monthly aggregates as the leaderboard ranks them: ``0``/``None`` (no
+    score) becomes NaN, the rest is rounded like ``wide_scores_and_rank_df``."""
+    values = np.array(values, dtype=float)
+    values[values == 0.0] = np.nan
+    return round_half_up(round_half_up(values, 3), 2)
+
+
 def wide_scores_and_rank_df(df, month_cols):
     """Wide ``model_id × month`` score frame + same-shape rank frame (1 = best,
     ties skip).
@@ -602,16 +796,12 @@ def wide_scores_and_rank_df(df, month_cols):
     then ``_rank_models`` rounds to 2dp HALF_UP. A one-shot 2dp on the raw
     float disagrees on values just under ``.xx5`` (e.g. ``0.3849...``)."""
     wide_scores = df[['model_id'] + month_cols].copy()
-    for col in month_cols:
-        s = wide_scores[col].replace(0.0, np.nan).astype(float)
-        # floor(x*N + 0.5)/N = ROUND_HALF_UP for x >= 0; NaN propagates.
-        s_3dp = np.floor(s * 1000 + 0.5) / 1000
-        wide_scores[col] = np.floor(s_3dp * 100 + 0.5) / 100
-    rank_df = wide_scores[['model_id']].copy()
-    for col in month_cols:
-        # method='min' is competition ranking (1, 2, 2, 4, ...), which already
-        # matches the leaderboard's tie handling; no remap needed.
-        rank_df[col] = wide_scores[col].rank(method='min', ascending=False, na_option='keep')
+    if month_cols:
+        wide_scores[month_cols] = trend_ranking_scores(wide_scores[month_cols])
+    # competition ranking (1, 2, 2, 4, ...), which matches the leaderboard's tie handling
+    rank_df = pd.DataFrame(min_rank(wide_scores[month_cols].to_numpy(dtype=float), axis=0),
+                           columns=month_cols, index=wide_scores.index)
+    rank_df.insert(0, 'model_id', wide_scores['model_id'])
     return wide_scores, rank_df
 
 
@@ -688,10 +878,12 @@ def load_and_build_score_trend(model_id, domain):
 def load_and_build_rank_trend(model_id, domain, focal_is_public=True):
     """Rank-over-time trend; vision domain only for now.
 
-    Private focal models are spliced into the public-only frame so they get a
-    rank against the public pool without ever appearing as named entries
-    elsewhere -- the focal-exclusion in ``rank_transition_model_lines`` plus
-    other private models simply not being in the frame keeps it safe."""
+    Public models read their persisted monthly ranks (``_load_rank_series``).
+    Private focal models are ranked against the public pool by binary search
+    (``rank_if_inserted``) and spliced into the public rank frame for the hover
+    narrative, without ever appearing as named entries elsewhere -- the
+    focal-exclusion in ``rank_transition_model_lines`` plus other private
+    models simply not being in the frame keeps it safe."""
     if domain != 'vision':
         return None
     try:
@@ -699,30 +891,18 @@ def load_and_build_rank_trend(model_id, domain, focal_is_public=True):
         month_cols = [c for c in public_wide.columns if c != 'model_id']
         if not month_cols:
             return None
-        df = public_wide
-        if not focal_is_public:
-            focal_rows = list(ModelMonthlyAggregate.objects
-                              .filter(model_id=model_id, domain=domain)
-                              .values('month', 'score'))
-            if not focal_rows:
-                return None
-            focal = {'model_id': model_id}
-            focal.update({m: None for m in month_cols})
-            for r in focal_rows:
-                if r['month'] in focal:
-                    focal[r['month']] = r['score']
-            df = pd.concat([public_wide, pd.DataFrame([focal])], ignore_index=True)
-        row = df.loc[df['model_id'].astype(str) == str(model_id)]
-        if row.empty:
-            return None
         if focal_is_public:
-            # df is public_wide unchanged -> reuse the cached rank frame.
+            ranks_by_month = _load_rank_series(model_id, domain)
             rank_df, _ = _load_public_rank_df(domain)
         else:
-            _wide_scores, rank_df = wide_scores_and_rank_df(df, month_cols)
-        model_idx = row.index[0]
-        series = rank_df.loc[model_idx, month_cols]
-        valid = series.dropna()
+            focal_scores = dict(ModelMonthlyAggregate.objects
+                                .filter(model_id=model_id, domain=domain)
+                                .values_list('month', 'score'))
+            if not focal_scores:
+                return None
+            ranks_by_month = rank_if_inserted(focal_scores, domain)
+            rank_df = _spliced_rank_df({model_id: focal_scores}, domain)
+        valid = pd.Series({m: ranks_by_month[m] for m in month_cols if m in ranks_by_month}, dtype=float)
         if valid.empty:
             return None
         dates = []
@@ -809,30 +989,31 @@ def _truncate_sidebar_name(name):
 
 
 def _load_comparison_rank_df(mid_a, mid_b, domain):
-    """Build the rank table needed to explain why a model’s rank changed."""
-    public_wide, _ = _load_public_wide_scores(domain)
-    month_cols = [c for c in public_wide.columns if c != 'model_id']
-    if not month_cols:
+    """Rank table both the plotted rank series and the hover narrative read:
+    the public rank frame with whichever of the pair isn't in it spliced in
+    (``_spliced_rank_df``)."""
+    (wide, rank_df), _ = _load_public_frames(domain)
+    if not [c for c in wide.columns if c != 'model_id']:
         return None
-    df = public_wide
-    for mid in (mid_a, mid_b):
-        if (df['model_id'].astype(str) == str(mid)).any():
+    row_index = _load_public_row_index(domain)
+    focal = {}
+    for mid in dict.fromkeys((mid_a, mid_b)):
+        if mid in row_index:
             continue
-        focal_rows = dict(ModelMonthlyAggregate.objects
-                          .filter(model_id=mid, domain=domain)
-                          .values_list('month', 'score'))
-        if not focal_rows:
-            continue
-        focal = {'model_id': mid}
-        focal.update({m: focal_rows.get(m) for m in month_cols})
-        df = pd.concat([df, pd.DataFrame([focal])], ignore_index=True)
-    _, rank_df = wide_scores_and_rank_df(df, month_cols)
-    return rank_df
+        scores = dict(ModelMonthlyAggregate.objects
+                      .filter(model_id=mid, domain=domain)
+                      .values_list('month', 'score'))
+        if scores:
+            focal[mid] = scores
+    if not focal:
+        # nothing to splice in -> the shared public rank frame is the answer
+        return rank_df
+    return _spliced_rank_df(focal, domain)
 
 
 def _compare_focal_change_lines(i, dates, values, kind, display_name, edges_map,
                                 coverage_deltas, model_id=None, rank_df=None,
-                                scored_new_deltas=None):
+                                scored_new_deltas=None, transition_lines=None):
     """Explain one model’s month-over-month change. This is the compare-side mirror
     of _point_attribution_lines on the model card."""
     if i == 0 or values[i] is None or values[i - 1] is None:
@@ -860,7 +1041,9 @@ def _compare_focal_change_lines(i, dates, values, kind, display_name, edges_map,
 
     model_lines = []
     if kind == 'rank' and rank_df is not None and model_id is not None:
-        if ym_prev in rank_df.columns and ym_curr in rank_df.columns:
+        if transition_lines is not None:
+            model_lines = transition_lines.get((ym_prev, ym_curr), [])
+        elif ym_prev in rank_df.columns and ym_curr in rank_df.columns:
             model_lines = rank_transition_model_lines(model_id, ym_prev, ym_curr, prev_v, curr_v, rank_df)
 
     if model_lines:
@@ -915,7 +1098,8 @@ def _comparison_point_lines(i, dates, kind, series_a, series_b, name_a, name_b,
                              new_leaf_counts=None, new_model_counts=None,
                              edges_map=None, mid_a=None, mid_b=None, rank_df=None,
                              scored_new_a=None, scored_new_b=None,
-                             scored_values_a=None, scored_values_b=None):
+                             scored_values_a=None, scored_values_b=None,
+                             transition_lines=None):
     """Hover narrative at month index ``i`` comparing A and B at that point.
     When ``i > 0``, appends month-over-month change reasons per model (mirroring
     the single-model trend panel)."""
@@ -1012,6 +1196,7 @@ def _comparison_point_lines(i, dates, kind, series_a, series_b, name_a, name_b,
             lines.extend(_compare_focal_change_lines(
                 i, dates, series, kind, name, edges_map, cov,
                 model_id=mid, rank_df=rank_df, scored_new_deltas=scored,
+                transition_lines=(transition_lines or {}).get(mid),
             ))
 
     if kind == 'rank':
@@ -1057,6 +1242,10 @@ def _build_comparison_trend_meta(dates, kind, series_a, series_b, name_a, name_b
             ]
     else:
         overall = ['No overlapping trend data for these two models.']
+    transition_lines = None
+    if kind == 'rank' and rank_df is not None:
+        transition_lines = {mid: rank_transition_lines(mid, dates, series, rank_df)
+                            for mid, series in ((mid_a, series_a), (mid_b, series_b)) if mid is not None}
     points = [{
         'lines': _comparison_point_lines(
             i, dates, kind, series_a, series_b, name_a, name_b,
@@ -1065,6 +1254,7 @@ def _build_comparison_trend_meta(dates, kind, series_a, series_b, name_a, name_b
             edges_map=edges_map, mid_a=mid_a, mid_b=mid_b, rank_df=rank_df,
             scored_new_a=scored_new_a, scored_new_b=scored_new_b,
             scored_values_a=scored_values_a, scored_values_b=scored_values_b,
+            transition_lines=transition_lines,
         ),
     } for i in range(len(dates))]
     list_el = ('compare-score-attribution-list' if kind == 'score'
@@ -1146,10 +1336,12 @@ def _build_comparison_plot_json(dates, kind, series_a, series_b, name_a, name_b,
     }
 
 
-def _aligned_pair_series(mid_a, mid_b, domain, kind):
+def _aligned_pair_series(mid_a, mid_b, domain, kind, rank_df=None):
     """``(dates, series_a, series_b, name_a, name_b)`` aligned on the union of
     months either model has data for. ``series_*`` carries ``None`` for missing
-    months so the Plotly trace can break the line via ``connectgaps=False``."""
+    months so the Plotly trace can break the line via ``connectgaps=False``.
+    Ranks are read from ``rank_df`` (``_load_comparison_rank_df``), the same
+    frame the hover narrative explains them with."""
     if kind == 'score':
         rows_a = dict(ModelMonthlyAggregate.objects
                       .filter(model_id=mid_a, domain=domain)
@@ -1165,32 +1357,25 @@ def _aligned_pair_series(mid_a, mid_b, domain, kind):
         series_a = [float(rows_a[m]) if (rows_a.get(m) or 0) > 0 else None for m in months]
         series_b = [float(rows_b[m]) if (rows_b.get(m) or 0) > 0 else None for m in months]
     else:
-        public_wide, _ = _load_public_wide_scores(domain)
-        month_cols = [c for c in public_wide.columns if c != 'model_id']
-        if not month_cols:
-            return None
-        df = public_wide
-        for mid in (mid_a, mid_b):
-            if not (df['model_id'].astype(str) == str(mid)).any():
-                focal_rows = dict(ModelMonthlyAggregate.objects
-                                  .filter(model_id=mid, domain=domain)
-                                  .values_list('month', 'score'))
-                if not focal_rows:
-                    continue
-                focal = {'model_id': mid}
-                focal.update({m: focal_rows.get(m) for m in month_cols})
-                df = pd.concat([df, pd.DataFrame([focal])], ignore_index=True)
-        _, rank_df = wide_scores_and_rank_df(df, month_cols)
-        rank_idx = rank_df.set_index('model_id')
-        if mid_a not in rank_idx.index or mid_b not in rank_idx.index:
+        if rank_df is None:
             return None
-        ra = rank_idx.loc[mid_a, month_cols]
-        rb = rank_idx.loc[mid_b, month_cols]
-        months = [m for m in month_cols if pd.notna(ra[m]) or pd.notna(rb[m])]
+        month_cols = [c for c in rank_df.columns if c != 'model_id']
+        model_ids = rank_df['model_id'].to_numpy()
+        ranks = rank_df[month_cols].to_numpy(dtype=float)
+
+        def rank_series(mid):
+            rows = np.flatnonzero(model_ids == mid)
+            if not len(rows):
+                return {}
+            return {m: int(r) for m, r in zip(month_cols, ranks[rows[0]]) if not np.isnan(r)}
+
+        ra = rank_series(mid_a)
+        rb = rank_series(mid_b)
+        months = [m for m in month_cols if m in ra or m in rb]
         if not months:
             return None
-        series_a = [int(ra[m]) if pd.notna(ra[m]) else None for m in months]
-        series_b = [int(rb[m]) if pd.notna(rb[m]) else None for m in months]
+        series_a = [ra.get(m) for m in months]
+        series_b = [rb.get(m) for m in months]
 
     name_map, _ = _load_model_names(domain)
     name_a = name_map.get(mid_a) or f'#{_fmt_model_id(mid_a)}'
@@ -1225,7 +1410,7 @@ def load_and_build_comparison_trend(mid_a, mid_b, domain):
         scored_values_b = _load_scored_new_leaf_values(mid_b, domain, edges)
 
         for kind in ('score', 'rank'):
-            pair = _aligned_pair_series(mid_a, mid_b, domain, kind)
+            pair = _aligned_pair_series(mid_a, mid_b, domain, kind, rank_df=rank_df)
             if pair is None:
                 continue
             dates, series_a, series_b, name_a, name_b = pair
@@ -0,0 +1,156 @@
+"""
+Score cell colors.
+
+Two palettes are in use, each precomputed once at import into a lookup table so that
+coloring a cell is an index into an array rather than a ``colour.Color`` interpolation:
+
+- the leaderboard palette (``REDGREEN_COLORS`` / ``GRAY_COLORS``), shared with the
+  client-side ``color-utils.js`` and used by the model card: gamma-stretched, 101 steps,
+  ``rgba(r, g, b, a)`` with alpha clamped to [0, 1];
+- the legacy gradient used by the benchmark page and the old table templates: a
+  power-scaled ``colour.Color`` red-to-green range, normalized to 70% of the range.
+
+Both are exposed as vectorized functions over numpy arrays plus scalar wrappers.
+"""
+import numpy as np
+from colour import Color
+
+COLOR_NONE = '#e0e1e2'
+GAMMA = 0.5
+PALETTE_STEPS = 101
+
+# Precomputed color arrays matching JavaScript client-side logic
+REDGREEN_COLORS = [
+    '#ff0000', '#ff0000', '#ff0000', '#ff0000', '#fe0600', '#fe0600', '#fd0d01', '#fd0d01', '#fc1301', '#fb1901',
+    '#fb1901', '#fa1f02', '#f92502', '#f92502', '#f82b02', '#f73103', '#f73103', '#f63703', '#f53d03', '#f44204',
+    '#f44204', '#f44804', '#f34d04', '#f25305', '#f15805', '#f15805', '#f05e05', '#ef6306', '#ee6806', '#ed6e06',
+    '#ec7307', '#eb7807', '#ea7d07', '#e98208', '#e88708', '#e88708', '#e78c08', '#e69109', '#e69509', '#e59a09',
+    '#e49f0a', '#e3a30a', '#e2a80a', '#e1ac0a', '#e0b10b', '#dfb50b', '#deb90b', '#ddbe0c', '#dcc20c', '#dcc60c',
+    '#dbca0d', '#d9d20d', '#d8d60d', '#d4d70e', '#cfd60e', '#c9d50e', '#c4d40f', '#bed40f', '#b9d30f', '#b4d20f',
+    '#aed110', '#a4cf10', '#9fce10', '#9acd11', '#95cc11', '#90cc11', '#8bcb11', '#86ca12', '#7dc812', '#78c712',
+    '#74c613', '#6fc613', '#6ac513', '#66c413', '#5dc214', '#59c114', '#55c014', '#51c015', '#48be15', '#44bd15',
+    '#40bc16', '#3cbb16', '#38bb16', '#31b917', '#2db817', '#29b717', '#26b617', '#1eb518', '#1bb418', '#18b319',
+    '#18b21c', '#19b124', '#19b028', '#19af2b', '#19ad32', '#1aad36', '#1aac39', '#1aaa40', '#1aa943', '#1ba947',
+    '#1ba84a'
+]
+
+GRAY_COLORS = [
+    '#f2f2f2', '#f2f2f2', '#f2f2f2', '#f2f2f2', '#f0f0f0', '#f0f0f0', '#eeeeee', '#eeeeee', '#ededed', '#ebebeb',
+    '#ebebeb', '#e9e9e9', '#e7e7e7', '#e7e7e7', '#e6e6e6', '#e4e4e4', '#e4e4e4', '#e2e2e2', '#e0e0e0', '#dedede',
+    '#dedede', '#dddddd', '#dbdbdb', '#d9d9d9', '#d7d7d7', '#d7d7d7', '#d6d6d6', '#d4d4d4', '#d2d2d2', '#d0d0d0',
+    '#cecece', '#cdcdcd', '#cbcbcb', '#c9c9c9', '#c7c7c7', '#c7c7c7', '#c5c5c5', '#c4c4c4', '#c2c2c2', '#c0c0c0',
+    '#bebebe', '#bdbdbd', '#bbbbbb', '#b9b9b9', '#b7b7b7', '#b5b5b5', '#b4b4b4', '#b2b2b2', '#b0b0b0', '#aeaeae',
+    '#adadad', '#a9a9a9', '#a7a7a7', '#a5a5a5', '#a4a4a4', '#a2a2a2', '#a0a0a0', '#9e9e9e', '#9d9d9d', '#9b9b9b',
+    '#999999', '#959595', '#949494', '#929292', '#909090', '#8e8e8e', '#8d8d8d', '#8b8b8b', '#878787', '#858585',
+    '#848484', '#828282', '#808080', '#7e7e7e', '#7b7b7b', '#797979', '#777777', '#757575', '#727272', '#707070',
+    '#6e6e6e', '#6c6c6c', '#6b6b6b', '#676767', '#656565', '#646464', '#626262', '#5e5e5e', '#5c5c5c', '#5b5b5b',
+    '#595959', '#555555', '#545454', '#525252', '#4e4e4e', '#4c4c4c', '#4b4b4b', '#474747', '#454545', '#444444',
+    '#424242'
+]
+
+
+def _hex_to_rgb(colors):
+    return np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in colors], dtype=np.int64)
+
+
+# (PALETTE_STEPS, 3) integer rgb per scheme, and the "r, g, b" prefix pre-rendered per step
+REDGREEN_RGB = _hex_to_rgb(REDGREEN_COLORS)
+GRAY_RGB = _hex_to_rgb(GRAY_COLORS)
+_REDGREEN_PREFIX = np.array([f'{r}, {g}, {b}' for r, g, b in REDGREEN_RGB], dtype=object)
+_GRAY_PREFIX = np.array([f'{r}, {g}, {b}' for r, g, b in GRAY_RGB], dtype=object)
+
+# Legacy gradients (previously built in views.index)
+colors_redgreen = list(Color('red').range_to(Color('#1BA74D'), PALETTE_STEPS))
+colors_gray = list(Color('#f2f2f2').range_to(Color('#404040'), PALETTE_STEPS))
+# scale colors: highlight differences at the top-end of the spectrum more than at the lower end
+a, b = 0.2270617, 1.321928  # fit to (0, 0), (60, 50), (100, 100)
+colors_redgreen = [colors_redgreen[int(a * np.power(i, b))] for i in range(len(colors_redgreen))]
+colors_gray = [colors_gray[int(a * np.power(i, b))] for i in range(len(colors_gray))]
+
+# Pre-rendered "rgb(...)" fallback and float rgb tuple per legacy step
+_LEGACY_LUT = {
+    'redgreen': [(str(tuple(round(c * 255) for c in color.rgb)), tuple(c * 255 for c in color.rgb))
+                 for color in colors_redgreen],
+    'gray': [(str(tuple(round(c * 255) for c in color.rgb)), tuple(c * 255 for c in color.rgb))
+             for color in colors_gray],
+}
+
+
+def palette_indices(values, min_values, max_values):
+    """
+    Vectorized leaderboard-palette mapping.
+
+    :param values: scores (array-like of float, NaN for missing)
+    :param min_values: per-score (or scalar) minimum of the score distribution
+    :param max_values: per-score (or scalar) maximum of the score distribution
+    :return: ``(indices, alphas, valid)``: palette step per score, alpha per score and a mask
+        of the scores that have a color (``False`` for NaN scores)
+    """
+    values = np.asarray(values, dtype=float)
+    min_values = np.broadcast_to(np.asarray(min_values, dtype=float), values.shape)
+    max_values = np.broadcast_to(np.asarray(max_values, dtype=float), values.shape)
+    span = max_values - min_values
+    flat = span == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalized = np.where(flat, 0.5, (values - min_values) / span)
+        normalized = np.clip(normalized, 0.0, 1.0)
+        # Apply gamma correction to emphasize differences at the top-end, then scale down
+        normalized = np.clip(0.8 * normalized ** (1.0 / GAMMA), 0.0, 1.0)
+        slope = -0.9 / (min_values - max_values)
+        alphas = np.where(flat, 1.0, slope * values + (0.1 - slope * min_values))
+    alphas = np.clip(alphas, 0.0, 1.0)
+    valid = ~np.isnan(values)
+    indices = np.minimum(np.floor(100 * np.where(valid, normalized, 0.0)), PALETTE_STEPS - 1).astype(np.int64)
+    return indices, alphas, valid
+
+
+def representative_colors(values, min_values, max_values, is_engineering=False):
+    """
+    Vectorized leaderboard-palette CSS colors, ``rgba(r, g, b, a)`` per score or ``COLOR_NONE``
+    for NaN scores. ``is_engineering`` (scalar or per-score) selects the gray scheme.
+    """
+    indices, alphas, valid = palette_indices(values, min_values, max_values)
+    is_engineering = np.broadcast_to(np.asarray(is_engineering, dtype=bool), indices.shape)
+    prefixes = np.where(is_engineering, _GRAY_PREFIX[indices], _REDGREEN_PREFIX[indices])
+    return [f'rgba({prefix}, {alpha:.2f})' if is_valid else COLOR_NONE
+            for prefix, alpha, is_valid in zip(prefixes.tolist(), alphas.tolist(), valid.tolist())]
+
+
+def representative_color(value, min_value, max_value, is_engineering=False):
+    """Scalar :func:`representative_colors`, e.g. ``'rgba(255, 0, 0, 0.85)'``."""
+    return representative_colors([value], [min_value], [max_value], is_engineering)[0]
+
+
+def legacy_representative_colors(values, min_value, max_value, scheme='redgreen'):
+    """
+    Vectorized legacy gradient for scores sharing one ``min_value``/``max_value``, as
+    ``style`` attribute strings. Missing scores, and distributions without a range, are gray.
+    """
+    values = np.asarray(values, dtype=float)
+    none_style = f"background-color: {COLOR_NONE}"
+    if min_value is None or max_value is None or np.isnan(min_value) or np.isnan(max_value) \
+            or min_value == max_value:
+        return [none_style] * len(values)
+    lut = _LEGACY_LUT[scheme]
+    with np.errstate(invalid='ignore'):
+        # same float operations as the original normalize_value / normalize_alpha so strings match exactly
+        steps = 100 * (.7 * ((values - min_value) / (max_value - min_value)))
+        slope = -.9 / (min_value - max_value)
+        alphas = slope * values + (.1 - slope * min_value)
+    valid = ~np.isnan(steps)
+    steps = np.clip(np.where(valid, steps, 0), 0, len(lut) - 1).astype(np.int64)
+    styles = []
+    for step, alpha, is_valid in zip(steps.tolist(), alphas.tolist(), valid.tolist()):
+        if not is_valid:
+            styles.append(none_style)
+            continue
+        fallback_color, color = lut[step]
+        styles.append(f"background-color: rgb{fallback_color}; background-color: rgba{color + (alpha,)};")
+    return styles
+
+
+def legacy_representative_color(value, min_value=None, max_value=None, scheme='redgreen'):
+    """Scalar :func:`legacy_representative_colors`; non-numeric values are gray."""
+    if not isinstance(value, (int, float)):
+        return f"background-color: {COLOR_NONE}"
+    return legacy_representative_colors([value], min_value, max_value, scheme)[0]
@@ -0,0 +1,121 @@
+"""
+Vectorized score rounding and ranking shared by the leaderboard, the model card and
+the score/rank trends.
+
+Semantics (identical everywhere):
+
+- rounding is decimal ROUND_HALF_UP of the score's shortest decimal representation,
+  i.e. ``Decimal(str(x)).quantize(..., ROUND_HALF_UP)`` and PostgreSQL
+  ``ROUND(x::numeric, n)``, at a configurable number of decimals;
+- ranks are competition ("min") ranks on descending scores: 1, 2, 2, 4, ...;
+- missing scores (``None``, ``''``, unparsable) are not ranked (NaN rank);
+- ``"X"`` (and NaN) scores are ranked last, all tied, one place after the last number.
+"""
+import numpy as np
+
+
+def round_half_up(values, decimals=2):
+    """
+    ROUND_HALF_UP ``values`` to ``decimals`` places. NaN passes through.
+
+    Exact without going through ``Decimal``: the tie ``(k + .5) / 10**decimals`` computed in
+    floating point is the double nearest to the decimal tie, so comparing the value against it
+    decides the same way as comparing the value's shortest decimal representation.
+
+    :param values: float or array-like of floats
+    :return: float ndarray of the same shape (a float for scalar input)
+    """
+    array = np.asarray(values, dtype=float)
+    scale = 10.0 ** decimals
+    magnitude = np.abs(array)
+    floor = np.floor(magnitude * scale)
+    with np.errstate(invalid='ignore'):
+        rounded = np.copysign((floor + (magnitude >= (floor + 0.5) / scale)) / scale, array)
+    if rounded.ndim == 0:
+        return float(rounded)
+    return rounded
+
+
+def parse_scores(values):
+    """
+    Parse displayed score values (numbers, numeric strings, ``"X"``, ``""``, ``None``).
+
+    :return: ``(scores, is_x)``: float ndarray with NaN for anything that is not a finite
+        number, and a boolean mask of the ``"X"``/NaN entries that rank last
+    """
+    scores = np.full(len(values), np.nan)
+    is_x = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if value is None or value == '':
+            continue
+        if value == 'X':
+            is_x[i] = True
+            continue
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            continue
+        if score != score:
+            is_x[i] = True
+        else:
+            scores[i] = score
+    return scores, is_x
+
+
+def min_rank(scores, axis=0):
+    """
+    Competition ranks of ``scores`` in descending order along ``axis``; NaN stays NaN.
+    Same as ``pandas.DataFrame.rank(method='min', ascending=False, na_option='keep')``.
+
+    :param scores: 1-d or 2-d array-like of floats
+    :return: float ndarray of ranks, same shape as ``scores``
+    """
+    scores = np.asarray(scores, dtype=float)
+    if scores.ndim == 1:
+        return min_rank(scores[:, None], axis=0)[:, 0]
+    # work along the last axis of a contiguous copy: row-wise sorts are much faster than strided ones
+    negated = np.ascontiguousarray(-(scores.T if axis == 0 else scores))  # argsort puts NaN last
+    order = np.argsort(negated, axis=1, kind='stable')
+    ordered = np.take_along_axis(negated, order, axis=1)
+    positions = np.broadcast_to(np.arange(ordered.shape[1]), ordered.shape)
+    group_start = np.ones(ordered.shape, dtype=bool)
+    group_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ordered_ranks = np.maximum.accumulate(np.where(group_start, positions, 0), axis=1) + 1.0
+    ordered_ranks[np.isnan(ordered)] = np.nan
+    ranks = np.empty_like(ordered_ranks)
+    np.put_along_axis(ranks, order, ordered_ranks, axis=1)
+    return ranks.T if axis == 0 else ranks
+
+
+def rank_scores(values, decimals=2):
+    """
+    Leaderboard ranks for displayed score values: HALF_UP to ``decimals`` places, min-rank
+    ties, ``"X"``/NaN tied last and missing values unranked.
+
+    :return: ``(rounded, ranks)`` float ndarrays; ``rounded`` is NaN for ``"X"`` and missing values
+    """
+    scores, is_x = parse_scores(values)
+    rounded = round_half_up(scores, decimals) if decimals is not None else scores
+    ranks = min_rank(rounded)
+    ranks[is_x] = np.count_nonzero(~np.isnan(rounded)) + 1
+    return rounded, ranks
+
+
+def insertion_rank(targets, pool):
+    """
+    Rank each target would get if inserted into ``pool``: one plus the number of ``pool``
+    scores strictly greater. Binary search over the sorted pool; NaN targets get NaN and
+    NaN pool entries are ignored.
+
+    :param targets: float or array-like of floats
+    :param pool: array-like of comparator scores
+    :return: float ndarray of ranks (a float for scalar input)
+    """
+    pool = np.asarray(pool, dtype=float)
+    pool = np.sort(pool[~np.isnan(pool)])
+    targets_array = np.asarray(targets, dtype=float)
+    ranks = (len(pool) - np.searchsorted(pool, targets_array, side='right') + 1).astype(float)
+    ranks = np.where(np.isnan(targets_array), np.nan, ranks)
+    if ranks.ndim == 0:
+        return float(ranks)
+    return ranks
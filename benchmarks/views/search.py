@@ -0,0 +1,175 @@
+"""
+Typeahead search over public model and benchmark names.
+
+One :class:`SearchIndex` per domain is built in-process from the database. At most every
+``_RECHECK_SECONDS`` the names are re-read, and the index is rebuilt only if they changed, so
+every worker picks up renamed, published or new models without a cache signal.
+``invalidate_domain_cache`` drops the indexes of its own process straight away. Lookups
+never touch the database: prefixes are answered by binary search over the sorted
+lowercase names (and name tokens), substrings by intersecting trigram postings.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from django.http import JsonResponse, HttpResponseBadRequest
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from benchmarks.models import Model, BenchmarkInstance
+
+NGRAM = 3
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+KINDS = ('model', 'benchmark')
+
+# Match quality, best first
+_EXACT, _PREFIX, _TOKEN_PREFIX, _SUBSTRING = range(4)
+_TOKEN_SPLIT = re.compile(r'[\s_\-.:/()\[\]]+')
+
+_INDEXES = {}  # domain -> (entries fingerprint, SearchIndex, recheck_at)
+_LOAD_LOCKS = {}  # domain -> lock held while that domain's names are re-read
+_INDEXES_LOCK = threading.Lock()  # guards the two dicts and _generation, never held across a query
+_generation = 0  # bumped by clear_search_index, so loads it overtook don't store stale indexes
+
+# How often each process re-reads a domain's names to check its index is current
+_RECHECK_SECONDS = 30
+
+
+class SearchIndex:
+    """
+    In-memory name index.
+
+    :param entries: ``(kind, id, name)`` tuples
+    """
+
+    def __init__(self, entries):
+        self.entries = [(kind, entry_id, name, name.lower()) for kind, entry_id, name in entries]
+        # (lowercase name, entry index), sorted for prefix search on whole names and on name tokens
+        self._names = sorted((lower, i) for i, (_, _, _, lower) in enumerate(self.entries))
+        self._name_keys = [lower for lower, _ in self._names]
+        self._tokens = sorted({(token, i) for i, (_, _, _, lower) in enumerate(self.entries)
+                               for token in _TOKEN_SPLIT.split(lower)[1:] if token})
+        self._token_keys = [token for token, _ in self._tokens]
+        # trigram -> sorted entry indices
+        postings = {}
+        for i, (_, _, _, lower) in enumerate(self.entries):
+            for gram in {lower[j:j + NGRAM] for j in range(len(lower) - NGRAM + 1)}:
+                postings.setdefault(gram, []).append(i)
+        self._postings = postings
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _prefix_range(keys, prefix):
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\uffff', lo=start)
+        return start, end
+
+    def _substring_candidates(self, query):
+        grams = {query[j:j + NGRAM] for j in range(len(query) - NGRAM + 1)}
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        if not postings or not postings[0]:
+            return ()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query, kind=None, limit=DEFAULT_LIMIT):
+        """
+        Ranked matches for ``query`` (case-insensitive): exact name, then name prefix, then a
+        prefix of a later name token (e.g. ``"v1"`` in ``"MajajHong2015.V1-pls"``), then any
+        substring (queries of at least ``NGRAM`` characters). Ties go to shorter names, then
+        alphabetical order.
+
+        :return: list of ``{'kind', 'id', 'name'}`` dicts, at most ``limit`` long
+        """
+        query = query.strip().lower()
+        if not query or limit <= 0:
+            return []
+        quality = {}
+
+        start, end = self._prefix_range(self._name_keys, query)
+        for _, i in self._names[start:end]:
+            quality[i] = _EXACT if self.entries[i][3] == query else _PREFIX
+        start, end = self._prefix_range(self._token_keys, query)
+        for _, i in self._tokens[start:end]:
+            quality.setdefault(i, _TOKEN_PREFIX)
+        if len(query) >= NGRAM:
+            for i in self._substring_candidates(query):
+                if i not in quality and query in self.entries[i][3]:
+                    quality[i] = _SUBSTRING
+
+        if kind is not None:
+            quality = {i: q for i, q in quality.items() if self.entries[i][0] == kind}
+        ranked = sorted(quality, key=lambda i: (quality[i], len(self.entries[i][3]), self.entries[i][3]))
+        return [{'kind': self.entries[i][0], 'id': self.entries[i][1], 'name': self.entries[i][2]}
+                for i in ranked[:limit]]
+
+
+def _load_entries(domain):
+    models = (Model.objects
+              .filter(domain=domain, public=True)
+              .values_list('id', 'name'))
+    # latest version per visible benchmark type, as on the explore page
+    benchmarks = (BenchmarkInstance.objects
+                  .filter(benchmark_type__domain=domain, benchmark_type__visible=True)
+                  .order_by('benchmark_type__identifier', '-version')
+                  .distinct('benchmark_type__identifier')
+                  .values_list('id', 'benchmark_type__identifier'))
+    return ([('model', model_id, name) for model_id, name in models]
+            + [('benchmark', benchmark_id, identifier) for benchmark_id, identifier in benchmarks])
+
+
+def get_search_index(domain):
+    """The domain's :class:`SearchIndex`, rebuilt when its names change."""
+    hit = _INDEXES.get(domain)
+    if hit is not None and hit[2] > time.monotonic():
+        return hit[1]
+    with _INDEXES_LOCK:
+        load_lock = _LOAD_LOCKS.setdefault(domain, threading.Lock())
+    with load_lock:
+        hit = _INDEXES.get(domain)
+        if hit is not None and hit[2] > time.monotonic():
+            return hit[1]
+        generation = _generation
+        entries = _load_entries(domain)
+        fingerprint = hash(frozenset(entries))
+        index = hit[1] if hit is not None and hit[0] == fingerprint else SearchIndex(entries)
+        with _INDEXES_LOCK:
+            if generation == _generation:
+                _INDEXES[domain] = (fingerprint, index, time.monotonic() + _RECHECK_SECONDS)
+        return index
+
+
+def clear_search_index():
+    """Drop all in-process indexes, so the next search rebuilds from the database."""
+    global _generation
+    with _INDEXES_LOCK:
+        _generation += 1
+        _INDEXES.clear()
+
+
+@require_GET
+def search(request, domain: str):
+    """
+    JSON typeahead. Query: ``q``, optional ``kind`` (``model`` or ``benchmark``) and ``limit``
+    (default 10, at most 50).
+    """
+    kind = request.GET.get('kind') or None
+    if kind is not None and kind not in KINDS:
+        return HttpResponseBadRequest(f"kind must be one of {', '.join(KINDS)}")
+    try:
+        limit = min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+    except (TypeError, ValueError):
+        return HttpResponseBadRequest('limit must be an integer')
+    results = get_search_index(domain).search(request.GET.get('q', ''), kind=kind, limit=limit)
+    for result in results:
+        view_name = 'model-view' if result['kind'] == 'model' else 'benchmark-view'
+        result['url'] = reverse(view_name, args=[domain, result['id']])
+    return JsonResponse({'results': results}, json_dumps_params={"separators": (",", ":")})
@@ -0,0 +1,169 @@
+"""
+Bounded in-process cache for the score/rank trend loaders (see ``model_trends``).
+
+Entries are keyed on ``(kind, domain, data_version)``. Every operation is O(1):
+entries sit in one global LRU order plus one LRU order per kind family (the part of
+the kind before ``:``, so ``focal_coverage:42`` belongs to ``focal_coverage``), and
+evictions pop from the cold end of either. Sizes are approximate byte counts,
+computed once on insert.
+
+Three limits apply:
+
+- a total byte budget for the whole cache (global LRU eviction);
+- optional per-family entry limits, so that per-model kinds (one entry per model card
+  ever viewed) cannot push out the shared per-domain frames;
+- version scoping: when a domain's data version advances, every entry of that domain
+  cached under another version is dropped at once, and later puts under an older
+  version (a loader that read its version before the bump) are dropped instead of
+  evicting the current entries.
+"""
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def approx_size(value):
+    """Approximate memory footprint of ``value`` in bytes (frames and arrays by their buffers)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(approx_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def kind_family(kind):
+    """``'focal_coverage:42'`` -> ``'focal_coverage'``; shared kinds are their own family."""
+    return kind.partition(':')[0]
+
+
+def _is_older(version, other):
+    """Data versions are counters; ``None`` (no recompute yet) is older than any of them."""
+    return other is not None and (version is None or version < other)
+
+
+class TrendCache:
+    """
+    Thread-safe LRU cache with approximate byte accounting.
+
+    :param max_bytes: total size budget; values larger than this are not cached
+    :param kind_limits: ``{family: max_entries}`` for kind families that need their own cap
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, kind_limits=None):
+        self.max_bytes = max_bytes
+        self.kind_limits = dict(kind_limits or {})
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size), least recently used first
+        self._families = defaultdict(OrderedDict)  # family -> {key: None}, least recently used first
+        self._domain_keys = defaultdict(set)  # domain -> keys
+        self._domain_versions = {}  # domain -> latest version stored
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = defaultdict(int)  # reason -> count
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    def get(self, key):
+        """Cached value for ``(kind, domain, version)``, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            self._families[kind_family(key[0])].move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        """Store ``value`` under ``(kind, domain, version)``, evicting as needed."""
+        kind, domain, version = key
+        size = approx_size(value)
+        family = kind_family(kind)
+        with self._lock:
+            current = self._domain_versions.get(domain, version)
+            if current != version:
+                if _is_older(version, current):
+                    self._evictions['stale_version'] += 1
+                    return
+                self._evict_domain(domain, keep_version=version)
+            self._domain_versions[domain] = version
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                self._evictions['too_large'] += 1
+                return
+            self._entries[key] = (value, size)
+            self._families[family][key] = None
+            self._domain_keys[domain].add(key)
+            self._bytes += size
+
+            limit = self.kind_limits.get(family)
+            members = self._families[family]
+            while limit is not None and len(members) > limit:
+                self._remove(next(iter(members)))
+                self._evictions['kind_limit'] += 1
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions['lru'] += 1
+
+    def evict_domain(self, domain, keep_version=None):
+        """Drop every entry of ``domain`` that was not cached under ``keep_version``."""
+        with self._lock:
+            self._evict_domain(domain, keep_version)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._families.clear()
+            self._domain_keys.clear()
+            self._domain_versions.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Snapshot of hit/miss/eviction counters and current size, overall and per kind family."""
+        with self._lock:
+            families = {}
+            for family, members in self._families.items():
+                families[family] = {'entries': len(members),
+                                    'bytes': sum(self._entries[key][1] for key in members),
+                                    'limit': self.kind_limits.get(family)}
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes,
+                    'hits': self._hits, 'misses': self._misses, 'evictions': dict(self._evictions),
+                    'families': families}
+
+    def _evict_domain(self, domain, keep_version):
+        stale = [key for key in self._domain_keys.get(domain, ()) if key[2] != keep_version]
+        for key in stale:
+            self._remove(key)
+        self._evictions['version'] += len(stale)
+
+    def _remove(self, key):
+        _value, size = self._entries.pop(key)
+        family = kind_family(key[0])
+        members = self._families[family]
+        del members[key]
+        if not members:
+            del self._families[family]
+        self._domain_keys[key[1]].discard(key)
+        self._bytes -= size
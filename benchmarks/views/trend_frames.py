@@ -0,0 +1,84 @@
+"""
+Compact binary encoding of the public wide-score and rank frames, so that one worker
+builds them per trend data version and every other worker maps them out of the shared
+cache instead of re-pivoting ``ModelMonthlyAggregate``.
+
+Layout (all buffers 8-byte aligned, native little-endian)::
+
+    b'BSTF' | uint32 header length | JSON header | model ids (int64)
+            | scores (float64, models × months, C order) | ranks (float32, same shape)
+
+Decoding does not copy: the arrays are read-only views over the cached bytes.
+"""
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'BSTF'
+_ALIGN = 8
+_ID_DTYPE = np.dtype('<i8')
+_SCORE_DTYPE = np.dtype('<f8')
+_RANK_DTYPE = np.dtype('<f4')  # ranks are small integers or NaN; float32 is exact
+
+
+def _padding(length):
+    return -length % _ALIGN
+
+
+def pack_frames(model_ids, months, scores, ranks):
+    """
+    Encode the public frames.
+
+    :param model_ids: sequence of model ids (row order)
+    :param months: sequence of ``YYYY-MM`` strings (column order)
+    :param scores: ``len(model_ids) × len(months)`` raw monthly scores
+    :param ranks: same-shape public ranks
+    :return: bytes
+    """
+    header = json.dumps({'months': list(months), 'n_models': len(model_ids)}).encode()
+    prefix = MAGIC + struct.pack('<I', len(header)) + header
+    parts = [prefix, b'\0' * _padding(len(prefix))]
+    for array, dtype in ((model_ids, _ID_DTYPE), (scores, _SCORE_DTYPE), (ranks, _RANK_DTYPE)):
+        buffer = np.ascontiguousarray(array, dtype=dtype).tobytes()
+        parts += [buffer, b'\0' * _padding(len(buffer))]
+    return b''.join(parts)
+
+
+def unpack_frames(blob):
+    """
+    Decode :func:`pack_frames` output into read-only views over ``blob``.
+
+    :return: ``(model_ids, months, scores, ranks)``
+    """
+    if blob[:len(MAGIC)] != MAGIC:
+        raise ValueError('not a trend frame blob')
+    (header_length,) = struct.unpack_from('<I', blob, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(bytes(blob[start:start + header_length]))
+    months, n_models = header['months'], header['n_models']
+    offset = start + header_length
+    offset += _padding(offset)
+    arrays = []
+    for dtype, count in ((_ID_DTYPE, n_models), (_SCORE_DTYPE, n_models * len(months)),
+                         (_RANK_DTYPE, n_models * len(months))):
+        arrays.append(np.frombuffer(blob, dtype=dtype, count=count, offset=offset))
+        size = count * dtype.itemsize
+        offset += size + _padding(size)
+    model_ids, scores, ranks = arrays
+    shape = (n_models, len(months))
+    return model_ids, months, scores.reshape(shape), ranks.reshape(shape)
+
+
+def frames_from_blob(blob):
+    """
+    ``(wide_scores, rank_df)`` frames (``model_id`` column + one column per month) backed by
+    the read-only arrays in ``blob``. Callers must not modify them in place.
+    """
+    model_ids, months, scores, ranks = unpack_frames(blob)
+    wide = pd.DataFrame(scores, columns=months, copy=False)
+    wide.insert(0, 'model_id', model_ids)
+    rank_df = pd.DataFrame(ranks, columns=months, copy=False)
+    rank_df.insert(0, 'model_id', model_ids)
+    return wide, rank_df
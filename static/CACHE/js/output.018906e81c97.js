@@ -0,0 +1,308 @@
+const CELL_ALPHA=0.85;const DEFAULT_CELL_BG='#e0e1e2';const RUNNABLE_STATUS={FUNCTIONAL:'runnable-green',ISSUES:'runnable-red',UNKNOWN:'runnable-grey'};const RUNNABLE_SORT_VALUES={FUNCTIONAL:2,ISSUES:1,UNKNOWN:0};const RUNNABLE_TOOLTIPS={FUNCTIONAL:'Model code is functional and runnable',ISSUES:'Model code has known issues or is non-functional',UNKNOWN:'Model code status unknown'};const GROUP_STATUS={MEMBER:'group-blue',NON_MEMBER:'group-grey'};const GROUP_SORT_VALUES={MEMBER:1,NON_MEMBER:0};const GROUP_TOOLTIPS={MEMBER:'Curated model (part of a benchmark group)',NON_MEMBER:'Community-submitted model'};const COLUMN_WIDTHS={GROUP_STATUS:80,MODEL_COLUMN:200,SCORE_COLUMN:100};const NAVIGATION_CLICK_AREA=0.8;const SORT_CLICK_AREA=0.2;const FILTER_DEBOUNCE_DELAY=300;const SLIDER_UPDATE_DELAY=100;const ENABLE_WAYBACK_SLIDER=true;const URL_PARAMS={ARCHITECTURE:'architecture',MODEL_FAMILY:'model_family',TRAINING_DATASET:'training_dataset',TASK_SPECIALIZATION:'task_specialization',MAX_PARAM_COUNT:'max_param_count',MAX_MODEL_SIZE:'max_model_size',RUNNABLE_ONLY:'runnable_only',BENCHMARK_REGIONS:'benchmark_regions',BENCHMARK_SPECIES:'benchmark_species',BENCHMARK_TASKS:'benchmark_tasks',PUBLIC_DATA_ONLY:'public_data_only',EXCLUDED_BENCHMARKS:'excluded_benchmarks'};window.LeaderboardConstants={CELL_ALPHA,DEFAULT_CELL_BG,RUNNABLE_STATUS,RUNNABLE_SORT_VALUES,RUNNABLE_TOOLTIPS,GROUP_STATUS,GROUP_SORT_VALUES,GROUP_TOOLTIPS,COLUMN_WIDTHS,NAVIGATION_CLICK_AREA,SORT_CLICK_AREA,FILTER_DEBOUNCE_DELAY,SLIDER_UPDATE_DELAY,URL_PARAMS,ENABLE_WAYBACK_SLIDER};;function PublicToggleCellRenderer(){}
+PublicToggleCellRenderer.prototype.init=function(params){this.params=params;this.eGui=document.createElement('div');this.eGui.className='public-toggle-cell';this.eGui.style.display='flex';this.eGui.style.justifyContent='center';this.eGui.style.alignItems='center';this.eGui.style.height='100%';if(params.data&&params.data.is_owner){const toggleWrapper=document.createElement('div');toggleWrapper.className='toggle-wrapper';toggleWrapper.style.cursor='pointer';const toggleButton=document.createElement('button');toggleButton.className='toggle-switch';const isPublic=params.data.public===true||params.data.public==='true'||params.data.public===1||params.data.public==='1';toggleButton.setAttribute('aria-pressed',isPublic?'true':'false');toggleButton.title=isPublic?'Make private':'Make public';const knob=document.createElement('span');knob.className='knob';toggleButton.appendChild(knob);toggleWrapper.appendChild(toggleButton);this.eGui.appendChild(toggleWrapper);toggleButton.addEventListener('click',(e)=>{e.stopPropagation();this.handleToggle(params);});}};PublicToggleCellRenderer.prototype.getGui=function(){return this.eGui;};PublicToggleCellRenderer.prototype.handleToggle=function(params){const modelId=params.data.id;const currentPublicStatus=!!params.data.public;const newPublicStatus=!currentPublicStatus;fetch('/profile/public-ajax/',{method:'POST',headers:{'Content-Type':'application/json','X-CSRFToken':this.getCookie('csrftoken')},body:JSON.stringify({id:modelId,public:newPublicStatus})}).then(response=>{if(!response.ok){throw new Error('Failed to update model visibility');}
+return response.json();}).then(data=>{params.data.public=newPublicStatus;const toggleButton=this.eGui.querySelector('.toggle-switch');if(toggleButton){toggleButton.setAttribute('aria-pressed',newPublicStatus?'true':'false');toggleButton.title=newPublicStatus?'Make private':'Make public';if(window.globalGridApi){window.globalGridApi.refreshCells({rowNodes:[params.node]});}}
+const modelName=params.data?.model?.name||'your model';const note=document.createElement('div');note.className='notification is-info is-light';note.style.cssText=`
+      position: fixed;
+      top: 20px;
+      right: 20px;
+      z-index: 9999;
+      max-width: 420px;
+      box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+      padding: 12px 14px;
+      border-radius: 6px;
+      background: #eef6ff;
+      color: #114a7a;
+      font-size: 14px;
+    `;note.innerHTML=`Changes saved for <strong>${modelName}</strong>.<br/>Please hit <strong>Apply</strong> below to apply your changes.`;document.body.appendChild(note);setTimeout(()=>{if(note.parentNode)note.parentNode.removeChild(note);},5000);}).catch(error=>{console.error('Error updating model visibility:',error);alert('Failed to update model visibility. Please try again.');});};PublicToggleCellRenderer.prototype.getCookie=function(name){let cookieValue=null;if(document.cookie&&document.cookie!==''){const cookies=document.cookie.split(';');for(let i=0;i<cookies.length;i++){const cookie=cookies[i].trim();if(cookie.substring(0,name.length+1)===(name+'=')){cookieValue=decodeURIComponent(cookie.substring(name.length+1));break;}}}
+return cookieValue;};window.LeaderboardRenderers={PublicToggleCellRenderer};;var ACTIVE_NEW_UPDATE=new URLSearchParams(window.location.search).get('new');function buildHierarchyFromTree(tree,hierarchyMap=new Map()){tree.forEach(node=>{const nodeId=node.id||node.identifier||node.field||node.name;const children=node.children?node.children.map(child=>child.id||child.identifier||child.field||child.name).filter(Boolean):[];if(nodeId){hierarchyMap.set(nodeId,children);if(node.children&&node.children.length>0){buildHierarchyFromTree(node.children,hierarchyMap);}}});return hierarchyMap;}
+function getAllDescendantsFromHierarchy(parentId,hierarchyMap){const children=hierarchyMap.get(parentId)||[];let descendants=[...children];children.forEach(childId=>{descendants.push(...getAllDescendantsFromHierarchy(childId,hierarchyMap));});return descendants;}
+function createSortIndicator(params,element,fontSize='12px'){const indicator=document.createElement('span');indicator.className='sort-indicator ag-icon';indicator.style.cursor='pointer';indicator.style.marginLeft='4px';indicator.style.fontSize='16px';indicator.style.opacity='0.87';const updateSortIndicator=()=>{const column=params.column;const currentSort=column.getSort();indicator.classList.remove('ag-icon-asc','ag-icon-desc','ag-icon-none');if(currentSort==='asc'){indicator.classList.add('ag-icon-asc');indicator.style.opacity='1';}else if(currentSort==='desc'){indicator.classList.add('ag-icon-desc');indicator.style.opacity='1';}else{indicator.classList.add('ag-icon-none');indicator.style.opacity='0.54';}};const handleSort=(event)=>{event.stopPropagation();const column=params.column;const colId=column.getColId();const currentSort=column.getSort();const nextSort=currentSort==='desc'?'asc':(currentSort==='asc'?null:'desc');if(params.api&&typeof params.api.applyColumnState==='function'){params.api.applyColumnState({state:[{colId,sort:nextSort}],defaultState:{sort:null}});}
+setTimeout(updateSortIndicator,10);};indicator.addEventListener('click',handleSort);updateSortIndicator();if(params.api){params.api.addEventListener('sortChanged',updateSortIndicator);}
+element.appendChild(indicator);return{indicator,updateSortIndicator,handleSort};}
+function updateColumnVisibility(){if(!window.globalGridApi||!window.benchmarkTree)return;const excludedBenchmarks=new Set(window.filteredOutBenchmarks||[]);const allColumns=window.globalGridApi.getAllGridColumns();const columnsToUpdate=[];function shouldColumnBeVisible(benchmarkId){if(excludedBenchmarks.has(benchmarkId)){return false;}
+if(benchmarkId==='average_vision_v0'){const filteredScoreColumn=window.globalGridApi?.getAllGridColumns()?.find(col=>col.getColId()==='filtered_score');if(filteredScoreColumn&&filteredScoreColumn.isVisible()){return false;}
+return true;}
+const domain=(window.DJANGO_DATA&&window.DJANGO_DATA.domain)||'vision';const topLevelCategories=[`neural_${domain}_v0`,`behavior_${domain}_v0`,`engineering_${domain}_v0`];if(topLevelCategories.includes(benchmarkId)){if(window.getFilteredLeafCount&&typeof window.getFilteredLeafCount==='function'){const leafCount=window.getFilteredLeafCount(benchmarkId);if(leafCount===0){return false;}}
+return true;}
+if(!window.cachedHierarchyMap){window.cachedHierarchyMap=buildHierarchyFromTree(window.benchmarkTree||[]);}
+const hierarchyMap=window.cachedHierarchyMap;const children=hierarchyMap.get(benchmarkId)||[];const isLeafColumn=children.length===0;if(isLeafColumn){if(shouldHideColumnWithAllXsOrZeros(benchmarkId)){return false;}}else{if(window.getFilteredLeafCount&&typeof window.getFilteredLeafCount==='function'){const leafCount=window.getFilteredLeafCount(benchmarkId);if(leafCount===0){return false;}}
+if(shouldHideColumnWithAllXsOrZeros(benchmarkId)){return false;}}
+let parentId=null;for(const[parent,children]of hierarchyMap.entries()){if(children.includes(benchmarkId)){parentId=parent;break;}}
+if(!parentId){return true;}
+const isParentExpanded=window.columnExpansionState.get(parentId)===true;const isParentVisible=shouldColumnBeVisible(parentId);return isParentExpanded&&isParentVisible;}
+function shouldHideColumnWithAllXsOrZeros(benchmarkId){const rowData=[];if(window.globalGridApi){window.globalGridApi.forEachNode(node=>{if(node.data){rowData.push(node.data);}});}
+if(rowData.length===0){return false;}
+const values=rowData.map(row=>{const cellData=row[benchmarkId];return cellData&&typeof cellData==='object'?cellData.value:cellData;}).filter(val=>val!==null&&val!==undefined&&val!=='');if(values.length===0){return false;}
+const minTimestamp=window.activeFilters?.min_wayback_timestamp;const maxTimestamp=window.activeFilters?.max_wayback_timestamp;const ranges=window.filterOptions?.datetime_range;const fullRangeMin=ranges?.min_unix;const fullRangeMax=ranges?.max_unix;const isWaybackActive=minTimestamp&&maxTimestamp&&!(minTimestamp<=fullRangeMin&&maxTimestamp>=fullRangeMax);if(isWaybackActive){if(window.waybackHiddenBenchmarks&&window.waybackHiddenBenchmarks.has(benchmarkId)){return true;}
+return false;}
+const allZeros=values.every(val=>val===0);return allZeros;}
+allColumns.forEach(column=>{const colId=column.getColId();if(['model','rank','group_status','filtered_score'].includes(colId)){return;}
+const shouldShow=shouldColumnBeVisible(colId);const isCurrentlyVisible=column.isVisible();if(shouldShow!==isCurrentlyVisible){columnsToUpdate.push({colId,hide:!shouldShow});}});if(columnsToUpdate.length>0){window.globalGridApi.applyColumnState({state:columnsToUpdate});}}
+function isLeafNew(ctx){return ACTIVE_NEW_UPDATE?(ctx.newUpdates||[]).includes(ACTIVE_NEW_UPDATE):!!ctx.isNewDefault;}
+const highlightedNewCols=new Set();function highlightNewBenchmarkColumns(colIds){colIds.forEach(id=>highlightedNewCols.add(id));const ids=[...highlightedNewCols];const sel=(cls)=>ids.map(id=>`#leaderboardGrid ${cls}[col-id="${id}"]`).join(',');let style=document.getElementById('new-benchmark-col-highlight');if(!style){style=document.createElement('style');style.id='new-benchmark-col-highlight';document.head.appendChild(style);}
+style.textContent=`${sel('.ag-cell')}{background-color:rgba(71,183,222,0.10);}`+`${sel('.ag-header-cell')}{background-color:rgba(71,183,222,0.20);}`;}
+function revealNewBenchmarks(newLeaves){const api=window.globalGridApi;if(!api||!window.benchmarkTree||!newLeaves||newLeaves.length===0)return;highlightNewBenchmarkColumns(newLeaves);const hierarchy=buildHierarchyFromTree(window.benchmarkTree);const parentOf=new Map();hierarchy.forEach((children,parent)=>children.forEach(c=>parentOf.set(c,parent)));const ancestors=new Set();newLeaves.forEach(leaf=>{let p=parentOf.get(leaf);while(p){ancestors.add(p);p=parentOf.get(p);}});if(ancestors.size===0)return;ancestors.forEach(id=>window.columnExpansionState.set(id,true));updateColumnVisibility();const depth=id=>{let d=0,p=parentOf.get(id);while(p){d++;p=parentOf.get(p);}return d;};[...ancestors].sort((a,b)=>depth(a)-depth(b)).forEach(parent=>{const cols=api.getAllGridColumns();const parentIdx=cols.findIndex(c=>c.getColId()===parent);if(parentIdx===-1)return;const childIds=(hierarchy.get(parent)||[]).filter(id=>{const c=cols.find(x=>x.getColId()===id);return c&&c.isVisible();});if(childIds.length)api.moveColumns(childIds,parentIdx+1);});api.refreshHeader();if(typeof api.ensureColumnVisible==='function')api.ensureColumnVisible(newLeaves[0],'middle');}
+function expandNewBenchmarkColumns(){const api=window.globalGridApi;if(!ACTIVE_NEW_UPDATE||!api)return;const newLeaves=api.getAllGridColumns().filter(col=>isLeafNew(col.getColDef()?.context||{})).map(col=>col.getColId());revealNewBenchmarks(newLeaves);}
+function LeafHeaderComponent(){}
+LeafHeaderComponent.prototype.init=function(params){this.eGui=document.createElement('div');this.eGui.className='leaf-header';this.eGui.style.position='relative';const label=document.createElement('span');label.className='leaf-header-label';label.textContent=params.displayName||params.colDef.headerName;this.eGui.appendChild(label);const leafColDef=params.column?.userProvidedColDef||params.column?.colDef||params.colDef||{};const leafCtx=leafColDef.context||{};if(isLeafNew(leafCtx)){const leafNewDot=document.createElement('span');leafNewDot.className='new-dot';leafNewDot.title='Recently added';this.eGui.insertBefore(leafNewDot,label);}
+createSortIndicator(params,this.eGui);if(typeof addHoverTooltip==='function'){addHoverTooltip(this.eGui,label.textContent,{type:'info',position:'top'});}else{this.eGui.title=label.textContent;}
+const navigationArea=document.createElement('div');navigationArea.className='navigation-area';navigationArea.style.position='absolute';navigationArea.style.top='0';navigationArea.style.left='0';navigationArea.style.width=`${window.LeaderboardConstants.NAVIGATION_CLICK_AREA * 100}%`;navigationArea.style.height='100%';navigationArea.style.cursor='pointer';navigationArea.style.zIndex='9';navigationArea.style.backgroundColor='transparent';this.eGui.appendChild(navigationArea);navigationArea.addEventListener('click',(event)=>{event.stopPropagation();const colDef=params.column?.userProvidedColDef||params.column?.colDef||params.colDef||{};const benchmarkIdentifier=colDef.field||colDef.headerName||params.displayName;if(!benchmarkIdentifier){console.warn('Could not determine benchmark identifier from params:',params);return;}
+const actualBenchmarkId=window.benchmarkIds&&window.benchmarkIds[benchmarkIdentifier];if(actualBenchmarkId){const domain='vision';window.location.href=`/benchmark/${domain}/${actualBenchmarkId}`;}else{console.warn('No benchmark ID found for identifier:',benchmarkIdentifier);}});};LeafHeaderComponent.prototype.getGui=function(){return this.eGui;};function ExpandableHeaderComponent(){}
+ExpandableHeaderComponent.prototype.init=function(params){this.params=params;const colDef=params.column?.userProvidedColDef||params.column?.colDef||{};const benchmarkId=colDef.benchmarkId||colDef.field||colDef.headerName;const nameMap={average_vision_v0:'Global Score',neural_vision_v0:'Neural',behavior_vision_v0:'Behavior',engineering_vision_v0:'Engineering',average_language_v0:'Global Score',neural_language_v0:'Neural',behavior_language_v0:'Behavior',engineering_language_v0:'Engineering'};const displayName=nameMap[benchmarkId]||params.displayName||benchmarkId;this.eGui=document.createElement('div');const type=benchmarkId.split('_')[0];this.eGui.className=`expandable-header ${type}`;this.eGui.style.display='flex';this.eGui.style.alignItems='center';const labelContainer=document.createElement('div');labelContainer.className='expandable-header-label-container';const title=document.createElement('span');title.className='expandable-header-label';title.textContent=displayName;if(typeof addHoverTooltip==='function'){addHoverTooltip(title,displayName,{type:'info',position:'top'});}else{title.title=displayName;}
+labelContainer.appendChild(title);this.eGui.appendChild(labelContainer);const badgeCtx=colDef.context||{};const newLeafCount=ACTIVE_NEW_UPDATE?((badgeCtx.newLeafCounts||{})[ACTIVE_NEW_UPDATE]||0):(badgeCtx.newLeafCountDefault||0);const badgeField=colDef.field||'';const badgeDomain=(window.DJANGO_DATA&&window.DJANGO_DATA.domain)||'vision';const isTopCategory=[`neural_${badgeDomain}_v0`,`behavior_${badgeDomain}_v0`,`engineering_${badgeDomain}_v0`].includes(badgeField);const badgeExcluded=badgeField.startsWith('average_')||badgeField==='filtered_score';if(newLeafCount>0&&!badgeExcluded){if(isTopCategory){const newBadge=document.createElement('span');newBadge.className='new-benchmark-badge';newBadge.textContent=`+${newLeafCount} NEW`;newBadge.style.cursor='pointer';newBadge.style.pointerEvents='auto';newBadge.title='Show the new benchmarks';['mousedown','pointerdown'].forEach(evt=>newBadge.addEventListener(evt,e=>e.stopPropagation()));newBadge.addEventListener('click',e=>{e.stopPropagation();const underCategory=new Set(getAllDescendantsFromHierarchy(badgeField,buildHierarchyFromTree(window.benchmarkTree||[])));const newLeaves=params.api.getAllGridColumns().filter(col=>underCategory.has(col.getColId())&&isLeafNew(col.getColDef()?.context||{})).map(col=>col.getColId());revealNewBenchmarks(newLeaves);});this.eGui.appendChild(newBadge);}else{const dot=document.createElement('span');dot.className='new-dot';dot.title='Recently added';labelContainer.insertBefore(dot,title);}}
+if(!benchmarkId||!params.api?.getAllGridColumns)return;const allCols=params.api.getAllGridColumns();function getDirectChildren(parentField){const parentBase=parentField.split('_v')[0];return allCols.filter(col=>{const ctx=col.getColDef()?.context||{};const childParent=ctx.parentField;if(!childParent)return false;const childBase=childParent.split('_v')[0];return childBase===parentBase;});}
+const directChildren=getDirectChildren(colDef.field);const hasChildren=directChildren.length>0;const domain=(window.DJANGO_DATA&&window.DJANGO_DATA.domain)||'vision';const isTopLevelCategory=[`average_${domain}_v0`,`neural_${domain}_v0`,`behavior_${domain}_v0`,`engineering_${domain}_v0`].includes(colDef.field);if(hasChildren||isTopLevelCategory){const count=document.createElement('span');count.className='benchmark-count';count.style.cursor='pointer';count.dataset.parentField=colDef.field;const icon=document.createElement('i');icon.className=window.columnExpansionState.get(colDef.field)===true?'fa-solid fa-down-left-and-up-right-to-center':'fa-solid fa-up-right-and-down-left-from-center';icon.style.marginRight='4px';icon.style.fontSize='10px';const countText=document.createElement('span');countText.className='count-value';countText.style.transition='all 0.2s ease';let initialCount=0;if(window.getFilteredLeafCount&&typeof window.getFilteredLeafCount==='function'){initialCount=window.getFilteredLeafCount(colDef.field);}else if(isTopLevelCategory){const fallbackCounts={[`average_${domain}_v0`]:50,[`neural_${domain}_v0`]:25,[`behavior_${domain}_v0`]:25,[`engineering_${domain}_v0`]:5};initialCount=fallbackCounts[colDef.field]||0;}else{initialCount=directChildren.length;}
+countText.textContent=initialCount;count.appendChild(icon);count.appendChild(countText);this.eGui.appendChild(count);count.addEventListener('click',e=>{e.stopPropagation();const columnId=colDef.field;const directChildren=getDirectChildren(columnId);const isCurrentlyExpanded=window.columnExpansionState.get(columnId)===true;const shouldExpand=!isCurrentlyExpanded;if(shouldExpand){const directChildIds=directChildren.map(c=>c.getColId());window.columnExpansionState.set(columnId,true);const showState=directChildIds.map(id=>({colId:id,hide:false}));params.api.applyColumnState({state:showState});const allCols=params.api.getAllGridColumns();const parentIndex=allCols.findIndex(col=>col.getColId()===columnId);if(parentIndex!==-1){const insertIndex=parentIndex+1;params.api.moveColumns(directChildIds,insertIndex);}
+directChildIds.forEach(childId=>{window.columnExpansionState.set(childId,false);});icon.className='fa-solid fa-down-left-and-up-right-to-center';}else{const allCols=params.api.getAllGridColumns();const allDescendantIds=getAllDescendantsFromHierarchy(columnId,buildHierarchyFromTree(window.benchmarkTree||[])).map(id=>allCols.find(col=>col.getColId()===id)).filter(Boolean).map(col=>col.getColId());const hideState=allDescendantIds.map(id=>({colId:id,hide:true}));params.api.applyColumnState({state:hideState});window.columnExpansionState.set(columnId,false);allDescendantIds.forEach(descendantId=>{window.columnExpansionState.set(descendantId,false);});icon.className='fa-solid fa-up-right-and-down-left-from-center';}
+const toggle=this.eGui.querySelector('.expand-toggle');if(toggle){toggle.textContent=shouldExpand?'▴':'▾';}
+if(window.expandCollapseUpdateTimeout){clearTimeout(window.expandCollapseUpdateTimeout);}
+window.expandCollapseUpdateTimeout=setTimeout(()=>{if(typeof window.LeaderboardHeaderComponents?.updateColumnVisibility==='function'){window.LeaderboardHeaderComponents.updateColumnVisibility();}},100);});}
+if(benchmarkId?.startsWith('average_')){createSortIndicator(params,this.eGui,'14px');return;}
+const childColumns=getDirectChildren(colDef.field);if(childColumns.length>0){createSortIndicator(params,this.eGui);this.eGui.style.position='relative';this.eGui.style.cursor='pointer';const handleSort=(event)=>{if(event.target.closest('.expandable-header .benchmark-count')||event.target.closest('.sort-indicator')){return;}
+event.stopPropagation();const column=params.column;const colId=column.getColId();const currentSort=column.getSort();const nextSort=currentSort==='desc'?'asc':(currentSort==='asc'?null:'desc');if(params.api&&typeof params.api.applyColumnState==='function'){params.api.applyColumnState({state:[{colId,sort:nextSort}],defaultState:{sort:null}});}};this.eGui.addEventListener('click',handleSort);}};ExpandableHeaderComponent.prototype.getGui=function(){return this.eGui;};window.LeaderboardHeaderComponents={LeafHeaderComponent,ExpandableHeaderComponent,createSortIndicator,updateColumnVisibility,expandNewBenchmarkColumns,buildHierarchyFromTree,getAllDescendantsFromHierarchy};;function getSearchableText(rowData){const model=rowData.model||{};const searchFields=[model.name||'',model.submitter||''];return searchFields.join(' ').toLowerCase();}
+function parseSearchQuery(query){if(!query.trim())return null;const orParts=query.toLowerCase().split(/\s+or\s+/);return{type:'OR',parts:orParts.map(orPart=>{const andParts=orPart.split(/\s+and\s+/);if(andParts.length===1){const term=andParts[0].trim();if(term.startsWith('not ')){return{type:'NOT',term:term.substring(4).trim()};}
+return{type:'TERM',term};}
+return{type:'AND',parts:andParts.map(andPart=>{const term=andPart.trim();if(term.startsWith('not ')){return{type:'NOT',term:term.substring(4).trim()};}
+return{type:'TERM',term};})};})};}
+function executeSearchQuery(parsedQuery,searchableText){if(!parsedQuery)return true;function evaluateNode(node){switch(node.type){case'TERM':return searchableText.includes(node.term);case'NOT':return!searchableText.includes(node.term);case'AND':return node.parts.every(evaluateNode);case'OR':return node.parts.some(evaluateNode);default:return false;}}
+return evaluateNode(parsedQuery);}
+function setupSearchHandlers(){const searchInput=document.getElementById('modelSearchInput');if(searchInput&&window.globalGridApi){const newInput=searchInput.cloneNode(true);searchInput.parentNode.replaceChild(newInput,searchInput);newInput.addEventListener('input',function(){const searchText=this.value;window.currentSearchQuery=parseSearchQuery(searchText);if(typeof window.globalGridApi.onFilterChanged==='function'){window.globalGridApi.onFilterChanged();}
+if(typeof window.LeaderboardURLState?.updateURLFromFilters==='function'){window.LeaderboardURLState.updateURLFromFilters();}});}}
+function clearSearch(){const searchInput=document.getElementById('modelSearchInput');if(searchInput){searchInput.value='';if(window.globalGridApi){window.globalGridApi.setFilterModel(null);window.globalGridApi.setGridOption('isExternalFilterPresent',()=>false);window.globalGridApi.onFilterChanged();}
+if(typeof window.LeaderboardURLState?.updateURLFromFilters==='function'){window.LeaderboardURLState.updateURLFromFilters();}}}
+window.LeaderboardSearch={getSearchableText,parseSearchQuery,executeSearchQuery,setupSearchHandlers,clearSearch};;function updateBenchmarkFilters(){window.activeFilters.benchmark_regions=Array.from(document.querySelectorAll('.region-checkbox:checked')).map(cb=>cb.value);window.activeFilters.benchmark_species=Array.from(document.querySelectorAll('.species-checkbox:checked')).map(cb=>cb.value);window.activeFilters.benchmark_tasks=Array.from(document.querySelectorAll('.task-checkbox:checked')).map(cb=>cb.value);window.activeFilters.public_data_only=document.getElementById('publicDataFilter')?.checked||false;const stimuliMin=parseInt(document.getElementById('stimuliCountMin')?.value||0);const stimuliMax=parseInt(document.getElementById('stimuliCountMax')?.value||1000);window.activeFilters.min_stimuli_count=stimuliMin;window.activeFilters.max_stimuli_count=stimuliMax;const ceilingMin=parseFloat(document.getElementById('ceilingMin')?.value||0);const ceilingMax=parseFloat(document.getElementById('ceilingMax')?.value||1);window.activeFilters.min_ceiling=ceilingMin;window.activeFilters.max_ceiling=ceilingMax;if(!window.filteredOutBenchmarks)window.filteredOutBenchmarks=new Set();window.filteredOutBenchmarks.clear();const allCheckboxes=document.querySelectorAll('#benchmarkFilterPanel input[type="checkbox"]');allCheckboxes.forEach(cb=>{if(!cb.checked){window.filteredOutBenchmarks.add(cb.value);}});addBenchmarksFilteredByMetadata();}
+function setupBenchmarkCheckboxes(filterOptions){const taskContainer=document.getElementById('taskFilter');if(taskContainer&&filterOptions.benchmark_tasks){taskContainer.innerHTML='';filterOptions.benchmark_tasks.forEach(task=>{const label=document.createElement('label');label.className='checkbox-label';label.innerHTML=`
+        <input type="checkbox" value="${task}" class="task-checkbox">
+        <span>${task}</span>
+      `;taskContainer.appendChild(label);});}
+document.querySelectorAll('.region-checkbox, .species-checkbox, .task-checkbox').forEach(checkbox=>{checkbox.addEventListener('change',function(){updateBenchmarkFilters();if(typeof window.applyCombinedFilters==='function'){window.applyCombinedFilters();}});});const publicDataCheckbox=document.getElementById('publicDataFilter');if(publicDataCheckbox){publicDataCheckbox.addEventListener('change',function(){updateBenchmarkFilters();if(typeof window.applyCombinedFilters==='function'){window.applyCombinedFilters();}});}}
+function addBenchmarksFilteredByMetadata(){if(!window.benchmarkMetadata||!window.benchmarkTree)return;if(window.updatingCheckboxes||window.processingManualTreeChange)return;if(window.restoringFromURL)return;window.updatingCheckboxes=true;const hierarchyMap=window.buildHierarchyFromTree(window.benchmarkTree);const stimuliMin=parseInt(document.getElementById('stimuliCountMin')?.value||0);const stimuliMax=parseInt(document.getElementById('stimuliCountMax')?.value||1000);const stimuliContainer=document.querySelector('#stimuliCountMin')?.closest('.filter-group')?.querySelector('.slider-container');const stimuliRangeMin=parseInt(stimuliContainer?.dataset?.min||0);const stimuliRangeMax=parseInt(stimuliContainer?.dataset?.max||1000);const isStimuliFilterActive=stimuliMin>stimuliRangeMin||stimuliMax<stimuliRangeMax;const ceilingMin=parseFloat(document.getElementById('ceilingMin')?.value||0);const ceilingMax=parseFloat(document.getElementById('ceilingMax')?.value||1);const ceilingContainer=document.querySelector('#ceilingMin')?.closest('.filter-group')?.querySelector('.slider-container');const ceilingRangeMin=parseFloat(ceilingContainer?.dataset?.min||0)/100;const ceilingRangeMax=parseFloat(ceilingContainer?.dataset?.max||100)/100;const isCeilingFilterActive=ceilingMin>ceilingRangeMin||ceilingMax<ceilingRangeMax;const hasMetadataFilters=(window.activeFilters.benchmark_regions.length>0||window.activeFilters.benchmark_species.length>0||window.activeFilters.benchmark_tasks.length>0||window.activeFilters.public_data_only||isStimuliFilterActive||isCeilingFilterActive);const allCheckboxes=document.querySelectorAll('#benchmarkFilterPanel input[type="checkbox"]');allCheckboxes.forEach(checkbox=>{checkbox.checked=true;});window.filteredOutBenchmarks.clear();if(!hasMetadataFilters){window.updatingCheckboxes=false;return;}
+window.benchmarkMetadata.forEach(benchmark=>{let shouldExclude=false;const children=hierarchyMap.get(benchmark.identifier)||[];const isParentBenchmark=children.length>0;if(!isParentBenchmark){if(window.activeFilters.benchmark_regions.length>0){if(!window.activeFilters.benchmark_regions.includes(benchmark.region)){shouldExclude=true;}}
+if(window.activeFilters.benchmark_species.length>0){if(!window.activeFilters.benchmark_species.includes(benchmark.species)){shouldExclude=true;}}
+if(window.activeFilters.benchmark_tasks.length>0){if(!window.activeFilters.benchmark_tasks.includes(benchmark.task)){shouldExclude=true;}}
+if(window.activeFilters.public_data_only){if(benchmark.data_publicly_available===false){shouldExclude=true;}}
+if(isStimuliFilterActive&&benchmark.num_stimuli!==null&&benchmark.num_stimuli!==undefined){if(benchmark.num_stimuli<stimuliMin||benchmark.num_stimuli>stimuliMax){shouldExclude=true;}}
+if(isCeilingFilterActive&&benchmark.ceiling!==null&&benchmark.ceiling!==undefined){if(benchmark.ceiling<ceilingMin||benchmark.ceiling>ceilingMax){shouldExclude=true;}}}
+if(shouldExclude){window.filteredOutBenchmarks.add(benchmark.identifier);const checkbox=document.querySelector(`#benchmarkFilterPanel input[value="${benchmark.identifier}"]`);if(checkbox){checkbox.checked=false;}}});updateParentCheckboxes();window.updatingCheckboxes=false;}
+function updateParentCheckboxes(){const allCheckboxes=document.querySelectorAll('#benchmarkFilterPanel input[type="checkbox"]');for(let i=0;i<3;i++){allCheckboxes.forEach(parentCheckbox=>{const parentNode=parentCheckbox.closest('.benchmark-node');const immediateChildren=[];const childUl=parentNode.querySelector(':scope > ul');if(childUl){const immediateChildNodes=childUl.querySelectorAll(':scope > .benchmark-node');immediateChildNodes.forEach(childNode=>{const childCheckbox=childNode.querySelector(':scope > .tree-node-header input[type="checkbox"]');if(childCheckbox){immediateChildren.push(childCheckbox);}});}
+if(immediateChildren.length>0){const allChildrenUnchecked=immediateChildren.every(cb=>!cb.checked);const allChildrenChecked=immediateChildren.every(cb=>cb.checked);if(allChildrenUnchecked){parentCheckbox.checked=false;window.filteredOutBenchmarks.add(parentCheckbox.value);}else if(allChildrenChecked){parentCheckbox.checked=true;window.filteredOutBenchmarks.delete(parentCheckbox.value);}
+else{parentCheckbox.checked=true;window.filteredOutBenchmarks.delete(parentCheckbox.value);}}});}}
+function renderBenchmarkTree(container,tree){const ul=document.createElement('ul');ul.classList.add('benchmark-tree');const visionParentLi=document.createElement('li');visionParentLi.classList.add('benchmark-node','vision-parent');const visionParentHeader=document.createElement('div');visionParentHeader.classList.add('tree-node-header');const visionToggle=document.createElement('span');visionToggle.classList.add('tree-toggle');visionToggle.textContent='▼';visionParentLi.classList.add('expanded');visionToggle.addEventListener('click',(e)=>{e.stopPropagation();visionParentLi.classList.toggle('collapsed');visionToggle.textContent=visionParentLi.classList.contains('collapsed')?'▶':'▼';});const visionLabel=document.createElement('span');visionLabel.className='vision-parent-label';visionLabel.textContent='Vision Benchmarks (Neural + Behavior)';visionParentHeader.appendChild(visionToggle);visionParentHeader.appendChild(visionLabel);visionParentLi.appendChild(visionParentHeader);const visionChildrenUl=document.createElement('ul');visionChildrenUl.classList.add('benchmark-tree');let engineeringNode=null;tree.forEach((node,index)=>{if(node.id==='engineering_vision_v0'){engineeringNode=node;return;}
+if(node.id==='average_vision_v0'){return;}
+if(node.id==='neural_vision_v0'||node.id==='behavior_vision_v0'){const childLi=createBenchmarkNode(node);visionChildrenUl.appendChild(childLi);}});visionParentLi.appendChild(visionChildrenUl);ul.appendChild(visionParentLi);if(engineeringNode){const separator=document.createElement('div');separator.classList.add('benchmark-separator');separator.innerHTML='<hr><span class="separator-label"></span>';ul.appendChild(separator);const engineeringParentLi=document.createElement('li');engineeringParentLi.classList.add('benchmark-node','engineering-parent');const engineeringParentHeader=document.createElement('div');engineeringParentHeader.classList.add('tree-node-header');const engineeringToggle=document.createElement('span');engineeringToggle.classList.add('tree-toggle');engineeringToggle.textContent='▼';engineeringParentLi.classList.add('expanded');engineeringToggle.addEventListener('click',(e)=>{e.stopPropagation();engineeringParentLi.classList.toggle('collapsed');engineeringToggle.textContent=engineeringParentLi.classList.contains('collapsed')?'▶':'▼';});const engineeringLabel=document.createElement('span');engineeringLabel.className='engineering-parent-label';engineeringLabel.textContent='Engineering Benchmarks (Not included in Global Score)';engineeringParentHeader.appendChild(engineeringToggle);engineeringParentHeader.appendChild(engineeringLabel);engineeringParentLi.appendChild(engineeringParentHeader);const engineeringChildrenUl=document.createElement('ul');engineeringChildrenUl.classList.add('benchmark-tree');const engineeringChildLi=createBenchmarkNode(engineeringNode);engineeringChildrenUl.appendChild(engineeringChildLi);engineeringParentLi.appendChild(engineeringChildrenUl);ul.appendChild(engineeringParentLi);}
+container.appendChild(ul);function createBenchmarkNode(node){const li=document.createElement('li');li.classList.add('benchmark-node');const header=document.createElement('div');header.classList.add('tree-node-header');const checkbox=document.createElement('input');checkbox.type='checkbox';checkbox.value=node.id;checkbox.checked=true;checkbox.addEventListener('change',(e)=>{if(window.updatingCheckboxes){return;}
+window.processingManualTreeChange=true;const isChecked=e.target.checked;if(!window.filteredOutBenchmarks)window.filteredOutBenchmarks=new Set();if(isChecked){autoSelectAncestors(checkbox);checkAllDescendants(li);}else{uncheckAllDescendants(li);}
+updateExclusionsFromTreeOnly();if(typeof window.applyCombinedFilters==='function'){window.applyCombinedFilters();}
+window.processingManualTreeChange=false;});const label=document.createElement('label');label.appendChild(checkbox);label.append(` ${node.label}`);let toggle=null;if(node.children?.length){toggle=document.createElement('span');toggle.classList.add('tree-toggle');toggle.textContent='▶';li.classList.add('collapsed');toggle.addEventListener('click',(e)=>{e.stopPropagation();li.classList.toggle('collapsed');toggle.textContent=li.classList.contains('collapsed')?'▶':'▼';});header.appendChild(toggle);}else{const spacer=document.createElement('span');spacer.classList.add('tree-toggle');spacer.textContent=' ';header.appendChild(spacer);}
+header.appendChild(label);li.appendChild(header);if(node.children?.length){const childUl=document.createElement('ul');childUl.classList.add('benchmark-tree');node.children.forEach(childNode=>{const childLi=createBenchmarkNode(childNode);childUl.appendChild(childLi);});li.appendChild(childUl);}
+return li;}
+function autoSelectAncestors(checkbox){let currentElement=checkbox.closest('.benchmark-node');while(currentElement){const parentUl=currentElement.parentElement;const parentLi=parentUl?.closest('.benchmark-node');if(parentLi&&!parentLi.classList.contains('vision-parent')&&!parentLi.classList.contains('engineering-parent')){const parentCheckbox=parentLi.querySelector(':scope > .tree-node-header input[type="checkbox"]');if(parentCheckbox&&!parentCheckbox.checked){parentCheckbox.checked=true;}
+currentElement=parentLi;}else{break;}}}
+function uncheckAllDescendants(parentNode){const descendantCheckboxes=parentNode.querySelectorAll('input[type="checkbox"]');descendantCheckboxes.forEach(cb=>{cb.checked=false;});}
+function checkAllDescendants(parentNode){const descendantCheckboxes=parentNode.querySelectorAll('input[type="checkbox"]');descendantCheckboxes.forEach(cb=>{cb.checked=true;});}
+function updateExclusions(){window.filteredOutBenchmarks.clear();const allCheckboxes=document.querySelectorAll('#benchmarkFilterPanel input[type="checkbox"]');allCheckboxes.forEach(cb=>{if(!cb.checked){window.filteredOutBenchmarks.add(cb.value);}});if(window.benchmarkMetadata){addBenchmarksFilteredByMetadata();}
+if(typeof window.updateAllCountBadges==='function'){window.updateAllCountBadges();}}
+function updateExclusionsFromTreeOnly(){window.filteredOutBenchmarks.clear();const allCheckboxes=document.querySelectorAll('#benchmarkFilterPanel input[type="checkbox"]');allCheckboxes.forEach(cb=>{if(!cb.checked){window.filteredOutBenchmarks.add(cb.value);}});if(typeof window.updateAllCountBadges==='function'){window.updateAllCountBadges();}}}
+window.LeaderboardBenchmarkFilters={updateBenchmarkFilters,setupBenchmarkCheckboxes,addBenchmarksFilteredByMetadata,renderBenchmarkTree};;function populateFilterDropdowns(filterOptions){populateDropdown('architectureFilter',filterOptions.architectures||[]);populateDropdown('modelFamilyFilter',filterOptions.model_families||[]);populateDropdown('trainingDatasetFilter',filterOptions.training_datasets||[]);populateDropdown('taskSpecFilter',filterOptions.task_specializations||[]);}
+function populateDropdown(filterId,options){const filter=document.getElementById(filterId);if(!filter)return;const dropdown=filter.querySelector('.dropdown-content');if(!dropdown)return;dropdown.innerHTML='';options.forEach(option=>{const optionElement=document.createElement('div');optionElement.className='dropdown-option';optionElement.textContent=option;optionElement.addEventListener('click',()=>{selectFilterOption(getFilterTypeFromId(filterId),option,optionElement);});dropdown.appendChild(optionElement);});}
+function selectFilterOption(filterType,value,optionElement){const dropdown=optionElement.closest('.filter-dropdown');const input=dropdown.querySelector('.filter-input');optionElement.classList.toggle('selected');if(!window.activeFilters[filterType]){window.activeFilters[filterType]=[];}
+if(optionElement.classList.contains('selected')){if(!window.activeFilters[filterType].includes(value)){window.activeFilters[filterType].push(value);}}else{window.activeFilters[filterType]=window.activeFilters[filterType].filter(v=>v!==value);}
+if(window.activeFilters[filterType].length>0){input.value=window.activeFilters[filterType].join(', ');}else{input.value='';}
+if(typeof window.applyCombinedFilters==='function'){window.applyCombinedFilters();}}
+function getFilterTypeFromId(filterId){const mapping={'architectureFilter':'architecture','modelFamilyFilter':'model_family','trainingDatasetFilter':'training_dataset','taskSpecFilter':'task_specialization'};return mapping[filterId];}
+function setupDropdownHandlers(){const dropdowns=document.querySelectorAll('.filter-dropdown .filter-input');dropdowns.forEach(input=>{const originalPlaceholder=input.placeholder;input.addEventListener('click',(e)=>{e.stopPropagation();const dropdown=e.target.closest('.filter-dropdown');const content=dropdown.querySelector('.dropdown-content');document.querySelectorAll('.filter-dropdown').forEach(other=>{if(other!==dropdown){other.classList.remove('active');other.querySelector('.dropdown-content').classList.add('hidden');}});dropdown.classList.add('active');content.classList.remove('hidden');});input.addEventListener('input',(e)=>{const searchTerm=e.target.value.toLowerCase();const dropdown=e.target.closest('.filter-dropdown');const content=dropdown.querySelector('.dropdown-content');const options=content.querySelectorAll('.dropdown-option');options.forEach(option=>{const text=option.textContent.toLowerCase();if(text.includes(searchTerm)){option.style.display='block';}else{option.style.display='none';}});content.classList.remove('hidden');});input.addEventListener('blur',(e)=>{setTimeout(()=>{const dropdown=e.target.closest('.filter-dropdown');if(!dropdown.classList.contains('active')){if(!e.target.value){e.target.placeholder=originalPlaceholder;}}},200);});});document.querySelectorAll('.leaderboard-container .dropdown-content').forEach(content=>{content.addEventListener('click',(e)=>{e.stopPropagation();});});document.addEventListener('click',(e)=>{if(!e.target.closest('.leaderboard-container .filter-dropdown')){document.querySelectorAll('.leaderboard-container .filter-dropdown').forEach(dropdown=>{dropdown.classList.remove('active');const content=dropdown.querySelector('.dropdown-content');content.classList.add('hidden');const input=dropdown.querySelector('.filter-input');if(!input.value&&window.activeFilters){const filterType=dropdown.id.replace('Filter','').replace(/([A-Z])/g,'_$1').toLowerCase().substring(1);if(window.activeFilters[filterType]&&window.activeFilters[filterType].length>0){input.value=window.activeFilters[filterType].join(', ');}}
+if(!input.value){input.placeholder=input.getAttribute('placeholder')||'Select...';}});}});}
+window.LeaderboardModelFilters={populateFilterDropdowns,setupDropdownHandlers,selectFilterOption,getFilterTypeFromId};window.populateFilterDropdowns=populateFilterDropdowns;window.setupDropdownHandlers=setupDropdownHandlers;;const FREEZE_WAYBACK_MIN_HANDLE=true;function shouldFreezeMinHandle(sliderType){return FREEZE_WAYBACK_MIN_HANDLE&&sliderType==='waybackTimestamp';}
+window.shouldFreezeMinHandle=shouldFreezeMinHandle;function initializeDualHandleSliders(){const sliderContainers=document.querySelectorAll('.slider-container');sliderContainers.forEach(container=>{initializeDualHandleSlider(container);});}
+function initializeDualHandleSlider(container){const minHandle=container.querySelector('.handle-min');const maxHandle=container.querySelector('.handle-max');const range=container.querySelector('.slider-range');if(!minHandle||!maxHandle||!range)return;const min=parseFloat(container.dataset.min)||0;const max=parseFloat(container.dataset.max)||100;let minValue=parseFloat(minHandle.dataset.value)||min;let maxValue=parseFloat(maxHandle.dataset.value)||max;const sliderGroup=container.closest('.filter-group');const sliderType=sliderGroup?.querySelector('#paramCountMin')?'paramCount':sliderGroup?.querySelector('#modelSizeMin')?'modelSize':sliderGroup?.querySelector('#stimuliCountMin')?'stimuliCount':sliderGroup?.querySelector('#ceilingMin')?'ceilingValue':sliderGroup?.querySelector('#waybackDateMin')?'waybackTimestamp':'unknown';const minInput=sliderGroup?.querySelector('.range-input-min');const maxInput=sliderGroup?.querySelector('.range-input-max');function updateSliderPosition(){if(shouldFreezeMinHandle(sliderType)){minValue=min;}
+const minPercent=((minValue-min)/(max-min))*100;const maxPercent=((maxValue-min)/(max-min))*100;minHandle.style.left=`${minPercent}%`;maxHandle.style.left=`${maxPercent}%`;range.style.left=`${minPercent}%`;range.style.width=`${maxPercent - minPercent}%`;if(sliderType==='waybackTimestamp'){if(minInput){const minDate=new Date(minValue*1000);minInput.value=minDate.toISOString().split('T')[0];}
+if(maxInput){const maxDate=new Date(maxValue*1000);maxInput.value=maxDate.toISOString().split('T')[0];}}else if(sliderType==='ceilingValue'){if(minInput)minInput.value=(minValue/100).toFixed(2);if(maxInput)maxInput.value=(maxValue/100).toFixed(2);}else{if(minInput)minInput.value=Math.round(minValue);if(maxInput)maxInput.value=Math.round(maxValue);}}
+function updateActiveFilters(skipDebounce=false){const filterId=container.closest('.filter-group').id;if(filterId==='paramCountMin'||filterId==='paramCountMax'||sliderGroup?.querySelector('#paramCountMin')||sliderGroup?.querySelector('#paramCountMax')){window.activeFilters.max_param_count=maxValue<max?maxValue:null;}else if(filterId==='modelSizeMin'||filterId==='modelSizeMax'||sliderGroup?.querySelector('#modelSizeMin')||sliderGroup?.querySelector('#modelSizeMax')){window.activeFilters.max_model_size=maxValue<max?maxValue:null;}else if(filterId==='waybackTimestampFilter'||sliderType==='waybackTimestamp'){window.activeFilters.min_wayback_timestamp=shouldFreezeMinHandle(sliderType)?min:minValue;window.activeFilters.max_wayback_timestamp=maxValue;}
+if(!skipDebounce){if(sliderType==='stimuliCount'||sliderType==='ceilingValue'){if(typeof window.LeaderboardBenchmarkFilters?.updateBenchmarkFilters==='function'){window.LeaderboardBenchmarkFilters.updateBenchmarkFilters();}}
+debounceFilterUpdate();}}
+function handleMouseMove(e,handle,isMin){if(shouldFreezeMinHandle(sliderType)&&isMin){return;}
+const rect=container.getBoundingClientRect();const percent=Math.max(0,Math.min(1,(e.clientX-rect.left)/rect.width));const value=min+percent*(max-min);if(isMin){minValue=Math.min(value,maxValue-1);}else{maxValue=Math.max(value,minValue+1);}
+updateSliderPosition();updateActiveFilters();}
+function addMouseListeners(handle,isMin){if(shouldFreezeMinHandle(sliderType)&&isMin){return;}
+let isDragging=false;let tooltip=null;handle.addEventListener('mousedown',(e)=>{isDragging=true;document.addEventListener('mousemove',mouseMoveHandler);document.addEventListener('mouseup',mouseUpHandler);e.preventDefault();if(sliderType==='waybackTimestamp'&&typeof createTooltip==='function'&&(!shouldFreezeMinHandle(sliderType)||!isMin)){const currentValue=isMin?minValue:maxValue;const date=new Date(currentValue*1000);const dateStr=date.toLocaleDateString('en-US',{year:'numeric',month:'short',day:'numeric'});tooltip=createTooltip(handle,dateStr,{type:'info',position:'top',duration:999999,offset:25});}});function mouseMoveHandler(e){if(isDragging){handleMouseMove(e,handle,isMin);if(sliderType==='waybackTimestamp'&&tooltip&&typeof createTooltip==='function'&&(!shouldFreezeMinHandle(sliderType)||!isMin)){const currentValue=isMin?minValue:maxValue;const date=new Date(currentValue*1000);const dateStr=date.toLocaleDateString('en-US',{year:'numeric',month:'short',day:'numeric'});tooltip.remove();tooltip=createTooltip(handle,dateStr,{type:'info',position:'top',duration:999999,offset:25});}}}
+function mouseUpHandler(){isDragging=false;document.removeEventListener('mousemove',mouseMoveHandler);document.removeEventListener('mouseup',mouseUpHandler);if(tooltip){tooltip.remove();tooltip=null;}}}
+addMouseListeners(minHandle,true);addMouseListeners(maxHandle,false);if(minInput){if(!shouldFreezeMinHandle(sliderType)){minInput?.addEventListener('change',()=>{if(sliderType==='waybackTimestamp'){const ts=new Date(minInput.value).getTime()/1000;if(!isNaN(ts)){minValue=ts;minHandle.dataset.value=ts;updateSliderPosition();updateActiveFilters();}}else if(sliderType==='ceilingValue'){const val=parseFloat(minInput.value);if(!isNaN(val)){minValue=val*100;minHandle.dataset.value=minValue;updateSliderPosition();updateActiveFilters();}}else{const ts=parseFloat(minInput.value);if(!isNaN(ts)){minValue=ts;minHandle.dataset.value=ts;updateSliderPosition();updateActiveFilters();}}});}}
+if(maxInput){maxInput?.addEventListener('change',()=>{if(sliderType==='ceilingValue'){const val=parseFloat(maxInput.value);if(!isNaN(val)){maxValue=val*100;maxHandle.dataset.value=maxValue;updateSliderPosition();updateActiveFilters();}}else{const ts=new Date(maxInput.value).getTime()/1000;if(!isNaN(ts)){if(sliderType==='waybackTimestamp'){const today=new Date();today.setHours(23,59,59,999);const todayTs=Math.floor(today.getTime()/1000);if(ts>todayTs){maxInput.value=today.toISOString().split('T')[0];maxValue=todayTs;}else{maxValue=ts;}}else{maxValue=ts;}
+maxHandle.dataset.value=maxValue;updateSliderPosition();updateActiveFilters();}}});}
+if(sliderType==='waybackTimestamp'){if(shouldFreezeMinHandle(sliderType)){minValue=min;minHandle.dataset.value=minValue;if(minInput){minInput.disabled=true;minInput.style.cursor='not-allowed';minInput.style.opacity='0.6';}
+minHandle.style.cursor='not-allowed';minHandle.style.opacity='0.6';minHandle.classList.add('handle-disabled');}else{const dateValue=new Date(minInput.value);minValue=isNaN(dateValue.getTime())?min:Math.floor(dateValue.getTime()/1000);minHandle.dataset.value=minValue;}}else if(sliderType==='ceilingValue'){minValue=(parseFloat(minInput.value)||0)*100;minHandle.dataset.value=minValue;}else{minValue=parseFloat(minInput.value)||min;minHandle.dataset.value=minValue;}
+if(sliderType==='waybackTimestamp'){const dateValue=new Date(maxInput.value);maxValue=isNaN(dateValue.getTime())?max:Math.floor(dateValue.getTime()/1000);maxHandle.dataset.value=maxValue;}else if(sliderType==='ceilingValue'){maxValue=(parseFloat(maxInput.value)||1)*100;maxHandle.dataset.value=maxValue;}else{maxValue=parseFloat(maxInput.value)||max;maxHandle.dataset.value=maxValue;}
+updateSliderPosition();updateActiveFilters(true);}
+let filterUpdateTimeout;function debounceFilterUpdate(){clearTimeout(filterUpdateTimeout);filterUpdateTimeout=setTimeout(()=>{if(typeof window.applyCombinedFilters==='function'){window.applyCombinedFilters();}},window.LeaderboardConstants.SLIDER_UPDATE_DELAY);}
+function resetSliderUI(){const ranges=window.filterOptions||{};const sliderContainers=document.querySelectorAll('.slider-container');sliderContainers.forEach(container=>{const minHandle=container.querySelector('.handle-min');const maxHandle=container.querySelector('.handle-max');const range=container.querySelector('.slider-range');if(!minHandle||!maxHandle||!range)return;const min=parseFloat(container.dataset.min)||0;let max=parseFloat(container.dataset.max)||100;const sliderGroup=container.closest('.filter-group');const isWaybackTimestamp=sliderGroup?.querySelector('#waybackDateMin');if(sliderGroup?.querySelector('#paramCountMin')&&ranges.parameter_ranges?.max){max=ranges.parameter_ranges.max;container.dataset.max=max;}else if(sliderGroup?.querySelector('#modelSizeMin')&&ranges.size_ranges?.max){max=ranges.size_ranges.max;container.dataset.max=max;}else if(sliderGroup?.querySelector('#stimuliCountMin')&&ranges.stimuli_ranges?.max){max=ranges.stimuli_ranges.max;container.dataset.max=max;}else if(sliderGroup?.querySelector('#ceilingMin')&&ranges.ceiling_ranges?.max){max=Math.round(ranges.ceiling_ranges.max*100);container.dataset.max=max;}else if(isWaybackTimestamp&&ranges.datetime_range?.min_unix&&ranges.datetime_range?.max_unix){min=ranges.datetime_range.min_unix;max=ranges.datetime_range.max_unix;container.dataset.min=min;container.dataset.max=max;if(shouldFreezeMinHandle('waybackTimestamp')){const minHandle=container.querySelector('.handle-min');const minInput=sliderGroup?.querySelector('.range-input-min');if(minHandle){minHandle.dataset.value=min;minHandle.style.left='0%';minHandle.style.cursor='not-allowed';minHandle.style.opacity='0.6';minHandle.classList.add('handle-disabled');}
+if(minInput){minInput.disabled=true;minInput.style.cursor='not-allowed';minInput.style.opacity='0.6';}}}
+minHandle.style.left='0%';maxHandle.style.left='100%';range.style.left='0%';range.style.width='100%';minHandle.dataset.value=min;maxHandle.dataset.value=max;const minInput=sliderGroup?.querySelector('.range-input-min');const maxInput=sliderGroup?.querySelector('.range-input-max');if(isWaybackTimestamp){const minDate=new Date(min*1000);const maxDate=new Date(max*1000);if(minInput)minInput.value=minDate.toISOString().split('T')[0];if(maxInput){const today=new Date();const todayStr=today.toISOString().split('T')[0];const maxDateStr=maxDate.toISOString().split('T')[0];maxInput.value=maxDateStr>todayStr?todayStr:maxDateStr;maxInput.max=todayStr;}}else if(sliderGroup?.querySelector('#ceilingMin')){if(minInput)minInput.value=(min/100).toFixed(2);if(maxInput)maxInput.value=(max/100).toFixed(2);}else{if(minInput)minInput.value=min;if(maxInput)maxInput.value=max;}});}
+function getRangeValues(filterId){const container=document.querySelector(`#${filterId}`)?.closest('.filter-group')?.querySelector('.slider-container');if(!container)return null;const minHandle=container.querySelector('.handle-min');const maxHandle=container.querySelector('.handle-max');if(!minHandle||!maxHandle)return null;return{min:parseFloat(minHandle.dataset.value)||0,max:parseFloat(maxHandle.dataset.value)||100};}
+function setRangeValues(filterId,minVal,maxVal){const container=document.querySelector(`#${filterId}`)?.closest('.filter-group')?.querySelector('.slider-container');if(!container)return;const minHandle=container.querySelector('.handle-min');const maxHandle=container.querySelector('.handle-max');const range=container.querySelector('.slider-range');if(!minHandle||!maxHandle||!range)return;const min=parseFloat(container.dataset.min)||0;const max=parseFloat(container.dataset.max)||100;const sliderGroup=container.closest('.filter-group');const isWaybackTimestamp=sliderGroup?.querySelector('#waybackDateMin');let minValue,maxValue;if(isWaybackTimestamp&&typeof window.shouldFreezeMinHandle==='function'&&window.shouldFreezeMinHandle('waybackTimestamp')){minValue=min;maxValue=Math.max(min,Math.min(maxVal,max));}else{minValue=Math.max(min,Math.min(minVal,max));maxValue=Math.max(min,Math.min(maxVal,max));}
+minHandle.dataset.value=minValue;maxHandle.dataset.value=maxValue;const minPercent=((minValue-min)/(max-min))*100;const maxPercent=((maxValue-min)/(max-min))*100;minHandle.style.left=`${minPercent}%`;maxHandle.style.left=`${maxPercent}%`;range.style.left=`${minPercent}%`;range.style.width=`${maxPercent - minPercent}%`;const minInput=sliderGroup?.querySelector('.range-input-min');const maxInput=sliderGroup?.querySelector('.range-input-max');if(isWaybackTimestamp){if(minInput){const minDate=new Date(minValue*1000);minInput.value=minDate.toISOString().split('T')[0];}
+if(maxInput){const maxDate=new Date(maxValue*1000);const today=new Date();const todayStr=today.toISOString().split('T')[0];const maxDateStr=maxDate.toISOString().split('T')[0];maxInput.value=maxDateStr>todayStr?todayStr:maxDateStr;maxInput.max=todayStr;if(maxDateStr>todayStr){const todayTs=Math.floor(today.getTime()/1000);maxValue=Math.min(maxValue,todayTs);maxHandle.dataset.value=maxValue;const newMaxPercent=((maxValue-min)/(max-min))*100;maxHandle.style.left=`${newMaxPercent}%`;range.style.width=`${newMaxPercent - minPercent}%`;}}}else if(sliderGroup?.querySelector('#ceilingMin')){if(minInput)minInput.value=(minValue/100).toFixed(2);if(maxInput)maxInput.value=(maxValue/100).toFixed(2);}else{if(minInput)minInput.value=Math.round(minValue);if(maxInput)maxInput.value=Math.round(maxValue);}}
+window.LeaderboardRangeFilters={initializeDualHandleSliders,initializeDualHandleSlider,resetSliderUI,getRangeValues,setRangeValues,debounceFilterUpdate};;function applyCombinedFilters(skipColumnToggle=false,skipAutoSort=false){if(!window.globalGridApi||!window.originalRowData)return;if(typeof window.LeaderboardBenchmarkFilters?.updateBenchmarkFilters==='function'){window.LeaderboardBenchmarkFilters.updateBenchmarkFilters();}
+const selectedRegions=Array.from(document.querySelectorAll('.region-checkbox:checked')).map(cb=>cb.value);const selectedSpecies=Array.from(document.querySelectorAll('.species-checkbox:checked')).map(cb=>cb.value);const selectedTasks=Array.from(document.querySelectorAll('.task-checkbox:checked')).map(cb=>cb.value);const publicDataOnly=document.getElementById('publicDataFilter')?.checked||false;window.activeFilters.benchmark_regions=selectedRegions;window.activeFilters.benchmark_species=selectedSpecies;window.activeFilters.benchmark_tasks=selectedTasks;window.activeFilters.public_data_only=publicDataOnly;const modelSizeMinEl=document.getElementById('modelSizeMin');const modelSizeMaxEl=document.getElementById('modelSizeMax');const paramCountMinEl=document.getElementById('paramCountMin');const paramCountMaxEl=document.getElementById('paramCountMax');const scoreMinEl=document.getElementById('scoreMin');const scoreMaxEl=document.getElementById('scoreMax');const modelSizeMin=modelSizeMinEl?parseInt(modelSizeMinEl.value)||0:0;const modelSizeMax=modelSizeMaxEl?parseInt(modelSizeMaxEl.value)||1000:1000;const paramCountMin=paramCountMinEl?parseInt(paramCountMinEl.value)||0:0;const paramCountMax=paramCountMaxEl?parseInt(paramCountMaxEl.value)||100:100;const scoreMin=scoreMinEl?parseFloat(scoreMinEl.value)||0:0;const scoreMax=scoreMaxEl?parseFloat(scoreMaxEl.value)||1:1;window.activeFilters.min_model_size=modelSizeMin;window.activeFilters.max_model_size=modelSizeMax;window.activeFilters.min_param_count=paramCountMin;window.activeFilters.max_param_count=paramCountMax;window.activeFilters.min_score=scoreMin;window.activeFilters.max_score=scoreMax;const filteredData=window.originalRowData.filter(row=>{const metadata=row.metadata||{};if(window.activeFilters.architecture.length>0){const modelArchitectures=metadata.architecture?metadata.architecture.split(',').map(a=>a.trim()):[];const hasMatch=modelArchitectures.some(arch=>window.activeFilters.architecture.includes(arch));if(!hasMatch)return false;}
+if(window.activeFilters.model_family.length>0){const modelFamilies=metadata.model_family?metadata.model_family.split(',').map(f=>f.trim()):[];const hasMatch=modelFamilies.some(fam=>window.activeFilters.model_family.includes(fam));if(!hasMatch)return false;}
+if(window.activeFilters.training_dataset.length>0){const modelDatasets=metadata.training_dataset?metadata.training_dataset.split(',').map(d=>d.trim()):[];const hasMatch=modelDatasets.some(ds=>window.activeFilters.training_dataset.includes(ds));if(!hasMatch)return false;}
+if(window.activeFilters.task_specialization.length>0){const modelSpecs=metadata.task_specialization?metadata.task_specialization.split(',').map(s=>s.trim()):[];const hasMatch=modelSpecs.some(spec=>window.activeFilters.task_specialization.includes(spec));if(!hasMatch)return false;}
+if(modelSizeMinEl&&modelSizeMaxEl){const modelSize=metadata.model_size_mb||0;if(modelSize<window.activeFilters.min_model_size||modelSize>window.activeFilters.max_model_size){return false;}}
+if(paramCountMinEl&&paramCountMaxEl){const paramCountInMillions=(metadata.total_parameter_count||0)/1_000_000;if(paramCountInMillions<window.activeFilters.min_param_count||paramCountInMillions>window.activeFilters.max_param_count){return false;}}
+if(scoreMinEl&&scoreMaxEl){const avgScore=row.average_vision_v0?.value;if(typeof avgScore==='number'){if(avgScore<window.activeFilters.min_score||avgScore>window.activeFilters.max_score){return false;}}}
+return true;});let timestampFilteredData=filteredData;window.waybackHiddenBenchmarks=new Set();if(typeof applyWaybackTimestampFilter==='function'){timestampFilteredData=applyWaybackTimestampFilter(filteredData);const minTimestamp=window.activeFilters?.min_wayback_timestamp;const maxTimestamp=window.activeFilters?.max_wayback_timestamp;const ranges=window.filterOptions?.datetime_range;const fullRangeMin=ranges?.min_unix;const fullRangeMax=ranges?.max_unix;const isWaybackActive=minTimestamp&&maxTimestamp&&!(minTimestamp<=fullRangeMin&&maxTimestamp>=fullRangeMax);if(isWaybackActive&&timestampFilteredData.length>0){const allLeafBenchmarkIds=new Set();timestampFilteredData.forEach(row=>{Object.keys(row).forEach(key=>{if(key!=='id'&&key!=='metadata'&&key!=='filtered_score'&&row[key]&&typeof row[key]==='object'&&row[key].value!==undefined){if(row[key].version_valid_from!==undefined&&row[key].version_valid_from!==null){allLeafBenchmarkIds.add(key);}}});});allLeafBenchmarkIds.forEach(benchmarkId=>{let hasAnyValues=false;let xCount=0;let nonXCount=0;filteredData.forEach((beforeWaybackRow)=>{const waybackFilteredRow=timestampFilteredData.find(row=>row.id===beforeWaybackRow.id);if(!waybackFilteredRow)return;const beforeWaybackValue=beforeWaybackRow[benchmarkId]?.value;const waybackFilteredValue=waybackFilteredRow[benchmarkId]?.value;if(beforeWaybackValue===null||beforeWaybackValue===undefined||beforeWaybackValue===''){if(waybackFilteredValue==='X'){hasAnyValues=true;xCount++;}
+return;}
+hasAnyValues=true;if(waybackFilteredValue==='X'){xCount++;}else{nonXCount++;}});const allValuesAreX=hasAnyValues&&xCount>0&&nonXCount===0;if(hasAnyValues&&allValuesAreX){window.waybackHiddenBenchmarks.add(benchmarkId);}});}}else{window.waybackHiddenBenchmarks.clear();}
+let finalData=timestampFilteredData;if(typeof computeFilteredScores==='function'){const updatedData=computeFilteredScores(timestampFilteredData);if(updatedData){finalData=updatedData;}}
+if(typeof applyGlobalScoreModelRemoval==='function'){finalData=applyGlobalScoreModelRemoval(finalData);}
+if(typeof window.LeaderboardColorUtils?.recalculateColorsForBenchmark==='function'&&window.benchmarkTree){if(!window.cachedHierarchyMap&&typeof window.buildHierarchyFromTree==='function'){window.cachedHierarchyMap=window.buildHierarchyFromTree(window.benchmarkTree);}
+const hierarchyMap=window.cachedHierarchyMap||new Map();const benchmarksWithBlueColors=new Set();const excludedBenchmarks=window.filteredOutBenchmarks||new Set();if(excludedBenchmarks.size>0){const allBenchmarkIds=Array.from(hierarchyMap.keys());allBenchmarkIds.forEach(benchmarkId=>{const children=hierarchyMap.get(benchmarkId)||[];if(children.length>0){const hasExcludedChildren=children.some(childId=>excludedBenchmarks.has(childId));if(hasExcludedChildren){benchmarksWithBlueColors.add(benchmarkId);function markAncestorsBlue(targetId){allBenchmarkIds.forEach(parentId=>{const parentChildren=hierarchyMap.get(parentId)||[];if(parentChildren.includes(targetId)){benchmarksWithBlueColors.add(parentId);markAncestorsBlue(parentId);}});}
+markAncestorsBlue(benchmarkId);}}});if(benchmarksWithBlueColors.has('neural_vision_v0')||benchmarksWithBlueColors.has('behavior_vision_v0')){benchmarksWithBlueColors.add('average_vision_v0');}}
+if(!window.rootParentCache||window.rootParentCache.size===0){window.rootParentCache=new Map();const allBenchmarkIds=new Set();finalData.forEach(row=>{Object.keys(row).forEach(key=>{if(key!=='id'&&key!=='metadata'&&key!=='filtered_score'&&row[key]&&typeof row[key]==='object'&&row[key].value!==undefined){allBenchmarkIds.add(key);}});});allBenchmarkIds.add('average_vision_v0');const childToParentMap=new Map();for(const[parentId,children]of hierarchyMap.entries()){children.forEach(childId=>{childToParentMap.set(childId,parentId);});}
+allBenchmarkIds.forEach(benchmarkId=>{let rootParent=null;let currentId=benchmarkId;const visited=new Set();while(currentId&&!visited.has(currentId)){visited.add(currentId);const parentId=childToParentMap.get(currentId);if(!parentId){rootParent=currentId;break;}
+currentId=parentId;}
+if(!rootParent){const checkId=benchmarkId.toLowerCase();if(checkId.includes('engineering')){rootParent='engineering_vision_v0';}else{rootParent='neural_vision_v0';}}
+window.rootParentCache.set(benchmarkId,rootParent);});}
+const benchmarkIds=new Set();finalData.forEach(row=>{Object.keys(row).forEach(key=>{if(key!=='id'&&key!=='metadata'&&key!=='filtered_score'&&row[key]&&typeof row[key]==='object'&&row[key].value!==undefined){benchmarkIds.add(key);}});});benchmarkIds.forEach(benchmarkId=>{if(!benchmarksWithBlueColors.has(benchmarkId)){window.LeaderboardColorUtils.recalculateColorsForBenchmark(finalData,benchmarkId,hierarchyMap,window.rootParentCache);}});if(!benchmarksWithBlueColors.has('average_vision_v0')){window.LeaderboardColorUtils.recalculateColorsForBenchmark(finalData,'average_vision_v0',hierarchyMap,window.rootParentCache);}}
+if(window.globalGridApi){window.globalGridApi.setGridOption('rowData',finalData);window.globalGridApi.redrawRows();}
+if(!skipColumnToggle&&typeof toggleFilteredScoreColumn==='function'){toggleFilteredScoreColumn(window.globalGridApi);}
+if(typeof window.LeaderboardHeaderComponents?.updateColumnVisibility==='function'){setTimeout(()=>{window.LeaderboardHeaderComponents.updateColumnVisibility();},50);}
+setTimeout(()=>{if(typeof window.updateAllCountBadges==='function'){window.updateAllCountBadges();}},50);if(typeof window.LeaderboardURLState?.updateURLFromFilters==='function'){window.LeaderboardURLState.updateURLFromFilters();}}
+function isColumnHiddenByWaybackFiltering(benchmarkId){if(window.waybackHiddenBenchmarks&&window.waybackHiddenBenchmarks.has(benchmarkId)){return true;}
+return false;}
+function applyWaybackTimestampFilter(rowData){const minTimestamp=window.activeFilters?.min_wayback_timestamp;const maxTimestamp=window.activeFilters?.max_wayback_timestamp;const ranges=window.filterOptions?.datetime_range;const fullRangeMin=ranges?.min_unix;const fullRangeMax=ranges?.max_unix;const isAtFullRange=(minTimestamp<=fullRangeMin&&maxTimestamp>=fullRangeMax);if(!minTimestamp||!maxTimestamp||isAtFullRange){return rowData;}
+const waybackMs=maxTimestamp*1000;const filteredWithValidModels=rowData.map(row=>{const newRow={...row};Object.keys(row).forEach(key=>{const scoreObj=row[key];if(!scoreObj||typeof scoreObj!=="object"||scoreObj.value===undefined){return;}
+let activeVersionData=null;if(scoreObj.version_valid_from!==undefined&&scoreObj.version_valid_from!==null){const validFrom=new Date(scoreObj.version_valid_from).getTime();const validTo=scoreObj.version_valid_to?new Date(scoreObj.version_valid_to).getTime():Infinity;if(waybackMs>=validFrom&&waybackMs<validTo){activeVersionData=scoreObj;}else if(scoreObj.historical_versions){for(const[ver,data]of Object.entries(scoreObj.historical_versions)){if(data.version_valid_from){const hvFrom=new Date(data.version_valid_from).getTime();const hvTo=data.version_valid_to?new Date(data.version_valid_to).getTime():Infinity;if(waybackMs>=hvFrom&&waybackMs<hvTo){activeVersionData=data;break;}}}}
+if(!activeVersionData){newRow[key]={...scoreObj,value:"X",color:"#E0E1E2",waybackExcluded:true};return;}
+if(activeVersionData!==scoreObj){if(activeVersionData.value===null||activeVersionData.value===undefined){newRow[key]={...scoreObj,value:"X",color:"#E0E1E2",waybackExcluded:true};return;}
+const rawNumeric=typeof activeVersionData.value==='number'?activeVersionData.value:parseFloat(activeVersionData.value);let formattedValue=activeVersionData.value;if(typeof formattedValue==='number'){formattedValue=formattedValue.toFixed(2);}
+newRow[key]={...scoreObj,value:formattedValue,valueNumeric:rawNumeric,score_raw:activeVersionData.score_raw,timestamp:activeVersionData.timestamp,};}
+const ts=newRow[key].timestamp;if(ts){try{const scoreTime=new Date(ts).getTime();if(scoreTime>waybackMs){newRow[key]={...newRow[key],value:"X",color:"#E0E1E2",waybackExcluded:true};}}catch(error){newRow[key]={...newRow[key],value:"X",color:"#E0E1E2",waybackExcluded:true};}}}else{}});return newRow;});return filteredWithValidModels;}
+function applyGlobalScoreModelRemoval(rowData){const minTimestamp=window.activeFilters?.min_wayback_timestamp;const maxTimestamp=window.activeFilters?.max_wayback_timestamp;const ranges=window.filterOptions?.datetime_range;const fullRangeMin=ranges?.min_unix;const fullRangeMax=ranges?.max_unix;const isAtFullRange=(minTimestamp<=fullRangeMin&&maxTimestamp>=fullRangeMax);if(!minTimestamp||!maxTimestamp||isAtFullRange){return rowData;}
+const waybackMs=maxTimestamp*1000;const filteredData=rowData.filter(row=>{if(row.submission_timestamp){const submissionTime=new Date(row.submission_timestamp).getTime();if(submissionTime>waybackMs){return false;}}
+const globalScore=row.average_vision_v0?.value;return globalScore!=='X';});return filteredData;}
+function resetAllFilters(){window.waybackHiddenBenchmarks=new Set();window.rootParentCache=null;window.activeFilters={architecture:[],model_family:[],training_dataset:[],task_specialization:[],min_param_count:null,max_param_count:null,min_model_size:null,max_model_size:null,min_score:null,max_score:null,runnable_only:false,benchmark_regions:[],benchmark_species:[],benchmark_tasks:[],public_data_only:false,min_wayback_timestamp:null,max_wayback_timestamp:null};document.querySelectorAll('.filter-dropdown .filter-input').forEach(input=>{if(input){input.value='';input.placeholder=input.getAttribute('placeholder')||'Select...';}});document.querySelectorAll('.dropdown-option.selected').forEach(option=>{if(option){option.classList.remove('selected');}});const ranges=window.filterOptions||{};if(ranges.parameter_ranges?.max){document.getElementById('paramCountMin').value=0;document.getElementById('paramCountMax').value=ranges.parameter_ranges.max;const paramSliderContainer=document.querySelector('#paramCountMin')?.closest('.filter-group')?.querySelector('.slider-container');if(paramSliderContainer){const minHandle=paramSliderContainer.querySelector('.handle-min');const maxHandle=paramSliderContainer.querySelector('.handle-max');const range=paramSliderContainer.querySelector('.slider-range');if(minHandle&&maxHandle&&range){minHandle.style.left='0%';maxHandle.style.left='100%';range.style.left='0%';range.style.width='100%';minHandle.dataset.value=0;maxHandle.dataset.value=ranges.parameter_ranges.max;}}}
+if(ranges.size_ranges?.max){document.getElementById('modelSizeMin').value=0;document.getElementById('modelSizeMax').value=ranges.size_ranges.max;const modelSizeSliderContainer=document.querySelector('#modelSizeMin')?.closest('.filter-group')?.querySelector('.slider-container');if(modelSizeSliderContainer){const minHandle=modelSizeSliderContainer.querySelector('.handle-min');const maxHandle=modelSizeSliderContainer.querySelector('.handle-max');const range=modelSizeSliderContainer.querySelector('.slider-range');if(minHandle&&maxHandle&&range){minHandle.style.left='0%';maxHandle.style.left='100%';range.style.left='0%';range.style.width='100%';minHandle.dataset.value=0;maxHandle.dataset.value=ranges.size_ranges.max;}}}
+if(ranges.stimuli_ranges?.max){document.getElementById('stimuliCountMin').value=0;document.getElementById('stimuliCountMax').value=ranges.stimuli_ranges.max;const stimuliSliderContainer=document.querySelector('#stimuliCountMin')?.closest('.filter-group')?.querySelector('.slider-container');if(stimuliSliderContainer){const minHandle=stimuliSliderContainer.querySelector('.handle-min');const maxHandle=stimuliSliderContainer.querySelector('.handle-max');const range=stimuliSliderContainer.querySelector('.slider-range');if(minHandle&&maxHandle&&range){minHandle.style.left='0%';maxHandle.style.left='100%';range.style.left='0%';range.style.width='100%';minHandle.dataset.value=0;maxHandle.dataset.value=ranges.stimuli_ranges.max;}}}
+if(ranges.ceiling_ranges?.max){document.getElementById('ceilingMin').value=0;document.getElementById('ceilingMax').value=ranges.ceiling_ranges.max;const ceilingSliderContainer=document.querySelector('#ceilingMin')?.closest('.filter-group')?.querySelector('.slider-container');if(ceilingSliderContainer){const minHandle=ceilingSliderContainer.querySelector('.handle-min');const maxHandle=ceilingSliderContainer.querySelector('.handle-max');const range=ceilingSliderContainer.querySelector('.slider-range');if(minHandle&&maxHandle&&range){minHandle.style.left='0%';maxHandle.style.left='100%';range.style.left='0%';range.style.width='100%';minHandle.dataset.value=0;maxHandle.dataset.value=Math.round(ranges.ceiling_ranges.max*100);}}}
+if(ranges.datetime_range?.min_unix&&ranges.datetime_range?.max_unix){const waybackSliderContainer=document.querySelector('#waybackTimestampFilter .slider-container');const waybackDateMin=document.getElementById('waybackDateMin');const waybackDateMax=document.getElementById('waybackDateMax');if(waybackSliderContainer&&waybackDateMin&&waybackDateMax){const minHandle=waybackSliderContainer.querySelector('.handle-min');const maxHandle=waybackSliderContainer.querySelector('.handle-max');const range=waybackSliderContainer.querySelector('.slider-range');if(minHandle&&maxHandle&&range){minHandle.style.left='0%';maxHandle.style.left='100%';range.style.left='0%';range.style.width='100%';minHandle.dataset.value=ranges.datetime_range.min_unix;maxHandle.dataset.value=ranges.datetime_range.max_unix;const minDate=new Date(ranges.datetime_range.min_unix*1000);const maxDate=new Date(ranges.datetime_range.max_unix*1000);waybackDateMin.value=minDate.toISOString().split('T')[0];const today=new Date();const todayStr=today.toISOString().split('T')[0];const maxDateStr=maxDate.toISOString().split('T')[0];waybackDateMax.value=maxDateStr>todayStr?todayStr:maxDateStr;waybackDateMax.max=todayStr;if(waybackDateMin&&typeof window.shouldFreezeMinHandle==='function'&&window.shouldFreezeMinHandle('waybackTimestamp')){waybackDateMin.disabled=true;waybackDateMin.style.cursor='not-allowed';waybackDateMin.style.opacity='0.6';}else if(waybackDateMin){waybackDateMin.disabled=false;waybackDateMin.style.cursor='';waybackDateMin.style.opacity='';}}}}
+const checkboxes=document.querySelectorAll('#benchmarkFilterPanel input[type="checkbox"]');checkboxes.forEach(cb=>{if(cb){cb.checked=true;}});document.querySelectorAll('.region-checkbox, .species-checkbox, .task-checkbox').forEach(checkbox=>{if(checkbox){checkbox.checked=false;}});const publicDataCheckbox=document.getElementById('publicDataFilter');if(publicDataCheckbox){publicDataCheckbox.checked=false;}
+window.filteredOutBenchmarks=new Set();checkboxes.forEach(cb=>{if(cb&&!cb.checked){window.filteredOutBenchmarks.add(cb.value);}});window.columnExpansionState.clear();const topLevelCategories=['average_vision_v0','neural_vision_v0','behavior_vision_v0','engineering_vision_v0'];topLevelCategories.forEach(colId=>{window.columnExpansionState.set(colId,false);});if(typeof window.setInitialColumnState==='function'){window.setInitialColumnState();}
+applyCombinedFilters(false,true);if(window.globalGridApi){setTimeout(()=>{window.globalGridApi.applyColumnState({state:[{colId:'average_vision_v0',sort:'desc'},{colId:'filtered_score',sort:null}]});},100);}
+if(typeof window.LeaderboardURLState?.updateURLFromFilters==='function'){window.LeaderboardURLState.updateURLFromFilters();}}
+function computeFilteredScores(rowData){if(!window.originalRowData||!window.benchmarkTree)return;const excludedBenchmarks=new Set(window.filteredOutBenchmarks||[]);const hierarchyMap=window.buildHierarchyFromTree(window.benchmarkTree);const workingRowData=rowData.map(row=>{const newRow={...row};Object.keys(row).forEach(key=>{if(key!=='model'&&key!=='rank'&&key!=='metadata'&&row[key]&&typeof row[key]==='object'){newRow[key]={...row[key]};}});return newRow;});function getDepthLevel(benchmarkId,visited=new Set()){if(visited.has(benchmarkId))return 0;visited.add(benchmarkId);const children=hierarchyMap.get(benchmarkId)||[];if(children.length===0)return 0;const maxChildDepth=Math.max(...children.map(child=>getDepthLevel(child,new Set(visited))));return maxChildDepth+1;}
+const allBenchmarkIds=Array.from(hierarchyMap.keys());const benchmarksByDepth=allBenchmarkIds.map(id=>({id,depth:getDepthLevel(id)})).sort((a,b)=>a.depth-b.depth);const benchmarksToExcludeFromAggregation=new Set();const minTimestamp=window.activeFilters?.min_wayback_timestamp;const maxTimestamp=window.activeFilters?.max_wayback_timestamp;const ranges=window.filterOptions?.datetime_range;const fullRangeMin=ranges?.min_unix;const fullRangeMax=ranges?.max_unix;const isWaybackActive=minTimestamp&&maxTimestamp&&!(minTimestamp<=fullRangeMin&&maxTimestamp>=fullRangeMax);if(isWaybackActive&&window.waybackHiddenBenchmarks){window.waybackHiddenBenchmarks.forEach(benchmarkId=>{benchmarksToExcludeFromAggregation.add(benchmarkId);});let changed=true;while(changed){changed=false;allBenchmarkIds.forEach(benchmarkId=>{if(benchmarksToExcludeFromAggregation.has(benchmarkId))return;const children=hierarchyMap.get(benchmarkId)||[];if(children.length===0)return;const allChildrenExcluded=children.every(childId=>excludedBenchmarks.has(childId)||benchmarksToExcludeFromAggregation.has(childId));if(allChildrenExcluded){benchmarksToExcludeFromAggregation.add(benchmarkId);changed=true;}});}}
+workingRowData.forEach((row)=>{const originalRow=window.originalRowData.find(origRow=>origRow.id===row.id);if(!originalRow)return;benchmarksByDepth.forEach(({id:benchmarkId})=>{const children=hierarchyMap.get(benchmarkId)||[];if(children.length===0){if(excludedBenchmarks.has(benchmarkId)){row[benchmarkId]={...row[benchmarkId],value:'X',color:'#e0e1e2'};}}else{const childScores=[];const childInfo=[];children.forEach(childId=>{if(!excludedBenchmarks.has(childId)&&row[childId]){if(benchmarksToExcludeFromAggregation.has(childId)){return;}
+const childScore=row[childId].value;const hasValidScore=childScore!==null&&childScore!==undefined&&childScore!==''&&childScore!=='X'&&!isNaN(parseFloat(childScore));childInfo.push({childId,childScore,hasValidScore});}});const hasAnyValidScores=childInfo.some(info=>info.hasValidScore);childInfo.forEach(({childId,childScore,hasValidScore})=>{if(hasValidScore){const childObj=row[childId];const numVal=(childObj&&typeof childObj.valueNumeric==='number'&&!isNaN(childObj.valueNumeric))?childObj.valueNumeric:parseFloat(childScore);childScores.push(numVal);}else if(hasAnyValidScores&&(childScore==='X'||childScore==='')){childScores.push(0);}});let shouldDropOut=false;if(childScores.length===0){shouldDropOut=true;}else{let validChildrenCount=0;let nonZeroChildrenCount=0;children.forEach(childId=>{if(!excludedBenchmarks.has(childId)&&row[childId]){if(benchmarksToExcludeFromAggregation.has(childId))return;validChildrenCount++;const childScore=row[childId].value;if(childScore!==null&&childScore!==undefined&&childScore!==''&&childScore!=='X'){const numVal=typeof childScore==='string'?parseFloat(childScore):childScore;if(!isNaN(numVal)&&numVal>0){nonZeroChildrenCount++;}}}});shouldDropOut=validChildrenCount===0||nonZeroChildrenCount===0;}
+if(shouldDropOut){row[benchmarkId]={...row[benchmarkId],value:'X',color:'#e0e1e2'};}else{const average=childScores.reduce((a,b)=>a+b,0)/childScores.length;row[benchmarkId]={...row[benchmarkId],value:average.toFixed(2),valueNumeric:average,};}}});const visionCategories=['neural_vision_v0','behavior_vision_v0'];const categoryScores=[];let hasVisibleCategory=false;let anyChildExcluded=false;let anyChildReduced=false;visionCategories.forEach(category=>{if(excludedBenchmarks.has(category)){anyChildExcluded=true;}
+allBenchmarkIds.forEach(benchmarkId=>{if(excludedBenchmarks.has(benchmarkId)){anyChildExcluded=true;}});if(window.getFilteredLeafCount&&typeof window.getFilteredLeafCount==='function'){const leafCount=window.getFilteredLeafCount(category);if(leafCount===0){anyChildReduced=true;}}});visionCategories.forEach(category=>{const isExcluded=excludedBenchmarks.has(category);let isColumnVisible=true;if(window.getFilteredLeafCount&&typeof window.getFilteredLeafCount==='function'){const leafCount=window.getFilteredLeafCount(category);if(leafCount===0){isColumnVisible=false;}}
+if(!isExcluded&&isColumnVisible&&row[category]){hasVisibleCategory=true;}
+if(row[category]&&!isExcluded&&isColumnVisible){const scoreObj=row[category];const score=scoreObj.value;if(score!==null&&score!==undefined&&score!==''){if(score==='X'){categoryScores.push(0);}else{const numVal=(typeof scoreObj.valueNumeric==='number'&&!isNaN(scoreObj.valueNumeric))?scoreObj.valueNumeric:(typeof score==='string'?parseFloat(score):score);if(!isNaN(numVal)){categoryScores.push(numVal);}else{categoryScores.push(0);}}}}});const shouldRecalculateAverage=isWaybackActive||anyChildExcluded||anyChildReduced||excludedBenchmarks.size>0||benchmarksToExcludeFromAggregation.size>0;if(hasVisibleCategory&&shouldRecalculateAverage){if(categoryScores.length>0){const neuralScore=row.neural_vision_v0?.value;const behaviorScore=row.behavior_vision_v0?.value;const bothAreX=(neuralScore==='X'||neuralScore===null||neuralScore===undefined||neuralScore==='')&&(behaviorScore==='X'||behaviorScore===null||behaviorScore===undefined||behaviorScore==='');if(bothAreX&&categoryScores.length===2&&categoryScores.every(s=>s===0)){let hasAnyValidNonZeroScore=false;allBenchmarkIds.forEach(benchmarkId=>{if(excludedBenchmarks.has(benchmarkId))return;if(benchmarksToExcludeFromAggregation.has(benchmarkId))return;if(!row[benchmarkId])return;let isBenchmarkVisible=true;if(window.getFilteredLeafCount&&typeof window.getFilteredLeafCount==='function'){const leafCount=window.getFilteredLeafCount(benchmarkId);if(leafCount===0){isBenchmarkVisible=false;}}
+if(!isBenchmarkVisible)return;const score=row[benchmarkId].value;if(score!==null&&score!==undefined&&score!==''&&score!=='X'){const numVal=typeof score==='string'?parseFloat(score):score;if(!isNaN(numVal)&&numVal!==0){hasAnyValidNonZeroScore=true;}}});if(!hasAnyValidNonZeroScore){row.average_vision_v0={...row.average_vision_v0,value:'X',color:'#e0e1e2'};row._tempFilteredScore=null;return;}}
+const globalAverage=categoryScores.reduce((a,b)=>a+b,0)/categoryScores.length;row.average_vision_v0={...row.average_vision_v0,value:globalAverage.toFixed(2),valueNumeric:globalAverage,};row._tempFilteredScore=globalAverage;}else{row._tempFilteredScore=null;}}else if(hasVisibleCategory){const originalScore=row.average_vision_v0?.value;if(originalScore!==null&&originalScore!==undefined&&originalScore!==''&&originalScore!=='X'){const numVal=typeof originalScore==='string'?parseFloat(originalScore):originalScore;row._tempFilteredScore=!isNaN(numVal)?numVal:null;}else{row._tempFilteredScore=null;}}else{row._tempFilteredScore=null;}});const recalculatedBenchmarks=new Set();recalculatedBenchmarks.add('average_vision_v0');allBenchmarkIds.forEach(benchmarkId=>{const children=hierarchyMap.get(benchmarkId)||[];if(children.length>0){const hasExcludedChildren=children.some(childId=>excludedBenchmarks.has(childId));if(hasExcludedChildren){recalculatedBenchmarks.add(benchmarkId);function markAncestorsRecalculated(targetId){allBenchmarkIds.forEach(parentId=>{const parentChildren=hierarchyMap.get(parentId)||[];if(parentChildren.includes(targetId)){recalculatedBenchmarks.add(parentId);markAncestorsRecalculated(parentId);}});}
+markAncestorsRecalculated(benchmarkId);}}});allBenchmarkIds.forEach(benchmarkId=>{if(recalculatedBenchmarks.has(benchmarkId)){const scores=[];workingRowData.forEach(row=>{if(row[benchmarkId]&&row[benchmarkId].value!=='X'&&row[benchmarkId].value!==null){const val=row[benchmarkId].value;const numVal=typeof val==='string'?parseFloat(val):val;if(!isNaN(numVal)){scores.push(numVal);}}});if(scores.length>0){const minScore=Math.min(...scores);const maxScore=Math.max(...scores);const scoreRange=maxScore-minScore;workingRowData.forEach(row=>{if(row[benchmarkId]&&row[benchmarkId].value!=='X'){const val=row[benchmarkId].value;const numVal=typeof val==='string'?parseFloat(val):val;if(!isNaN(numVal)){const intensity=scoreRange>0?(numVal-minScore)/scoreRange:0.5;const baseBlue=255;const green=Math.round(173+(105*(1-intensity)));const red=Math.round(216*(1-intensity));const color=`rgba(${red}, ${green}, ${baseBlue}, 0.6)`;row[benchmarkId].color=color;}}});}}else{workingRowData.forEach((row)=>{const originalRow=window.originalRowData.find(origRow=>origRow.id===row.id);if(originalRow&&originalRow[benchmarkId]&&originalRow[benchmarkId].color){if(row[benchmarkId]&&row[benchmarkId].value!=='X'){row[benchmarkId].color=originalRow[benchmarkId].color;}}});}});const globalFilteredScores=workingRowData.map(row=>row._tempFilteredScore).filter(score=>score!==null);const globalMinScore=globalFilteredScores.length>0?Math.min(...globalFilteredScores):0;const globalMaxScore=globalFilteredScores.length>0?Math.max(...globalFilteredScores):1;const globalScoreRange=globalMaxScore-globalMinScore;workingRowData.forEach((row)=>{const mean=row._tempFilteredScore;delete row._tempFilteredScore;if(mean!==null){const intensity=globalScoreRange>0?(mean-globalMinScore)/globalScoreRange:0.5;const baseBlue=255;const green=Math.round(173+(105*(1-intensity)));const red=Math.round(216*(1-intensity));const color=`rgba(${red}, ${green}, ${baseBlue}, 0.6)`;row.filtered_score={value:parseFloat(mean.toFixed(2)),color:color};}else{row.filtered_score={value:'X',color:'#e0e1e2'};}});return workingRowData;}
+function toggleFilteredScoreColumn(gridApi){if(!gridApi)return;const stimuliMin=parseInt(document.getElementById('stimuliCountMin')?.value||0);const stimuliMax=parseInt(document.getElementById('stimuliCountMax')?.value||1000);const stimuliContainer=document.querySelector('#stimuliCountMin')?.closest('.filter-group')?.querySelector('.slider-container');const stimuliRangeMin=parseInt(stimuliContainer?.dataset?.min||0);const stimuliRangeMax=parseInt(stimuliContainer?.dataset?.max||1000);const hasStimuliFiltering=(stimuliMin>stimuliRangeMin||stimuliMax<stimuliRangeMax);const ceilingMin=parseFloat(document.getElementById('ceilingMin')?.value||0);const ceilingMax=parseFloat(document.getElementById('ceilingMax')?.value||1);const ceilingContainer=document.querySelector('#ceilingMin')?.closest('.filter-group')?.querySelector('.slider-container');const ceilingRangeMin=parseFloat(ceilingContainer?.dataset?.min||0)/100;const ceilingRangeMax=parseFloat(ceilingContainer?.dataset?.max||100)/100;const hasCeilingFiltering=(ceilingMin>ceilingRangeMin||ceilingMax<ceilingRangeMax);const hasBenchmarkMetadataFilters=(window.activeFilters.benchmark_regions.length>0||window.activeFilters.benchmark_species.length>0||window.activeFilters.benchmark_tasks.length>0||window.activeFilters.public_data_only||hasStimuliFiltering||hasCeilingFiltering);const uncheckedCheckboxes=document.querySelectorAll('#benchmarkFilterPanel input[type="checkbox"]:not(:checked)');let hasNonEngineeringBenchmarkFilters=false;const benchmarkPanel=document.getElementById('benchmarkFilterPanel');if(benchmarkPanel&&benchmarkPanel.children.length>0){uncheckedCheckboxes.forEach(checkbox=>{const engineeringNode=document.querySelector('input[value="engineering_vision_v0"]')?.closest('.benchmark-node');const isEngineeringChild=engineeringNode&&engineeringNode.contains(checkbox);const isEngineeringParent=checkbox.value==='engineering_vision_v0';if(!isEngineeringChild&&!isEngineeringParent){hasNonEngineeringBenchmarkFilters=true;}});}
+const shouldShowFilteredScore=hasNonEngineeringBenchmarkFilters||hasBenchmarkMetadataFilters;if(shouldShowFilteredScore){gridApi.applyColumnState({state:[{colId:'filtered_score',hide:false},{colId:'average_vision_v0',hide:true}]});setTimeout(()=>{const filteredScoreColumn=gridApi.getAllGridColumns().find(col=>col.getColId()==='filtered_score');if(filteredScoreColumn){gridApi.applyColumnState({state:[{colId:'filtered_score',sort:'desc'}]});setTimeout(()=>{const currentSort=filteredScoreColumn.getSort();if(currentSort!=='desc'){filteredScoreColumn.setSort('desc');}},50);}},25);}else{gridApi.applyColumnState({state:[{colId:'filtered_score',hide:true},{colId:'average_vision_v0',hide:false}]});const minTimestamp=window.activeFilters?.min_wayback_timestamp;const maxTimestamp=window.activeFilters?.max_wayback_timestamp;const ranges=window.filterOptions?.datetime_range;const fullRangeMin=ranges?.min_unix;const fullRangeMax=ranges?.max_unix;const isWaybackActive=minTimestamp&&maxTimestamp&&!(minTimestamp<=fullRangeMin&&maxTimestamp>=fullRangeMax);if(isWaybackActive){setTimeout(()=>{const averageVisionColumn=gridApi.getAllGridColumns().find(col=>col.getColId()==='average_vision_v0');if(averageVisionColumn){gridApi.applyColumnState({state:[{colId:'average_vision_v0',sort:'desc'}]});setTimeout(()=>{const currentSort=averageVisionColumn.getSort();if(currentSort!=='desc'){averageVisionColumn.setSort('desc');}},50);}},25);}}
+setTimeout(()=>{if(typeof window.LeaderboardHeaderComponents?.updateColumnVisibility==='function'){window.LeaderboardHeaderComponents.updateColumnVisibility();}},100);}
+window.LeaderboardFilterCoordinator={applyCombinedFilters,resetAllFilters,updateFilteredScores:computeFilteredScores,toggleFilteredScoreColumn,isColumnHiddenByWaybackFiltering};window.applyCombinedFilters=applyCombinedFilters;window.resetAllFilters=resetAllFilters;window.toggleFilteredScoreColumn=toggleFilteredScoreColumn;;function getFilteredLeafCount(parentField){if(!window.benchmarkTree||!window.filteredOutBenchmarks){console.warn('getFilteredLeafCount: Missing dependencies:',{benchmarkTree:!!window.benchmarkTree,filteredOutBenchmarks:!!window.filteredOutBenchmarks,parentField});return 0;}
+if(!window.cachedHierarchyMap){window.cachedHierarchyMap=buildHierarchyFromTree(window.benchmarkTree);}
+const hierarchyMap=window.cachedHierarchyMap;const excludedBenchmarks=window.filteredOutBenchmarks;if(parentField==='average_vision_v0'){const allLeafIds=new Set();const visionCategories=['neural_vision_v0','behavior_vision_v0'];visionCategories.forEach(category=>{if(hierarchyMap.has(category)){const categoryLeafs=getAllLeafDescendants(category,hierarchyMap);categoryLeafs.forEach(leafId=>allLeafIds.add(leafId));}});const count=Array.from(allLeafIds).filter(leafId=>{if(excludedBenchmarks.has(leafId)){return false;}
+if(typeof window.LeaderboardFilterCoordinator?.isColumnHiddenByWaybackFiltering==='function'){if(window.LeaderboardFilterCoordinator.isColumnHiddenByWaybackFiltering(leafId)){return false;}}
+return true;}).length;return count;}
+const leafDescendants=getAllLeafDescendants(parentField,hierarchyMap);const count=leafDescendants.filter(leafId=>{if(excludedBenchmarks.has(leafId)){return false;}
+if(typeof window.LeaderboardFilterCoordinator?.isColumnHiddenByWaybackFiltering==='function'){if(window.LeaderboardFilterCoordinator.isColumnHiddenByWaybackFiltering(leafId)){return false;}}
+return true;}).length;return count;}
+function getAllLeafDescendants(benchmarkId,hierarchyMap){const children=hierarchyMap.get(benchmarkId)||[];let leafDescendants=[];children.forEach(childId=>{const grandchildren=hierarchyMap.get(childId)||[];if(grandchildren.length===0){leafDescendants.push(childId);}else{leafDescendants.push(...getAllLeafDescendants(childId,hierarchyMap));}});return leafDescendants;}
+function buildHierarchyFromTree(tree,hierarchyMap=new Map()){tree.forEach((node,index)=>{const nodeId=node.id||node.identifier||node.field||node.name;const children=node.children?node.children.map(child=>child.id||child.identifier||child.field||child.name).filter(Boolean):[];hierarchyMap.set(nodeId,children);if(node.children&&node.children.length>0){buildHierarchyFromTree(node.children,hierarchyMap);}});return hierarchyMap;}
+function getAllDescendantsFromHierarchy(parentId,hierarchyMap){const children=hierarchyMap.get(parentId)||[];let descendants=[...children];children.forEach(childId=>{descendants.push(...getAllDescendantsFromHierarchy(childId,hierarchyMap));});return descendants;}
+function getAllAncestors(benchmarkId,hierarchyMap){const ancestors=[];for(const[parentId,children]of hierarchyMap.entries()){if(children.includes(benchmarkId)){ancestors.push(parentId);ancestors.push(...getAllAncestors(parentId,hierarchyMap));}}
+return ancestors;}
+function findParent(benchmarkId,hierarchyMap){for(const[parentId,children]of hierarchyMap.entries()){if(children.includes(benchmarkId)){return parentId;}}
+return null;}
+function isLeafBenchmark(benchmarkId,hierarchyMap){const children=hierarchyMap.get(benchmarkId)||[];return children.length===0;}
+function isParentBenchmark(benchmarkId,hierarchyMap){const children=hierarchyMap.get(benchmarkId)||[];return children.length>0;}
+function getDepthLevel(benchmarkId,hierarchyMap,visited=new Set()){if(visited.has(benchmarkId))return 0;visited.add(benchmarkId);const children=hierarchyMap.get(benchmarkId)||[];if(children.length===0)return 0;const maxChildDepth=Math.max(...children.map(child=>getDepthLevel(child,hierarchyMap,new Set(visited))));return maxChildDepth+1;}
+function getBenchmarksAtDepth(hierarchyMap,targetDepth){const benchmarks=[];for(const benchmarkId of hierarchyMap.keys()){const depth=getDepthLevel(benchmarkId,hierarchyMap);if(depth===targetDepth){benchmarks.push(benchmarkId);}}
+return benchmarks;}
+function getBenchmarkPath(benchmarkId,hierarchyMap){const path=[];let currentId=benchmarkId;while(currentId){path.unshift(currentId);currentId=findParent(currentId,hierarchyMap);}
+return path;}
+function getSiblings(benchmarkId,hierarchyMap){const parent=findParent(benchmarkId,hierarchyMap);if(!parent)return[];const siblings=hierarchyMap.get(parent)||[];return siblings.filter(id=>id!==benchmarkId);}
+function updateAllCountBadges(){const countBadges=document.querySelectorAll('[data-parent-field]');countBadges.forEach(badge=>{const parentField=badge.dataset.parentField;const countElement=badge.querySelector('.count-value');if(countElement&&parentField){const newCount=getFilteredLeafCount(parentField);countElement.textContent=newCount;}});if(window.columnVisibilityUpdateTimeout){clearTimeout(window.columnVisibilityUpdateTimeout);}
+window.columnVisibilityUpdateTimeout=setTimeout(()=>{if(typeof window.LeaderboardHeaderComponents?.updateColumnVisibility==='function'){window.LeaderboardHeaderComponents.updateColumnVisibility();}},150);}
+function shouldBenchmarkBeVisible(benchmarkId,hierarchyMap){const topLevelCategories=['average_vision_v0','neural_vision_v0','behavior_vision_v0','engineering_vision_v0'];if(topLevelCategories.includes(benchmarkId)){return true;}
+const parent=findParent(benchmarkId,hierarchyMap);if(!parent)return true;const isParentExpanded=window.columnExpansionState.get(parent)===true;const isParentVisible=shouldBenchmarkBeVisible(parent,hierarchyMap);return isParentExpanded&&isParentVisible;}
+function getBenchmarkDisplayName(benchmarkId){const nameMap={'average_vision_v0':'Global Score','neural_vision_v0':'Neural','behavior_vision_v0':'Behavior','engineering_vision_v0':'Engineering'};return nameMap[benchmarkId]||benchmarkId;}
+window.LeaderboardHierarchyUtils={getFilteredLeafCount,getAllLeafDescendants,buildHierarchyFromTree,getAllDescendantsFromHierarchy,getAllAncestors,findParent,isLeafBenchmark,isParentBenchmark,getDepthLevel,getBenchmarksAtDepth,getBenchmarkPath,getSiblings,updateAllCountBadges,shouldBenchmarkBeVisible,getBenchmarkDisplayName};window.getFilteredLeafCount=getFilteredLeafCount;window.updateAllCountBadges=updateAllCountBadges;window.buildHierarchyFromTree=buildHierarchyFromTree;window.getAllDescendantsFromHierarchy=getAllDescendantsFromHierarchy;;const REDGREEN_COLORS=['#ff0000','#ff0000','#ff0000','#ff0000','#fe0600','#fe0600','#fd0d01','#fd0d01','#fc1301','#fb1901','#fb1901','#fa1f02','#f92502','#f92502','#f82b02','#f73103','#f73103','#f63703','#f53d03','#f44204','#f44204','#f44804','#f34d04','#f25305','#f15805','#f15805','#f05e05','#ef6306','#ee6806','#ed6e06','#ec7307','#eb7807','#ea7d07','#e98208','#e88708','#e88708','#e78c08','#e69109','#e69509','#e59a09','#e49f0a','#e3a30a','#e2a80a','#e1ac0a','#e0b10b','#dfb50b','#deb90b','#ddbe0c','#dcc20c','#dcc60c','#dbca0d','#d9d20d','#d8d60d','#d4d70e','#cfd60e','#c9d50e','#c4d40f','#bed40f','#b9d30f','#b4d20f','#aed110','#a4cf10','#9fce10','#9acd11','#95cc11','#90cc11','#8bcb11','#86ca12','#7dc812','#78c712','#74c613','#6fc613','#6ac513','#66c413','#5dc214','#59c114','#55c014','#51c015','#48be15','#44bd15','#40bc16','#3cbb16','#38bb16','#31b917','#2db817','#29b717','#26b617','#1eb518','#1bb418','#18b319','#18b21c','#19b124','#19b028','#19af2b','#19ad32','#1aad36','#1aac39','#1aaa40','#1aa943','#1ba947','#1ba84a'];const GRAY_COLORS=['#f2f2f2','#f2f2f2','#f2f2f2','#f2f2f2','#f0f0f0','#f0f0f0','#eeeeee','#eeeeee','#ededed','#ebebeb','#ebebeb','#e9e9e9','#e7e7e7','#e7e7e7','#e6e6e6','#e4e4e4','#e4e4e4','#e2e2e2','#e0e0e0','#dedede','#dedede','#dddddd','#dbdbdb','#d9d9d9','#d7d7d7','#d7d7d7','#d6d6d6','#d4d4d4','#d2d2d2','#d0d0d0','#cecece','#cdcdcd','#cbcbcb','#c9c9c9','#c7c7c7','#c7c7c7','#c5c5c5','#c4c4c4','#c2c2c2','#c0c0c0','#bebebe','#bdbdbd','#bbbbbb','#b9b9b9','#b7b7b7','#b5b5b5','#b4b4b4','#b2b2b2','#b0b0b0','#aeaeae','#adadad','#a9a9a9','#a7a7a7','#a5a5a5','#a4a4a4','#a2a2a2','#a0a0a0','#9e9e9e','#9d9d9d','#9b9b9b','#999999','#959595','#949494','#929292','#909090','#8e8e8e','#8d8d8d','#8b8b8b','#878787','#858585','#848484','#828282','#808080','#7e7e7e','#7b7b7b','#797979','#777777','#757575','#727272','#707070','#6e6e6e','#6c6c6c','#6b6b6b','#676767','#656565','#646464','#626262','#5e5e5e','#5c5c5c','#5b5b5b','#595959','#555555','#545454','#525252','#4e4e4e','#4c4c4c','#4b4b4b','#474747','#454545','#444444','#424242'];const COLOR_NONE='#e0e1e2';const GAMMA=0.5;function calculateRepresentativeColor(value,minValue,maxValue,rootParent){if(value===null||value===undefined||isNaN(value)||value==='NaN'||value===''){return`background-color: ${COLOR_NONE};`;}
+let normalizedValue;if(maxValue-minValue===0){normalizedValue=0.5;}else{normalizedValue=(value-minValue)/(maxValue-minValue);}
+normalizedValue=Math.max(0,Math.min(1,normalizedValue));normalizedValue=Math.pow(normalizedValue,1.0/GAMMA);normalizedValue=0.8*normalizedValue;normalizedValue=Math.max(0,Math.min(1,normalizedValue));let idx=Math.floor(100*normalizedValue);if(idx>100){idx=100;}
+const isEngineering=rootParent&&rootParent.toLowerCase().includes('engineering');const colorHex=isEngineering?GRAY_COLORS[idx]:REDGREEN_COLORS[idx];const r=parseInt(colorHex.substring(1,3),16);const g=parseInt(colorHex.substring(3,5),16);const b=parseInt(colorHex.substring(5,7),16);let alpha;if(maxValue-minValue===0){alpha=1.0;}else{const slope=-0.9/(minValue-maxValue);const intercept=0.1-slope*minValue;alpha=slope*value+intercept;}
+alpha=Math.max(0,Math.min(1,alpha));const fallbackColor=`rgb(${Math.round(r)}, ${Math.round(g)}, ${Math.round(b)})`;const rgbaColor=`rgba(${r}, ${g}, ${b}, ${alpha.toFixed(2)})`;return`background-color: ${fallbackColor}; background-color: ${rgbaColor};`;}
+function recalculateColorsForBenchmark(rowData,benchmarkId,hierarchyMap,rootParentCache=null){const values=[];rowData.forEach(row=>{if(row[benchmarkId]&&row[benchmarkId].value!=='X'&&row[benchmarkId].value!==null){const val=row[benchmarkId].value;const numVal=typeof val==='string'?parseFloat(val):val;if(!isNaN(numVal)){values.push(numVal);}}});if(values.length===0){return;}
+const minValue=Math.min(...values);const maxValue=Math.max(...values);let rootParent=null;if(rootParentCache&&rootParentCache.has(benchmarkId)){rootParent=rootParentCache.get(benchmarkId);}else{let currentId=benchmarkId;const visited=new Set();while(currentId&&!visited.has(currentId)){visited.add(currentId);let hasParent=false;for(const[parentId,children]of hierarchyMap.entries()){if(children.includes(currentId)){currentId=parentId;hasParent=true;break;}}
+if(!hasParent){rootParent=currentId;break;}}
+if(!rootParent){const checkId=benchmarkId.toLowerCase();if(checkId.includes('engineering')){rootParent='engineering_vision_v0';}else{rootParent='neural_vision_v0';}}}
+rowData.forEach(row=>{if(row[benchmarkId]&&row[benchmarkId].value!=='X'&&row[benchmarkId].value!==null){const val=row[benchmarkId].value;const numVal=typeof val==='string'?parseFloat(val):val;if(!isNaN(numVal)){const colorCss=calculateRepresentativeColor(numVal,minValue,maxValue,rootParent);const rgbaMatch=colorCss.match(/rgba?\([^)]*\)/);if(rgbaMatch){row[benchmarkId].color=rgbaMatch[0];}else{row[benchmarkId].color=COLOR_NONE;}}}});}
+function computeBenchmarkMinMax(rowData,columnDefs){const benchmarkStats={};const benchmarkIds=columnDefs.filter(col=>col.field!=='rank'&&col.field!=='model'&&col.field!=='group_status'&&col.field!=='filtered_score'&&col.field!=='public_toggle').map(col=>col.field);benchmarkIds.forEach(benchmarkId=>{const values=[];rowData.forEach(row=>{const scoreData=row[benchmarkId];if(scoreData&&scoreData.value!=='X'&&scoreData.value!==null){const numValue=typeof scoreData.value==='string'?parseFloat(scoreData.value):scoreData.value;if(!isNaN(numValue)){values.push(numValue);}}});if(values.length>0){benchmarkStats[benchmarkId]={min:Math.min(...values),max:Math.max(...values)};}else{benchmarkStats[benchmarkId]={min:0,max:1};}});return benchmarkStats;}
+window.LeaderboardColorUtils={calculateRepresentativeColor,recalculateColorsForBenchmark,computeBenchmarkMinMax};;document.getElementById('exportCsvButton')?.addEventListener('click',async function(){if(!window.globalGridApi||!window.benchmarkTree){console.warn('Grid or benchmark tree not ready');return;}
+const hierarchyMap=buildHierarchyFromTree(window.benchmarkTree||[]);const allColumns=window.globalGridApi.getColumnDefs();const excludedBenchmarks=new Set(window.filteredOutBenchmarks||[]);const waybackHiddenBenchmarks=window.waybackHiddenBenchmarks||new Set();const allExcludedBenchmarks=new Set([...excludedBenchmarks,...waybackHiddenBenchmarks]);const fixedOrder=['rank','model','model_id','filtered_score','average_vision_v0'];const fixedColumns=fixedOrder.filter(id=>id==='model_id'||allColumns.some(col=>col.colId===id));const benchmarkColumns=[];const visited=new Set();const queue=[...hierarchyMap.keys()];while(queue.length){const current=queue.shift();if(visited.has(current)||allExcludedBenchmarks.has(current))continue;visited.add(current);const col=allColumns.find(c=>c.colId===current||c.field===current);if(col)benchmarkColumns.push(current);const children=hierarchyMap.get(current)||[];queue.push(...children);}
+const columnKeys=[...fixedColumns,...benchmarkColumns].filter(id=>id!=='group_status');const rows=[];const headerRow=columnKeys.map(id=>{if(id==='model_id')return'"Model ID"';const col=allColumns.find(c=>c.colId===id);return`"${col?.headerName || id}"`;}).join(',');rows.push(headerRow);const nodes=[];window.globalGridApi.forEachNodeAfterFilter(node=>{nodes.push(node);});const sortColumns=[];window.globalGridApi.getAllGridColumns().forEach(column=>{const sort=column.getSort();if(sort){sortColumns.push({colId:column.getColId(),sort:sort});}});if(sortColumns.length>0){nodes.sort((a,b)=>{for(const sortCol of sortColumns){const colId=sortCol.colId;let aVal=a.data?.[colId];let bVal=b.data?.[colId];if(typeof aVal==='object'&&aVal!==null&&'value'in aVal){aVal=aVal.value;}
+if(typeof bVal==='object'&&bVal!==null&&'value'in bVal){bVal=bVal.value;}
+if(colId==='model'){aVal=aVal?.name||'';bVal=bVal?.name||'';}
+if(aVal===bVal)continue;if(aVal==null)return 1;if(bVal==null)return-1;if(aVal==='X')return 1;if(bVal==='X')return-1;const comparison=aVal<bVal?-1:aVal>bVal?1:0;return sortCol.sort==='desc'?-comparison:comparison;}
+return 0;});}
+nodes.forEach(node=>{const row=columnKeys.map(colId=>{const val=node.data?.[colId];if(colId==='model')return`"${val?.name || ''}"`;if(colId==='model_id')return`"${node.data?.id || node.data?.model?.id || ''}"`;if(colId==='submitter')return`"${val?.submitter || ''}"`;if(typeof val==='object'&&val!==null&&'value'in val)
+return val.value==='X'?'':`"${val.value}"`;return`"${val ?? ''}"`;}).join(',');rows.push(row);});const leaderboardCsv=rows.join('\n');const pluginRows=[['plugin_name','plugin_type','model_id','metadata']];window.globalGridApi.forEachNodeAfterFilter(node=>{const modelName=node.data?.model?.name;const modelId=node.data?.id||node.data?.model?.id||'';if(!modelName)return;const meta=window.modelMetadataMap[modelName]||node.data.metadata||{};const modelJson=JSON.stringify(meta).replace(/"/g,'""');const modelCell=`"${modelJson}"`;pluginRows.push([modelName,'model',modelId,modelCell]);});const benchmarkLeafIds=[];const queue2=[...window.benchmarkTree];while(queue2.length){const node=queue2.shift();if(node.children&&node.children.length){queue2.push(...node.children);}else{if(!allExcludedBenchmarks.has(node.id)){benchmarkLeafIds.push(node.id);}}}
+benchmarkLeafIds.forEach(id=>{const stimuliMeta=(window.benchmarkStimuliMetaMap||{})[id]||{};const dataMeta=(window.benchmarkDataMetaMap||{})[id]||{};const metricMeta=(window.benchmarkMetricMetaMap||{})[id]||{};const combined={Stimuli:stimuliMeta,Data:dataMeta,Metric:metricMeta};const jsonStr=JSON.stringify(combined).replace(/"/g,'""');pluginRows.push([id,'benchmark','',`"${jsonStr}"`]);});const pluginCsv=pluginRows.map(row=>row.join(',')).join('\n');const now=new Date();const pad=n=>String(n).padStart(2,'0');const tz=Intl.DateTimeFormat('en-US',{timeZoneName:'short'}).formatToParts(now).find(part=>part.type==='timeZoneName')?.value||'local';const timestamp=`${now.getFullYear()}-${pad(now.getMonth() + 1)}-${pad(now.getDate())}_${pad(now.getHours())}-${pad(now.getMinutes())}-${pad(now.getSeconds())}_${tz}`;const datetimeComment=`# Generated on ${now.toISOString()} (${tz})`;const DEFAULT_MIN_TS=1598524327;let minTs=window.activeFilters?.min_wayback_timestamp;let maxTs=window.activeFilters?.max_wayback_timestamp;if(minTs==null||minTs<DEFAULT_MIN_TS){minTs=DEFAULT_MIN_TS;}
+let startDate=new Date(minTs*1000);let endDate;if(maxTs==null){endDate=now;}else{const tentativeEnd=new Date(maxTs*1000);if(tentativeEnd.getUTCFullYear()===1970){endDate=now;}else{endDate=tentativeEnd;}}
+const waybackComment=`# Date from ${startDate.toISOString()} to ${endDate.toISOString()}`;const leaderboardCsvWithComment=`${datetimeComment}\n${waybackComment}\n${leaderboardCsv}`;const pluginCsvWithComment=`${datetimeComment}\n${waybackComment}\n${pluginCsv}`;const zip=new JSZip();zip.file('leaderboard.csv',leaderboardCsvWithComment);zip.file('plugin-info.csv',pluginCsvWithComment);const zipBlob=await zip.generateAsync({type:'blob'});const link=document.createElement('a');link.href=URL.createObjectURL(zipBlob);link.download=`leaderboard_export_${timestamp}.zip`;link.click();});;function setupCitationExport(){const copyBibtexBtn=document.getElementById('copyBibtexBtn');if(!copyBibtexBtn)return;copyBibtexBtn.addEventListener('click',(e)=>{e.preventDefault();copyBibtexToClipboard();});}
+function handleCitationExport(){try{const bibtexContent=collectBenchmarkBibtex();if(!bibtexContent||bibtexContent.length===0){alert('No benchmarks selected for citation export.');return;}
+copyToClipboard(bibtexContent);showCopyFeedback();}catch(error){console.error('Error copying BibTeX to clipboard:',error);alert('Error copying citations to clipboard. Please try again.');}}
+function copyBibtexToClipboard(){const bibtexList=collectBenchmarkBibtex();if(bibtexList.length===0){alert('No citations found for selected benchmarks');return;}
+const formattedBibtex=bibtexList.join('\n\n');navigator.clipboard.writeText(formattedBibtex).then(()=>{const count=bibtexList.length;const message=`Copied ${count} citation${count === 1 ? '' : 's'} to clipboard`;alert(message);}).catch(err=>{console.error('Failed to copy to clipboard:',err);alert('Failed to copy to clipboard');});}
+function collectBenchmarkBibtex(){if(!window.originalRowData||window.originalRowData.length===0){console.warn('Original row data not available');return[];}
+const excludedBenchmarks=new Set(window.filteredOutBenchmarks||[]);const hierarchyMap=window.LeaderboardHierarchyUtils?.buildHierarchyFromTree?window.LeaderboardHierarchyUtils.buildHierarchyFromTree(window.benchmarkTree):(window.benchmarkTree?buildHierarchyFromTree(window.benchmarkTree):new Map());const bibtexSet=new Set();function isLeafBenchmark(benchmarkId){const children=hierarchyMap.get(benchmarkId)||[];return children.length===0;}
+const firstModel=window.originalRowData[0];Object.keys(firstModel).forEach(fieldName=>{if(fieldName==='id'||fieldName==='rank'||fieldName==='model'||fieldName==='metadata'){return;}
+const scoreData=firstModel[fieldName];if(scoreData&&typeof scoreData==='object'&&isLeafBenchmark(fieldName)){const bibtexData=window.benchmarkBibtexMap?.[fieldName];if(bibtexData&&bibtexData.bibtex){const baseFieldName=fieldName.replace(/_v\d+$/,'');const benchmarkTypeId=bibtexData.benchmark_type_id;const isExcluded=excludedBenchmarks.has(fieldName)||excludedBenchmarks.has(baseFieldName)||excludedBenchmarks.has(benchmarkTypeId);if(!isExcluded){const bibtex=bibtexData.bibtex.trim();if(bibtex&&bibtex!=='null'){bibtexSet.add(bibtex);}}}}});return Array.from(bibtexSet);}
+function buildHierarchyFromTree(tree,hierarchyMap=new Map()){tree.forEach(node=>{const nodeId=node.id||node.identifier||node.field||node.name;const children=node.children?node.children.map(child=>child.id||child.identifier||child.field||child.name).filter(Boolean):[];if(nodeId){hierarchyMap.set(nodeId,children);if(node.children&&node.children.length>0){buildHierarchyFromTree(node.children,hierarchyMap);}}});return hierarchyMap;}
+function copyToClipboard(text){if(navigator.clipboard&&navigator.clipboard.writeText){return navigator.clipboard.writeText(text);}else{const textArea=document.createElement('textarea');textArea.value=text;textArea.style.position='fixed';textArea.style.opacity='0';document.body.appendChild(textArea);textArea.focus();textArea.select();try{document.execCommand('copy');document.body.removeChild(textArea);return Promise.resolve();}catch(err){document.body.removeChild(textArea);return Promise.reject(err);}}}
+function showCopyFeedback(){}
+function getCitationCount(){return collectBenchmarkBibtex().length;}
+function getCitationPreview(maxEntries=3){const bibtexList=collectBenchmarkBibtex();return bibtexList.slice(0,maxEntries);}
+function exportBenchmarkReferences(){const bibtexList=collectBenchmarkBibtex();return{metadata:{generated_on:new Date().toISOString(),total_benchmarks:bibtexList.length,brain_score_version:'2.0'},references:bibtexList.map(bibtex=>({bibtex}))};}
+window.LeaderboardCitationExport={setupCitationExport,handleCitationExport,copyBibtexToClipboard,collectBenchmarkBibtex,copyToClipboard,showCopyFeedback,getCitationCount,getCitationPreview,exportBenchmarkReferences};window.copyBibtexToClipboard=copyBibtexToClipboard;;function initTopScrollbar(attempt){attempt=attempt||0;var topScrollbar=document.getElementById('topScrollbar');var topScrollbarInner=document.getElementById('topScrollbarInner');if(!topScrollbar||!topScrollbarInner)return;var gridEl=document.getElementById('leaderboardGrid');if(!gridEl)return;var agScrollViewport=gridEl.querySelector('.ag-body-horizontal-scroll-viewport');var agScrollContainer=gridEl.querySelector('.ag-body-horizontal-scroll-container');var centerViewport=gridEl.querySelector('.ag-center-cols-viewport');if(!agScrollViewport||!agScrollContainer||!centerViewport){if(attempt<20){setTimeout(function(){initTopScrollbar(attempt+1);},200);}
+return;}
+var syncing=false;function syncWidths(){var scrollWidth=agScrollContainer.scrollWidth;var clientWidth=agScrollViewport.clientWidth;topScrollbarInner.style.width=scrollWidth+'px';topScrollbar.style.display=scrollWidth>clientWidth?'':'none';var gridRect=gridEl.getBoundingClientRect();var vpRect=centerViewport.getBoundingClientRect();topScrollbar.style.marginLeft=(vpRect.left-gridRect.left)+'px';topScrollbar.style.width=vpRect.width+'px';}
+syncWidths();topScrollbar.addEventListener('scroll',function(){if(syncing)return;syncing=true;agScrollViewport.scrollLeft=topScrollbar.scrollLeft;requestAnimationFrame(function(){syncing=false;});});agScrollViewport.addEventListener('scroll',function(){if(syncing)return;syncing=true;topScrollbar.scrollLeft=agScrollViewport.scrollLeft;requestAnimationFrame(function(){syncing=false;});});var mutObs=new MutationObserver(syncWidths);mutObs.observe(agScrollContainer,{attributes:true,childList:true,subtree:true});var resizeObs=new ResizeObserver(syncWidths);resizeObs.observe(gridEl);window.addEventListener('resize',syncWidths);window._topScrollbarSyncWidths=syncWidths;}
+function resizeGridToViewport(){var grid=document.getElementById('leaderboardGrid');if(!grid)return;var top=grid.getBoundingClientRect().top;var available=window.innerHeight-top-16;var height=Math.max(400,available);grid.style.height=height+'px';var container=grid.closest('.leaderboard-container');var panel=document.getElementById('advancedFiltersPanel');if(panel){if(container&&container.classList.contains('sidebar-mode')){panel.style.maxHeight=height+'px';}else{panel.style.maxHeight='';}}
+if(window.globalGridApi){window.globalGridApi.resetRowHeights();}
+requestAnimationFrame(function(){requestAnimationFrame(function(){if(window._topScrollbarSyncWidths){window._topScrollbarSyncWidths();}else{initTopScrollbar();}});});};window.globalGridApi=null;window.globalColumnApi=null;window.activeFilters={architecture:[],model_family:[],training_dataset:[],task_specialization:[],max_param_count:null,max_model_size:null,runnable_only:false,benchmark_regions:[],benchmark_species:[],benchmark_tasks:[],public_data_only:false};window.columnExpansionState=new Map();window.filteredOutBenchmarks=new Set();function ModelCellRenderer(){}
+ModelCellRenderer.prototype.init=function(params){this.eGui=document.createElement('div');this.eGui.className='model-cell';const nameRow=document.createElement('div');nameRow.className='model-name-row';const a=document.createElement('a');const domain=(window.DJANGO_DATA&&window.DJANGO_DATA.domain)||'vision';a.href=`/model/${domain}/${params.value.id}`;a.textContent=params.value.name;nameRow.appendChild(a);this.eGui.appendChild(nameRow);if(params.value.submitter){const contributor=document.createElement('div');contributor.className='model-submitter';contributor.textContent=params.value.submitter;this.eGui.appendChild(contributor);}};ModelCellRenderer.prototype.getGui=function(){return this.eGui;};function GroupStatusCellRenderer(){}
+GroupStatusCellRenderer.prototype.init=function(params){this.eGui=document.createElement('div');this.eGui.className='group-status-cell';const group=params.data?.metadata?.group;const statusIcon=document.createElement('div');statusIcon.className='group-status-icon';if(group){statusIcon.classList.add('group-blue');}else{statusIcon.classList.add('group-grey');}
+this.eGui.appendChild(statusIcon);};GroupStatusCellRenderer.prototype.getGui=function(){return this.eGui;};function createGroupStatusColumn(){return{headerName:'',field:'group_status',colId:'group_status',lockPosition:true,suppressMovable:true,width:60,cellRenderer:'groupStatusCellRenderer',sortable:true,filter:false,headerClass:'centered-header',valueGetter:params=>{const group=params.data?.metadata?.group;return group?1:0;},tooltipValueGetter:params=>{const group=params.data?.metadata?.group;if(group){return'Curated model (part of a benchmark group)';}
+return'Community-submitted model';}};}
+function modelComparator(a,b){const nameA=a?.name?.toLowerCase()||'';const nameB=b?.name?.toLowerCase()||'';return nameA.localeCompare(nameB);}
+function ScoreCellRenderer(){}
+ScoreCellRenderer.prototype.init=function(params){const field=params.colDef.field;const cellObj=params.data[field]||{};let display='X';const CELL_ALPHA=0.85;let bg='#e0e1e2';if(cellObj.value!=null&&cellObj.value!==''&&!isNaN(Number(cellObj.value))){display=String(cellObj.value);if(cellObj.color){bg=cellObj.color;}else{const benchmarkId=field;const stats=window.benchmarkStats&&window.benchmarkStats[benchmarkId];if(stats&&window.LeaderboardColorUtils?.calculateRepresentativeColor){const rootParent=params.colDef.context?.rootParent||null;const colorCss=window.LeaderboardColorUtils.calculateRepresentativeColor(parseFloat(cellObj.value),stats.min,stats.max,rootParent);const rgbaMatch=colorCss.match(/rgba?\([^)]*\)/g);if(rgbaMatch&&rgbaMatch.length>0){const colorStr=rgbaMatch[rgbaMatch.length-1];if(colorStr.startsWith('rgba(')){bg=colorStr.replace(/,\s*[\d.]+\)$/,`, ${CELL_ALPHA})`);}else if(colorStr.startsWith('rgb(')){bg=colorStr.replace('rgb(','rgba(').replace(')',`, ${CELL_ALPHA})`);}else{bg=colorStr;}}}}}
+this.eGui=document.createElement('div');this.eGui.className='score-pill-container';const pill=document.createElement('div');pill.className='score-pill';pill.textContent=display;pill.style.backgroundColor=bg;this.eGui.appendChild(pill);};ScoreCellRenderer.prototype.getGui=function(){return this.eGui;};window.currentSearchQuery=null;function getSearchableText(rowData){const model=rowData.model||{};const searchFields=[model.name||'',model.submitter||''];return searchFields.join(' ').toLowerCase();}
+function parseSearchQuery(query){if(!query.trim())return null;const orParts=query.toLowerCase().split(/\s+or\s+/);return{type:'OR',parts:orParts.map(orPart=>{const andParts=orPart.split(/\s+and\s+/);if(andParts.length===1){const term=andParts[0].trim();if(term.startsWith('not ')){return{type:'NOT',term:term.substring(4).trim()};}
+return{type:'TERM',term};}
+return{type:'AND',parts:andParts.map(andPart=>{const term=andPart.trim();if(term.startsWith('not ')){return{type:'NOT',term:term.substring(4).trim()};}
+return{type:'TERM',term};})};})};}
+function executeSearchQuery(parsedQuery,searchableText){if(!parsedQuery)return true;function evaluateNode(node){switch(node.type){case'TERM':return searchableText.includes(node.term);case'NOT':return!searchableText.includes(node.term);case'AND':return node.parts.every(evaluateNode);case'OR':return node.parts.some(evaluateNode);default:return false;}}
+return evaluateNode(parsedQuery);}
+function initializeGrid(rowData,columnDefs,benchmarkGroups){if(typeof LoadingAnimation!=='undefined'&&typeof LoadingAnimation.setProgress==='function'){LoadingAnimation.setProgress(88);}
+window.originalRowData=rowData;updateFilteredScores(rowData);if(window.LeaderboardColorUtils?.computeBenchmarkMinMax){window.benchmarkStats=window.LeaderboardColorUtils.computeBenchmarkMinMax(rowData,columnDefs);}else{console.warn('LeaderboardColorUtils.computeBenchmarkMinMax not available - colors may not display correctly');window.benchmarkStats={};}
+columnDefs.forEach(col=>{col.colId=col.field;if(col.field==='model'){col.comparator=modelComparator;}
+if(col.cellRenderer==='scoreCellRenderer'){col.cellDataType='object';col.valueFormatter=params=>{const v=params.value;return(v&&typeof v==='object'&&'value'in v)?v.value:v;};col.comparator=(valueA,valueB,nodeA,nodeB,isDescending)=>{const objA=valueA&&typeof valueA==='object'?valueA:{};const objB=valueB&&typeof valueB==='object'?valueB:{};const valA='value'in objA?objA.value:valueA;const valB='value'in objB?objB.value:valueB;const isMissingA=valA==null||valA===''||valA==='X';const isMissingB=valB==null||valB===''||valB==='X';const MISSING_VALUE=Number.NEGATIVE_INFINITY;const numA=isMissingA?MISSING_VALUE:parseFloat(valA);const numB=isMissingB?MISSING_VALUE:parseFloat(valB);const isNanA=isNaN(numA)&&!isMissingA;const isNanB=isNaN(numB)&&!isMissingB;if(isNanA&&isNanB)return 0;if(isNanA)return-1;if(isNanB)return 1;return numA-numB;};}
+if(col.headerComponent==='expandableHeaderComponent'){col.headerComponentParams={benchmarkId:col.context?.benchmarkId||null};}});const groupStatusColumn=createGroupStatusColumn();const filteredScoreColumn={headerName:'Filtered Score',field:'filtered_score',colId:'filtered_score',hide:true,lockPosition:true,suppressMovable:true,width:150,cellRenderer:'scoreCellRenderer',cellDataType:'object',sortable:true,valueFormatter:params=>{const v=params.value;return v&&typeof v==='object'&&'value'in v?v.value:v;},headerClass:'centered-header',comparator:(valueA,valueB)=>{const objA=valueA&&typeof valueA==='object'?valueA:{};const objB=valueB&&typeof valueB==='object'?valueB:{};const valA='value'in objA?objA.value:valueA;const valB='value'in objB?objB.value:valueB;const isMissingA=valA==null||valA===''||valA==='X';const isMissingB=valB==null||valB===''||valB==='X';const numA=isMissingA?Number.NEGATIVE_INFINITY:parseFloat(valA);const numB=isMissingB?Number.NEGATIVE_INFINITY:parseFloat(valB);return numA-numB;}};const rankColumnIndex=columnDefs.findIndex(col=>col.field==='rank');const modelColumnIndex=columnDefs.findIndex(col=>col.field==='model');let rankColumn=null;let modelColumn=null;if(rankColumnIndex!==-1&&modelColumnIndex!==-1){if(rankColumnIndex>modelColumnIndex){rankColumn=columnDefs.splice(rankColumnIndex,1)[0];modelColumn=columnDefs.splice(modelColumnIndex,1)[0];}else{modelColumn=columnDefs.splice(modelColumnIndex,1)[0];rankColumn=columnDefs.splice(rankColumnIndex,1)[0];}
+columnDefs.unshift(filteredScoreColumn);columnDefs.unshift(groupStatusColumn);columnDefs.unshift(modelColumn);columnDefs.unshift(rankColumn);}else{columnDefs.push(groupStatusColumn,filteredScoreColumn);}
+const gridOptions={rowData,columnDefs,headerHeight:60,rowHeight:60,tooltipShowDelay:500,components:{modelCellRenderer:ModelCellRenderer,scoreCellRenderer:ScoreCellRenderer,groupStatusCellRenderer:GroupStatusCellRenderer,publicToggleCellRenderer:window.LeaderboardRenderers?.PublicToggleCellRenderer,expandableHeaderComponent:window.LeaderboardHeaderComponents?.ExpandableHeaderComponent,leafComponent:window.LeaderboardHeaderComponents?.LeafHeaderComponent,},suppressFieldDotNotation:true,isExternalFilterPresent:()=>{return window.currentSearchQuery!==null;},doesExternalFilterPass:(node)=>{if(!window.currentSearchQuery)return true;const searchableText=getSearchableText(node.data);return executeSearchQuery(window.currentSearchQuery,searchableText);},sortingOrder:['desc','asc',null],defaultColDef:{sortable:true,resizable:false,unSortIcon:true,valueFormatter:params=>{const v=params.value;return(v!=null&&typeof v==='object'&&'value'in v)?v.value:v;}},onGridReady:params=>{window.globalGridApi=params.api;params.api.resetRowHeights();setInitialColumnState();params.api.applyColumnState({state:[{colId:'group_status',hide:false},{colId:'filtered_score',hide:true},{colId:`average_${(window.DJANGO_DATA && window.DJANGO_DATA.domain) || 'vision'}_v0`,hide:false,sort:'desc'}]});if(typeof window.LeaderboardHeaderComponents?.expandNewBenchmarkColumns==='function'){window.LeaderboardHeaderComponents.expandNewBenchmarkColumns();}
+if(typeof LoadingAnimation!=='undefined'&&typeof LoadingAnimation.setProgress==='function'){LoadingAnimation.setProgress(92);}
+setTimeout(()=>{if(typeof LoadingAnimation!=='undefined'&&LoadingAnimation.complete){LoadingAnimation.complete();}else if(typeof LoadingAnimation!=='undefined'&&LoadingAnimation.hide){LoadingAnimation.hide();}},300);}};const eGridDiv=document.getElementById('leaderboardGrid');if(!eGridDiv){console.error('Could not find #leaderboardGrid');return;}
+let gridApi;if(window.agGrid&&typeof agGrid.createGrid==='function'){gridApi=agGrid.createGrid(eGridDiv,gridOptions);window.globalGridApi=gridApi;}else if(window.agGrid&&typeof agGrid.Grid==='function'){const grid=new agGrid.Grid(eGridDiv,gridOptions);gridApi=gridOptions.api;window.globalGridApi=gridApi;}else{console.error('AG Grid not found on window.agGrid');}
+if(gridApi){const searchInput=document.getElementById('modelSearchInput');if(searchInput){const newInput=searchInput.cloneNode(true);searchInput.parentNode.replaceChild(newInput,searchInput);newInput.addEventListener('input',function(){const searchText=this.value;window.currentSearchQuery=parseSearchQuery(searchText);if(typeof gridApi.onFilterChanged==='function'){gridApi.onFilterChanged();}else{console.warn('onFilterChanged not available on gridApi');}});}else{console.error('Search input not found');}}else{console.error('Grid API not available after initialization');}}
+function setInitialColumnState(){if(!window.globalGridApi)return;const allColumns=window.globalGridApi.getAllGridColumns();const initialColumnState=[];window.columnExpansionState.clear();allColumns.forEach(column=>{const colId=column.getColId();if(['model','rank','group_status','filtered_score'].includes(colId)){initialColumnState.push({colId:colId,hide:false});return;}
+const domain=(window.DJANGO_DATA&&window.DJANGO_DATA.domain)||'vision';const topLevelCategories=[`average_${domain}_v0`,`neural_${domain}_v0`,`behavior_${domain}_v0`,`engineering_${domain}_v0`];const shouldShow=topLevelCategories.includes(colId);initialColumnState.push({colId:colId,hide:!shouldShow});if(topLevelCategories.includes(colId)){window.columnExpansionState.set(colId,false);}});window.globalGridApi.applyColumnState({state:initialColumnState});}
+function updateFilteredScores(rowData){if(typeof window.LeaderboardFilterCoordinator?.updateFilteredScores==='function'){const updatedData=window.LeaderboardFilterCoordinator.updateFilteredScores(rowData);if(updatedData&&window.globalGridApi){window.globalGridApi.setGridOption('rowData',updatedData);}
+return updatedData;}
+return rowData;}
+window.initializeGrid=initializeGrid;window.setInitialColumnState=setInitialColumnState;window.updateFilteredScores=updateFilteredScores;;
\ No newline at end of file
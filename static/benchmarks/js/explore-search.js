@@ -0,0 +1,74 @@
+/**
+ * Explore page model search.
+ * Queries the domain's typeahead endpoint (views/search.py) as the user types and
+ * renders the matches as model tags, instead of shipping every model name in the page.
+ */
+
+(function() {
+    'use strict';
+
+    const DEBOUNCE_MS = 120;
+    const RESULT_LIMIT = 50;
+
+    function renderResults(container, results, query) {
+        container.innerHTML = '';
+        if (!query) {
+            return;
+        }
+        if (!results.length) {
+            const empty = document.createElement('p');
+            empty.className = 'help';
+            empty.textContent = 'No models match "' + query + '".';
+            container.appendChild(empty);
+            return;
+        }
+        results.forEach(function(result) {
+            const tag = document.createElement('a');
+            tag.className = 'tag model-tag';
+            tag.href = result.url;
+            tag.textContent = result.name;
+            container.appendChild(tag);
+        });
+    }
+
+    function initExploreSearch() {
+        const input = document.getElementById('explore-search-input');
+        const container = document.getElementById('explore-search-results');
+        if (!input || !container) {
+            return;
+        }
+        const searchUrl = input.dataset.searchUrl;
+        let timer = null;
+        let latestQuery = '';
+
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            timer = setTimeout(function() {
+                const query = input.value.trim();
+                latestQuery = query;
+                if (!query) {
+                    renderResults(container, [], query);
+                    return;
+                }
+                const params = new URLSearchParams({q: query, kind: 'model', limit: RESULT_LIMIT});
+                fetch(searchUrl + '?' + params.toString())
+                    .then(function(response) { return response.json(); })
+                    .then(function(payload) {
+                        // Drop responses for queries the user has already typed past
+                        if (query === latestQuery) {
+                            renderResults(container, payload.results || [], query);
+                        }
+                    })
+                    .catch(function(error) {
+                        console.error('Model search failed:', error);
+                    });
+            }, DEBOUNCE_MS);
+        });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', initExploreSearch);
+    } else {
+        initExploreSearch();
+    }
+})();
@@ -1,7 +1,7 @@
 // Color calculation utilities
-// Replicates the SQL representative_color_sql_precomputed function logic
+// Mirrors the leaderboard palette in benchmarks/views/palette.py
 
-// Precomputed color arrays matching SQL (101 colors each)
+// Precomputed color arrays matching palette.py (101 colors each)
 const REDGREEN_COLORS = [
   '#ff0000', '#ff0000', '#ff0000', '#ff0000', '#fe0600', '#fe0600', '#fd0d01', '#fd0d01', '#fc1301', '#fb1901', 
   '#fb1901', '#fa1f02', '#f92502', '#f92502', '#f82b02', '#f73103', '#f73103', '#f63703', '#f53d03', '#f44204', 
@@ -35,7 +35,7 @@ const GAMMA = 0.5;  // Gamma value to stretch high-end differences
 
 /**
  * Calculate representative color for a score value
- * Replicates the SQL representative_color_sql_precomputed function
+ * Mirrors palette.representative_color
  * 
  * @param {number} value - The score value
  * @param {number} minValue - Minimum value in the distribution